@@ -8,6 +8,7 @@ from randomgen.jsf import JSF
 from randomgen.mt64 import MT64
 from randomgen.mt19937 import MT19937
 from randomgen.mtrand import RandomState
+from randomgen.parallel import ParallelGenerator
 from randomgen.pcg32 import PCG32
 from randomgen.pcg64 import PCG64
 from randomgen.philox import Philox
@@ -27,7 +28,7 @@ __all__ = ["DSFMT", "Generator", "HC128", "JSF", "MT19937", "MT64", "PCG32",
            "PCG64", "Philox", "RDRAND", "RandomState", "SFMT", "SPECK128",
            "ThreeFry", "Xoroshiro128", "Xorshift1024", "Xoshiro256",
            "Xoshiro512", "AESCounter", "ChaCha", "random_entropy",
-           "SeedSequence", "SeedlessSeedSequence"]
+           "SeedSequence", "SeedlessSeedSequence", "ParallelGenerator"]
 
 __version__ = get_versions()["version"]
 del get_versions
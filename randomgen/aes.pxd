@@ -4,26 +4,32 @@ cdef extern from "src/aesctr/aesctr.h":
 
     # int are placeholders only for
     struct AESCTR_STATE_T:
-        int ctr[4]
+        int ctr[16]
         int seed[10 + 1]
-        uint8_t state[16 * 4]
+        uint8_t state[16 * 16]
         size_t offset
         int has_uint32
         uint32_t uinteger
+        int lanes
 
     ctypedef AESCTR_STATE_T aesctr_state_t
 
     uint64_t aes_next64(aesctr_state_t *aesctr) nogil
     uint32_t aes_next32(aesctr_state_t *aesctr) nogil
     double aes_next_double(aesctr_state_t *aesctr) nogil
+    void aes_fill64(aesctr_state_t *aesctr, size_t cnt, uint64_t *out) nogil
 
     int RANDOMGEN_USE_AESNI
+    int RANDOMGEN_USE_VAES
     void aesctr_use_aesni(int val)
+    void aesctr_use_vaes(int val)
     void aesctr_seed(aesctr_state_t *aesctr, uint64_t *seed)
     void aesctr_set_seed_counter(aesctr_state_t *aesctr, uint64_t *seed, uint64_t *counter)
     void aesctr_get_seed_counter(aesctr_state_t *aesctr, uint64_t *seed, uint64_t *counter)
     int aes_capable()
+    int aes_vaes_capable()
     void aesctr_advance(aesctr_state_t *aesctr, uint64_t *step)
+    void aesctr_raw_at(aesctr_state_t *aesctr, uint64_t *positions, size_t cnt, uint64_t *out) nogil
     void aesctr_set_counter(aesctr_state_t *aesctr, uint64_t *counter)
 
 
@@ -14,9 +14,21 @@ cdef uint32_t aes_uint32(void *st) nogil:
 cdef double aes_double(void* st) nogil:
     return uint64_to_double(aes_next64(<aesctr_state_t *>st))
 
+cdef void aes_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    aes_fill64(<aesctr_state_t *>st, <size_t>cnt, out)
+
+cdef void aes_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(aes_next64(<aesctr_state_t *>st))
+
+cdef void aes_values_at(void *st, uint64_t *positions, np.npy_intp cnt, uint64_t *out) nogil:
+    aesctr_raw_at(<aesctr_state_t *>st, positions, <size_t>cnt, out)
+
+
 cdef class AESCounter(BitGenerator):
     """
-    AESCounter(, seed=None, *, counter=None, key=None, mode=None)
+    AESCounter(seed=None, *, counter=None, key=None, mode=None, lanes=4)
 
     Container for the AES Counter pseudo-random number generator.
 
@@ -42,6 +54,10 @@ cdef class AESCounter(BitGenerator):
         SplitMix64-based initialization. "sequence" uses a SeedSequence
         to transforms the seed into an initial state. None defaults to "legacy"
         and warns that the default after 1.19 will change to "sequence".
+    lanes : {4, 8, 16}, optional
+        The number of 128-bit counter blocks encrypted each time the buffer
+        is refilled. Larger values make better use of the AES pipeline.
+        The value does not affect the random values produced.
 
     Attributes
     ----------
@@ -72,13 +88,23 @@ cdef class AESCounter(BitGenerator):
 
     **State and Seeding**
 
-    The ``AESCounter`` state vector consists of a 64-element array of uint8
-    that capture buffered draws from the distribution, a 22-element array of
-    uint64s holding the seed (11 by 128bits), and an 8-element array of
-    uint64 that holds the counters (4 by 129 bits). The first two elements of
-    the seed are the value provided by the user (or from the entropy pool).
-    The offset varies between 0 and 64 and shows the location in the buffer of
-    the next 64 bits.
+    The ``AESCounter`` state vector consists of a ``16 * lanes``-element array
+    of uint8 that capture buffered draws from the distribution, a 22-element
+    array of uint64s holding the seed (11 by 128bits), and a
+    ``2 * lanes``-element array of uint64 that holds the counters (``lanes``
+    by 128 bits). The first two elements of the seed are the value provided
+    by the user (or from the entropy pool). The offset varies between 0 and
+    ``16 * lanes`` and shows the location in the buffer of the next 64 bits.
+    When ``lanes`` is 4, the default, the state is identical to the state
+    used in earlier versions.
+
+    **Wide Blocks**
+
+    By default 4 blocks are encrypted in each refill of the buffer. Setting
+    ``lanes`` to 8 or 16 encrypts more blocks at once which keeps more AES
+    instructions in flight. When the CPU supports VAES and AVX-512, 4 blocks
+    are encrypted per instruction. The VAES path is selected at runtime and
+    can be toggled using ``use_vaes``.
 
     ``AESCounter`` is seeded using either a single 128-bit unsigned integer
     or a vector of 2 64-bit unsigned integers. In either case, the seed is
@@ -125,10 +151,14 @@ cdef class AESCounter(BitGenerator):
     .. [1] Advanced Encryption Standard. (n.d.). In Wikipedia. Retrieved
         June 1, 2019, from https://en.wikipedia.org/wiki/Advanced_Encryption_Standard
     """
-    def __init__(self, seed=None, *, counter=None, key=None, mode=None):
+    def __init__(self, seed=None, *, counter=None, key=None, mode=None,
+                 lanes=4):
+        if lanes not in (4, 8, 16):
+            raise ValueError("lanes must be one of 4, 8 or 16")
         BitGenerator.__init__(self, seed, mode)
         # Calloc since ctr needs to be 0
         self.rng_state = <aesctr_state_t *>PyArray_calloc_aligned(sizeof(aesctr_state_t), 1)
+        self.rng_state.lanes = lanes
         self.seed(seed, counter, key)
 
         self._bitgen.state = <void *>self.rng_state
@@ -136,6 +166,8 @@ cdef class AESCounter(BitGenerator):
         self._bitgen.next_uint32 = &aes_uint32
         self._bitgen.next_double = &aes_double
         self._bitgen.next_raw = &aes_uint64
+        self._bitgen.fill_uint64 = &aes_fill_uint64
+        self._bitgen.fill_double = &aes_fill_double
 
     def __dealloc__(self):
         if self.rng_state:
@@ -174,6 +206,36 @@ cdef class AESCounter(BitGenerator):
             raise ValueError("CPU does not support AESNI")
         aesctr_use_aesni(bool(value))
 
+    @property
+    def use_vaes(self):
+        """
+        Toggle use of VAES
+
+        Parameters
+        ----------
+        flag : bool
+            Flag indicating whether to use VAES and AVX-512 when AESNI is
+            in use
+
+        Returns
+        -------
+        flag : bool
+            Current flag value
+
+        Raises
+        ------
+        ValueError
+            If VAES is not supported
+        """
+        return RANDOMGEN_USE_VAES
+
+    @use_vaes.setter
+    def use_vaes(self, value):
+        capable = aes_vaes_capable()
+        if value and not capable:
+            raise ValueError("CPU does not support VAES")
+        aesctr_use_vaes(bool(value))
+
     def _seed_from_seq(self, counter=None):
         state = self.seed_seq.generate_state(2, np.uint64)
         self.seed(key=state, counter=counter)
@@ -241,9 +303,10 @@ cdef class AESCounter(BitGenerator):
         else:
             _seed = int_to_array(key, "key", 128, 64)
         aesctr_seed(self.rng_state, <uint64_t*>np.PyArray_DATA(_seed))
-        _counter = np.empty(8, dtype=np.uint64)
+        lanes = self.rng_state.lanes
+        _counter = np.empty(2 * lanes, dtype=np.uint64)
         counter = 0 if counter is None else counter
-        for i in range(4):
+        for i in range(lanes):
             _counter[2*i:2*i+2] = int_to_array(counter+i, "counter", 128, 64)
         aesctr_set_counter(self.rng_state,
                            <uint64_t*>np.PyArray_DATA(_counter))
@@ -263,19 +326,20 @@ cdef class AESCounter(BitGenerator):
         cdef np.ndarray seed, counter
         cdef np.npy_intp i
         cdef size_t offset
+        cdef int lanes = self.rng_state.lanes
 
         seed = np.empty(2 * (10 + 1), dtype=np.uint64)
-        counter = np.empty(2 * 4, dtype=np.uint64)
+        counter = np.empty(2 * lanes, dtype=np.uint64)
         aesctr_get_seed_counter(self.rng_state,
                                 <uint64_t*>np.PyArray_DATA(seed),
                                 <uint64_t*>np.PyArray_DATA(counter))
-        state = np.empty(16 * 4, dtype=np.uint8)
-        for i in range(16 * 4):
+        state = np.empty(16 * lanes, dtype=np.uint8)
+        for i in range(16 * lanes):
             state[i] = self.rng_state.state[i]
         offset = self.rng_state.offset
         return {"bit_generator": self.__class__.__name__,
                 "s": {"state": state, "seed": seed, "counter": counter,
-                      "offset": offset},
+                      "offset": offset, "lanes": lanes},
                 "has_uint32": self.rng_state.has_uint32,
                 "uinteger": self.rng_state.uinteger}
 
@@ -289,18 +353,25 @@ cdef class AESCounter(BitGenerator):
         if bitgen != self.__class__.__name__:
             raise ValueError("state must be for a {0} "
                              "PRNG".format(self.__class__.__name__))
-        state =value["s"]["state"]
-        for i in range(16 * 4):
-            self.rng_state.state[i] = state[i]
-        offset = self.rng_state.offset
-        self.rng_state.offset = value["s"]["offset"]
+        # States from versions without lanes always used 4
+        lanes = value["s"].get("lanes", 4)
+        if lanes not in (4, 8, 16):
+            raise ValueError("lanes must be one of 4, 8 or 16")
+        state = np.ascontiguousarray(value["s"]["state"], dtype=np.uint8)
         seed = np.ascontiguousarray(value["s"]["seed"], dtype=np.uint64)
         counter = np.ascontiguousarray(value["s"]["counter"], dtype=np.uint64)
+        if state.ndim != 1 or state.shape[0] != 16 * lanes:
+            raise ValueError("state must be a 1d uint8 array with "
+                             "{0} elements".format(16 * lanes))
         if seed.ndim != 1 or seed.shape[0] != 2 * (10 + 1):
             raise ValueError("seed must be a 1d uint64 array with 22 elements")
-        if counter.ndim != 1 or counter.shape[0] != 2 * (4):
-            raise ValueError("counter must be a 1d uint64 array with 8 "
-                             "elements")
+        if counter.ndim != 1 or counter.shape[0] != 2 * lanes:
+            raise ValueError("counter must be a 1d uint64 array with "
+                             "{0} elements".format(2 * lanes))
+        self.rng_state.lanes = lanes
+        for i in range(16 * lanes):
+            self.rng_state.state[i] = state[i]
+        self.rng_state.offset = value["s"]["offset"]
         aesctr_set_seed_counter(self.rng_state,
                                 <uint64_t*>np.PyArray_DATA(seed),
                                 <uint64_t*>np.PyArray_DATA(counter))
@@ -418,3 +489,48 @@ cdef class AESCounter(BitGenerator):
         self.rng_state.has_uint32 = 0
         self.rng_state.uinteger = 0
         return self
+
+    def values_at(self, positions, dtype=np.uint64):
+        """
+        values_at(positions, dtype=np.uint64)
+
+        Compute the values at positions in the stream without changing the state
+
+        Parameters
+        ----------
+        positions : array_like[int]
+            Non-negative positions relative to the next value. Position 0 is
+            the next value returned by ``random_raw``.
+        dtype : {np.uint64, np.float64}, optional
+            Type of the values to return. ``np.uint64`` returns the raw values
+            returned by ``random_raw``. ``np.float64`` returns the doubles in
+            [0, 1) that ``Generator.random`` would return.
+
+        Returns
+        -------
+        values : {int, float, ndarray}
+            Values at positions with the same shape as positions.
+
+        Notes
+        -----
+        The value at any position is a pure function of the key and the
+        counter and so positions can be evaluated in any order without
+        advancing the state. The cost of each value does not depend on the
+        position, which allows any part of a stream to be regenerated directly.
+        Consecutive positions that fall in the same block share the cost of
+        computing the block.
+
+        Only uniform values are supported since distributions that use
+        rejection sampling, e.g., ``standard_normal``, consume an unknown
+        number of values.
+
+        Examples
+        --------
+        >>> from randomgen import AESCounter
+        >>> bg = AESCounter(1234, mode="sequence")
+        >>> values = bg.values_at([0, 1, 2**40])
+        >>> bool((values[:2] == bg.random_raw(2)).all())
+        True
+        """
+        return values_at(<void *>&aes_values_at, <void *>self.rng_state,
+                         self.lock, positions, dtype, 64)
@@ -3,9 +3,10 @@ from randomgen.common cimport *
 cdef extern from "src/chacha/chacha.h":
 
     int RANDOMGEN_USE_SIMD
+    int RANDOMGEN_USE_AVX2
 
     struct CHACHA_STATE_T:
-        uint32_t block[16]
+        uint32_t block[16 * 8]
         uint32_t keysetup[8]
         uint64_t ctr[2]
         int rounds
@@ -15,11 +16,16 @@ cdef extern from "src/chacha/chacha.h":
     uint32_t chacha_next32(chacha_state_t *state) nogil
     uint64_t chacha_next64(chacha_state_t *state) nogil
     double chacha_next_double(chacha_state_t *state) nogil
+    void chacha_fill64(chacha_state_t *state, size_t cnt, uint64_t *out) nogil
 
     void chacha_seed(chacha_state_t *state, uint64_t *seedval, uint64_t *stream, uint64_t *ctr)
     void chacha_advance(chacha_state_t *state, uint64_t *delta)
+    void chacha_raw_at(chacha_state_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
     int chacha_simd_capable()
     void chacha_use_simd(int value)
+    int chacha_avx2_capable()
+    void chacha_use_avx2(int value)
+    void chacha_refresh(chacha_state_t *state)
 
 cdef class ChaCha(BitGenerator):
     cdef chacha_state_t *rng_state
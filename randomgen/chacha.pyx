@@ -14,6 +14,18 @@ cdef uint32_t chacha_uint32(void *st) nogil:
 cdef double chacha_double(void* st) nogil:
     return chacha_next_double(<chacha_state_t *>st)
 
+cdef void chacha_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    chacha_fill64(<chacha_state_t *>st, <size_t>cnt, out)
+
+cdef void chacha_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = chacha_next_double(<chacha_state_t *>st)
+
+cdef void chacha_values_at(void *st, uint64_t *positions, np.npy_intp cnt, uint64_t *out) nogil:
+    chacha_raw_at(<chacha_state_t *>st, positions, <size_t>cnt, out)
+
+
 cdef class ChaCha(BitGenerator):
     """
     ChaCha(seed=None, *, counter=None, key=None, rounds=20, mode=None)
@@ -79,11 +91,14 @@ cdef class ChaCha(BitGenerator):
     **State and Seeding**
 
     The ``ChaCha`` state vector consists of a 16-element array of uint32
-    that capture buffered draws from the distribution, an 8-element array of
+    that holds the most recently generated block, an 8-element array of
     uint32s holding the seed, and an 2-element array of uint64 that holds the
     counter ([low, high]). The elements of the seed are the value provided by
     the user (or from the entropy pool). The final value rounds contains the
     number of rounds used. Typical values are  8, 12, or 20 (for high security).
+    Internally 8 blocks are generated at a time. When the CPU supports AVX2
+    these are computed in parallel. The output does not depend on the
+    implementation used.
 
     ``ChaCha`` is seeded using either a single 256-bit unsigned integer
     or a vector of 4 64-bit unsigned integers. In either case, the seed is
@@ -143,6 +158,8 @@ cdef class ChaCha(BitGenerator):
         self._bitgen.next_uint32 = &chacha_uint32
         self._bitgen.next_double = &chacha_double
         self._bitgen.next_raw = &chacha_uint64
+        self._bitgen.fill_uint64 = &chacha_fill_uint64
+        self._bitgen.fill_double = &chacha_fill_double
 
     def __dealloc__(self):
         if self.rng_state:
@@ -181,7 +198,35 @@ cdef class ChaCha(BitGenerator):
             raise ValueError("CPU does not support SIMD implementation")
         chacha_use_simd(bool(value))
 
+    @property
+    def use_avx2(self):
+        """
+        Toggle use of the AVX2 kernel
+
+        Parameters
+        ----------
+        flag : bool
+            Flag indicating whether to use the AVX2 kernel, which computes
+            8 blocks in parallel, when SIMD is in use
+
+        Returns
+        -------
+        flag : bool
+            Current flag value
+
+        Raises
+        ------
+        ValueError
+            If AVX2 is not supported
+        """
+        return RANDOMGEN_USE_AVX2
 
+    @use_avx2.setter
+    def use_avx2(self, value):
+        capable = chacha_avx2_capable()
+        if value and not capable:
+            raise ValueError("CPU does not support AVX2 implementation")
+        chacha_use_avx2(bool(value))
 
     def seed(self, seed=None, counter=None, key=None):
         """
@@ -261,12 +306,14 @@ cdef class ChaCha(BitGenerator):
             Dictionary containing the information required to describe the
             state of the PRNG
         """
-        cdef int i
+        cdef int i, offset
         block = np.empty(16, dtype=np.uint32)
         keysetup = np.empty(8, dtype=np.uint32)
         ctr = np.empty(2, dtype=np.uint64)
+        # The block containing the most recently used word
+        offset = 16 * (((self.rng_state.ctr[0] - 1) % (16 * 8)) // 16)
         for i in range(16):
-            block[i] = self.rng_state.block[i]
+            block[i] = self.rng_state.block[offset + i]
         for i in range(8):
             keysetup[i] = self.rng_state.keysetup[i]
         for i in range(2):
@@ -286,9 +333,6 @@ cdef class ChaCha(BitGenerator):
                              "PRNG".format(self.__class__.__name__))
 
         state = value["state"]
-        block = state["block"]
-        for i in range(16):
-            self.rng_state.block[i] = block[i]
         keysetup = state["keysetup"]
         for i in range(8):
             self.rng_state.keysetup[i] = keysetup[i]
@@ -296,6 +340,9 @@ cdef class ChaCha(BitGenerator):
         for i in range(2):
             self.rng_state.ctr[i] = ctr[i]
         self.rng_state.rounds = state["rounds"]
+        # block is determined by the key and counter, so regenerate the
+        # buffer which holds several blocks
+        chacha_refresh(self.rng_state)
 
     cdef jump_inplace(self, object iter):
         """
@@ -405,3 +452,48 @@ cdef class ChaCha(BitGenerator):
         step = int_to_array(delta, "delta", 128, 64)
         chacha_advance(self.rng_state, <uint64_t *>np.PyArray_DATA(step))
         return self
+
+    def values_at(self, positions, dtype=np.uint64):
+        """
+        values_at(positions, dtype=np.uint64)
+
+        Compute the values at positions in the stream without changing the state
+
+        Parameters
+        ----------
+        positions : array_like[int]
+            Non-negative positions relative to the next value. Position 0 is
+            the next value returned by ``random_raw``.
+        dtype : {np.uint64, np.float64}, optional
+            Type of the values to return. ``np.uint64`` returns the raw values
+            returned by ``random_raw``. ``np.float64`` returns the doubles in
+            [0, 1) that ``Generator.random`` would return.
+
+        Returns
+        -------
+        values : {int, float, ndarray}
+            Values at positions with the same shape as positions.
+
+        Notes
+        -----
+        The value at any position is a pure function of the key and the
+        counter and so positions can be evaluated in any order without
+        advancing the state. The cost of each value does not depend on the
+        position, which allows any part of a stream to be regenerated directly.
+        Consecutive positions that fall in the same block share the cost of
+        computing the block.
+
+        Only uniform values are supported since distributions that use
+        rejection sampling, e.g., ``standard_normal``, consume an unknown
+        number of values.
+
+        Examples
+        --------
+        >>> from randomgen import ChaCha
+        >>> bg = ChaCha(1234, mode="sequence")
+        >>> values = bg.values_at([0, 1, 2**40])
+        >>> bool((values[:2] == bg.random_raw(2)).all())
+        True
+        """
+        return values_at(<void *>&chacha_values_at, <void *>self.rng_state,
+                         self.lock, positions, dtype, 64)
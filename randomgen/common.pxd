@@ -1,6 +1,6 @@
 #cython: language_level=3
 
-from cpython.pycapsule cimport PyCapsule_New
+from cpython.pycapsule cimport PyCapsule_New, PyCapsule_IsValid, PyCapsule_GetPointer
 from libc.stdint cimport (uint8_t, uint16_t, uint32_t, uint64_t,
                           int8_t, int16_t, int32_t, int64_t, intptr_t,
                           uintptr_t)
@@ -39,6 +39,9 @@ cdef class BitGenerator:
 
 cdef object benchmark(bitgen_t *bitgen, object lock, Py_ssize_t cnt, object method)
 cdef object random_raw(bitgen_t *bitgen, object lock, object size, object output)
+cdef object values_at(void *func, void *state, object lock, object positions,
+                      object dtype, int bits)
+cdef int copy_bitgen(object bit_generator, bitgen_t *bitgen) except -1
 cdef object prepare_cffi(bitgen_t *bitgen)
 cdef object prepare_ctypes(bitgen_t *bitgen)
 cdef int check_constraint(double val, object name, constraint_type cons) except -1
@@ -55,14 +58,21 @@ cdef extern from "src/aligned_malloc/aligned_malloc.h":
     cdef void *PyArray_calloc_aligned(size_t n, size_t s)
     cdef void PyArray_free_aligned(void *p)
 
+ctypedef void (*random_raw_at)(void *state, uint64_t *positions, np.npy_intp cnt, uint64_t *out) nogil
 ctypedef double (*random_double_fill)(bitgen_t *state, np.npy_intp count, double* out) nogil
+ctypedef void (*random_uint16_fill)(bitgen_t *state, np.npy_intp count, uint16_t* out) nogil
 ctypedef double (*random_double_0)(void *state) nogil
 ctypedef double (*random_double_1)(void *state, double a) nogil
 ctypedef double (*random_double_2)(void *state, double a, double b) nogil
 ctypedef double (*random_double_3)(void *state, double a, double b, double c) nogil
+ctypedef void (*random_param_setup)(double a, void *params) nogil
+ctypedef double (*random_double_p1)(void *state, void *a, double b) nogil
+ctypedef double (*random_double_p2)(void *state, void *a, void *b) nogil
+ctypedef int64_t (*random_uint_p)(void *state, void *a) nogil
 
 ctypedef float (*random_float_0)(bitgen_t *state) nogil
 ctypedef float (*random_float_1)(bitgen_t *state, float a) nogil
+ctypedef float (*random_float_2)(bitgen_t *state, float a, float b) nogil
 
 ctypedef int64_t (*random_uint_0)(void *state) nogil
 ctypedef int64_t (*random_uint_d)(void *state, double a) nogil
@@ -82,10 +92,14 @@ cdef double kahan_sum(double *darr, np.npy_intp n)
 cdef inline double uint64_to_double(uint64_t rnd) nogil:
     return (rnd >> 11) * (1.0 / 9007199254740992.0)
 
+cdef check_output(object out, object dtype, object size)
+
 cdef object double_fill(void *func, bitgen_t *state, object size, object lock, object out)
 
 cdef object float_fill(void *func, bitgen_t *state, object size, object lock, object out)
 
+cdef object half_fill(void *func, bitgen_t *state, object size, object lock, object out, object dtype)
+
 cdef object float_fill_from_double(void *func, bitgen_t *state, object size, object lock, object out)
 
 cdef np.ndarray int_to_array(object value, object name, object bits, object uint_size)
@@ -96,25 +110,42 @@ cdef object cont(void *func, void *state, object size, object lock, int narg,
                  object c, object c_name, constraint_type c_constraint,
                  object out)
 
+cdef object cont_params(void *setup, void *func, size_t param_size, void *state,
+                        object size, object lock, int n_params,
+                        object a, object a_name, constraint_type a_constraint,
+                        object b, object b_name, constraint_type b_constraint,
+                        object out)
+
+cdef object disc_params(void *setup, void *func, size_t param_size, void *state,
+                        object size, object lock,
+                        object a, object a_name, constraint_type a_constraint,
+                        object out)
+
+cdef np.ndarray setup_params(void *setup, size_t param_size, np.ndarray arr)
+
 cdef object disc(void *func, void *state, object size, object lock,
                  int narg_double, int narg_int64,
                  object a, object a_name, constraint_type a_constraint,
                  object b, object b_name, constraint_type b_constraint,
-                 object c, object c_name, constraint_type c_constraint)
+                 object c, object c_name, constraint_type c_constraint,
+                 object out=*)
 
-cdef object cont_f(void *func, bitgen_t *state, object size, object lock,
+cdef object cont_f(void *func, bitgen_t *state, object size, object lock, int narg,
                    object a, object a_name, constraint_type a_constraint,
+                   object b, object b_name, constraint_type b_constraint,
                    object out)
 
 cdef object cont_broadcast_3(void *func, void *state, object size, object lock,
                              np.ndarray a_arr, object a_name, constraint_type a_constraint,
                              np.ndarray b_arr, object b_name, constraint_type b_constraint,
-                             np.ndarray c_arr, object c_name, constraint_type c_constraint)
+                             np.ndarray c_arr, object c_name, constraint_type c_constraint,
+                             object out=*)
 
 cdef object discrete_broadcast_iii(void *func, void *state, object size, object lock,
                                    np.ndarray a_arr, object a_name, constraint_type a_constraint,
                                    np.ndarray b_arr, object b_name, constraint_type b_constraint,
-                                   np.ndarray c_arr, object c_name, constraint_type c_constraint)
+                                   np.ndarray c_arr, object c_name, constraint_type c_constraint,
+                                   object out=*)
 
 cdef inline void compute_complex(double *rv_r, double *rv_i, double loc_r,
                                  double loc_i, double var_r, double var_i, double rho) nogil:
@@ -65,6 +65,9 @@ cdef class BitGenerator:
         self._ctypes = None
         self._cffi = None
 
+        self._bitgen.fill_uint64 = NULL
+        self._bitgen.fill_double = NULL
+
         cdef const char *name = "BitGenerator"
         self.capsule = PyCapsule_New(<void *>&self._bitgen, name, NULL)
         if type(self) is BitGenerator:
@@ -269,11 +272,117 @@ cdef object random_raw(bitgen_t *bitgen, object lock, object size, object output
     randoms_data = <uint64_t*>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
 
+    # The bulk fill produces next_uint64 values which are only the raw
+    # values when the bit generator natively produces 64 bits
+    if bitgen.fill_uint64 != NULL and bitgen.next_raw == bitgen.next_uint64:
+        with lock, nogil:
+            bitgen.fill_uint64(bitgen.state, n, randoms_data)
+        return randoms
+
     with lock, nogil:
         for i in range(n):
             randoms_data[i] = bitgen.next_raw(bitgen.state)
     return randoms
 
+cdef object values_at(void *func, void *state, object lock, object positions,
+                      object dtype, int bits):
+    """
+    values_at(func, state, lock, positions, dtype, bits)
+
+    Evaluate the values at positions in the stream of a counter-based PRNG
+
+    Parameters
+    ----------
+    func : random_raw_at
+        Function that computes the raw values at an array of positions
+    state : void *
+        Pointer to the state of the bit generator. Never modified.
+    lock : Lock
+        Lock of the bit generator
+    positions : array_like[int]
+        Non-negative offsets relative to the next value produced
+    dtype : {np.uint64, np.float64}
+        Return either raw values or doubles
+    bits : {32, 64}
+        The number of bits in each raw value. Doubles are constructed from
+        two 32-bit values when bits is 32.
+
+    Returns
+    -------
+    out : {int, float, ndarray}
+        Values with the same shape as positions
+    """
+    cdef random_raw_at f = <random_raw_at>func
+    cdef np.ndarray pos_arr, raw
+    cdef np.npy_intp n
+
+    key = np.dtype(dtype).name
+    if key not in ("uint64", "float64"):
+        raise TypeError("Unsupported dtype \"{0}\" for values_at".format(key))
+    pos = np.asarray(positions)
+    if pos.dtype.kind not in "iu":
+        raise TypeError("positions must be an array of integers")
+    if pos.dtype.kind == "i" and np.any(pos < 0):
+        raise ValueError("positions must be non-negative")
+    shape = pos.shape
+    pos_arr = np.ascontiguousarray(pos.ravel(), dtype=np.uint64)
+    if key == "float64" and bits == 32:
+        # Each double consumes two 32-bit values
+        pos_arr = np.repeat(2 * pos_arr, 2)
+        pos_arr[1::2] += 1
+    raw = np.empty_like(pos_arr)
+    n = np.PyArray_SIZE(pos_arr)
+    with lock, nogil:
+        f(state, <uint64_t *>np.PyArray_DATA(pos_arr), n,
+          <uint64_t *>np.PyArray_DATA(raw))
+    if key == "uint64":
+        out = raw
+    elif bits == 64:
+        out = (raw >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+    else:
+        out = ((raw[::2] >> np.uint64(5)) * 67108864.0 +
+               (raw[1::2] >> np.uint64(6))) / 9007199254740992.0
+    return out.reshape(shape)[()]
+
+
+cdef int copy_bitgen(object bit_generator, bitgen_t *bitgen) except -1:
+    """
+    Copy the bitgen_t struct exposed by a bit generator
+
+    Parameters
+    ----------
+    bit_generator : BitGenerator
+        Bit generator exposing a capsule named "BitGenerator"
+    bitgen : pointer
+        Pointer to the bitgen_t struct to populate
+
+    Notes
+    -----
+    Bit generators that are not derived from BitGenerator, e.g., those
+    provided by NumPy, do not have the bulk fill slots and so these are
+    set to NULL.
+    """
+    cdef bitgen_t *source
+    cdef const char *name = "BitGenerator"
+
+    capsule = bit_generator.capsule
+    if not PyCapsule_IsValid(capsule, name):
+        raise ValueError("Invalid bit generator. The bit generator must "
+                         "be instantized.")
+    source = <bitgen_t *> PyCapsule_GetPointer(capsule, name)
+    if isinstance(bit_generator, BitGenerator):
+        bitgen[0] = source[0]
+        return 0
+
+    bitgen.state = source.state
+    bitgen.next_uint64 = source.next_uint64
+    bitgen.next_uint32 = source.next_uint32
+    bitgen.next_double = source.next_double
+    bitgen.next_raw = source.next_raw
+    bitgen.fill_uint64 = NULL
+    bitgen.fill_double = NULL
+    return 0
+
 cdef object prepare_cffi(bitgen_t *bitgen):
     """
     Bundles the interfaces to interact with a bit generator using cffi
@@ -502,16 +611,29 @@ cdef np.ndarray int_to_array(object value, object name, object bits, object uint
     return out
 
 
+cdef bint needs_iterator(np.ndarray arr):
+    """True if arr must be filled using an iterator to follow its C order"""
+    return not np.PyArray_IS_C_CONTIGUOUS(arr)
+
+
 cdef check_output(object out, object dtype, object size):
+    """
+    Validate a user-provided output array
+
+    The array may be strided or otherwise non-contiguous, but it must be
+    writable, aligned, have the required dtype and, if size is not None,
+    have shape size.
+    """
     if out is None:
         return
+    if not isinstance(out, np.ndarray):
+        raise TypeError("out must be a NumPy array")
     cdef np.ndarray out_array = <np.ndarray>out
-    if not (np.PyArray_CHKFLAGS(out_array, api.NPY_ARRAY_CARRAY) or
-            np.PyArray_CHKFLAGS(out_array, api.NPY_ARRAY_FARRAY)):
-        raise ValueError("Supplied output array is not contiguous, writable or aligned.")
+    if not (np.PyArray_ISWRITEABLE(out_array) and np.PyArray_ISALIGNED(out_array)):
+        raise ValueError("Supplied output array is not writable or aligned.")
     if out_array.dtype != dtype:
         raise TypeError("Supplied output array has the wrong type. "
-                        "Expected {0}, got {0}".format(dtype, out_array.dtype))
+                        "Expected {0}, got {1}".format(np.dtype(dtype), out_array.dtype))
     if size is not None:
         try:
             tup_size = tuple(size)
@@ -521,12 +643,23 @@ cdef check_output(object out, object dtype, object size):
             raise ValueError("size must match out.shape when used together")
 
 
+cdef int check_output_shape(np.ndarray out, np.broadcast it) except -1:
+    """Ensure that the parameters broadcast to the shape of out"""
+    if it.shape != (<object>out).shape:
+        raise ValueError("The shape of out, {0}, is not compatible with the "
+                         "broadcast shape of the parameters, "
+                         "{1}".format((<object>out).shape, it.shape))
+    return 0
+
+
 cdef object double_fill(void *func, bitgen_t *state, object size, object lock, object out):
     cdef random_double_fill random_func = (<random_double_fill>func)
     cdef double out_val
+    cdef double buffer[256]
     cdef double *out_array_data
     cdef np.ndarray out_array
-    cdef np.npy_intp i, n
+    cdef np.flatiter out_it
+    cdef np.npy_intp i, j, n, cnt
 
     if size is None and out is None:
         with lock:
@@ -540,6 +673,20 @@ cdef object double_fill(void *func, bitgen_t *state, object size, object lock, o
         out_array = <np.ndarray>np.empty(size, np.double)
 
     n = np.PyArray_SIZE(out_array)
+    if needs_iterator(out_array):
+        # Fill in blocks and scatter using the array's logical (C) order
+        out_it = <np.flatiter>np.PyArray_IterNew(out_array)
+        with lock, nogil:
+            i = 0
+            while i < n:
+                cnt = min(n - i, 256)
+                random_func(state, cnt, buffer)
+                for j in range(cnt):
+                    (<double *>np.PyArray_ITER_DATA(out_it))[0] = buffer[j]
+                    np.PyArray_ITER_NEXT(out_it)
+                i += cnt
+        return out_array
+
     out_array_data = <double *>np.PyArray_DATA(out_array)
     with lock, nogil:
         random_func(state, n, out_array_data)
@@ -549,6 +696,7 @@ cdef object float_fill(void *func, bitgen_t *state, object size, object lock, ob
     cdef random_float_0 random_func = (<random_float_0>func)
     cdef float *out_array_data
     cdef np.ndarray out_array
+    cdef np.flatiter out_it
     cdef np.npy_intp i, n
 
     if size is None and out is None:
@@ -562,16 +710,65 @@ cdef object float_fill(void *func, bitgen_t *state, object size, object lock, ob
         out_array = <np.ndarray>np.empty(size, np.float32)
 
     n = np.PyArray_SIZE(out_array)
+    if needs_iterator(out_array):
+        out_it = <np.flatiter>np.PyArray_IterNew(out_array)
+        with lock, nogil:
+            for i in range(n):
+                (<float *>np.PyArray_ITER_DATA(out_it))[0] = random_func(state)
+                np.PyArray_ITER_NEXT(out_it)
+        return out_array
+
     out_array_data = <float *>np.PyArray_DATA(out_array)
     with lock, nogil:
         for i in range(n):
             out_array_data[i] = random_func(state)
     return out_array
 
+cdef object half_fill(void *func, bitgen_t *state, object size, object lock, object out, object dtype):
+    # dtype is float16, or uint16 when func produces bfloat16 bit patterns
+    cdef random_uint16_fill random_func = (<random_uint16_fill>func)
+    cdef uint16_t buffer[256]
+    cdef uint16_t *out_array_data
+    cdef np.ndarray out_array
+    cdef np.flatiter out_it
+    cdef np.npy_intp i, j, n, cnt
+
+    if size is None and out is None:
+        out_array = <np.ndarray>np.empty((), dtype)
+        with lock:
+            random_func(state, 1, <uint16_t *>np.PyArray_DATA(out_array))
+        return out_array[()]
+
+    if out is not None:
+        check_output(out, dtype, size)
+        out_array = <np.ndarray>out
+    else:
+        out_array = <np.ndarray>np.empty(size, dtype)
+
+    n = np.PyArray_SIZE(out_array)
+    if needs_iterator(out_array):
+        out_it = <np.flatiter>np.PyArray_IterNew(out_array)
+        with lock, nogil:
+            i = 0
+            while i < n:
+                cnt = min(n - i, 256)
+                random_func(state, cnt, buffer)
+                for j in range(cnt):
+                    (<uint16_t *>np.PyArray_ITER_DATA(out_it))[0] = buffer[j]
+                    np.PyArray_ITER_NEXT(out_it)
+                i += cnt
+        return out_array
+
+    out_array_data = <uint16_t *>np.PyArray_DATA(out_array)
+    with lock, nogil:
+        random_func(state, n, out_array_data)
+    return out_array
+
 cdef object float_fill_from_double(void *func, bitgen_t *state, object size, object lock, object out):
     cdef random_double_0 random_func = (<random_double_0>func)
     cdef float *out_array_data
     cdef np.ndarray out_array
+    cdef np.flatiter out_it
     cdef np.npy_intp i, n
 
     if size is None and out is None:
@@ -585,6 +782,14 @@ cdef object float_fill_from_double(void *func, bitgen_t *state, object size, obj
         out_array = <np.ndarray>np.empty(size, np.float32)
 
     n = np.PyArray_SIZE(out_array)
+    if needs_iterator(out_array):
+        out_it = <np.flatiter>np.PyArray_IterNew(out_array)
+        with lock, nogil:
+            for i in range(n):
+                (<float *>np.PyArray_ITER_DATA(out_it))[0] = <float>random_func(state)
+                np.PyArray_ITER_NEXT(out_it)
+        return out_array
+
     out_array_data = <float *>np.PyArray_DATA(out_array)
     with lock, nogil:
         for i in range(n):
@@ -674,7 +879,6 @@ cdef object cont_broadcast_1(void *func, void *state, object size, object lock,
 
     cdef np.ndarray randoms
     cdef double a_val
-    cdef double *randoms_data
     cdef np.broadcast it
     cdef random_double_1 f = (<random_double_1>func)
     cdef np.npy_intp i, n
@@ -689,14 +893,15 @@ cdef object cont_broadcast_1(void *func, void *state, object size, object lock,
     else:
         randoms = <np.ndarray>out
 
-    randoms_data = <double *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
     it = np.PyArray_MultiIterNew2(randoms, a_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
 
     with lock, nogil:
         for i in range(n):
             a_val = (<double*>np.PyArray_MultiIter_DATA(it, 1))[0]
-            randoms_data[i] = f(state, a_val)
+            (<double*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val)
 
             np.PyArray_MultiIter_NEXT(it)
 
@@ -704,10 +909,10 @@ cdef object cont_broadcast_1(void *func, void *state, object size, object lock,
 
 cdef object cont_broadcast_2(void *func, void *state, object size, object lock,
                              np.ndarray a_arr, object a_name, constraint_type a_constraint,
-                             np.ndarray b_arr, object b_name, constraint_type b_constraint):
+                             np.ndarray b_arr, object b_name, constraint_type b_constraint,
+                             object out=None):
     cdef np.ndarray randoms
     cdef double a_val, b_val
-    cdef double *randoms_data
     cdef np.broadcast it
     cdef random_double_2 f = (<random_double_2>func)
     cdef np.npy_intp i, n
@@ -718,22 +923,25 @@ cdef object cont_broadcast_2(void *func, void *state, object size, object lock,
     if b_constraint != CONS_NONE:
         check_array_constraint(b_arr, b_name, b_constraint)
 
-    if size is not None:
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
         randoms = <np.ndarray>np.empty(size, np.double)
     else:
         it = np.PyArray_MultiIterNew2(a_arr, b_arr)
         randoms = <np.ndarray>np.empty(it.shape, np.double)
         # randoms = np.PyArray_SimpleNew(it.nd, np.PyArray_DIMS(it), np.NPY_DOUBLE)
 
-    randoms_data = <double *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
 
     it = np.PyArray_MultiIterNew3(randoms, a_arr, b_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
     with lock, nogil:
         for i in range(n):
             a_val = (<double*>np.PyArray_MultiIter_DATA(it, 1))[0]
             b_val = (<double*>np.PyArray_MultiIter_DATA(it, 2))[0]
-            randoms_data[i] = f(state, a_val, b_val)
+            (<double*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val, b_val)
 
             np.PyArray_MultiIter_NEXT(it)
 
@@ -742,10 +950,10 @@ cdef object cont_broadcast_2(void *func, void *state, object size, object lock,
 cdef object cont_broadcast_3(void *func, void *state, object size, object lock,
                              np.ndarray a_arr, object a_name, constraint_type a_constraint,
                              np.ndarray b_arr, object b_name, constraint_type b_constraint,
-                             np.ndarray c_arr, object c_name, constraint_type c_constraint):
+                             np.ndarray c_arr, object c_name, constraint_type c_constraint,
+                             object out=None):
     cdef np.ndarray randoms
     cdef double a_val, b_val, c_val
-    cdef double *randoms_data
     cdef np.broadcast it
     cdef random_double_3 f = (<random_double_3>func)
     cdef np.npy_intp i, n
@@ -759,23 +967,26 @@ cdef object cont_broadcast_3(void *func, void *state, object size, object lock,
     if c_constraint != CONS_NONE:
         check_array_constraint(c_arr, c_name, c_constraint)
 
-    if size is not None:
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
         randoms = <np.ndarray>np.empty(size, np.double)
     else:
         it = np.PyArray_MultiIterNew3(a_arr, b_arr, c_arr)
         # randoms = np.PyArray_SimpleNew(it.nd, np.PyArray_DIMS(it), np.NPY_DOUBLE)
         randoms = <np.ndarray>np.empty(it.shape, np.double)
 
-    randoms_data = <double *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
 
     it = np.PyArray_MultiIterNew4(randoms, a_arr, b_arr, c_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
     with lock, nogil:
         for i in range(n):
             a_val = (<double*>np.PyArray_MultiIter_DATA(it, 1))[0]
             b_val = (<double*>np.PyArray_MultiIter_DATA(it, 2))[0]
             c_val = (<double*>np.PyArray_MultiIter_DATA(it, 3))[0]
-            randoms_data[i] = f(state, a_val, b_val, c_val)
+            (<double*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val, b_val, c_val)
 
             np.PyArray_MultiIter_NEXT(it)
 
@@ -809,12 +1020,14 @@ cdef object cont(void *func, void *state, object size, object lock, int narg,
         elif narg == 2:
             return cont_broadcast_2(func, state, size, lock,
                                     a_arr, a_name, a_constraint,
-                                    b_arr, b_name, b_constraint)
+                                    b_arr, b_name, b_constraint,
+                                    out)
         else:
             return cont_broadcast_3(func, state, size, lock,
                                     a_arr, a_name, a_constraint,
                                     b_arr, b_name, b_constraint,
-                                    c_arr, c_name, c_constraint)
+                                    c_arr, c_name, c_constraint,
+                                    out)
 
     if narg > 0:
         _a = PyFloat_AsDouble(a)
@@ -853,6 +1066,24 @@ cdef object cont(void *func, void *state, object size, object lock, int narg,
     cdef random_double_1 f1
     cdef random_double_2 f2
     cdef random_double_3 f3
+    cdef np.flatiter out_it
+    cdef double val = 0.0
+
+    if needs_iterator(randoms):
+        out_it = <np.flatiter>np.PyArray_IterNew(randoms)
+        with lock, nogil:
+            for i in range(n):
+                if narg == 0:
+                    val = (<random_double_0>func)(state)
+                elif narg == 1:
+                    val = (<random_double_1>func)(state, _a)
+                elif narg == 2:
+                    val = (<random_double_2>func)(state, _a, _b)
+                elif narg == 3:
+                    val = (<random_double_3>func)(state, _a, _b, _c)
+                (<double *>np.PyArray_ITER_DATA(out_it))[0] = val
+                np.PyArray_ITER_NEXT(out_it)
+        return out
 
     with lock, nogil:
         if narg == 0:
@@ -877,11 +1108,194 @@ cdef object cont(void *func, void *state, object size, object lock, int narg,
     else:
         return out
 
+cdef np.ndarray setup_params(void *setup, size_t param_size, np.ndarray arr):
+    """
+    Call setup once for each element of arr
+
+    Returns a buffer holding the param_size-byte result for each element of
+    arr in C order.
+    """
+    cdef random_param_setup f = (<random_param_setup>setup)
+    cdef np.ndarray values, params
+    cdef double *values_data
+    cdef char *params_data
+    cdef np.npy_intp i, n
+
+    values = <np.ndarray>np.array(arr, dtype=np.double, order="C")
+    n = np.PyArray_SIZE(values)
+    params = <np.ndarray>np.empty(n * param_size, dtype=np.uint8)
+    values_data = <double *>np.PyArray_DATA(values)
+    params_data = <char *>np.PyArray_DATA(params)
+    with nogil:
+        for i in range(n):
+            f(values_data[i], params_data + i * param_size)
+    return params
+
+
+cdef object cont_params(void *setup, void *func, size_t param_size, void *state,
+                        object size, object lock, int n_params,
+                        object a, object a_name, constraint_type a_constraint,
+                        object b, object b_name, constraint_type b_constraint,
+                        object out):
+    """
+    Draw from a distribution where some parameters require a setup step
+
+    setup is called once for each element of the parameter a, and of b
+    when n_params is 2, rather than once per draw. func receives pointers
+    to the param_size-byte results of setup in place of these parameters.
+    Otherwise behaves like cont with 2 parameters.
+    """
+    cdef np.ndarray a_arr, b_arr, a_params, b_params, randoms
+    cdef char *a_data
+    cdef char *b_data = NULL
+    cdef double *b_vals
+    cdef double *randoms_data
+    cdef np.broadcast it
+    cdef random_double_p1 f1 = (<random_double_p1>func)
+    cdef random_double_p2 f2 = (<random_double_p2>func)
+    cdef np.npy_intp i, n, a_i, b_i, a_step, b_step
+    cdef double b_val, val
+
+    check_output(out, np.float64, size)
+    a_arr = <np.ndarray>np.PyArray_FROM_OTF(a, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
+    b_arr = <np.ndarray>np.PyArray_FROM_OTF(b, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
+    if a_constraint != CONS_NONE:
+        check_array_constraint(a_arr, a_name, a_constraint)
+    if b_constraint != CONS_NONE:
+        check_array_constraint(b_arr, b_name, b_constraint)
+
+    a_params = setup_params(setup, param_size, a_arr)
+    a_data = <char *>np.PyArray_DATA(a_params)
+    if n_params == 2:
+        b_params = setup_params(setup, param_size, b_arr)
+        b_data = <char *>np.PyArray_DATA(b_params)
+
+    if (size is None and out is None and np.PyArray_NDIM(a_arr) == 0 and
+            np.PyArray_NDIM(b_arr) == 0):
+        with lock:
+            if n_params == 1:
+                return f1(state, a_data, (<double *>np.PyArray_DATA(b_arr))[0])
+            return f2(state, a_data, b_data)
+
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
+        randoms = <np.ndarray>np.empty(size, np.double)
+    else:
+        it = np.PyArray_MultiIterNew2(a_arr, b_arr)
+        randoms = <np.ndarray>np.empty(it.shape, np.double)
+    if out is not None:
+        it = np.PyArray_MultiIterNew3(randoms, a_arr, b_arr)
+        check_output_shape(randoms, it)
+    n = np.PyArray_SIZE(randoms)
+
+    shape = np.shape(randoms)
+    if (np.PyArray_IS_C_CONTIGUOUS(randoms) and
+            (np.PyArray_NDIM(a_arr) == 0 or np.shape(a_arr) == shape) and
+            (np.PyArray_NDIM(b_arr) == 0 or np.shape(b_arr) == shape)):
+        # No broadcasting so the parameters can be walked directly
+        a_step = 0 if np.PyArray_NDIM(a_arr) == 0 else param_size
+        b_step = 0 if np.PyArray_NDIM(b_arr) == 0 else 1
+        b_arr = <np.ndarray>np.ascontiguousarray(b_arr)
+        b_vals = <double *>np.PyArray_DATA(b_arr)
+        randoms_data = <double *>np.PyArray_DATA(randoms)
+        with lock, nogil:
+            if n_params == 1:
+                for i in range(n):
+                    randoms_data[i] = f1(state, a_data + i * a_step, b_vals[i * b_step])
+            else:
+                for i in range(n):
+                    randoms_data[i] = f2(state, a_data + i * a_step,
+                                         b_data + i * b_step * param_size)
+        return randoms
+
+    # Broadcast indices into the parameter buffers
+    a_op = np.arange(np.PyArray_SIZE(a_arr), dtype=np.intp).reshape(np.shape(a_arr))
+    b_op = b_arr
+    if n_params == 2:
+        b_op = np.arange(np.PyArray_SIZE(b_arr), dtype=np.intp).reshape(np.shape(b_arr))
+    it = np.PyArray_MultiIterNew3(randoms, a_op, b_op)
+    with lock, nogil:
+        for i in range(n):
+            a_i = (<np.npy_intp *>np.PyArray_MultiIter_DATA(it, 1))[0]
+            if n_params == 1:
+                b_val = (<double *>np.PyArray_MultiIter_DATA(it, 2))[0]
+                val = f1(state, a_data + a_i * param_size, b_val)
+            else:
+                b_i = (<np.npy_intp *>np.PyArray_MultiIter_DATA(it, 2))[0]
+                val = f2(state, a_data + a_i * param_size, b_data + b_i * param_size)
+            (<double *>np.PyArray_MultiIter_DATA(it, 0))[0] = val
+            np.PyArray_MultiIter_NEXT(it)
+
+    return randoms
+
+cdef object disc_params(void *setup, void *func, size_t param_size, void *state,
+                        object size, object lock,
+                        object a, object a_name, constraint_type a_constraint,
+                        object out):
+    """
+    Draw integers from a distribution where the parameter requires a setup
+    step
+
+    setup is called once for each element of a rather than once per draw
+    and func receives a pointer to the param_size-byte result. Otherwise
+    behaves like disc with a single double parameter.
+    """
+    cdef np.ndarray a_arr, a_params, randoms
+    cdef char *a_data
+    cdef int64_t *randoms_data
+    cdef np.broadcast it
+    cdef random_uint_p f = (<random_uint_p>func)
+    cdef np.npy_intp i, n, a_i, a_step
+
+    check_output(out, np.int64, size)
+    a_arr = <np.ndarray>np.PyArray_FROM_OTF(a, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
+    if a_constraint != CONS_NONE:
+        check_array_constraint(a_arr, a_name, a_constraint)
+    a_params = setup_params(setup, param_size, a_arr)
+    a_data = <char *>np.PyArray_DATA(a_params)
+
+    if size is None and out is None and np.PyArray_NDIM(a_arr) == 0:
+        with lock:
+            return f(state, a_data)
+
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
+        randoms = <np.ndarray>np.empty(size, np.int64)
+    else:
+        randoms = np.PyArray_SimpleNew(np.PyArray_NDIM(a_arr), np.PyArray_DIMS(a_arr), np.NPY_INT64)
+    if out is not None:
+        it = np.PyArray_MultiIterNew2(randoms, a_arr)
+        check_output_shape(randoms, it)
+    n = np.PyArray_SIZE(randoms)
+
+    if (np.PyArray_IS_C_CONTIGUOUS(randoms) and
+            (np.PyArray_NDIM(a_arr) == 0 or np.shape(a_arr) == np.shape(randoms))):
+        # No broadcasting so the parameters can be walked directly
+        a_step = 0 if np.PyArray_NDIM(a_arr) == 0 else param_size
+        randoms_data = <int64_t *>np.PyArray_DATA(randoms)
+        with lock, nogil:
+            for i in range(n):
+                randoms_data[i] = f(state, a_data + i * a_step)
+        return randoms
+
+    # Broadcast indices into the parameter buffer
+    a_op = np.arange(np.PyArray_SIZE(a_arr), dtype=np.intp).reshape(np.shape(a_arr))
+    it = np.PyArray_MultiIterNew2(randoms, a_op)
+    with lock, nogil:
+        for i in range(n):
+            a_i = (<np.npy_intp *>np.PyArray_MultiIter_DATA(it, 1))[0]
+            (<int64_t *>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_data + a_i * param_size)
+            np.PyArray_MultiIter_NEXT(it)
+
+    return randoms
+
 cdef object discrete_broadcast_d(void *func, void *state, object size, object lock,
-                                 np.ndarray a_arr, object a_name, constraint_type a_constraint):
+                                 np.ndarray a_arr, object a_name, constraint_type a_constraint,
+                                 object out=None):
 
     cdef np.ndarray randoms
-    cdef int64_t *randoms_data
     cdef np.broadcast it
     cdef random_uint_d f = (<random_uint_d>func)
     cdef np.npy_intp i, n
@@ -889,20 +1303,23 @@ cdef object discrete_broadcast_d(void *func, void *state, object size, object lo
     if a_constraint != CONS_NONE:
         check_array_constraint(a_arr, a_name, a_constraint)
 
-    if size is not None:
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
         randoms = np.empty(size, np.int64)
     else:
         # randoms = np.empty(np.shape(a_arr), np.double)
         randoms = np.PyArray_SimpleNew(np.PyArray_NDIM(a_arr), np.PyArray_DIMS(a_arr), np.NPY_INT64)
 
-    randoms_data = <int64_t *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
 
     it = np.PyArray_MultiIterNew2(randoms, a_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
     with lock, nogil:
         for i in range(n):
             a_val = (<double*>np.PyArray_MultiIter_DATA(it, 1))[0]
-            randoms_data[i] = f(state, a_val)
+            (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val)
 
             np.PyArray_MultiIter_NEXT(it)
 
@@ -910,9 +1327,9 @@ cdef object discrete_broadcast_d(void *func, void *state, object size, object lo
 
 cdef object discrete_broadcast_dd(void *func, void *state, object size, object lock,
                                   np.ndarray a_arr, object a_name, constraint_type a_constraint,
-                                  np.ndarray b_arr, object b_name, constraint_type b_constraint):
+                                  np.ndarray b_arr, object b_name, constraint_type b_constraint,
+                                  object out=None):
     cdef np.ndarray randoms
-    cdef int64_t *randoms_data
     cdef np.broadcast it
     cdef random_uint_dd f = (<random_uint_dd>func)
     cdef np.npy_intp i, n
@@ -922,22 +1339,25 @@ cdef object discrete_broadcast_dd(void *func, void *state, object size, object l
     if b_constraint != CONS_NONE:
         check_array_constraint(b_arr, b_name, b_constraint)
 
-    if size is not None:
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
         randoms = <np.ndarray>np.empty(size, np.int64)
     else:
         it = np.PyArray_MultiIterNew2(a_arr, b_arr)
         randoms = <np.ndarray>np.empty(it.shape, np.int64)
         # randoms = np.PyArray_SimpleNew(it.nd, np.PyArray_DIMS(it), np.NPY_INT64)
 
-    randoms_data = <int64_t *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
 
     it = np.PyArray_MultiIterNew3(randoms, a_arr, b_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
     with lock, nogil:
         for i in range(n):
             a_val = (<double*>np.PyArray_MultiIter_DATA(it, 1))[0]
             b_val = (<double*>np.PyArray_MultiIter_DATA(it, 2))[0]
-            randoms_data[i] = f(state, a_val, b_val)
+            (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val, b_val)
 
             np.PyArray_MultiIter_NEXT(it)
 
@@ -945,9 +1365,9 @@ cdef object discrete_broadcast_dd(void *func, void *state, object size, object l
 
 cdef object discrete_broadcast_di(void *func, void *state, object size, object lock,
                                   np.ndarray a_arr, object a_name, constraint_type a_constraint,
-                                  np.ndarray b_arr, object b_name, constraint_type b_constraint):
+                                  np.ndarray b_arr, object b_name, constraint_type b_constraint,
+                                  object out=None):
     cdef np.ndarray randoms
-    cdef int64_t *randoms_data
     cdef np.broadcast it
     cdef random_uint_di f = (<random_uint_di>func)
     cdef np.npy_intp i, n
@@ -958,16 +1378,19 @@ cdef object discrete_broadcast_di(void *func, void *state, object size, object l
     if b_constraint != CONS_NONE:
         check_array_constraint(b_arr, b_name, b_constraint)
 
-    if size is not None:
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
         randoms = <np.ndarray>np.empty(size, np.int64)
     else:
         it = np.PyArray_MultiIterNew2(a_arr, b_arr)
         randoms = <np.ndarray>np.empty(it.shape, np.int64)
 
-    randoms_data = <int64_t *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
 
     it = np.PyArray_MultiIterNew3(randoms, a_arr, b_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
     with lock, nogil:
         for i in range(n):
             a_val = (<double*>np.PyArray_MultiIter_DATA(it, 1))[0]
@@ -981,9 +1404,9 @@ cdef object discrete_broadcast_di(void *func, void *state, object size, object l
 cdef object discrete_broadcast_iii(void *func, void *state, object size, object lock,
                                    np.ndarray a_arr, object a_name, constraint_type a_constraint,
                                    np.ndarray b_arr, object b_name, constraint_type b_constraint,
-                                   np.ndarray c_arr, object c_name, constraint_type c_constraint):
+                                   np.ndarray c_arr, object c_name, constraint_type c_constraint,
+                                   object out=None):
     cdef np.ndarray randoms
-    cdef int64_t *randoms_data
     cdef np.broadcast it
     cdef random_uint_iii f = (<random_uint_iii>func)
     cdef np.npy_intp i, n
@@ -997,31 +1420,34 @@ cdef object discrete_broadcast_iii(void *func, void *state, object size, object
     if c_constraint != CONS_NONE:
         check_array_constraint(c_arr, c_name, c_constraint)
 
-    if size is not None:
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
         randoms = <np.ndarray>np.empty(size, np.int64)
     else:
         it = np.PyArray_MultiIterNew3(a_arr, b_arr, c_arr)
         randoms = <np.ndarray>np.empty(it.shape, np.int64)
 
-    randoms_data = <int64_t *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
 
     it = np.PyArray_MultiIterNew4(randoms, a_arr, b_arr, c_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
     with lock, nogil:
         for i in range(n):
             a_val = (<int64_t*>np.PyArray_MultiIter_DATA(it, 1))[0]
             b_val = (<int64_t*>np.PyArray_MultiIter_DATA(it, 2))[0]
             c_val = (<int64_t*>np.PyArray_MultiIter_DATA(it, 3))[0]
-            randoms_data[i] = f(state, a_val, b_val, c_val)
+            (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val, b_val, c_val)
 
             np.PyArray_MultiIter_NEXT(it)
 
     return randoms
 
 cdef object discrete_broadcast_i(void *func, void *state, object size, object lock,
-                                 np.ndarray a_arr, object a_name, constraint_type a_constraint):
+                                 np.ndarray a_arr, object a_name, constraint_type a_constraint,
+                                 object out=None):
     cdef np.ndarray randoms
-    cdef int64_t *randoms_data
     cdef np.broadcast it
     cdef random_uint_i f = (<random_uint_i>func)
     cdef np.npy_intp i, n
@@ -1029,19 +1455,22 @@ cdef object discrete_broadcast_i(void *func, void *state, object size, object lo
     if a_constraint != CONS_NONE:
         check_array_constraint(a_arr, a_name, a_constraint)
 
-    if size is not None:
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
         randoms = <np.ndarray>np.empty(size, np.int64)
     else:
         randoms = np.PyArray_SimpleNew(np.PyArray_NDIM(a_arr), np.PyArray_DIMS(a_arr), np.NPY_INT64)
 
-    randoms_data = <int64_t *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
 
     it = np.PyArray_MultiIterNew2(randoms, a_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
     with lock, nogil:
         for i in range(n):
             a_val = (<int64_t*>np.PyArray_MultiIter_DATA(it, 1))[0]
-            randoms_data[i] = f(state, a_val)
+            (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val)
 
             np.PyArray_MultiIter_NEXT(it)
 
@@ -1052,11 +1481,13 @@ cdef object disc(void *func, void *state, object size, object lock,
                  int narg_double, int narg_int64,
                  object a, object a_name, constraint_type a_constraint,
                  object b, object b_name, constraint_type b_constraint,
-                 object c, object c_name, constraint_type c_constraint):
+                 object c, object c_name, constraint_type c_constraint,
+                 object out=None):
 
     cdef double _da = 0, _db = 0
     cdef int64_t _ia = 0, _ib = 0, _ic = 0
     cdef bint is_scalar = True
+    check_output(out, np.int64, size)
     if narg_double > 0:
         a_arr = <np.ndarray>np.PyArray_FROM_OTF(a, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
         is_scalar = is_scalar and np.PyArray_NDIM(a_arr) == 0
@@ -1081,19 +1512,23 @@ cdef object disc(void *func, void *state, object size, object lock,
         if narg_int64 == 0:
             if narg_double == 1:
                 return discrete_broadcast_d(func, state, size, lock,
-                                            a_arr, a_name, a_constraint)
+                                            a_arr, a_name, a_constraint,
+                                            out)
             elif narg_double == 2:
                 return discrete_broadcast_dd(func, state, size, lock,
                                              a_arr, a_name, a_constraint,
-                                             b_arr, b_name, b_constraint)
+                                             b_arr, b_name, b_constraint,
+                                             out)
         elif narg_int64 == 1:
             if narg_double == 0:
                 return discrete_broadcast_i(func, state, size, lock,
-                                            a_arr, a_name, a_constraint)
+                                            a_arr, a_name, a_constraint,
+                                            out)
             elif narg_double == 1:
                 return discrete_broadcast_di(func, state, size, lock,
                                              a_arr, a_name, a_constraint,
-                                             b_arr, b_name, b_constraint)
+                                             b_arr, b_name, b_constraint,
+                                             out)
         else:
             raise NotImplementedError("No vector path available")
 
@@ -1124,7 +1559,7 @@ cdef object disc(void *func, void *state, object size, object lock,
             if c_constraint != CONS_NONE and is_scalar:
                 check_constraint(<double>_ic, c_name, c_constraint)
 
-    if size is None:
+    if size is None and out is None:
         with lock:
             if narg_int64 == 0:
                 if narg_double == 0:
@@ -1142,7 +1577,7 @@ cdef object disc(void *func, void *state, object size, object lock,
                 return (<random_uint_iii>func)(state, _ia, _ib, _ic)
 
     cdef np.npy_intp i, n
-    cdef np.ndarray randoms = <np.ndarray>np.empty(size, np.int64)
+    cdef np.ndarray randoms
     cdef np.int64_t *randoms_data
     cdef random_uint_0 f0
     cdef random_uint_d fd
@@ -1150,10 +1585,38 @@ cdef object disc(void *func, void *state, object size, object lock,
     cdef random_uint_di fdi
     cdef random_uint_i fi
     cdef random_uint_iii fiii
+    cdef np.flatiter out_it
+    cdef int64_t val = 0
 
+    if out is None:
+        randoms = <np.ndarray>np.empty(size, np.int64)
+    else:
+        randoms = <np.ndarray>out
     n = np.PyArray_SIZE(randoms)
     randoms_data = <np.int64_t *>np.PyArray_DATA(randoms)
 
+    if needs_iterator(randoms):
+        out_it = <np.flatiter>np.PyArray_IterNew(randoms)
+        with lock, nogil:
+            for i in range(n):
+                if narg_int64 == 0:
+                    if narg_double == 0:
+                        val = (<random_uint_0>func)(state)
+                    elif narg_double == 1:
+                        val = (<random_uint_d>func)(state, _da)
+                    elif narg_double == 2:
+                        val = (<random_uint_dd>func)(state, _da, _db)
+                elif narg_int64 == 1:
+                    if narg_double == 0:
+                        val = (<random_uint_i>func)(state, _ia)
+                    if narg_double == 1:
+                        val = (<random_uint_di>func)(state, _da, _ib)
+                else:
+                    val = (<random_uint_iii>func)(state, _ia, _ib, _ic)
+                (<int64_t *>np.PyArray_ITER_DATA(out_it))[0] = val
+                np.PyArray_ITER_NEXT(out_it)
+        return randoms
+
     with lock, nogil:
         if narg_int64 == 0:
             if narg_double == 0:
@@ -1191,7 +1654,6 @@ cdef object cont_broadcast_1_f(void *func, bitgen_t *state, object size, object
 
     cdef np.ndarray randoms
     cdef float a_val
-    cdef float *randoms_data
     cdef np.broadcast it
     cdef random_float_1 f = (<random_float_1>func)
     cdef np.npy_intp i, n
@@ -1208,41 +1670,97 @@ cdef object cont_broadcast_1_f(void *func, bitgen_t *state, object size, object
     else:
         randoms = <np.ndarray>out
 
-    randoms_data = <float *>np.PyArray_DATA(randoms)
     n = np.PyArray_SIZE(randoms)
     it = np.PyArray_MultiIterNew2(randoms, a_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
+
+    with lock, nogil:
+        for i in range(n):
+            a_val = (<float*>np.PyArray_MultiIter_DATA(it, 1))[0]
+            (<float*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val)
+
+            np.PyArray_MultiIter_NEXT(it)
+
+    return randoms
+
+cdef object cont_broadcast_2_f(void *func, bitgen_t *state, object size, object lock,
+                               np.ndarray a_arr, object a_name, constraint_type a_constraint,
+                               np.ndarray b_arr, object b_name, constraint_type b_constraint,
+                               object out):
+
+    cdef np.ndarray randoms
+    cdef float a_val, b_val
+    cdef np.broadcast it
+    cdef random_float_2 f = (<random_float_2>func)
+    cdef np.npy_intp i, n
+
+    if a_constraint != CONS_NONE:
+        check_array_constraint(a_arr, a_name, a_constraint)
+
+    if b_constraint != CONS_NONE:
+        check_array_constraint(b_arr, b_name, b_constraint)
+
+    if out is not None:
+        randoms = <np.ndarray>out
+    elif size is not None:
+        randoms = <np.ndarray>np.empty(size, np.float32)
+    else:
+        it = np.PyArray_MultiIterNew2(a_arr, b_arr)
+        randoms = <np.ndarray>np.empty(it.shape, np.float32)
+
+    n = np.PyArray_SIZE(randoms)
+    it = np.PyArray_MultiIterNew3(randoms, a_arr, b_arr)
+    if out is not None:
+        check_output_shape(randoms, it)
 
     with lock, nogil:
         for i in range(n):
             a_val = (<float*>np.PyArray_MultiIter_DATA(it, 1))[0]
-            randoms_data[i] = f(state, a_val)
+            b_val = (<float*>np.PyArray_MultiIter_DATA(it, 2))[0]
+            (<float*>np.PyArray_MultiIter_DATA(it, 0))[0] = f(state, a_val, b_val)
 
             np.PyArray_MultiIter_NEXT(it)
 
     return randoms
 
-cdef object cont_f(void *func, bitgen_t *state, object size, object lock,
+cdef object cont_f(void *func, bitgen_t *state, object size, object lock, int narg,
                    object a, object a_name, constraint_type a_constraint,
+                   object b, object b_name, constraint_type b_constraint,
                    object out):
 
-    cdef np.ndarray a_arr, b_arr, c_arr
-    cdef float _a
+    cdef np.ndarray a_arr, b_arr
+    cdef float _a = 0.0, _b = 0.0
     cdef bint is_scalar = True
     cdef int requirements = api.NPY_ARRAY_ALIGNED | api.NPY_ARRAY_FORCECAST
     check_output(out, np.float32, size)
     a_arr = <np.ndarray>np.PyArray_FROMANY(a, np.NPY_FLOAT32, 0, 0, requirements)
     is_scalar = np.PyArray_NDIM(a_arr) == 0
+    if narg == 2:
+        b_arr = <np.ndarray>np.PyArray_FROMANY(b, np.NPY_FLOAT32, 0, 0, requirements)
+        is_scalar = is_scalar and np.PyArray_NDIM(b_arr) == 0
 
     if not is_scalar:
-        return cont_broadcast_1_f(func, state, size, lock, a_arr, a_name, a_constraint, out)
+        if narg == 1:
+            return cont_broadcast_1_f(func, state, size, lock,
+                                      a_arr, a_name, a_constraint, out)
+        return cont_broadcast_2_f(func, state, size, lock,
+                                  a_arr, a_name, a_constraint,
+                                  b_arr, b_name, b_constraint, out)
 
     _a = <float>PyFloat_AsDouble(a)
     if a_constraint != CONS_NONE:
         check_constraint(_a, a_name, a_constraint)
+    if narg == 2:
+        _b = <float>PyFloat_AsDouble(b)
+        if b_constraint != CONS_NONE:
+            check_constraint(_b, b_name, b_constraint)
 
     if size is None and out is None:
         with lock:
-            return (<random_float_1>func)(state, _a)
+            if narg == 1:
+                return (<random_float_1>func)(state, _a)
+            return (<random_float_2>func)(state, _a, _b)
 
     cdef np.npy_intp i, n
     cdef np.ndarray randoms
@@ -1254,10 +1772,29 @@ cdef object cont_f(void *func, bitgen_t *state, object size, object lock,
 
     cdef float *randoms_data = <float *>np.PyArray_DATA(randoms)
     cdef random_float_1 f1 = <random_float_1>func
+    cdef random_float_2 f2 = <random_float_2>func
+    cdef np.flatiter out_it
+    cdef float val
+
+    if needs_iterator(randoms):
+        out_it = <np.flatiter>np.PyArray_IterNew(randoms)
+        with lock, nogil:
+            for i in range(n):
+                if narg == 1:
+                    val = f1(state, _a)
+                else:
+                    val = f2(state, _a, _b)
+                (<float *>np.PyArray_ITER_DATA(out_it))[0] = val
+                np.PyArray_ITER_NEXT(out_it)
+        return out
 
     with lock, nogil:
-        for i in range(n):
-            randoms_data[i] = f1(state, _a)
+        if narg == 1:
+            for i in range(n):
+                randoms_data[i] = f1(state, _a)
+        else:
+            for i in range(n):
+                randoms_data[i] = f2(state, _a, _b)
 
     if out is None:
         return randoms
@@ -28,12 +28,48 @@ cdef extern from "src/distributions/distributions.h":
 
     ctypedef s_binomial_t binomial_t
 
+    enum: BINOMIAL_CACHE_SIZE
+
+    struct s_binomial_cache:
+        binomial_t entries[BINOMIAL_CACHE_SIZE]
+
+    ctypedef s_binomial_cache binomial_cache_t
+
+    struct s_sequential_sample:
+        int64_t N
+        int64_t n
+        int64_t pos
+        double vprime
+
+    ctypedef s_sequential_sample sequential_sample_t
+
+    struct s_gamma_params:
+        double shape
+        double b
+        double c
+
+    ctypedef s_gamma_params gamma_params_t
+
+    struct s_poisson_params:
+        double lam
+        double enlam
+        double slam
+        double loglam
+        double a
+        double b
+        double invalpha
+        double vr
+
+    ctypedef s_poisson_params poisson_params_t
+
     struct bitgen:
         void *state
         uint64_t (*next_uint64)(void *st) nogil
         uint32_t (*next_uint32)(void *st) nogil
         double (*next_double)(void *st) nogil
         uint64_t (*next_raw)(void *st) nogil
+        void (*fill_uint64)(void *st, np.npy_intp cnt, uint64_t *out) nogil
+        void (*fill_double)(void *st, np.npy_intp cnt, double *out) nogil
 
     ctypedef bitgen bitgen_t
 
@@ -46,11 +82,24 @@ cdef extern from "src/distributions/distributions.h":
     double random_gauss_zig(bitgen_t* bitgen_state) nogil
     void random_gauss_zig_fill(bitgen_t *bitgen_state, np.npy_intp count, double *out) nogil
     double random_standard_gamma_zig(bitgen_t *bitgen_state, double shape) nogil
+    void random_gamma_setup(double shape, gamma_params_t *params) nogil
+    double random_standard_gamma_params(bitgen_t *bitgen_state,
+                                        const gamma_params_t *params) nogil
+    double random_gamma_params(bitgen_t *bitgen_state,
+                               const gamma_params_t *params, double scale) nogil
+    double random_beta_params(bitgen_t *bitgen_state,
+                              const gamma_params_t *a_params,
+                              const gamma_params_t *b_params) nogil
 
     float random_float(bitgen_t *bitgen_state) nogil
     float random_standard_exponential_f(bitgen_t *bitgen_state) nogil
     float random_standard_exponential_zig_f(bitgen_t *bitgen_state) nogil
     float random_gauss_zig_f(bitgen_t* bitgen_state) nogil
+    void random_half_fill(bitgen_t *bitgen_state, np.npy_intp cnt, uint16_t *out) nogil
+    void random_bfloat16_fill(bitgen_t *bitgen_state, np.npy_intp cnt, uint16_t *out) nogil
+    void random_gauss_16_setup() nogil
+    void random_gauss_half_fill(bitgen_t *bitgen_state, np.npy_intp cnt, uint16_t *out) nogil
+    void random_gauss_bfloat16_fill(bitgen_t *bitgen_state, np.npy_intp cnt, uint16_t *out) nogil
     float random_standard_gamma_f(bitgen_t *bitgen_state, float shape) nogil
     float random_standard_gamma_zig_f(bitgen_t *bitgen_state, float shape) nogil
 
@@ -79,6 +128,19 @@ cdef extern from "src/distributions/distributions.h":
     double random_lognormal(bitgen_t *bitgen_state, double mean, double sigma) nogil
     double random_rayleigh(bitgen_t *bitgen_state, double mode) nogil
     double random_standard_t(bitgen_t *bitgen_state, double df) nogil
+
+    float random_normal_f(bitgen_t *bitgen_state, float loc, float scale) nogil
+    float random_exponential_f(bitgen_t *bitgen_state, float scale) nogil
+    float random_uniform_f(bitgen_t *bitgen_state, float lower, float range) nogil
+    float random_beta_f(bitgen_t *bitgen_state, float a, float b) nogil
+    float random_chisquare_f(bitgen_t *bitgen_state, float df) nogil
+    float random_weibull_f(bitgen_t *bitgen_state, float a) nogil
+    float random_laplace_f(bitgen_t *bitgen_state, float loc, float scale) nogil
+    float random_gumbel_f(bitgen_t *bitgen_state, float loc, float scale) nogil
+    float random_logistic_f(bitgen_t *bitgen_state, float loc, float scale) nogil
+    float random_lognormal_f(bitgen_t *bitgen_state, float mean, float sigma) nogil
+    float random_standard_t_f(bitgen_t *bitgen_state, float df) nogil
+
     double random_noncentral_chisquare(bitgen_t *bitgen_state, double df,
                                        double nonc) nogil
     double random_noncentral_f(bitgen_t *bitgen_state, double dfnum,
@@ -89,8 +151,19 @@ cdef extern from "src/distributions/distributions.h":
                              double right) nogil
 
     int64_t random_poisson(bitgen_t *bitgen_state, double lam) nogil
+    void random_poisson_setup(double lam, poisson_params_t *params) nogil
+    int64_t random_poisson_params(bitgen_t *bitgen_state,
+                                  const poisson_params_t *params) nogil
+    np.npy_intp random_poisson_table_setup(double lam, double *cdf,
+                                           np.npy_intp *guide,
+                                           np.npy_intp max_len) nogil
+    int64_t random_poisson_table(bitgen_t *bitgen_state, double lam,
+                                 const double *cdf, const np.npy_intp *guide,
+                                 np.npy_intp len) nogil
     int64_t random_negative_binomial(bitgen_t *bitgen_state, double n, double p) nogil
     int64_t random_binomial(bitgen_t *bitgen_state, double p, int64_t n, binomial_t *binomial) nogil
+    int64_t random_binomial_cached(bitgen_t *bitgen_state, double p, int64_t n,
+                                   binomial_cache_t *cache) nogil
     int64_t random_logseries(bitgen_t *bitgen_state, double p) nogil
     int64_t random_geometric_search(bitgen_t *bitgen_state, double p) nogil
     int64_t random_geometric_inversion(bitgen_t *bitgen_state, double p) nogil
@@ -144,6 +217,55 @@ cdef extern from "src/distributions/distributions.h":
                                   np.npy_bool off, np.npy_bool rng, np.npy_intp cnt,
                                   bint use_masked,
                                   np.npy_bool *out) nogil
+    void random_bits_fill(bitgen_t *bitgen_state, np.npy_intp cnt, uint64_t *out) nogil
+    void random_bernoulli_fill(bitgen_t *bitgen_state, double p, np.npy_intp cnt,
+                               uint64_t *out) nogil
+    np.npy_intp random_bernoulli_indices(bitgen_t *bitgen_state, double p, int64_t n,
+                                         int64_t *pos, np.npy_intp cnt,
+                                         int64_t *out) nogil
+    void random_sorted_uniform_fill(bitgen_t *bitgen_state, np.npy_intp cnt,
+                                    double *out) nogil
+    np.npy_intp random_sequential_sample(bitgen_t *bitgen_state,
+                                         sequential_sample_t *state,
+                                         np.npy_intp cnt, int64_t *out) nogil
 
     void random_multinomial(bitgen_t *bitgen_state, int64_t n, int64_t *mnix,
                             double *pix, np.npy_intp d, binomial_t *binomial) nogil
+    int64_t random_categorical(bitgen_t *bitgen_state, const double *p,
+                               np.npy_intp k, np.npy_intp stride) nogil
+    int64_t random_categorical_f(bitgen_t *bitgen_state, const float *p,
+                                 np.npy_intp k, np.npy_intp stride) nogil
+    int64_t random_categorical_logits(bitgen_t *bitgen_state,
+                                      const double *logits, np.npy_intp k,
+                                      np.npy_intp stride, double *buf) nogil
+    int64_t random_categorical_logits_f(bitgen_t *bitgen_state,
+                                        const float *logits, np.npy_intp k,
+                                        np.npy_intp stride, double *buf) nogil
+    void random_multinomial_cached(bitgen_t *bitgen_state, int64_t n, int64_t *mnix,
+                                   double *pix, np.npy_intp d,
+                                   binomial_cache_t *cache) nogil
+
+    void random_multinomial_alias(bitgen_t *bitgen_state, int64_t n, int64_t *mnix,
+                                  const double *prob, const int64_t *alias,
+                                  np.npy_intp d) nogil
+    np.npy_intp random_multinomial_alias_sparse(bitgen_t *bitgen_state, int64_t n,
+                                                const double *prob,
+                                                const int64_t *alias, np.npy_intp d,
+                                                int64_t *draws, int64_t *indices,
+                                                int64_t *counts) nogil
+    np.npy_intp random_multinomial_sparse(bitgen_t *bitgen_state, int64_t n,
+                                          double *pix, np.npy_intp d,
+                                          binomial_cache_t *cache, int64_t *dense,
+                                          int64_t *indices, int64_t *counts) nogil
+    void random_alias_setup(const double *p, np.npy_intp n, double *prob,
+                            int64_t *alias, int64_t *work) nogil
+    int64_t random_alias(bitgen_t *bitgen_state, const double *prob,
+                         const int64_t *alias, np.npy_intp n) nogil
+    void random_fenwick_setup(const double *weights, np.npy_intp n,
+                              double *tree) nogil
+    void random_weighted_without_replacement(bitgen_t *bitgen_state,
+                                             double *weights, double *tree,
+                                             np.npy_intp n, np.npy_intp k,
+                                             int64_t *out) nogil
+    uint64_t random_permuted_index(uint64_t index, uint64_t n, int half_bits,
+                                   const uint64_t *keys, int rounds) nogil
@@ -22,6 +22,16 @@ cdef uint32_t dsfmt_uint32(void *st) nogil:
 cdef double dsfmt_double(void* st) nogil:
     return dsfmt_next_double(<dsfmt_state_t *>st)
 
+cdef void dsfmt_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = dsfmt_next64(<dsfmt_state_t *>st)
+
+cdef void dsfmt_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = dsfmt_next_double(<dsfmt_state_t *>st)
+
 cdef uint64_t dsfmt_raw(void *st) nogil:
     return dsfmt_next_raw(<dsfmt_state_t *>st)
 
@@ -126,6 +136,8 @@ cdef class DSFMT(BitGenerator):
         self._bitgen.next_uint32 = &dsfmt_uint32
         self._bitgen.next_double = &dsfmt_double
         self._bitgen.next_raw = &dsfmt_raw
+        self._bitgen.fill_uint64 = &dsfmt_fill_uint64
+        self._bitgen.fill_double = &dsfmt_fill_double
 
     def __dealloc__(self):
         if self.rng_state.state:
@@ -1,5 +1,8 @@
 #!python
 #cython: wraparound=False, nonecheck=False, boundscheck=False, cdivision=True, language_level=3
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
 import operator
 
 import numpy as np
@@ -7,7 +10,6 @@ import numpy as np
 from randomgen.bounded_integers import _integers_types
 from randomgen.xoroshiro128 import Xoroshiro128
 
-from cpython.pycapsule cimport PyCapsule_IsValid, PyCapsule_GetPointer
 from cpython cimport (Py_INCREF, PyComplex_FromDoubles,
                       PyComplex_ImagAsDouble, PyComplex_RealAsDouble,
                       PyFloat_AsDouble)
@@ -51,6 +53,374 @@ def _rand_dep_message(old, new, args, dtype):
     return msg.format(old=old, new=new, call=call)
 
 
+# Build the table used by the 16-bit normal fills while holding the GIL
+random_gauss_16_setup()
+
+
+# The bools for each of the 256 values of a byte, in bit order
+cdef uint8_t _BITS_TO_BOOLS[256][8]
+for _i in range(256):
+    for _j in range(8):
+        _BITS_TO_BOOLS[_i][_j] = (_i >> _j) & 0x1
+del _i, _j
+
+
+# Methods that accept size and out, used by stream to refill buffers in place
+_OUT_METHODS = frozenset([
+    "bernoulli", "beta", "binomial", "chisquare", "choice", "complex_normal",
+    "exponential", "f", "gamma", "geometric", "gumbel", "hypergeometric",
+    "integers", "laplace", "logistic", "lognormal", "logseries",
+    "negative_binomial", "noncentral_chisquare", "noncentral_f", "normal",
+    "pareto", "poisson", "power", "random", "rayleigh", "standard_cauchy",
+    "standard_exponential", "standard_gamma", "standard_normal",
+    "standard_t", "triangular", "uniform", "vonmises", "wald", "weibull",
+    "zipf"])
+
+
+def _float_dtype_key(dtype):
+    """Name of a floating point dtype, including "bfloat16" """
+    if isinstance(dtype, str) and dtype == "bfloat16":
+        return dtype
+    return np.dtype(dtype).name
+
+
+def _stream(func, chunk, args, kwargs, n_buffers, background, use_out):
+    """
+    Iterate over reusable buffers filled by func
+
+    The first buffer is allocated by func and determines the shape and dtype
+    of all buffers. Later fills write into the buffers using out when
+    use_out is True. Fills are always performed in order and so the stream is
+    identical irrespective of background.
+    """
+    def fill(buf):
+        if use_out:
+            func(*args, out=buf, **kwargs)
+        else:
+            buf[...] = func(*args, size=chunk, **kwargs)
+
+    buffers = [np.asarray(func(*args, size=chunk, **kwargs))]
+    buffers += [np.empty_like(buffers[0]) for _ in range(n_buffers - 1)]
+    i = 0
+    if not background:
+        while True:
+            yield buffers[i]
+            i = (i + 1) % n_buffers
+            fill(buffers[i])
+
+    executor = ThreadPoolExecutor(1)
+    try:
+        pending = deque([executor.submit(fill, buf) for buf in buffers[1:]])
+        while True:
+            yield buffers[i]
+            # The caller has released buffer i so it can be refilled
+            pending.append(executor.submit(fill, buffers[i]))
+            i = (i + 1) % n_buffers
+            pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True)
+
+
+@cython.wraparound(True)
+def _mvnormal_prepare(mean, cov, check_valid, tol, method):
+    """
+    Validate the parameters of a multivariate normal and factor cov
+
+    Returns the mean, the factor A where ``A.T @ A`` equals cov, and the
+    batch shape. mean may have shape (..., N) and cov (..., N, N) where
+    the leading dimensions broadcast.
+    """
+    if method not in ("svd", "eigh", "cholesky"):
+        raise ValueError("method must be one of \"svd\", \"eigh\" or "
+                         "\"cholesky\"")
+    if check_valid not in ("warn", "raise", "ignore"):
+        raise ValueError("check_valid must equal \"warn\", \"raise\", "
+                         "or \"ignore\"")
+    mean = np.array(mean)
+    cov = np.array(cov)
+    if mean.ndim < 1:
+        raise ValueError("mean must be at least 1 dimensional")
+    if cov.ndim < 2 or cov.shape[-1] != cov.shape[-2]:
+        raise ValueError("cov must be at least 2 dimensional and square "
+                         "in the final two dimensions")
+    if mean.shape[-1] != cov.shape[-1]:
+        raise ValueError("mean and cov must have same length")
+    batch_shape = np.broadcast(mean[..., 0], cov[..., 0, 0]).shape
+
+    # GH10839, ensure double to make tol meaningful
+    cov = cov.astype(np.double)
+    if method == "cholesky":
+        # Raises LinAlgError if cov is not positive definite
+        return mean, np.swapaxes(np.linalg.cholesky(cov), -1, -2), batch_shape
+
+    if method == "svd":
+        # The SVD is used by default to preserve the existing stream.
+        # If cov is symmetric and positive-semidefinite, u.T and v are
+        # equal up to roundoff error when the singular value is not zero.
+        (u, s, v) = np.linalg.svd(cov)
+        psd = np.allclose(np.matmul(np.swapaxes(v, -1, -2) * s[..., None, :], v),
+                          cov, rtol=tol, atol=tol)
+        factor = np.sqrt(s)[..., :, None] * v
+    else:
+        (s, u) = np.linalg.eigh(cov)
+        psd = not np.any(s < -tol)
+        factor = np.sqrt(np.abs(s))[..., :, None] * np.swapaxes(u, -1, -2)
+
+    if check_valid != "ignore" and not psd:
+        if check_valid == "warn":
+            import warnings
+            warnings.warn("covariance is not positive-semidefinite.",
+                          RuntimeWarning)
+        else:
+            raise ValueError("covariance is not positive-semidefinite.")
+    return mean, factor, batch_shape
+
+
+@cython.wraparound(True)
+def _mvnormal_sample(gen, mean, factor, batch_shape, size):
+    """Transform standard normals using a precomputed factor"""
+    if size is None:
+        shape = ()
+    elif isinstance(size, (int, np.integer)):
+        shape = (size,)
+    else:
+        shape = tuple(size)
+    n = factor.shape[-1]
+    final_shape = shape + tuple(batch_shape) + (n,)
+    x = gen.standard_normal(final_shape)
+    if factor.ndim == 2:
+        x = np.dot(x.reshape(-1, n), factor)
+        x.shape = final_shape
+    else:
+        x = np.matmul(x[..., None, :], factor)[..., 0, :]
+    x += mean
+    return x
+
+
+class MultivariateNormal(object):
+    """
+    MultivariateNormal(generator, mean, cov, check_valid="warn", tol=1e-8, method="svd")
+
+    Multivariate normal sampler with a cached factorization of cov
+
+    Instances are created by
+    :meth:`~randomgen.generator.Generator.mvnormal_factory`. The
+    covariance is validated and factored once so that repeated draws only
+    require generating and transforming standard normals.
+
+    Parameters
+    ----------
+    generator : Generator
+        Generator used to produce the standard normals.
+    mean : array_like
+        Mean with shape (..., N).
+    cov : array_like
+        Covariance with shape (..., N, N).
+    check_valid : {"warn", "raise", "ignore"}, optional
+        Behavior when the covariance matrix is not positive semidefinite.
+    tol : float, optional
+        Tolerance when checking the covariance matrix.
+    method : {"svd", "eigh", "cholesky"}, optional
+        Method used to factor cov.
+
+    Attributes
+    ----------
+    mean : ndarray
+        The mean.
+    factor : ndarray
+        Array with shape (..., N, N) where ``factor.T @ factor`` is cov.
+    method : str
+        The method used to factor cov.
+    """
+    def __init__(self, generator, mean, cov, check_valid="warn", tol=1e-8,
+                 method="svd"):
+        self._generator = generator
+        self.mean, self.factor, self._batch_shape = _mvnormal_prepare(
+            mean, cov, check_valid, tol, method)
+        self.method = method
+
+    @cython.wraparound(True)
+    def __repr__(self):
+        return "{0}(dim={1}, method=\"{2}\")".format(self.__class__.__name__,
+                                                   self.factor.shape[-1],
+                                                   self.method)
+
+    def __call__(self, size=None):
+        """
+        __call__(size=None)
+
+        Draw samples from the multivariate normal distribution
+
+        Parameters
+        ----------
+        size : int or tuple of ints, optional
+            Leading shape of the output. The output has shape
+            ``size + batch_shape + (N,)`` where batch_shape is the
+            broadcast shape of the leading dimensions of mean and cov.
+
+        Returns
+        -------
+        out : ndarray
+            The drawn samples.
+        """
+        return _mvnormal_sample(self._generator, self.mean, self.factor,
+                                self._batch_shape, size)
+
+
+DEF MAX_SHUFFLE_BLOCKS = 64
+DEF SHUFFLE_BLOCK_SIZE = 65536
+DEF MULTINOMIAL_ALIAS_MIN_CATEGORIES = 1024
+DEF MULTINOMIAL_ALIAS_RATIO = 16
+
+
+cdef class _ParallelShuffle:
+    """
+    Shared state of a bucketed shuffle of n items
+
+    Each of the n_blocks chunks of the input assigns its items to random
+    buckets (label), the items are then moved to a contiguous buffer
+    grouped by bucket (scatter) and finally each bucket is shuffled and
+    copied back (shuffle_bucket). Chunk and bucket i both use the i-th
+    child bit generator so that the result does not depend on the
+    number of threads. Each step releases the GIL.
+    """
+    cdef char *data
+    cdef char *buf
+    cdef uint8_t *labels
+    cdef np.npy_intp n, itemsize, stride, n_blocks
+    cdef np.npy_intp *counts
+    cdef np.npy_intp *offsets
+    cdef np.npy_intp *bucket_start
+    cdef np.ndarray _buf, _labels, _counts, _offsets, _bucket_start
+    cdef object _bit_generators
+    cdef bitgen_t _bitgens[MAX_SHUFFLE_BLOCKS]
+
+    cdef _setup(self, np.npy_intp n, np.npy_intp itemsize, np.npy_intp stride,
+                char *data, object seeds):
+        cdef np.npy_intp i
+        self.n = n
+        self.itemsize = itemsize
+        self.stride = stride
+        self.data = data
+        self.n_blocks = len(seeds)
+        self._bit_generators = [Xoroshiro128(seed, mode="sequence") for seed in seeds]
+        for i in range(self.n_blocks):
+            copy_bitgen(self._bit_generators[i], &self._bitgens[i])
+        self._buf = np.empty(n * itemsize, dtype=np.uint8)
+        self.buf = <char *>np.PyArray_DATA(self._buf)
+        self._labels = np.empty(n, dtype=np.uint8)
+        self.labels = <uint8_t *>np.PyArray_DATA(self._labels)
+        self._counts = np.zeros((self.n_blocks, self.n_blocks), dtype=np.intp)
+        self.counts = <np.npy_intp *>np.PyArray_DATA(self._counts)
+
+    cdef inline np.npy_intp _chunk_start(self, np.npy_intp c) nogil:
+        return c * self.n // self.n_blocks
+
+    def label(self, np.npy_intp c):
+        cdef np.npy_intp i, end = self._chunk_start(c + 1)
+        cdef np.npy_intp *counts = self.counts + c * self.n_blocks
+        cdef uint8_t label
+        with nogil:
+            for i in range(self._chunk_start(c), end):
+                label = <uint8_t>random_interval(&self._bitgens[c], self.n_blocks - 1)
+                self.labels[i] = label
+                counts[label] += 1
+
+    def find_offsets(self):
+        totals = self._counts.sum(0)
+        start = np.zeros_like(totals)
+        start[1:] = np.cumsum(totals)[:-1]
+        self._bucket_start = np.append(start, self.n).astype(np.intp)
+        self.bucket_start = <np.npy_intp *>np.PyArray_DATA(self._bucket_start)
+        offsets = start + np.cumsum(self._counts, 0) - self._counts
+        self._offsets = np.ascontiguousarray(offsets, dtype=np.intp)
+        self.offsets = <np.npy_intp *>np.PyArray_DATA(self._offsets)
+
+    def scatter(self, np.npy_intp c):
+        cdef np.npy_intp i, end = self._chunk_start(c + 1)
+        cdef np.npy_intp *offsets = self.offsets + c * self.n_blocks
+        cdef uint8_t label
+        with nogil:
+            for i in range(self._chunk_start(c), end):
+                label = self.labels[i]
+                string.memcpy(self.buf + offsets[label] * self.itemsize,
+                              self.data + i * self.stride, self.itemsize)
+                offsets[label] += 1
+
+    def shuffle_bucket(self, np.npy_intp b):
+        cdef np.npy_intp i, j, start, end, itemsize = self.itemsize
+        cdef char *bucket
+        cdef char *tmp
+        tmp_buf = np.empty(itemsize, dtype=np.int8)  # GC'd at function exit
+        tmp = <char *>np.PyArray_DATA(tmp_buf)
+        start = self.bucket_start[b]
+        end = self.bucket_start[b + 1]
+        bucket = self.buf + start * itemsize
+        with nogil:
+            for i in reversed(range(1, end - start)):
+                j = random_interval(&self._bitgens[b], i)
+                string.memcpy(tmp, bucket + j * itemsize, itemsize)
+                string.memcpy(bucket + j * itemsize, bucket + i * itemsize, itemsize)
+                string.memcpy(bucket + i * itemsize, tmp, itemsize)
+            for i in range(start, end):
+                string.memcpy(self.data + i * self.stride,
+                              self.buf + i * itemsize, itemsize)
+
+
+cdef bint _scalar_params(object size, object out, tuple params):
+    """True if a single value is drawn using scalar parameters"""
+    if size is not None or out is not None:
+        return False
+    for param in params:
+        if np.ndim(param) != 0:
+            return False
+    return True
+
+
+cdef object _normalize_axis(object axis, int ndim):
+    """Validate axis and convert it to a non-negative value"""
+    axis = operator.index(axis)
+    if not -ndim <= axis < ndim:
+        raise np.AxisError(axis, ndim)
+    return axis % ndim
+
+
+cdef inline void _swap_strided(char *a, char *b, char *buf, int ndim,
+                               np.npy_intp *shape, np.npy_intp *strides,
+                               np.npy_intp itemsize) nogil:
+    """Swap two sub-arrays with the same shape and strides"""
+    cdef np.npy_intp index[np.NPY_MAXDIMS]
+    cdef np.npy_intp offset = 0
+    cdef int k
+
+    for k in range(ndim):
+        index[k] = 0
+    while True:
+        string.memcpy(buf, a + offset, itemsize)
+        string.memcpy(a + offset, b + offset, itemsize)
+        string.memcpy(b + offset, buf, itemsize)
+        k = ndim - 1
+        while k >= 0:
+            index[k] += 1
+            offset += strides[k]
+            if index[k] < shape[k]:
+                break
+            offset -= strides[k] * shape[k]
+            index[k] = 0
+            k -= 1
+        if k < 0:
+            return
+
+
+cdef inline uint64_t _sparse_find(uint64_t *keys, uint64_t mask,
+                                  uint64_t key) nogil:
+    """Slot holding key, or the empty slot where it would be inserted"""
+    cdef uint64_t loc = key & mask
+    while keys[loc] != <uint64_t>-1 and keys[loc] != key:
+        loc = (loc + 1) & mask
+    return loc
+
+
 cdef class Generator:
     """
     Generator(bit_generator=None)
@@ -108,7 +478,7 @@ cdef class Generator:
     """
     cdef public object _bit_generator
     cdef bitgen_t _bitgen
-    cdef binomial_t _binomial
+    cdef binomial_cache_t _binomial_cache
     cdef object lock
     _poisson_lam_max = POISSON_LAM_MAX
 
@@ -117,12 +487,7 @@ cdef class Generator:
             bit_generator = Xoroshiro128(mode="sequence")
         self._bit_generator = bit_generator
 
-        capsule = bit_generator.capsule
-        cdef const char *name = "BitGenerator"
-        if not PyCapsule_IsValid(capsule, name):
-            raise ValueError("Invalid bit generator. The bit generator must "
-                             "be instantized.")
-        self._bitgen = (<bitgen_t *> PyCapsule_GetPointer(capsule, name))[0]
+        copy_bitgen(bit_generator, &self._bitgen)
         self.lock = bit_generator.lock
 
     def __repr__(self):
@@ -326,9 +691,11 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. Default is None, in which case a
             single value is returned.
         dtype : {str, dtype}, optional
-            Desired dtype of the result, either 'd' (or 'float64') or 'f'
-            (or 'float32'). All dtypes are determined by their name. The
-            default value is 'd'.
+            Desired dtype of the result, either 'd' (or 'float64'), 'f'
+            (or 'float32'), 'e' (or 'float16') or 'bfloat16'. All dtypes
+            are determined by their name. The default value is 'd'. NumPy
+            does not have a bfloat16 type and so 'bfloat16' returns the bit
+            patterns of the values in an array with dtype uint16.
         out : ndarray, optional
             Alternative output array in which to place the result. If size is not None,
             it must have the same shape as the provided size and must match the type of
@@ -340,6 +707,13 @@ cdef class Generator:
             Array of random floats of shape `size` (unless ``size=None``, in which
             case a single float is returned).
 
+        Notes
+        -----
+        Values with dtype 'float16' are multiples of :math:`2^{-11}` and
+        values with dtype 'bfloat16' are multiples of :math:`2^{-8}`. Both
+        use 16 bits of each 64-bit value produced by the bit generator, so
+        that a single raw value produces four random values.
+
         Examples
         --------
         >>> randomgen.generator.random()
@@ -358,17 +732,628 @@ cdef class Generator:
 
         """
         cdef double temp
-        key = np.dtype(dtype).name
+        key = _float_dtype_key(dtype)
         if key == "float64":
             return double_fill(&random_double_fill, &self._bitgen, size, self.lock, out)
         elif key == "float32":
             return float_fill(&random_float, &self._bitgen, size, self.lock, out)
+        elif key == "float16":
+            return half_fill(&random_half_fill, &self._bitgen, size, self.lock, out,
+                             np.float16)
+        elif key == "bfloat16":
+            return half_fill(&random_bfloat16_fill, &self._bitgen, size, self.lock, out,
+                             np.uint16)
         else:
             raise TypeError("Unsupported dtype \"{key}\" for random".format(key=key))
 
-    def beta(self, a, b, size=None):
+    def stream(self, method, chunk, *args, n_buffers=2, background=True,
+               **kwargs):
+        """
+        stream(method, chunk, *args, n_buffers=2, background=True, **kwargs)
+
+        Iterate over chunks of random values held in reusable buffers
+
+        Parameters
+        ----------
+        method : str
+            Name of the Generator method used to produce values, e.g.,
+            "standard_normal".
+        chunk : int or tuple of ints
+            Shape of each chunk.
+        *args
+            Positional arguments passed to method.
+        n_buffers : int, optional
+            Number of preallocated buffers. The default is 2.
+        background : bool, optional
+            If True (default), buffers released by the caller are refilled on
+            a background thread while the current buffer is being consumed.
+            Requires at least 2 buffers.
+        **kwargs
+            Keyword arguments passed to method, e.g., dtype.
+
+        Returns
+        -------
+        stream : iterator
+            Infinite iterator over ndarrays with shape chunk.
+
+        Notes
+        -----
+        The buffers are allocated once and reused, so a chunk is only valid
+        until the next chunk is requested. Copy a chunk if it must be kept.
+
+        Chunks are always filled in order, so the values are identical to
+        calling ``method(*args, size=chunk, **kwargs)`` repeatedly and do not
+        depend on ``n_buffers`` or ``background``. When background is True,
+        the Generator should not be used for other draws while the stream is
+        active since the order of the draws would no longer be deterministic.
+        Buffers are filled ahead of use, so the underlying bit generator may
+        have produced up to ``n_buffers - 1`` more chunks than have been
+        returned. The background thread is stopped when the iterator is
+        closed or garbage collected.
+
+        Refilling on a background thread only helps when a chunk is large
+        enough for the cost of generating it to exceed the cost of handing
+        it between threads. Use ``background=False`` for small chunks.
+
+        Examples
+        --------
+        >>> from randomgen import Generator, Xoshiro256
+        >>> gen = Generator(Xoshiro256(1234, mode="sequence"))
+        >>> total = 0.0
+        >>> for i, chunk in enumerate(gen.stream("standard_normal", 100000)):
+        ...     total += chunk.sum()
+        ...     if i == 9:
+        ...         break
+        """
+        func = getattr(self, method, None) if isinstance(method, str) else None
+        if func is None or not callable(func) or method.startswith("_"):
+            raise ValueError("method must be the name of a Generator method")
+        n_buffers = operator.index(n_buffers)
+        if n_buffers < 1:
+            raise ValueError("n_buffers must be a positive integer")
+        if background and n_buffers < 2:
+            raise ValueError("n_buffers must be at least 2 when background "
+                             "is True")
+        return _stream(func, chunk, args, kwargs, n_buffers, background,
+                       method in _OUT_METHODS)
+
+    cdef object _fill_bits(self, bint raw, double p, object size, bint packed,
+                           object dtype, object out):
+        """Fill bits, packed along the last axis, from raw bits or Bernoulli(p)"""
+        cdef np.npy_intp j, k, m, w, row, n_rows, n_bits, n_words, n_out
+        cdef int width = 1
+        cdef uint64_t last_mask
+        cdef uint64_t buffer[256]
+        cdef uint64_t *words
+        cdef uint8_t *out_data
+        cdef uint8_t *dest
+
+        try:
+            shape = tuple(int(v) for v in size)
+        except TypeError:
+            shape = (int(size),)
+        if len(shape) == 0 or min(shape) < 0:
+            raise ValueError("size must have at least one dimension and all "
+                             "elements must be non-negative")
+        n_bits = shape[len(shape) - 1]
+        n_rows = int(np.prod(shape[:len(shape) - 1]))
+        if packed:
+            key = np.dtype(dtype).name
+            if key not in ("uint8", "uint64"):
+                raise TypeError("Unsupported dtype \"{key}\" for packed "
+                                "bits".format(key=key))
+            width = 8 if key == "uint8" else 64
+            out_dtype = np.dtype(dtype)
+            out_shape = shape[:len(shape) - 1] + ((n_bits + width - 1) // width,)
+        else:
+            out_dtype = np.dtype(np.bool_)
+            out_shape = shape
+        if out is None:
+            out = np.empty(out_shape, dtype=out_dtype)
+        else:
+            check_output(out, out_dtype, out_shape)
+            if not np.PyArray_IS_C_CONTIGUOUS(<np.ndarray>out):
+                raise ValueError("out must be C-contiguous")
+
+        n_words = (n_bits + 63) // 64
+        n_out = out_shape[len(out_shape) - 1]
+        last_mask = 0xFFFFFFFFFFFFFFFFULL
+        if n_bits % 64:
+            last_mask = (<uint64_t>1 << (n_bits % 64)) - 1
+        out_data = <uint8_t *>np.PyArray_DATA(<np.ndarray>out)
+        with self.lock, nogil:
+            for row in range(n_rows):
+                w = 0
+                while w < n_words:
+                    k = min(n_words - w, 256)
+                    if width == 64:
+                        words = (<uint64_t *>out_data) + row * n_words + w
+                    else:
+                        words = buffer
+                    if raw:
+                        random_bits_fill(&self._bitgen, k, words)
+                    else:
+                        random_bernoulli_fill(&self._bitgen, p, k, words)
+                    if w + k == n_words:
+                        words[k - 1] &= last_mask
+                    if width == 8:
+                        dest = out_data + row * n_out + w * 8
+                        for j in range(min(k * 8, n_out - w * 8)):
+                            dest[j] = <uint8_t>(words[j >> 3] >> ((j & 7) << 3))
+                    elif width == 1:
+                        dest = out_data + row * n_bits + w * 64
+                        m = min(k * 64, n_bits - w * 64)
+                        for j in range(0, m - 7, 8):
+                            string.memcpy(dest + j, _BITS_TO_BOOLS[(words[j >> 6] >> (j & 63)) & 0xff], 8)
+                        for j in range(m - m % 8, m):
+                            dest[j] = (words[j >> 6] >> (j & 63)) & 0x1
+                    w += k
+        return out
+
+    def bernoulli(self, p, size=None, bint packed=False, dtype=np.uint8, out=None):
+        """
+        bernoulli(p, size=None, packed=False, dtype=np.uint8, out=None)
+
+        Draw samples from a Bernoulli distribution.
+
+        Parameters
+        ----------
+        p : float
+            Probability of success, in [0, 1].
+        size : int or tuple of ints, optional
+            Output shape. If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` samples are drawn. If size is ``None`` (default),
+            a single value is returned. Required if ``packed`` is True.
+        packed : bool, optional
+            If True, return the outcomes packed into bits along the last
+            axis. Default is False.
+        dtype : {np.uint8, np.uint64}, optional
+            Type of the words that hold the bits when ``packed`` is True.
+            Ignored if ``packed`` is False.
+        out : ndarray, optional
+            Alternative C-contiguous output array in which to place the
+            result. It must have the shape and dtype of the result. If
+            ``size`` is None and ``packed`` is False, ``size`` is
+            ``out.shape``.
+
+        Returns
+        -------
+        out : bool or ndarray
+            If ``packed`` is False, an array of bools with shape ``size``. If
+            ``packed`` is True, an array with shape
+            ``size[:-1] + (ceil(size[-1] / bits),)`` where ``bits`` is the
+            number of bits in ``dtype``. Bit ``i`` of word ``j`` holds outcome
+            ``j * bits + i`` of the last axis and the unused bits of the
+            final word are 0.
+
+        See Also
+        --------
+        binomial : Number of successes in a number of Bernoulli trials.
+        random_bits : Packed random bits.
+
+        Notes
+        -----
+        Each outcome compares a uniform with ``p`` one binary digit at a time
+        and the outcomes for 64 elements are computed together from the same
+        64-bit values produced by the bit generator. An outcome is decided by
+        the first digit where the uniform and ``p`` differ, and so 64
+        outcomes usually require about 8 values from the bit generator for
+        any ``p``. The outcomes are exact for the double ``p``.
+
+        Packed outcomes use one bit per element, so that a mask with
+        :math:`10^9` elements requires 125MB. Packed outcomes with dtype
+        ``np.uint8`` can be unpacked using
+        ``np.unpackbits(out, axis=-1, count=size[-1], bitorder="little")``.
+
+        Examples
+        --------
+        >>> from randomgen import Generator, PCG64
+        >>> rg = Generator(PCG64())
+        >>> mask = rg.bernoulli(0.9, size=(128, 1000), packed=True)
+        >>> mask.shape
+        (128, 125)
+        """
+        cdef double _p
+        cdef np.ndarray values
+        if np.ndim(p) != 0:
+            raise ValueError("p must be a scalar")
+        _p = PyFloat_AsDouble(p)
+        check_constraint(_p, "p", CONS_BOUNDED_0_1)
+        if size is None:
+            if packed:
+                raise ValueError("size must be provided when packed is True")
+            if out is not None:
+                check_output(out, np.bool_, None)
+                return self._fill_bits(False, _p, out.shape, False, dtype, out)
+            values = self._fill_bits(False, _p, 1, False, None, None)
+            return bool(values[0])
+        return self._fill_bits(False, _p, size, packed, dtype, out)
+
+    cdef np.ndarray _bernoulli_positions(self, double p, object n):
+        """Sorted positions of the successes in n Bernoulli(p) trials"""
+        cdef int64_t _n, pos = -1
+        cdef np.npy_intp cap, count = 0, k
+        cdef np.ndarray out, grown
+        cdef int64_t *out_data
+
+        if n > np.iinfo(np.int64).max:
+            raise ValueError("The number of trials must be less than 2**63")
+        _n = n
+        mean = float(_n) * p
+        cap = int(min(_n, mean + 6 * np.sqrt(mean) + 16))
+        out = <np.ndarray>np.empty(max(cap, 1), dtype=np.int64)
+        cap = np.PyArray_SIZE(out)
+        with self.lock:
+            while True:
+                out_data = <int64_t *>np.PyArray_DATA(out)
+                with nogil:
+                    k = random_bernoulli_indices(&self._bitgen, p, _n, &pos,
+                                                 cap - count, out_data + count)
+                count += k
+                if count < cap:
+                    break
+                grown = <np.ndarray>np.empty(2 * cap, dtype=np.int64)
+                grown[:count] = out
+                out = grown
+                cap = 2 * cap
+        return out[:count].copy() if count < cap // 2 else out[:count]
+
+    def bernoulli_indices(self, n, p):
+        """
+        bernoulli_indices(n, p)
+
+        Positions of the successes in independent Bernoulli trials
+
+        Parameters
+        ----------
+        n : int or tuple of ints
+            Number of trials, or the shape of an array of trials.
+        p : float
+            Probability of success, in [0, 1].
+
+        Returns
+        -------
+        indices : ndarray or tuple of ndarrays
+            If ``n`` is an int, a sorted int64 array containing the positions
+            of the successes. If ``n`` is a tuple, a tuple of arrays, one for
+            each dimension, containing the coordinates of the successes in
+            C order, as returned by ``np.nonzero``.
+
+        See Also
+        --------
+        bernoulli : Dense Bernoulli outcomes.
+        sparse_random : Random sparse matrix in CSR format.
+
+        Notes
+        -----
+        The gaps between successive successes are independent geometric
+        random variables, and so the positions are generated by sampling the
+        gaps directly. The cost is proportional to the expected number of
+        successes, ``n * p``, rather than to ``n``.
+
+        The positions are identical to ``np.flatnonzero`` applied to a mask
+        with the same distribution, but are not the same values that would
+        be produced by :meth:`~randomgen.generator.Generator.bernoulli`.
+
+        Examples
+        --------
+        >>> from randomgen import Generator, PCG64
+        >>> rg = Generator(PCG64())
+        >>> idx = rg.bernoulli_indices(10**12, 1e-6)
+        >>> rows, cols = rg.bernoulli_indices((10**6, 10**6), 1e-6)
+        """
+        cdef double _p
+        if np.ndim(p) != 0:
+            raise ValueError("p must be a scalar")
+        _p = PyFloat_AsDouble(p)
+        check_constraint(_p, "p", CONS_BOUNDED_0_1)
+        try:
+            shape = tuple(int(v) for v in n)
+            is_tuple = True
+        except TypeError:
+            shape = (int(n),)
+            is_tuple = False
+        if min(shape, default=0) < 0:
+            raise ValueError("n must be non-negative")
+        n_trials = 1
+        for v in shape:
+            n_trials *= v
+        positions = self._bernoulli_positions(_p, n_trials)
+        if not is_tuple:
+            return positions
+        return np.unravel_index(positions, shape)
+
+    def sparse_random(self, shape, density, dtype=np.float64):
+        """
+        sparse_random(shape, density, dtype=np.float64)
+
+        Random sparse matrix in compressed sparse row (CSR) format
+
+        Parameters
+        ----------
+        shape : tuple of ints
+            Shape of the matrix, ``(n_rows, n_cols)``.
+        density : float
+            Probability that each element is nonzero, in [0, 1].
+        dtype : {str, dtype}, optional
+            Dtype of the nonzero values, which are uniform on (0, 1). Any
+            dtype supported by :meth:`~randomgen.generator.Generator.random`.
+            The default value is 'd'.
+
+        Returns
+        -------
+        data : ndarray
+            The nonzero values.
+        indices : ndarray
+            The int64 column index of each nonzero value.
+        indptr : ndarray
+            int64 array with ``n_rows + 1`` elements where the nonzero values
+            of row ``i`` are ``data[indptr[i]:indptr[i + 1]]``.
+
+        See Also
+        --------
+        bernoulli_indices : Positions of the successes in Bernoulli trials.
+
+        Notes
+        -----
+        Each element is independently nonzero with probability ``density``,
+        so that the number of nonzero values is binomial. The positions are
+        generated using :meth:`~randomgen.generator.Generator.bernoulli_indices`,
+        and so the cost is proportional to the number of nonzero values and
+        the number of rows, and not to the number of elements. The column
+        indices are sorted within each row. The values are drawn after the
+        positions, and any value that is exactly 0 is redrawn so that no
+        explicit zeros are stored.
+
+        The arrays can be used to construct a SciPy sparse matrix using
+        ``scipy.sparse.csr_matrix((data, indices, indptr), shape=shape)``.
+
+        Examples
+        --------
+        >>> from randomgen import Generator, PCG64
+        >>> rg = Generator(PCG64())
+        >>> data, indices, indptr = rg.sparse_random((10**6, 10**6), 1e-6)
+        """
+        cdef double _density
+        if np.ndim(density) != 0:
+            raise ValueError("density must be a scalar")
+        _density = PyFloat_AsDouble(density)
+        check_constraint(_density, "density", CONS_BOUNDED_0_1)
+        shape = tuple(int(v) for v in shape)
+        if len(shape) != 2 or min(shape) < 0:
+            raise ValueError("shape must contain two non-negative integers")
+        n_rows, n_cols = shape
+        positions = self._bernoulli_positions(_density, n_rows * n_cols)
+        if n_cols > 0:
+            row_starts = np.arange(n_rows + 1, dtype=np.int64) * n_cols
+            indptr = np.searchsorted(positions, row_starts).astype(np.int64)
+            indices = positions % n_cols
+        else:
+            indptr = np.zeros(n_rows + 1, dtype=np.int64)
+            indices = positions
+        data = self.random(np.PyArray_SIZE(positions), dtype=dtype)
+        # Redraw exact zeros so that every stored value is nonzero
+        zeros = np.flatnonzero(data == 0)
+        while zeros.shape[0] > 0:
+            data[zeros] = self.random(zeros.shape[0], dtype=dtype)
+            zeros = zeros[data[zeros] == 0]
+        return data, indices, indptr
+
+    cdef _sorted_uniform(self, double a, double b, double low, double scale,
+                         np.ndarray out):
+        """Fill out with sorted uniforms on [a, b) mapped to low + scale * u"""
+        cdef np.npy_intp i, n = np.PyArray_SIZE(out)
+        cdef double width = b - a
+        cdef double *out_data = <double *>np.PyArray_DATA(out)
+
+        with self.lock, nogil:
+            random_sorted_uniform_fill(&self._bitgen, n, out_data)
+        with nogil:
+            for i in range(n):
+                out_data[i] = low + scale * (a + width * out_data[i])
+
+    cdef np.ndarray _sequential_sample(self, sequential_sample_t *state,
+                                       np.npy_intp cnt, int64_t low):
+        """The next cnt positions of a sequential sample, offset by low"""
+        cdef np.npy_intp i, k
+        cdef np.ndarray out = <np.ndarray>np.empty(cnt, dtype=np.int64)
+        cdef int64_t *out_data = <int64_t *>np.PyArray_DATA(out)
+
+        with self.lock, nogil:
+            k = random_sequential_sample(&self._bitgen, state, cnt, out_data)
+        with nogil:
+            for i in range(k):
+                out_data[i] += low
+        return out[:k] if k < cnt else out
+
+    def sorted_random(self, n, low=0.0, high=1.0, chunk=None, out=None):
+        """
+        sorted_random(n, low=0.0, high=1.0, chunk=None, out=None)
+
+        Sorted random floats in the half-open interval [low, high)
+
+        Parameters
+        ----------
+        n : int
+            Number of values.
+        low : float, optional
+            Lower boundary of the output interval. The default value is 0.
+        high : float, optional
+            Upper boundary of the output interval. Must be greater than or
+            equal to low. The default value is 1.0.
+        chunk : int, optional
+            If provided, return an iterator over consecutive arrays of
+            ``chunk`` sorted values, the last of which may be shorter, which
+            together contain all ``n`` values.
+        out : ndarray, optional
+            Alternative C-contiguous float64 output array with shape ``(n,)``
+            in which to place the result. Cannot be used with ``chunk``.
+
+        Returns
+        -------
+        out : ndarray or iterator
+            The values, sorted in increasing order, or an iterator over
+            consecutive chunks of the values if ``chunk`` is provided.
+
+        See Also
+        --------
+        random : Unsorted random floats.
+        sorted_integers : Sorted sample of integers without replacement.
+
+        Notes
+        -----
+        The values have the same distribution as ``np.sort(uniform(low, high,
+        n))`` but are generated in order in O(n) time without sorting. The
+        sorted uniforms are distributed as the normalized partial sums of
+        ``n + 1`` standard exponentials [1]_, which are produced using the
+        ziggurat method.
+
+        When ``chunk`` is used, only one chunk is held in memory at a time so
+        that ``n`` can be larger than the available memory. The largest value
+        in each chunk is the ``chunk``-th smallest of the remaining values and
+        is drawn from its beta distribution. The other values in the chunk
+        are sorted uniforms below it. The values differ from those produced
+        without ``chunk``.
+
+        References
+        ----------
+        .. [1] Devroye, L., "Non-Uniform Random Variate Generation",
+               Springer-Verlag, New York, pp. 207-214, 1986.
+
+        Examples
+        --------
+        >>> from randomgen import Generator, PCG64
+        >>> rg = Generator(PCG64())
+        >>> arrivals = rg.sorted_random(1000, 0.0, 3600.0)
+        >>> for values in rg.sorted_random(10**10, chunk=10**7):
+        ...     pass
+        """
+        if np.ndim(low) != 0 or np.ndim(high) != 0:
+            raise ValueError("low and high must be scalars")
+        _low = PyFloat_AsDouble(low)
+        _high = PyFloat_AsDouble(high)
+        if not (np.isfinite(_low) and np.isfinite(_high)):
+            raise ValueError("low and high must be finite")
+        if _high < _low:
+            raise ValueError("high must be greater than or equal to low")
+        scale = _high - _low
+        if not np.isfinite(scale):
+            raise OverflowError("Range exceeds valid bounds")
+        n = operator.index(n)
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        if chunk is not None:
+            if out is not None:
+                raise ValueError("out cannot be used with chunk")
+            chunk = operator.index(chunk)
+            if chunk < 1:
+                raise ValueError("chunk must be a positive integer")
+            return _sorted_random_chunks(self, n, _low, scale, chunk)
+        if out is None:
+            out = np.empty(n, dtype=np.float64)
+        else:
+            check_output(out, np.float64, n)
+            if not np.PyArray_IS_C_CONTIGUOUS(<np.ndarray>out):
+                raise ValueError("out must be C-contiguous")
+        self._sorted_uniform(0.0, 1.0, _low, scale, <np.ndarray>out)
+        return out
+
+    def sorted_integers(self, low, high, k, endpoint=False, chunk=None):
+        """
+        sorted_integers(low, high, k, endpoint=False, chunk=None)
+
+        Sorted random sample of integers without replacement
+
+        Parameters
+        ----------
+        low : int
+            Lowest integer that can be selected.
+        high : int
+            One above the largest integer that can be selected, or the
+            largest integer if ``endpoint`` is True.
+        k : int
+            Number of distinct integers to select. Must not exceed the number
+            of integers in the range.
+        endpoint : bool, optional
+            If true, sample from the interval [low, high] instead of the
+            default [low, high).
+        chunk : int, optional
+            If provided, return an iterator over consecutive arrays of
+            ``chunk`` sorted values, the last of which may be shorter, which
+            together contain all ``k`` values.
+
+        Returns
+        -------
+        out : ndarray or iterator
+            int64 array of the selected integers in increasing order, or an
+            iterator over consecutive chunks of the integers if ``chunk`` is
+            provided.
+
+        See Also
+        --------
+        choice : Random sample with or without replacement.
+        sorted_random : Sorted random floats.
+        bernoulli_indices : Positions of the successes in Bernoulli trials.
+
+        Notes
+        -----
+        Every subset of ``k`` integers in the range is equally likely. The
+        integers are selected in increasing order by sampling the number of
+        integers skipped before each selection using Vitter's method D [1]_,
+        so that the expected cost is O(k) irrespective of the size of the
+        range and no sorting is required. Vitter's method A is used when more
+        than 1 in 13 of the integers are selected.
+
+        Since the sample is generated sequentially, the values produced using
+        ``chunk`` are identical to those produced without it, and only one
+        chunk is held in memory at a time.
+
+        The number of integers in the range must be less than 2**63.
+
+        References
+        ----------
+        .. [1] Vitter, J. S., "An Efficient Algorithm for Sequential Random
+               Sampling", ACM Transactions on Mathematical Software, 13(1),
+               pp. 58-67, 1987.
+
+        Examples
+        --------
+        >>> from randomgen import Generator, PCG64
+        >>> rg = Generator(PCG64())
+        >>> rows = rg.sorted_integers(0, 10**12, 1000)
         """
-        beta(a, b, size=None)
+        cdef sequential_sample_t state
+
+        low = operator.index(low)
+        high = operator.index(high)
+        k = operator.index(k)
+        if endpoint:
+            high = high + 1
+        n_pop = max(high - low, 0)
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        if k > n_pop:
+            raise ValueError("k must not exceed the number of integers in "
+                             "the range")
+        if low < np.iinfo(np.int64).min or high - 1 > np.iinfo(np.int64).max:
+            raise ValueError("low and high must be representable as int64")
+        if n_pop > np.iinfo(np.int64).max:
+            raise ValueError("The number of integers in the range must be "
+                             "less than 2**63")
+        if chunk is not None:
+            chunk = operator.index(chunk)
+            if chunk < 1:
+                raise ValueError("chunk must be a positive integer")
+            return _sorted_integers_chunks(self, n_pop, k, low, chunk)
+        state.N = n_pop
+        state.n = k
+        state.pos = -1
+        state.vprime = -1.0
+        return self._sequential_sample(&state, k, low)
+
+    def beta(self, a, b, size=None, dtype=np.float64, out=None):
+        """
+        beta(a, b, size=None, dtype='d', out=None)
 
         Draw samples from a Beta distribution.
 
@@ -397,6 +1382,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``a`` and ``b`` are both scalars.
             Otherwise, ``np.broadcast(a, b).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -404,14 +1397,27 @@ cdef class Generator:
             Drawn samples from the parameterized beta distribution.
 
         """
-        return cont(&random_beta, &self._bitgen, size, self.lock, 2,
-                    a, "a", CONS_POSITIVE,
-                    b, "b", CONS_POSITIVE,
-                    0.0, "", CONS_NONE, None)
-
-    def exponential(self, scale=1.0, size=None):
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_beta_f, &self._bitgen, size, self.lock, 2,
+                          a, "a", CONS_POSITIVE,
+                          b, "b", CONS_POSITIVE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for beta".format(key=key))
+        if _scalar_params(size, out, (a, b)):
+            return cont(&random_beta, &self._bitgen, size, self.lock, 2,
+                        a, "a", CONS_POSITIVE,
+                        b, "b", CONS_POSITIVE,
+                        0.0, "", CONS_NONE, out)
+        return cont_params(&random_gamma_setup, &random_beta_params,
+                           sizeof(gamma_params_t), &self._bitgen, size,
+                           self.lock, 2,
+                           a, "a", CONS_POSITIVE,
+                           b, "b", CONS_POSITIVE, out)
+
+    def exponential(self, scale=1.0, size=None, dtype=np.float64, out=None):
         """
-        exponential(scale=1.0, size=None)
+        exponential(scale=1.0, size=None, dtype='d', out=None)
 
         Draw samples from an exponential distribution.
 
@@ -439,6 +1445,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``scale`` is a scalar. Otherwise,
             ``np.array(scale).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -455,11 +1469,18 @@ cdef class Generator:
                https://en.wikipedia.org/wiki/Exponential_distribution
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_exponential_f, &self._bitgen, size, self.lock, 1,
+                          scale, "scale", CONS_NON_NEGATIVE,
+                          0.0, "", CONS_NONE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for exponential".format(key=key))
         return cont(&random_exponential, &self._bitgen, size, self.lock, 1,
                     scale, "scale", CONS_NON_NEGATIVE,
                     0.0, "", CONS_NONE,
                     0.0, "", CONS_NONE,
-                    None)
+                    out)
 
     def standard_exponential(self, size=None, dtype=np.float64, method=u"zig", out=None):
         """
@@ -573,9 +1594,9 @@ cdef class Generator:
         return self.integers(*args, **kwargs)
 
     def integers(self, low, high=None, size=None, dtype=np.int64,
-                 use_masked=None, endpoint=False, closed=None):
+                 use_masked=None, endpoint=False, closed=None, out=None):
         """
-        integers(low, high=None, size=None, dtype='int64', use_masked=True, endpoint=False)
+        integers(low, high=None, size=None, dtype='int64', use_masked=True, endpoint=False, out=None)
 
         Return random integers from `low` (inclusive) to `high` (exclusive), or
         if endpoint=True, `low` (inclusive) to `high` (inclusive).
@@ -618,6 +1639,10 @@ cdef class Generator:
         endpoint : bool
             If true, sample from the interval [low, high] instead of the
             default [low, high)
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -692,27 +1717,28 @@ cdef class Generator:
                           "platform-independent byteorder, call byteswap when "
                           "required.\n\nIn future version, specifying "
                           "byteorder will raise a ValueError", FutureWarning)
+        check_output(out, dt, size)
 
         if key == "int32":
-            ret = _rand_int32(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_int32(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
         elif key == "int64":
-            ret = _rand_int64(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_int64(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
         elif key == "int16":
-            ret = _rand_int16(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_int16(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
         elif key == "int8":
-            ret = _rand_int8(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_int8(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
         elif key == "uint64":
-            ret = _rand_uint64(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_uint64(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
         elif key == "uint32":
-            ret = _rand_uint32(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_uint32(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
         elif key == "uint16":
-            ret = _rand_uint16(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_uint16(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
         elif key == "uint8":
-            ret = _rand_uint8(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_uint8(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
         elif key == "bool":
-            ret = _rand_bool(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock)
+            ret = _rand_bool(low, high, size, _use_masked, endpoint, &self._bitgen, self.lock, out)
 
-        if size is None and dtype in (np.bool, np.int, np.long):
+        if size is None and out is None and dtype in (np.bool, np.int, np.long):
             if np.array(ret).shape == ():
                 return dtype(ret)
         return ret
@@ -742,35 +1768,98 @@ cdef class Generator:
         cdef Py_ssize_t n_uint32 = ((length - 1) // 4 + 1)
         return self.integers(0, 4294967296, size=n_uint32, dtype=np.uint32).tobytes()[:length]
 
-    @cython.wraparound(True)
-    def choice(self, a, size=None, replace=True, p=None, axis=0, bint shuffle=True):
+    def random_bits(self, size, bint packed=True, dtype=np.uint8, out=None):
         """
-        choice(a, size=None, replace=True, p=None, axis=0, shuffle=True):
+        random_bits(size, packed=True, dtype=np.uint8, out=None)
+
+        Return random bits.
 
         Parameters
         ----------
-        a : {array_like, int}
-            If an ndarray, a random sample is generated from its elements.
-            If an int, the random sample is generated as if a were np.arange(a)
-        size : int or tuple of ints, optional
-            Output shape.  If the given shape is, e.g., ``(m, n, k)``, then
-            ``m * n * k`` samples are drawn from the 1-d `a`. If `a` has more
-            than one dimension, the `size` shape will be inserted into the
-            `axis` dimension, so the output ``ndim`` will be ``a.ndim - 1 +
-            len(size)``. Default is None, in which case a single value is
-            returned.
-        replace : boolean, optional
-            Whether the sample is with or without replacement
-        p : 1-D array_like, optional
-            The probabilities associated with each entry in a.
-            If not given the sample assumes a uniform distribution over all
-            entries in a.
-        axis : int, optional
+        size : int or tuple of ints
+            Number of bits. If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` bits are drawn.
+        packed : bool, optional
+            If True (default), return the bits packed along the last axis.
+            If False, return one bool per bit.
+        dtype : {np.uint8, np.uint64}, optional
+            Type of the words that hold the bits when ``packed`` is True.
+            Ignored if ``packed`` is False.
+        out : ndarray, optional
+            Alternative C-contiguous output array in which to place the
+            result. It must have the shape and dtype of the result.
+
+        Returns
+        -------
+        out : ndarray
+            If ``packed`` is True, an array with shape
+            ``size[:-1] + (ceil(size[-1] / bits),)`` where ``bits`` is the
+            number of bits in ``dtype``. Bit ``i`` of word ``j`` holds bit
+            ``j * bits + i`` of the last axis and the unused bits of the
+            final word are 0. If ``packed`` is False, an array of bools with
+            shape ``size``.
+
+        See Also
+        --------
+        bernoulli : Random bits that are 1 with probability ``p``.
+
+        Notes
+        -----
+        The bits are taken directly from the 64-bit values produced by the
+        bit generator. Each row of the last axis starts with a new 64-bit
+        value.
+
+        Examples
+        --------
+        >>> from randomgen import Generator, PCG64
+        >>> rg = Generator(PCG64())
+        >>> bits = rg.random_bits(1000)
+        >>> bits.shape
+        (125,)
+        >>> mask = np.unpackbits(bits, count=1000, bitorder="little")
+        """
+        return self._fill_bits(True, 0.5, size, packed, dtype, out)
+
+    @cython.wraparound(True)
+    def choice(self, a, size=None, replace=True, p=None, axis=0, bint shuffle=True,
+               dtype=np.int64, out=None):
+        """
+        choice(a, size=None, replace=True, p=None, axis=0, shuffle=True, dtype=np.int64, out=None):
+
+        Parameters
+        ----------
+        a : {array_like, int}
+            If an ndarray, a random sample is generated from its elements.
+            If an int, the random sample is generated as if a were np.arange(a)
+        size : int or tuple of ints, optional
+            Output shape.  If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` samples are drawn from the 1-d `a`. If `a` has more
+            than one dimension, the `size` shape will be inserted into the
+            `axis` dimension, so the output ``ndim`` will be ``a.ndim - 1 +
+            len(size)``. Default is None, in which case a single value is
+            returned.
+        replace : boolean, optional
+            Whether the sample is with or without replacement
+        p : 1-D array_like, optional
+            The probabilities associated with each entry in a.
+            If not given the sample assumes a uniform distribution over all
+            entries in a.
+        axis : int, optional
             The axis along which the selection is performed. The default, 0,
             selects by row.
         shuffle : boolean, optional
             Whether the sample is shuffled when sampling without replacement.
             Default is True, False provides a speedup.
+        dtype : {str, dtype}, optional
+            Integer dtype of the result when `a` is an int. Must be able to
+            represent ``a - 1``. Using a 32-bit dtype halves the memory
+            required for large samples. Ignored when `a` is array-like.
+            The default value is np.int64.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If `a`
+            is an int, `out` must have dtype `dtype`, and if size is not
+            None, it must have shape `size`. If `a` is array-like, `out` is
+            passed to ``a.take``.
 
         Returns
         -------
@@ -824,10 +1913,28 @@ cdef class Generator:
         array(['pooh', 'pooh', 'pooh', 'Christopher', 'piglet'], # random
               dtype='<U11')
 
+        Sampling without replacement from a large population only requires
+        memory proportional to the number of values drawn:
+
+        >>> randomgen.generator.choice(2**32, 10**6, replace=False, dtype=np.uint32)
+        array([2913417329, 3408462105, ...,  215209431], dtype=uint32) # random
+
+        Notes
+        -----
+        When sampling without replacement and without `p`, a partial
+        Fisher-Yates shuffle is used when the sample is a large fraction of
+        the population. When the population is more than four times larger
+        than the sample, the displaced elements of the shuffle are tracked
+        in a hash map rather than materializing ``arange(a)``.
         """
 
         cdef int64_t val, t, loc, size_i, pop_size_i
         cdef int64_t *idx_data
+        cdef void *out_data
+        cdef np.ndarray arr, keys, values
+        cdef int itemsize
+        cdef double *pix
+        cdef double *tree_data
         cdef np.npy_intp j
         cdef uint64_t set_size, mask
         cdef uint64_t[::1] hash_set
@@ -869,6 +1976,19 @@ cdef class Generator:
             if abs(p_sum - 1.) > atol:
                 raise ValueError("probabilities do not sum to 1")
 
+        lean = a.ndim == 0
+        if lean:
+            dt = np.dtype(dtype)
+            if dt.kind not in "iu":
+                raise TypeError("Unsupported dtype \"{0}\" for "
+                                "choice".format(dt.name))
+            if pop_size - 1 > np.iinfo(dt).max:
+                raise ValueError("dtype {0} cannot represent all values in "
+                                 "the population".format(dt.name))
+            check_output(out, dt, size)
+            if out is not None and size is None:
+                size = out.shape
+
         shape = size
         if shape is not None:
             size = np.prod(shape, dtype=np.intp)
@@ -895,22 +2015,19 @@ cdef class Generator:
             if p is not None:
                 if np.count_nonzero(p > 0) < size:
                     raise ValueError("Fewer non-zero entries in p than size")
-                n_uniq = 0
                 p = p.copy()
+                tree = np.empty(pop_size + 1, dtype=np.float64)
                 found = np.zeros(shape, dtype=np.int64)
-                flat_found = found.ravel()
-                while n_uniq < size:
-                    x = self.random((size - n_uniq,))
-                    if n_uniq > 0:
-                        p[flat_found[0:n_uniq]] = 0
-                    cdf = np.cumsum(p)
-                    cdf /= cdf[-1]
-                    new = cdf.searchsorted(x, side="right")
-                    _, unique_indices = np.unique(new, return_index=True)
-                    unique_indices.sort()
-                    new = new.take(unique_indices)
-                    flat_found[n_uniq:n_uniq + new.size] = new
-                    n_uniq += new.size
+                size_i = size
+                pop_size_i = pop_size
+                pix = <double*>np.PyArray_DATA(p)
+                tree_data = <double*>np.PyArray_DATA(tree)
+                idx_data = <int64_t*>np.PyArray_DATA(found)
+                with self.lock, nogil:
+                    random_fenwick_setup(pix, pop_size_i, tree_data)
+                    random_weighted_without_replacement(&self._bitgen, pix,
+                                                        tree_data, pop_size_i,
+                                                        size_i, idx_data)
                 idx = found
             else:
                 size_i = size
@@ -921,7 +2038,29 @@ cdef class Generator:
                 else:
                     cutoff = 20
 
-                if pop_size_i > 10000 and (size_i > (pop_size_i // cutoff)):
+                if (pop_size_i > 10000 and (size_i > (pop_size_i // cutoff)) and
+                        pop_size_i > 4 * size_i):
+                    # Tail shuffle size elements tracking only displaced values
+                    idx_dtype = dt if lean and dt.itemsize in (4, 8) else np.dtype(np.int64)
+                    itemsize = idx_dtype.itemsize
+                    if (lean and out is not None and idx_dtype == dt and
+                            np.PyArray_IS_C_CONTIGUOUS(<np.ndarray>out)):
+                        arr = <np.ndarray>out
+                    else:
+                        arr = np.empty(size_i, dtype=idx_dtype)
+                    out_data = np.PyArray_DATA(arr)
+                    mask = _gen_mask(2 * size_i)
+                    keys = np.full(mask + 1, <uint64_t>-1, np.uint64)
+                    values = np.empty(mask + 1, dtype=np.int64)
+                    with self.lock, nogil:
+                        self._sparse_shuffle_tail(pop_size_i, size_i, out_data, itemsize,
+                                                  <uint64_t*>np.PyArray_DATA(keys),
+                                                  <int64_t*>np.PyArray_DATA(values),
+                                                  mask)
+                    if arr is out:
+                        return out
+                    idx = arr
+                elif pop_size_i > 10000 and (size_i > (pop_size_i // cutoff)):
                     # Tail shuffle size elements
                     idx = np.PyArray_Arange(0, pop_size_i, 1, np.NPY_INT64)
                     idx_data = <int64_t*>np.PyArray_DATA(<np.ndarray>idx)
@@ -965,7 +2104,12 @@ cdef class Generator:
 
         # Use samples as indices for a if a is array-like
         if a.ndim == 0:
-            return idx
+            if out is not None:
+                np.copyto(out, np.reshape(idx, out.shape), casting="unsafe")
+                return out
+            if isinstance(idx, np.ndarray):
+                return idx.astype(dt, copy=False)
+            return dt.type(idx)
 
         if shape is not None and idx.ndim == 0:
             # If size == () then the user requested a 0-d array as opposed to
@@ -979,11 +2123,52 @@ cdef class Generator:
 
         # asarray downcasts on 32-bit platforms, always safe
         # no-op on 64-bit platforms
-        return a.take(np.asarray(idx, dtype=np.intp), axis=axis)
+        return a.take(np.asarray(idx, dtype=np.intp), axis=axis, out=out)
+
+    def weighted_sampler(self, p):
+        """
+        weighted_sampler(p)
+
+        Create a sampler for repeated draws from a discrete distribution
+
+        Parameters
+        ----------
+        p : 1-D array_like
+            The probabilities associated with each index. Must be
+            non-negative and sum to 1.
+
+        Returns
+        -------
+        sampler : WeightedSampler
+            Sampler with a ``sample`` method that returns indices in
+            {0, 1, ..., len(p) - 1}.
+
+        See Also
+        --------
+        choice
+
+        Notes
+        -----
+        ``choice(n, size, p=p)`` computes the cumulative distribution of
+        p and performs a binary search for every sample. The sampler
+        builds an alias table once in O(len(p)) time so that each sample
+        requires O(1) time, which is substantially faster when drawing
+        repeatedly from the same, large, distribution. The samples differ
+        from those produced by ``choice``.
+
+        Examples
+        --------
+        >>> from randomgen import Generator
+        >>> rg = Generator()
+        >>> sampler = rg.weighted_sampler([0.1, 0.2, 0.3, 0.4])
+        >>> sampler.sample(5)
+        array([3, 2, 3, 1, 3])  # random
+        """
+        return WeightedSampler(self, p)
 
-    def uniform(self, low=0.0, high=1.0, size=None):
+    def uniform(self, low=0.0, high=1.0, size=None, dtype=np.float64, out=None):
         """
-        uniform(low=0.0, high=1.0, size=None)
+        uniform(low=0.0, high=1.0, size=None, dtype='d', out=None)
 
         Draw samples from a uniform distribution.
 
@@ -1005,6 +2190,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``low`` and ``high`` are both scalars.
             Otherwise, ``np.broadcast(low, high).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -1057,9 +2250,22 @@ cdef class Generator:
         cdef double _low, _high, range
         cdef object temp
 
+        key = np.dtype(dtype).name
+        if key not in ("float32", "float64"):
+            raise TypeError("Unsupported dtype \"{key}\" for uniform".format(key=key))
+
         alow = <np.ndarray>np.PyArray_FROM_OTF(low, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
         ahigh = <np.ndarray>np.PyArray_FROM_OTF(high, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
 
+        if key == "float32":
+            with np.errstate(over="ignore"):
+                arange = <np.ndarray>np.asarray(np.subtract(ahigh, alow), dtype=np.float32)
+            if not np.all(np.isfinite(arange)):
+                raise OverflowError("Range exceeds valid bounds")
+            return cont_f(&random_uniform_f, &self._bitgen, size, self.lock, 2,
+                          alow, "", CONS_NONE,
+                          arange, "", CONS_NONE, out)
+
         if np.PyArray_NDIM(alow) == np.PyArray_NDIM(ahigh) == 0:
             _low = PyFloat_AsDouble(low)
             _high = PyFloat_AsDouble(high)
@@ -1071,7 +2277,7 @@ cdef class Generator:
                         _low, "", CONS_NONE,
                         range, "", CONS_NONE,
                         0.0, "", CONS_NONE,
-                        None)
+                        out)
 
         temp = np.subtract(ahigh, alow)
         # needed to get around Pyrex's automatic reference-counting
@@ -1085,7 +2291,7 @@ cdef class Generator:
                     alow, "", CONS_NONE,
                     arange, "", CONS_NONE,
                     0.0, "", CONS_NONE,
-                    None)
+                    out)
 
     def rand(self, *args, dtype=np.float64):
         """
@@ -1317,9 +2523,11 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. Default is None, in which case a
             single value is returned.
         dtype : {str, dtype}, optional
-            Desired dtype of the result, either 'd' (or 'float64') or 'f'
-            (or 'float32'). All dtypes are determined by their name. The
-            default value is 'd'.
+            Desired dtype of the result, either 'd' (or 'float64'), 'f'
+            (or 'float32'), 'e' (or 'float16') or 'bfloat16'. All dtypes
+            are determined by their name. The default value is 'd'. NumPy
+            does not have a bfloat16 type and so 'bfloat16' returns the bit
+            patterns of the values in an array with dtype uint16.
         out : ndarray, optional
             Alternative output array in which to place the result. If size is not None,
             it must have the same shape as the provided size and must match the type of
@@ -1338,6 +2546,15 @@ cdef class Generator:
             mu + sigma * randomgen.generator.standard_normal(size=...)
             randomgen.generator.normal(mu, sigma, size=...)
 
+        Values with dtype 'float16' or 'bfloat16' use 32 bits produced by
+        the bit generator for each value. One bit determines the sign and 15
+        bits select one of 32768 equally likely intervals of :math:`|x|`.
+        Most intervals round to one or two adjacent 16-bit values, and a
+        precomputed threshold compared with the remaining 16 bits selects
+        between them. Intervals that cover more values, which occur near 0
+        and in the tails, are sampled exactly using additional random
+        values. The values are distributed as normals rounded to 16 bits.
+
         See Also
         --------
         normal :
@@ -1366,18 +2583,24 @@ cdef class Generator:
                [ 0.39924804,  4.68456316,  4.99394529,  4.84057254]])  # random
 
         """
-        key = np.dtype(dtype).name
+        key = _float_dtype_key(dtype)
         if key == "float64":
             return double_fill(&random_gauss_zig_fill, &self._bitgen, size, self.lock, out)
         elif key == "float32":
             return float_fill(&random_gauss_zig_f, &self._bitgen, size, self.lock, out)
+        elif key == "float16":
+            return half_fill(&random_gauss_half_fill, &self._bitgen, size,
+                             self.lock, out, np.float16)
+        elif key == "bfloat16":
+            return half_fill(&random_gauss_bfloat16_fill, &self._bitgen, size,
+                             self.lock, out, np.uint16)
 
         else:
             raise TypeError("Unsupported dtype \"{key}\" for standard_normal".format(key=key))
 
-    def normal(self, loc=0.0, scale=1.0, size=None):
+    def normal(self, loc=0.0, scale=1.0, size=None, dtype=np.float64, out=None):
         """
-        normal(loc=0.0, scale=1.0, size=None)
+        normal(loc=0.0, scale=1.0, size=None, dtype='d', out=None)
 
         Draw random samples from a normal (Gaussian) distribution.
 
@@ -1403,6 +2626,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``loc`` and ``scale`` are both scalars.
             Otherwise, ``np.broadcast(loc, scale).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -1471,11 +2702,18 @@ cdef class Generator:
                [ 0.39924804,  4.68456316,  4.99394529,  4.84057254]])  # random
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_normal_f, &self._bitgen, size, self.lock, 2,
+                          loc, "", CONS_NONE,
+                          scale, "scale", CONS_NON_NEGATIVE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for normal".format(key=key))
         return cont(&random_normal_zig, &self._bitgen, size, self.lock, 2,
                     loc, "", CONS_NONE,
                     scale, "scale", CONS_NON_NEGATIVE,
                     0.0, "", CONS_NONE,
-                    None)
+                    out)
 
     def standard_gamma(self, shape, size=None, dtype=np.float64, out=None):
         """
@@ -1557,21 +2795,28 @@ cdef class Generator:
         cdef void *func
         key = np.dtype(dtype).name
         if key == "float64":
-            return cont(&random_standard_gamma_zig, &self._bitgen, size, self.lock, 1,
-                        shape, "shape", CONS_NON_NEGATIVE,
-                        0.0, "", CONS_NONE,
-                        0.0, "", CONS_NONE,
-                        out)
+            if _scalar_params(size, out, (shape,)):
+                return cont(&random_standard_gamma_zig, &self._bitgen, size,
+                            self.lock, 1,
+                            shape, "shape", CONS_NON_NEGATIVE,
+                            0.0, "", CONS_NONE,
+                            0.0, "", CONS_NONE,
+                            out)
+            return cont_params(&random_gamma_setup, &random_gamma_params,
+                               sizeof(gamma_params_t), &self._bitgen, size,
+                               self.lock, 1,
+                               shape, "shape", CONS_NON_NEGATIVE,
+                               1.0, "", CONS_NONE, out)
         if key == "float32":
-            return cont_f(&random_standard_gamma_zig_f, &self._bitgen, size, self.lock,
+            return cont_f(&random_standard_gamma_zig_f, &self._bitgen, size, self.lock, 1,
                           shape, "shape", CONS_NON_NEGATIVE,
-                          out)
+                          0.0, "", CONS_NONE, out)
         else:
             raise TypeError("Unsupported dtype \"{key}\" for standard_gamma".format(key=key))
 
-    def gamma(self, shape, scale=1.0, size=None):
+    def gamma(self, shape, scale=1.0, size=None, dtype=np.float64, out=None):
         """
-        gamma(shape, scale=1.0, size=None)
+        gamma(shape, scale=1.0, size=None, dtype='d', out=None)
 
         Draw samples from a Gamma distribution.
 
@@ -1591,6 +2836,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``shape`` and ``scale`` are both scalars.
             Otherwise, ``np.broadcast(shape, scale).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -1642,14 +2895,27 @@ cdef class Generator:
         >>> plt.show()
 
         """
-        return cont(&random_gamma, &self._bitgen, size, self.lock, 2,
-                    shape, "shape", CONS_NON_NEGATIVE,
-                    scale, "scale", CONS_NON_NEGATIVE,
-                    0.0, "", CONS_NONE, None)
-
-    def f(self, dfnum, dfden, size=None):
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_gamma_float, &self._bitgen, size, self.lock, 2,
+                          shape, "shape", CONS_NON_NEGATIVE,
+                          scale, "scale", CONS_NON_NEGATIVE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for gamma".format(key=key))
+        if _scalar_params(size, out, (shape, scale)):
+            return cont(&random_gamma, &self._bitgen, size, self.lock, 2,
+                        shape, "shape", CONS_NON_NEGATIVE,
+                        scale, "scale", CONS_NON_NEGATIVE,
+                        0.0, "", CONS_NONE, out)
+        return cont_params(&random_gamma_setup, &random_gamma_params,
+                           sizeof(gamma_params_t), &self._bitgen, size,
+                           self.lock, 1,
+                           shape, "shape", CONS_NON_NEGATIVE,
+                           scale, "scale", CONS_NON_NEGATIVE, out)
+
+    def f(self, dfnum, dfden, size=None, out=None):
         """
-        f(dfnum, dfden, size=None)
+        f(dfnum, dfden, size=None, out=None)
 
         Draw samples from an F distribution.
 
@@ -1674,6 +2940,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``dfnum`` and ``dfden`` are both scalars.
             Otherwise, ``np.broadcast(dfnum, dfden).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -1733,11 +3003,11 @@ cdef class Generator:
         return cont(&random_f, &self._bitgen, size, self.lock, 2,
                     dfnum, "dfnum", CONS_POSITIVE,
                     dfden, "dfden", CONS_POSITIVE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def noncentral_f(self, dfnum, dfden, nonc, size=None):
+    def noncentral_f(self, dfnum, dfden, nonc, size=None, out=None):
         """
-        noncentral_f(dfnum, dfden, nonc, size=None)
+        noncentral_f(dfnum, dfden, nonc, size=None, out=None)
 
         Draw samples from the noncentral F distribution.
 
@@ -1764,6 +3034,10 @@ cdef class Generator:
             a single value is returned if ``dfnum``, ``dfden``, and ``nonc``
             are all scalars. Otherwise, ``np.broadcast(dfnum, dfden, nonc).size``
             samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -1810,11 +3084,11 @@ cdef class Generator:
         return cont(&random_noncentral_f, &self._bitgen, size, self.lock, 3,
                     dfnum, "dfnum", CONS_POSITIVE,
                     dfden, "dfden", CONS_POSITIVE,
-                    nonc, "nonc", CONS_NON_NEGATIVE, None)
+                    nonc, "nonc", CONS_NON_NEGATIVE, out)
 
-    def chisquare(self, df, size=None):
+    def chisquare(self, df, size=None, dtype=np.float64, out=None):
         """
-        chisquare(df, size=None)
+        chisquare(df, size=None, dtype='d', out=None)
 
         Draw samples from a chi-square distribution.
 
@@ -1832,6 +3106,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``df`` is a scalar. Otherwise,
             ``np.array(df).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -1875,14 +3157,21 @@ cdef class Generator:
         array([ 1.89920014,  9.00867716,  3.13710533,  5.62318272]) # random
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_chisquare_f, &self._bitgen, size, self.lock, 1,
+                          df, "df", CONS_POSITIVE,
+                          0.0, "", CONS_NONE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for chisquare".format(key=key))
         return cont(&random_chisquare, &self._bitgen, size, self.lock, 1,
                     df, "df", CONS_POSITIVE,
                     0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def noncentral_chisquare(self, df, nonc, size=None):
+    def noncentral_chisquare(self, df, nonc, size=None, out=None):
         """
-        noncentral_chisquare(df, nonc, size=None)
+        noncentral_chisquare(df, nonc, size=None, out=None)
 
         Draw samples from a noncentral chi-square distribution.
 
@@ -1903,6 +3192,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``df`` and ``nonc`` are both scalars.
             Otherwise, ``np.broadcast(df, nonc).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -1957,11 +3250,11 @@ cdef class Generator:
         return cont(&random_noncentral_chisquare, &self._bitgen, size, self.lock, 2,
                     df, "df", CONS_POSITIVE,
                     nonc, "nonc", CONS_NON_NEGATIVE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def standard_cauchy(self, size=None):
+    def standard_cauchy(self, size=None, out=None):
         """
-        standard_cauchy(size=None)
+        standard_cauchy(size=None, out=None)
 
         Draw samples from a standard Cauchy distribution with mode = 0.
 
@@ -1973,6 +3266,10 @@ cdef class Generator:
             Output shape. If the given shape is, e.g., ``(m, n, k)``, then
             ``m * n * k`` samples are drawn. Default is None, in which case a
             single value is returned.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2022,11 +3319,11 @@ cdef class Generator:
 
         """
         return cont(&random_standard_cauchy, &self._bitgen, size, self.lock, 0,
-                    0.0, "", CONS_NONE, 0.0, "", CONS_NONE, 0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, 0.0, "", CONS_NONE, 0.0, "", CONS_NONE, out)
 
-    def standard_t(self, df, size=None):
+    def standard_t(self, df, size=None, dtype=np.float64, out=None):
         """
-        standard_t(df, size=None)
+        standard_t(df, size=None, dtype='d', out=None)
 
         Draw samples from a standard Student's t distribution with `df` degrees
         of freedom.
@@ -2044,6 +3341,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``df`` is a scalar. Otherwise,
             ``np.array(df).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2112,15 +3417,22 @@ cdef class Generator:
         probability of about 99% of being true.
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_standard_t_f, &self._bitgen, size, self.lock, 1,
+                          df, "df", CONS_POSITIVE,
+                          0.0, "", CONS_NONE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for standard_t".format(key=key))
         return cont(&random_standard_t, &self._bitgen, size, self.lock, 1,
                     df, "df", CONS_POSITIVE,
                     0, "", CONS_NONE,
                     0, "", CONS_NONE,
-                    None)
+                    out)
 
-    def vonmises(self, mu, kappa, size=None):
+    def vonmises(self, mu, kappa, size=None, out=None):
         """
-        vonmises(mu, kappa, size=None)
+        vonmises(mu, kappa, size=None, out=None)
 
         Draw samples from a von Mises distribution.
 
@@ -2143,6 +3455,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``mu`` and ``kappa`` are both scalars.
             Otherwise, ``np.broadcast(mu, kappa).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2199,11 +3515,11 @@ cdef class Generator:
         return cont(&random_vonmises, &self._bitgen, size, self.lock, 2,
                     mu, "mu", CONS_NONE,
                     kappa, "kappa", CONS_NON_NEGATIVE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def pareto(self, a, size=None):
+    def pareto(self, a, size=None, out=None):
         """
-        pareto(a, size=None)
+        pareto(a, size=None, out=None)
 
         Draw samples from a Pareto II or Lomax distribution with
         specified shape.
@@ -2234,6 +3550,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``a`` is a scalar. Otherwise,
             ``np.array(a).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2296,11 +3616,11 @@ cdef class Generator:
         return cont(&random_pareto, &self._bitgen, size, self.lock, 1,
                     a, "a", CONS_POSITIVE,
                     0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def weibull(self, a, size=None):
+    def weibull(self, a, size=None, dtype=np.float64, out=None):
         """
-        weibull(a, size=None)
+        weibull(a, size=None, dtype='d', out=None)
 
         Draw samples from a Weibull distribution.
 
@@ -2323,6 +3643,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``a`` is a scalar. Otherwise,
             ``np.array(a).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2391,14 +3719,21 @@ cdef class Generator:
         >>> plt.show()
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_weibull_f, &self._bitgen, size, self.lock, 1,
+                          a, "a", CONS_NON_NEGATIVE,
+                          0.0, "", CONS_NONE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for weibull".format(key=key))
         return cont(&random_weibull, &self._bitgen, size, self.lock, 1,
                     a, "a", CONS_NON_NEGATIVE,
                     0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def power(self, a, size=None):
+    def power(self, a, size=None, out=None):
         """
-        power(a, size=None)
+        power(a, size=None, out=None)
 
         Draws samples in [0, 1] from a power distribution with positive
         exponent a - 1.
@@ -2414,6 +3749,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``a`` is a scalar. Otherwise,
             ``np.array(a).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2494,11 +3833,11 @@ cdef class Generator:
         return cont(&random_power, &self._bitgen, size, self.lock, 1,
                     a, "a", CONS_POSITIVE,
                     0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def laplace(self, loc=0.0, scale=1.0, size=None):
+    def laplace(self, loc=0.0, scale=1.0, size=None, dtype=np.float64, out=None):
         """
-        laplace(loc=0.0, scale=1.0, size=None)
+        laplace(loc=0.0, scale=1.0, size=None, dtype='d', out=None)
 
         Draw samples from the Laplace or double exponential distribution with
         specified location (or mean) and scale (decay).
@@ -2520,6 +3859,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``loc`` and ``scale`` are both scalars.
             Otherwise, ``np.broadcast(loc, scale).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2576,14 +3923,21 @@ cdef class Generator:
         >>> plt.plot(x,g)
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_laplace_f, &self._bitgen, size, self.lock, 2,
+                          loc, "loc", CONS_NONE,
+                          scale, "scale", CONS_NON_NEGATIVE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for laplace".format(key=key))
         return cont(&random_laplace, &self._bitgen, size, self.lock, 2,
                     loc, "loc", CONS_NONE,
                     scale, "scale", CONS_NON_NEGATIVE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def gumbel(self, loc=0.0, scale=1.0, size=None):
+    def gumbel(self, loc=0.0, scale=1.0, size=None, dtype=np.float64, out=None):
         """
-        gumbel(loc=0.0, scale=1.0, size=None)
+        gumbel(loc=0.0, scale=1.0, size=None, dtype='d', out=None)
 
         Draw samples from a Gumbel distribution.
 
@@ -2603,6 +3957,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``loc`` and ``scale`` are both scalars.
             Otherwise, ``np.broadcast(loc, scale).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2694,14 +4056,21 @@ cdef class Generator:
         >>> plt.show()
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_gumbel_f, &self._bitgen, size, self.lock, 2,
+                          loc, "loc", CONS_NONE,
+                          scale, "scale", CONS_NON_NEGATIVE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for gumbel".format(key=key))
         return cont(&random_gumbel, &self._bitgen, size, self.lock, 2,
                     loc, "loc", CONS_NONE,
                     scale, "scale", CONS_NON_NEGATIVE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def logistic(self, loc=0.0, scale=1.0, size=None):
+    def logistic(self, loc=0.0, scale=1.0, size=None, dtype=np.float64, out=None):
         """
-        logistic(loc=0.0, scale=1.0, size=None)
+        logistic(loc=0.0, scale=1.0, size=None, dtype='d', out=None)
 
         Draw samples from a logistic distribution.
 
@@ -2720,6 +4089,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``loc`` and ``scale`` are both scalars.
             Otherwise, ``np.broadcast(loc, scale).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2774,14 +4151,21 @@ cdef class Generator:
         >>> plt.show()
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_logistic_f, &self._bitgen, size, self.lock, 2,
+                          loc, "loc", CONS_NONE,
+                          scale, "scale", CONS_NON_NEGATIVE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for logistic".format(key=key))
         return cont(&random_logistic, &self._bitgen, size, self.lock, 2,
                     loc, "loc", CONS_NONE,
                     scale, "scale", CONS_NON_NEGATIVE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def lognormal(self, mean=0.0, sigma=1.0, size=None):
+    def lognormal(self, mean=0.0, sigma=1.0, size=None, dtype=np.float64, out=None):
         """
-        lognormal(mean=0.0, sigma=1.0, size=None)
+        lognormal(mean=0.0, sigma=1.0, size=None, dtype='d', out=None)
 
         Draw samples from a log-normal distribution.
 
@@ -2802,6 +4186,14 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``mean`` and ``sigma`` are both scalars.
             Otherwise, ``np.broadcast(mean, sigma).size`` samples are drawn.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). All dtypes are determined by their name. The
+            default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2884,14 +4276,21 @@ cdef class Generator:
         >>> plt.show()
 
         """
+        key = np.dtype(dtype).name
+        if key == "float32":
+            return cont_f(&random_lognormal_f, &self._bitgen, size, self.lock, 2,
+                          mean, "mean", CONS_NONE,
+                          sigma, "sigma", CONS_NON_NEGATIVE, out)
+        elif key != "float64":
+            raise TypeError("Unsupported dtype \"{key}\" for lognormal".format(key=key))
         return cont(&random_lognormal, &self._bitgen, size, self.lock, 2,
                     mean, "mean", CONS_NONE,
                     sigma, "sigma", CONS_NON_NEGATIVE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def rayleigh(self, scale=1.0, size=None):
+    def rayleigh(self, scale=1.0, size=None, out=None):
         """
-        rayleigh(scale=1.0, size=None)
+        rayleigh(scale=1.0, size=None, out=None)
 
         Draw samples from a Rayleigh distribution.
 
@@ -2907,6 +4306,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``scale`` is a scalar. Otherwise,
             ``np.array(scale).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -2955,11 +4358,11 @@ cdef class Generator:
         return cont(&random_rayleigh, &self._bitgen, size, self.lock, 1,
                     scale, "scale", CONS_NON_NEGATIVE,
                     0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def wald(self, mean, scale, size=None):
+    def wald(self, mean, scale, size=None, out=None):
         """
-        wald(mean, scale, size=None)
+        wald(mean, scale, size=None, out=None)
 
         Draw samples from a Wald, or inverse Gaussian, distribution.
 
@@ -2983,6 +4386,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``mean`` and ``scale`` are both scalars.
             Otherwise, ``np.broadcast(mean, scale).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -3023,11 +4430,11 @@ cdef class Generator:
         return cont(&random_wald, &self._bitgen, size, self.lock, 2,
                     mean, "mean", CONS_POSITIVE,
                     scale, "scale", CONS_POSITIVE,
-                    0.0, "", CONS_NONE, None)
+                    0.0, "", CONS_NONE, out)
 
-    def triangular(self, left, mode, right, size=None):
+    def triangular(self, left, mode, right, size=None, out=None):
         """
-        triangular(left, mode, right, size=None)
+        triangular(left, mode, right, size=None, out=None)
 
         Draw samples from the triangular distribution over the
         interval ``[left, right]``.
@@ -3052,6 +4459,10 @@ cdef class Generator:
             a single value is returned if ``left``, ``mode``, and ``right``
             are all scalars. Otherwise, ``np.broadcast(left, mode, right).size``
             samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -3110,7 +4521,7 @@ cdef class Generator:
             return cont(&random_triangular, &self._bitgen, size, self.lock, 3,
                         fleft, "", CONS_NONE,
                         fmode, "", CONS_NONE,
-                        fright, "", CONS_NONE, None)
+                        fright, "", CONS_NONE, out)
 
         if np.any(np.greater(oleft, omode)):
             raise ValueError("left > mode")
@@ -3119,15 +4530,17 @@ cdef class Generator:
         if np.any(np.equal(oleft, oright)):
             raise ValueError("left == right")
 
+        check_output(out, np.float64, size)
         return cont_broadcast_3(&random_triangular, &self._bitgen, size, self.lock,
                                 oleft, "", CONS_NONE,
                                 omode, "", CONS_NONE,
-                                oright, "", CONS_NONE)
+                                oright, "", CONS_NONE,
+                                out)
 
     # Complicated, discrete distributions:
-    def binomial(self, n, p, size=None):
+    def binomial(self, n, p, size=None, out=None):
         """
-        binomial(n, p, size=None)
+        binomial(n, p, size=None, out=None)
 
         Draw samples from a binomial distribution.
 
@@ -3148,6 +4561,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``n`` and ``p`` are both scalars.
             Otherwise, ``np.broadcast(n, p).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -3211,7 +4628,7 @@ cdef class Generator:
 
         """
 
-        # Uses a custom implementation since self._binomial is required
+        # Uses a custom implementation since self._binomial_cache is required
         cdef double _dp = 0
         cdef int64_t _in = 0
         cdef bint is_scalar = True
@@ -3219,7 +4636,9 @@ cdef class Generator:
         cdef np.ndarray randoms
         cdef np.int64_t *randoms_data
         cdef np.broadcast it
+        cdef np.flatiter out_it
 
+        check_output(out, np.int64, size)
         p_arr = <np.ndarray>np.PyArray_FROM_OTF(p, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
         is_scalar = is_scalar and np.PyArray_NDIM(p_arr) == 0
         n_arr = <np.ndarray>np.PyArray_FROM_OTF(n, np.NPY_INT64, api.NPY_ARRAY_ALIGNED)
@@ -3228,21 +4647,26 @@ cdef class Generator:
         if not is_scalar:
             check_array_constraint(p_arr, "p", CONS_BOUNDED_0_1)
             check_array_constraint(n_arr, "n", CONS_NON_NEGATIVE)
-            if size is not None:
+            if out is not None:
+                randoms = <np.ndarray>out
+            elif size is not None:
                 randoms = <np.ndarray>np.empty(size, np.int64)
             else:
                 it = np.PyArray_MultiIterNew2(p_arr, n_arr)
                 randoms = <np.ndarray>np.empty(it.shape, np.int64)
 
-            randoms_data = <np.int64_t *>np.PyArray_DATA(randoms)
             cnt = np.PyArray_SIZE(randoms)
 
             it = np.PyArray_MultiIterNew3(randoms, p_arr, n_arr)
+            if out is not None and it.shape != out.shape:
+                raise ValueError("The shape of out, {0}, is not compatible "
+                                 "with the broadcast shape of the "
+                                 "parameters, {1}".format(out.shape, it.shape))
             with self.lock, nogil:
                 for i in range(cnt):
                     _dp = (<double*>np.PyArray_MultiIter_DATA(it, 1))[0]
                     _in = (<int64_t*>np.PyArray_MultiIter_DATA(it, 2))[0]
-                    (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0] = random_binomial(&self._bitgen, _dp, _in, &self._binomial)
+                    (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0] = random_binomial_cached(&self._bitgen, _dp, _in, &self._binomial_cache)
 
                     np.PyArray_MultiIter_NEXT(it)
 
@@ -3253,51 +4677,110 @@ cdef class Generator:
         check_constraint(_dp, "p", CONS_BOUNDED_0_1)
         check_constraint(<double>_in, "n", CONS_NON_NEGATIVE)
 
-        if size is None:
+        if size is None and out is None:
             with self.lock:
-                return random_binomial(&self._bitgen, _dp, _in, &self._binomial)
+                return random_binomial_cached(&self._bitgen, _dp, _in, &self._binomial_cache)
 
-        randoms = <np.ndarray>np.empty(size, np.int64)
+        if out is None:
+            randoms = <np.ndarray>np.empty(size, np.int64)
+        else:
+            randoms = <np.ndarray>out
         cnt = np.PyArray_SIZE(randoms)
         randoms_data = <np.int64_t *>np.PyArray_DATA(randoms)
 
+        if not np.PyArray_IS_C_CONTIGUOUS(randoms):
+            out_it = <np.flatiter>np.PyArray_IterNew(randoms)
+            with self.lock, nogil:
+                for i in range(cnt):
+                    (<int64_t *>np.PyArray_ITER_DATA(out_it))[0] = random_binomial_cached(&self._bitgen, _dp, _in,
+                                                                                          &self._binomial_cache)
+                    np.PyArray_ITER_NEXT(out_it)
+            return randoms
+
         with self.lock, nogil:
             for i in range(cnt):
-                randoms_data[i] = random_binomial(&self._bitgen, _dp, _in,
-                                                  &self._binomial)
+                randoms_data[i] = random_binomial_cached(&self._bitgen, _dp, _in,
+                                                         &self._binomial_cache)
 
         return randoms
 
-    def negative_binomial(self, n, p, size=None):
+    def binomial_sampler(self, n, p):
         """
-        negative_binomial(n, p, size=None)
-
-        Draw samples from a negative binomial distribution.
+        binomial_sampler(n, p)
 
-        Samples are drawn from a negative binomial distribution with specified
-        parameters, `n` successes and `p` probability of success where `n`
-        is > 0 and `p` is in the interval [0, 1].
+        Create a sampler for repeated binomial draws with fixed parameters
 
         Parameters
         ----------
-        n : float or array_like of floats
-            Parameter of the distribution, > 0.
+        n : int or array_like of ints
+            Parameter of the distribution, >= 0.
         p : float or array_like of floats
             Parameter of the distribution, >= 0 and <=1.
-        size : int or tuple of ints, optional
-            Output shape. If the given shape is, e.g., ``(m, n, k)``, then
-            ``m * n * k`` samples are drawn. If size is ``None`` (default),
-            a single value is returned if ``n`` and ``p`` are both scalars.
-            Otherwise, ``np.broadcast(n, p).size`` samples are drawn.
 
         Returns
         -------
-        out : ndarray or scalar
-            Drawn samples from the parameterized negative binomial distribution,
-            where each sample is equal to N, the number of failures that
-            occurred before a total of n successes was reached.
+        sampler : BinomialSampler
+            Sampler with a ``sample`` method that draws one value for each
+            element of the broadcast of ``n`` and ``p``.
 
-        Notes
+        See Also
+        --------
+        binomial
+
+        Notes
+        -----
+        ``binomial`` caches the setup of the sampling algorithm for a small
+        number of recent (n, p) pairs. The sampler computes the setup once
+        for every distinct pair, which avoids repeating it when there are
+        many distinct pairs. The samples are identical to those produced by
+        ``binomial(n, p, size=size + shape)``.
+
+        Examples
+        --------
+        >>> from randomgen import Generator
+        >>> rg = Generator()
+        >>> sampler = rg.binomial_sampler([10, 1000, 10], [0.5, 0.1, 0.5])
+        >>> sampler.sample()
+        array([ 6, 95,  4])  # random
+        >>> sampler.sample(2).shape
+        (2, 3)
+        """
+        return BinomialSampler(self, n, p)
+
+    def negative_binomial(self, n, p, size=None, out=None):
+        """
+        negative_binomial(n, p, size=None, out=None)
+
+        Draw samples from a negative binomial distribution.
+
+        Samples are drawn from a negative binomial distribution with specified
+        parameters, `n` successes and `p` probability of success where `n`
+        is > 0 and `p` is in the interval [0, 1].
+
+        Parameters
+        ----------
+        n : float or array_like of floats
+            Parameter of the distribution, > 0.
+        p : float or array_like of floats
+            Parameter of the distribution, >= 0 and <=1.
+        size : int or tuple of ints, optional
+            Output shape. If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` samples are drawn. If size is ``None`` (default),
+            a single value is returned if ``n`` and ``p`` are both scalars.
+            Otherwise, ``np.broadcast(n, p).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
+
+        Returns
+        -------
+        out : ndarray or scalar
+            Drawn samples from the parameterized negative binomial distribution,
+            where each sample is equal to N, the number of failures that
+            occurred before a total of n successes was reached.
+
+        Notes
         -----
         The probability mass function of the negative binomial distribution is
 
@@ -3342,11 +4825,12 @@ cdef class Generator:
         return disc(&random_negative_binomial, &self._bitgen, size, self.lock, 2, 0,
                     n, "n", CONS_POSITIVE_NOT_NAN,
                     p, "p", CONS_BOUNDED_0_1,
-                    0.0, "", CONS_NONE)
+                    0.0, "", CONS_NONE,
+                    out)
 
-    def poisson(self, lam=1.0, size=None):
+    def poisson(self, lam=1.0, size=None, out=None):
         """
-        poisson(lam=1.0, size=None)
+        poisson(lam=1.0, size=None, out=None)
 
         Draw samples from a Poisson distribution.
 
@@ -3363,6 +4847,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``lam`` is a scalar. Otherwise,
             ``np.array(lam).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -3410,14 +4898,66 @@ cdef class Generator:
         >>> s = randomgen.generator.poisson(lam=(100., 500.), size=(100, 2))
 
         """
-        return disc(&random_poisson, &self._bitgen, size, self.lock, 1, 0,
-                    lam, "lam", CONS_POISSON,
-                    0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE)
+        if np.ndim(lam) != 0 or _scalar_params(size, out, (lam,)):
+            # Precomputing the constants only helps when lam is reused
+            return disc(&random_poisson, &self._bitgen, size, self.lock, 1, 0,
+                        lam, "lam", CONS_POISSON,
+                        0.0, "", CONS_NONE,
+                        0.0, "", CONS_NONE,
+                        out)
+        return disc_params(&random_poisson_setup, &random_poisson_params,
+                           sizeof(poisson_params_t), &self._bitgen, size,
+                           self.lock, lam, "lam", CONS_POISSON, out)
+
+    def poisson_sampler(self, lam):
+        """
+        poisson_sampler(lam)
+
+        Create a sampler for repeated Poisson draws with fixed rates
+
+        Parameters
+        ----------
+        lam : float or array_like of floats
+            Expected number of events. Must be >= 0.
 
-    def zipf(self, a, size=None):
+        Returns
+        -------
+        sampler : PoissonSampler
+            Sampler with a ``sample`` method that draws one count for
+            each element of ``lam``.
+
+        See Also
+        --------
+        poisson
+
+        Notes
+        -----
+        The sampler computes the constants used by the sampling algorithm
+        once for each distinct value in ``lam``. Rates below 10 use
+        inversion with a guide table, which requires a single double per
+        draw rather than the O(lam) doubles used by ``poisson``. Rates of
+        10 or more use the same transformed rejection method as
+        ``poisson``. The samples differ from those produced by
+        ``poisson``.
+
+        The sampler is most effective when ``lam`` contains many repeated
+        values and ``sample`` is called repeatedly.
+
+        Examples
+        --------
+        >>> from randomgen import Generator
+        >>> rg = Generator()
+        >>> sampler = rg.poisson_sampler([0.5, 3.0, 3.0, 250.0])
+        >>> sampler.sample()
+        array([  0,   5,   3, 239])  # random
+        >>> sampler.sample(2).shape
+        (2, 4)
+        """
+        return PoissonSampler(self, lam)
+
+    def zipf(self, a, size=None, out=None):
         """
-        zipf(a, size=None)
+        zipf(a, size=None, out=None)
 
         Draw samples from a Zipf distribution.
 
@@ -3438,6 +4978,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``a`` is a scalar. Otherwise,
             ``np.array(a).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -3493,11 +5037,12 @@ cdef class Generator:
         return disc(&random_zipf, &self._bitgen, size, self.lock, 1, 0,
                     a, "a", CONS_GT_1,
                     0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE)
+                    0.0, "", CONS_NONE,
+                    out)
 
-    def geometric(self, p, size=None):
+    def geometric(self, p, size=None, out=None):
         """
-        geometric(p, size=None)
+        geometric(p, size=None, out=None)
 
         Draw samples from the geometric distribution.
 
@@ -3522,6 +5067,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``p`` is a scalar. Otherwise,
             ``np.array(p).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -3544,11 +5093,12 @@ cdef class Generator:
         return disc(&random_geometric, &self._bitgen, size, self.lock, 1, 0,
                     p, "p", CONS_BOUNDED_GT_0_1,
                     0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE)
+                    0.0, "", CONS_NONE,
+                    out)
 
-    def hypergeometric(self, ngood, nbad, nsample, size=None):
+    def hypergeometric(self, ngood, nbad, nsample, size=None, out=None):
         """
-        hypergeometric(ngood, nbad, nsample, size=None)
+        hypergeometric(ngood, nbad, nsample, size=None, out=None)
 
         Draw samples from a Hypergeometric distribution.
 
@@ -3572,6 +5122,10 @@ cdef class Generator:
             a single value is returned if `ngood`, `nbad`, and `nsample`
             are all scalars. Otherwise, ``np.broadcast(ngood, nbad, nsample).size``
             samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -3660,21 +5214,24 @@ cdef class Generator:
             return disc(&random_hypergeometric, &self._bitgen, size, self.lock, 0, 3,
                         lngood, "ngood", CONS_NON_NEGATIVE,
                         lnbad, "nbad", CONS_NON_NEGATIVE,
-                        lnsample, "nsample", CONS_NON_NEGATIVE)
+                        lnsample, "nsample", CONS_NON_NEGATIVE,
+                        out)
 
         if np.any(ongood >= HYPERGEOM_MAX) or np.any(onbad >= HYPERGEOM_MAX):
             raise ValueError("both ngood and nbad must be less than "
                              "{:d}".format(HYPERGEOM_MAX))
         if np.any(np.less(np.add(ongood, onbad), onsample)):
             raise ValueError("ngood + nbad < nsample")
+        check_output(out, np.int64, size)
         return discrete_broadcast_iii(&random_hypergeometric, &self._bitgen, size, self.lock,
                                       ongood, "ngood", CONS_NON_NEGATIVE,
                                       onbad, "nbad", CONS_NON_NEGATIVE,
-                                      onsample, "nsample", CONS_NON_NEGATIVE)
+                                      onsample, "nsample", CONS_NON_NEGATIVE,
+                                      out)
 
-    def logseries(self, p, size=None):
+    def logseries(self, p, size=None, out=None):
         """
-        logseries(p, size=None)
+        logseries(p, size=None, out=None)
 
         Draw samples from a logarithmic series distribution.
 
@@ -3690,6 +5247,10 @@ cdef class Generator:
             ``m * n * k`` samples are drawn. If size is ``None`` (default),
             a single value is returned if ``p`` is a scalar. Otherwise,
             ``np.array(p).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
 
         Returns
         -------
@@ -3750,13 +5311,14 @@ cdef class Generator:
         return disc(&random_logseries, &self._bitgen, size, self.lock, 1, 0,
                     p, "p", CONS_BOUNDED_0_1,
                     0.0, "", CONS_NONE,
-                    0.0, "", CONS_NONE)
+                    0.0, "", CONS_NONE,
+                    out)
 
     # Multivariate distributions:
     def multivariate_normal(self, mean, cov, size=None, check_valid="warn",
-                            tol=1e-8):
+                            tol=1e-8, *, method="svd"):
         """
-        multivariate_normal(mean, cov, size=None, check_valid='warn', tol=1e-8)
+        multivariate_normal(mean, cov, size=None, check_valid='warn', tol=1e-8, *, method='svd')
 
         Draw random samples from a multivariate normal distribution.
 
@@ -3769,21 +5331,33 @@ cdef class Generator:
 
         Parameters
         ----------
-        mean : 1-D array_like, of length N
-            Mean of the N-dimensional distribution.
-        cov : 2-D array_like, of shape (N, N)
+        mean : array_like, of shape (..., N)
+            Mean of the N-dimensional distribution. Stacked means with
+            shape (k, N) draw from k distributions in a single call.
+        cov : array_like, of shape (..., N, N)
             Covariance matrix of the distribution. It must be symmetric and
-            positive-semidefinite for proper sampling.
+            positive-semidefinite for proper sampling. Stacked covariances
+            have shape (k, N, N). The leading dimensions of mean and cov
+            must broadcast.
         size : int or tuple of ints, optional
             Given a shape of, for example, ``(m,n,k)``, ``m*n*k`` samples are
             generated, and packed in an `m`-by-`n`-by-`k` arrangement. Because
             each sample is `N`-dimensional, the output shape is ``(m,n,k,N)``.
             If no shape is specified, a single (`N`-D) sample is returned.
+            When mean or cov are stacked, the output shape is
+            ``size + batch_shape + (N,)``.
         check_valid : { 'warn', 'raise', 'ignore' }, optional
             Behavior when the covariance matrix is not positive semidefinite.
         tol : float, optional
             Tolerance when checking the singular values in covariance matrix.
             cov is cast to double before the check.
+        method : { 'svd', 'eigh', 'cholesky'}, optional
+            Method used to compute a factor matrix A such that
+            ``A.T @ A = cov``. The default, 'svd', is the slowest. 'cholesky'
+            is the fastest but requires cov to be positive definite. 'eigh'
+            uses an eigen decomposition and is faster than 'svd' while still
+            supporting positive semidefinite cov. Only 'svd' preserves the
+            values produced by earlier versions.
 
         Returns
         -------
@@ -3835,6 +5409,11 @@ cdef class Generator:
         nonnegative-definite). Otherwise, the behavior of this method is
         undefined and backwards compatibility is not guaranteed.
 
+        The factorization of cov dominates the cost when drawing small
+        samples. Use :meth:`~randomgen.generator.Generator.mvnormal_factory`
+        to factor cov once when repeatedly sampling from the same
+        distribution.
+
         References
         ----------
         .. [1] Papoulis, A., "Probability, Random Variables, and Stochastic
@@ -3859,73 +5438,56 @@ cdef class Generator:
         [True, True] # random
 
         """
-        from numpy.dual import svd
+        mean, factor, batch_shape = _mvnormal_prepare(mean, cov, check_valid,
+                                                      tol, method)
+        return _mvnormal_sample(self, mean, factor, batch_shape, size)
 
-        # Check preconditions on arguments
-        mean = np.array(mean)
-        cov = np.array(cov)
-        if size is None:
-            shape = []
-        elif isinstance(size, (int, np.integer)):
-            shape = [size]
-        else:
-            shape = size
-
-        if len(mean.shape) != 1:
-            raise ValueError("mean must be 1 dimensional")
-        if (len(cov.shape) != 2) or (cov.shape[0] != cov.shape[1]):
-            raise ValueError("cov must be 2 dimensional and square")
-        if mean.shape[0] != cov.shape[0]:
-            raise ValueError("mean and cov must have same length")
-
-        # Compute shape of output and create a matrix of independent
-        # standard normally distributed random numbers. The matrix has rows
-        # with the same length as mean and as many rows are necessary to
-        # form a matrix of shape final_shape.
-        final_shape = list(shape[:])
-        final_shape.append(mean.shape[0])
-        x = self.standard_normal(final_shape).reshape(-1, mean.shape[0])
-
-        # Transform matrix of standard normals into matrix where each row
-        # contains multivariate normals with the desired covariance.
-        # Compute A such that dot(transpose(A),A) == cov.
-        # Then the matrix products of the rows of x and A has the desired
-        # covariance. Note that sqrt(s)*v where (u,s,v) is the singular value
-        # decomposition of cov is such an A.
-        #
-        # Also check that cov is positive-semidefinite. If so, the u.T and v
-        # matrices should be equal up to roundoff error if cov is
-        # symmetric and the singular value of the corresponding row is
-        # not zero. We continue to use the SVD rather than Cholesky in
-        # order to preserve current outputs. Note that symmetry has not
-        # been checked.
-
-        # GH10839, ensure double to make tol meaningful
-        cov = cov.astype(np.double)
-        (u, s, v) = svd(cov)
-
-        if check_valid != "ignore":
-            if check_valid != "warn" and check_valid != "raise":
-                raise ValueError("check_valid must equal \"warn\", \"raise\","
-                                 " or \"ignore\"")
-
-            psd = np.allclose(np.dot(v.T * s, v), cov, rtol=tol, atol=tol)
-            if not psd:
-                if check_valid == "warn":
-                    import warnings
-                    warnings.warn("covariance is not positive-semidefinite.",
-                                  RuntimeWarning)
-                else:
-                    raise ValueError("covariance is not positive-semidefinite.")
+    def mvnormal_factory(self, mean, cov, check_valid="warn", tol=1e-8,
+                         method="svd"):
+        """
+        mvnormal_factory(mean, cov, check_valid='warn', tol=1e-8, method='svd')
+
+        Create a multivariate normal sampler that caches the factored cov
+
+        Parameters
+        ----------
+        mean : array_like, of shape (..., N)
+            Mean of the N-dimensional distribution.
+        cov : array_like, of shape (..., N, N)
+            Covariance matrix of the distribution. The leading dimensions
+            of mean and cov must broadcast.
+        check_valid : { 'warn', 'raise', 'ignore' }, optional
+            Behavior when the covariance matrix is not positive semidefinite.
+        tol : float, optional
+            Tolerance when checking the covariance matrix.
+        method : { 'svd', 'eigh', 'cholesky'}, optional
+            Method used to factor cov. See
+            :meth:`~randomgen.generator.Generator.multivariate_normal`.
 
-        x = np.dot(x, np.sqrt(s)[:, None] * v)
-        x += mean
-        x.shape = tuple(final_shape)
-        return x
+        Returns
+        -------
+        sampler : MultivariateNormal
+            Callable that accepts size and returns samples. Calling
+            ``sampler(size)`` produces the same values as
+            ``multivariate_normal(mean, cov, size, method=method)``.
+
+        Examples
+        --------
+        >>> from randomgen import Generator
+        >>> rg = Generator()
+        >>> mvn = rg.mvnormal_factory([0, 0], [[1, 0.5], [0.5, 1]],
+        ...                           method="cholesky")
+        >>> x = mvn(10)
+        >>> x.shape
+        (10, 2)
+        """
+        return MultivariateNormal(self, mean, cov, check_valid=check_valid,
+                                  tol=tol, method=method)
 
-    def multinomial(self, object n, object pvals, size=None):
+    def multinomial(self, object n, object pvals, size=None, method="auto",
+                    bint sparse=False):
         """
-        multinomial(n, pvals, size=None)
+        multinomial(n, pvals, size=None, method="auto", sparse=False)
 
         Draw samples from a multinomial distribution.
 
@@ -3941,25 +5503,53 @@ cdef class Generator:
         ----------
         n : {int, array_like[int]}
             Number of experiments.
-        pvals : sequence of floats, length p
+        pvals : array_like of floats, shape (..., p)
             Probabilities of each of the ``p`` different outcomes. These
             must sum to 1 (however, the last element is always assumed to
             account for the remaining probability, as long as
-            ``sum(pvals[:-1]) <= 1)``.
+            ``sum(pvals[..., :-1]) <= 1)``. If pvals has more than one
+            dimension, each vector along the last axis is a distinct
+            distribution and the leading dimensions are broadcast against
+            ``n``.
         size : int or tuple of ints, optional
             Output shape. If the given shape is, e.g., ``(m, n, k)``, then
             ``m * n * k`` samples are drawn. Default is None, in which case a
             single value is returned.
+        method : {"auto", "alias", "conditional"}, optional
+            "conditional" draws a binomial for each category in turn and
+            requires O(p) time per sample. "alias" builds an alias table for
+            each distribution and draws ``n`` categories, which requires
+            O(n) time per sample. "auto", the default, uses "alias" when
+            there are at least 1024 categories and ``n`` is at most 1/16 of
+            the number of categories. See Notes.
+        sparse : bool, optional
+            If True, return the non-zero counts as a pair of arrays rather
+            than the dense counts. Default is False.
 
         Returns
         -------
-        out : ndarray
+        out : ndarray or tuple[ndarray, ndarray]
             The drawn samples, of shape *size*, if that was provided. If not,
-            the shape is ``(N,)``.
+            the shape is the broadcast shape of ``n`` and
+            ``pvals[..., 0]`` followed by ``(p,)``.
 
             In other words, each entry ``out[i,j,...,:]`` is an N-dimensional
             value drawn from the distribution.
 
+            If sparse is True, returns ``(indices, counts)`` where the last
+            dimension of both has length ``min(max(n), p)`` in place of
+            ``p``. Each row holds the categories with non-zero counts in
+            increasing order followed by padding where ``indices`` is -1 and
+            ``counts`` is 0.
+
+        Notes
+        -----
+        The two methods produce different values. The alias method has a
+        setup cost proportional to the number of categories for each
+        distribution in pvals and is much faster when ``n`` is small
+        relative to the number of categories. Sparse output avoids
+        allocating and zeroing ``p`` counts per sample.
+
         Examples
         --------
         Throw a dice 20 times:
@@ -3990,6 +5580,20 @@ cdef class Generator:
         The first array shows the outcomes of throwing the dice 10 times, and
         the second shows the outcomes from throwing the dice 20 times.
 
+        Draw 100 items from one million categories and return only the
+        categories that were drawn:
+
+        >>> p = np.full(10**6, 1e-6)
+        >>> indices, counts = randomgen.generator.multinomial(100, p, sparse=True)
+        >>> indices.shape, counts.sum()
+        ((100,), 100)
+
+        Throw a fair die and a loaded die 10 times each:
+
+        >>> randomgen.generator.multinomial(10, [[1/6.]*6, [0.1]*5 + [0.5]])
+        array([[1, 2, 1, 3, 2, 1],
+               [0, 1, 2, 1, 1, 5]])  # random
+
         A loaded die is more likely to land on number 6:
 
         >>> randomgen.generator.multinomial(100, [1/7.]*5 + [2/7.])
@@ -4019,13 +5623,30 @@ cdef class Generator:
         cdef int64_t ni
         cdef np.broadcast it
 
+        if method not in ("auto", "alias", "conditional"):
+            raise ValueError("method must be one of \"auto\", \"alias\" or "
+                             "\"conditional\"")
         d = len(pvals)
         on = <np.ndarray>np.PyArray_FROM_OTF(n, np.NPY_INT64, api.NPY_ARRAY_ALIGNED)
         parr = <np.ndarray>np.PyArray_FROM_OTF(pvals, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED | api.NPY_ARRAY_C_CONTIGUOUS)
         check_array_constraint(parr, "pvals", CONS_BOUNDED_0_1)
-        pix = <double*>np.PyArray_DATA(parr)
-        if kahan_sum(pix, d-1) > (1.0 + 1e-12):
-            raise ValueError("sum(pvals[:-1]) > 1.0")
+        if np.PyArray_NDIM(parr) > 1:
+            d = np.PyArray_DIM(parr, np.PyArray_NDIM(parr) - 1)
+            if np.any(np.sum(parr[..., :d - 1], axis=-1) > (1.0 + 1e-12)):
+                raise ValueError("sum(pvals[..., :-1]) > 1.0")
+        else:
+            pix = <double*>np.PyArray_DATA(parr)
+            if kahan_sum(pix, d-1) > (1.0 + 1e-12):
+                raise ValueError("sum(pvals[:-1]) > 1.0")
+
+        use_alias = method == "alias"
+        if method == "auto" and d >= MULTINOMIAL_ALIAS_MIN_CATEGORIES:
+            check_array_constraint(on, "n", CONS_NON_NEGATIVE)
+            n_max = np.max(on) if np.PyArray_SIZE(on) > 0 else 0
+            use_alias = n_max * MULTINOMIAL_ALIAS_RATIO <= d
+        if np.PyArray_NDIM(parr) > 1 or use_alias or sparse:
+            check_array_constraint(on, "n", CONS_NON_NEGATIVE)
+            return self._multinomial_rows(on, parr, size, use_alias, sparse)
 
         if np.PyArray_NDIM(on) != 0:  # vector
             check_array_constraint(on, "n", CONS_NON_NEGATIVE)
@@ -4044,7 +5665,7 @@ cdef class Generator:
             with self.lock, nogil:
                 for i in range(sz):
                     ni = (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0]
-                    random_multinomial(&self._bitgen, ni, &mnix[offset], pix, d, &self._binomial)
+                    random_multinomial_cached(&self._bitgen, ni, &mnix[offset], pix, d, &self._binomial_cache)
                     offset += d
                     np.PyArray_MultiIter_NEXT(it)
             return multin
@@ -4066,11 +5687,237 @@ cdef class Generator:
         offset = 0
         with self.lock, nogil:
             for i in range(sz // d):
-                random_multinomial(&self._bitgen, ni, &mnix[offset], pix, d, &self._binomial)
+                random_multinomial_cached(&self._bitgen, ni, &mnix[offset], pix, d, &self._binomial_cache)
                 offset += d
 
         return multin
 
+    @cython.wraparound(True)
+    cdef object _multinomial_rows(self, np.ndarray on, np.ndarray parr, object size,
+                                  bint use_alias, bint sparse):
+        """
+        Multinomial draws where each vector along the last axis of pvals is
+        a distribution, using either conditional binomials or alias tables
+        """
+        cdef np.npy_intp d, i, sz, offset, row, n_rows, m, n_max
+        cdef np.ndarray mnarr, p_rows, prob, alias, weights, work, scratch
+        cdef np.ndarray indices, counts
+        cdef double *pix
+        cdef double *prob_data = NULL
+        cdef int64_t *alias_data = NULL
+        cdef int64_t *mnix = NULL
+        cdef int64_t *indices_data = NULL
+        cdef int64_t *counts_data = NULL
+        cdef int64_t *scratch_data = NULL
+        cdef int64_t ni
+        cdef np.broadcast it
+
+        d = np.shape(parr)[-1]
+        row_shape = np.shape(parr)[:-1]
+        n_rows = np.prod(row_shape, dtype=np.intp)
+        p_rows = np.arange(n_rows, dtype=np.intp).reshape(row_shape)
+        if size is None:
+            it = np.PyArray_MultiIterNew2(on, p_rows)
+        else:
+            temp = np.empty(size, dtype=np.int8)
+            it = np.PyArray_MultiIterNew3(on, p_rows, temp)
+        pix = <double*>np.PyArray_DATA(parr)
+
+        if use_alias:
+            # The last category holds the probability not in pvals[..., :-1]
+            weights = <np.ndarray>np.array(parr, dtype=np.double, order="C").reshape(n_rows, d)
+            weights[:, -1] = np.maximum(1.0 - weights[:, :-1].sum(1), 0.0)
+            weights /= weights.sum(1)[:, None]
+            prob = <np.ndarray>np.empty((n_rows, d), dtype=np.double)
+            alias = <np.ndarray>np.empty((n_rows, d), dtype=np.int64)
+            work = <np.ndarray>np.empty(d, dtype=np.int64)
+            prob_data = <double *>np.PyArray_DATA(prob)
+            alias_data = <int64_t *>np.PyArray_DATA(alias)
+            for row in range(n_rows):
+                random_alias_setup(<double *>np.PyArray_DATA(weights) + row * d, d,
+                                   prob_data + row * d, alias_data + row * d,
+                                   <int64_t *>np.PyArray_DATA(work))
+
+        sz = it.size
+        if sparse:
+            n_max = np.max(on) if np.PyArray_SIZE(on) > 0 else 0
+            m = min(n_max, d)
+            indices = <np.ndarray>np.full(it.shape + (m,), -1, dtype=np.int64)
+            counts = <np.ndarray>np.zeros(it.shape + (m,), dtype=np.int64)
+            indices_data = <int64_t *>np.PyArray_DATA(indices)
+            counts_data = <int64_t *>np.PyArray_DATA(counts)
+            scratch = <np.ndarray>np.empty(n_max if use_alias else d, dtype=np.int64)
+            scratch_data = <int64_t *>np.PyArray_DATA(scratch)
+            offset = 0
+            with self.lock, nogil:
+                for i in range(sz):
+                    ni = (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0]
+                    row = (<np.npy_intp*>np.PyArray_MultiIter_DATA(it, 1))[0]
+                    if use_alias:
+                        random_multinomial_alias_sparse(&self._bitgen, ni,
+                                                        prob_data + row * d,
+                                                        alias_data + row * d, d,
+                                                        scratch_data,
+                                                        indices_data + offset,
+                                                        counts_data + offset)
+                    else:
+                        random_multinomial_sparse(&self._bitgen, ni, &pix[row * d],
+                                                  d, &self._binomial_cache,
+                                                  scratch_data,
+                                                  indices_data + offset,
+                                                  counts_data + offset)
+                    offset += m
+                    np.PyArray_MultiIter_NEXT(it)
+            return indices, counts
+
+        multin = np.zeros(it.shape + (d,), dtype=np.int64)
+        mnarr = <np.ndarray>multin
+        mnix = <int64_t*>np.PyArray_DATA(mnarr)
+        offset = 0
+        with self.lock, nogil:
+            for i in range(sz):
+                ni = (<int64_t*>np.PyArray_MultiIter_DATA(it, 0))[0]
+                row = (<np.npy_intp*>np.PyArray_MultiIter_DATA(it, 1))[0]
+                if use_alias:
+                    random_multinomial_alias(&self._bitgen, ni, &mnix[offset],
+                                             prob_data + row * d,
+                                             alias_data + row * d, d)
+                else:
+                    random_multinomial_cached(&self._bitgen, ni, &mnix[offset],
+                                              &pix[row * d], d, &self._binomial_cache)
+                offset += d
+                np.PyArray_MultiIter_NEXT(it)
+        return multin
+
+    @cython.wraparound(True)
+    def categorical(self, pvals, axis=-1, dtype=np.int64, logits=False, out=None):
+        """
+        categorical(pvals, axis=-1, dtype=np.int64, logits=False, out=None)
+
+        Draw one category from each distribution in an array
+
+        Parameters
+        ----------
+        pvals : array_like of floats
+            Probabilities, or log-probabilities if ``logits`` is True, of
+            the categories. Each vector along ``axis`` is a distinct
+            distribution. Probabilities must be non-negative and are
+            normalized so that the vectors do not need to sum exactly to 1.
+        axis : int, optional
+            The axis containing the categories. Default is -1.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either int64 or int32. The default
+            value is np.int64.
+        logits : bool, optional
+            If True, pvals contains unnormalized log-probabilities, such as
+            the output of a model before a softmax. -inf is allowed and
+            has probability 0. Default is False.
+        out : ndarray, optional
+            Alternative output array in which to place the result. Must
+            have the shape of pvals with axis removed and the dtype dtype.
+
+        Returns
+        -------
+        out : int or ndarray
+            The index along axis of the category drawn from each
+            distribution. A single int is returned if pvals is 1-d and out
+            is None.
+
+        See Also
+        --------
+        multinomial, choice
+
+        Notes
+        -----
+        Equivalent to the index of the non-zero element of
+        ``multinomial(1, pvals)`` but each draw uses a single double and
+        an inverse CDF search along the row. float32 and float64 inputs are
+        read directly without conversion. When ``logits`` is True, each
+        row is shifted by its maximum before exponentiating so large
+        logits do not overflow.
+
+        Examples
+        --------
+        >>> from randomgen import Generator
+        >>> rg = Generator()
+        >>> rg.categorical([[0.1, 0.9], [0.8, 0.2], [0.5, 0.5]])
+        array([1, 0, 1])  # random
+        >>> logits = rg.standard_normal((4, 1000), dtype=np.float32)
+        >>> rg.categorical(logits, logits=True, dtype=np.int32)
+        array([868, 345, 997,  21], dtype=int32)  # random
+        """
+        cdef np.ndarray arr, randoms, buf
+        cdef np.flatiter row_it, out_it
+        cdef np.npy_intp i, k, n_rows, stride
+        cdef int last_axis, is_float, use_logits, is_int32
+        cdef int64_t val = 0
+        cdef double *buf_data
+        cdef char *row
+        cdef bitgen_t *state = &self._bitgen
+
+        dt = np.dtype(dtype)
+        if dt not in (np.dtype(np.int64), np.dtype(np.int32)):
+            raise TypeError("Unsupported dtype \"{0}\" for "
+                            "categorical".format(dt.name))
+        arr = <np.ndarray>np.asarray(pvals)
+        if arr.dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+            arr = <np.ndarray>arr.astype(np.float64)
+        if np.PyArray_NDIM(arr) == 0:
+            raise ValueError("pvals must have at least 1 dimension")
+        axis = _normalize_axis(axis, np.PyArray_NDIM(arr))
+        arr = <np.ndarray>np.require(np.moveaxis(arr, axis, -1), requirements="A")
+        k = np.shape(arr)[-1]
+        if k == 0:
+            raise ValueError("pvals must have at least 1 category")
+        if k - 1 > np.iinfo(dt).max:
+            raise ValueError("dtype {0} cannot represent all categories".format(dt.name))
+        shape = np.shape(arr)[:-1]
+        if out is None:
+            randoms = <np.ndarray>np.empty(shape, dtype=dt)
+        else:
+            check_output(out, dt, shape)
+            randoms = <np.ndarray>out
+
+        n_rows = np.PyArray_SIZE(randoms)
+        last_axis = np.PyArray_NDIM(arr) - 1
+        stride = np.PyArray_STRIDE(arr, last_axis) // np.PyArray_ITEMSIZE(arr)
+        is_float = arr.dtype == np.float32
+        use_logits = bool(logits)
+        is_int32 = dt == np.int32
+        buf = np.empty(k, dtype=np.double)
+        buf_data = <double *>np.PyArray_DATA(buf)
+        row_it = <np.flatiter>np.PyArray_IterAllButAxis(arr, &last_axis)
+        out_it = <np.flatiter>np.PyArray_IterNew(randoms)
+        with self.lock, nogil:
+            for i in range(n_rows):
+                row = <char *>np.PyArray_ITER_DATA(row_it)
+                if use_logits and is_float:
+                    val = random_categorical_logits_f(state, <float *>row, k, stride, buf_data)
+                elif use_logits:
+                    val = random_categorical_logits(state, <double *>row, k, stride, buf_data)
+                elif is_float:
+                    val = random_categorical_f(state, <float *>row, k, stride)
+                else:
+                    val = random_categorical(state, <double *>row, k, stride)
+                if val < 0:
+                    break
+                if is_int32:
+                    (<int32_t *>np.PyArray_ITER_DATA(out_it))[0] = <int32_t>val
+                else:
+                    (<int64_t *>np.PyArray_ITER_DATA(out_it))[0] = val
+                np.PyArray_ITER_NEXT(row_it)
+                np.PyArray_ITER_NEXT(out_it)
+        if val < 0:
+            if use_logits:
+                raise ValueError("logits contain NaN or +inf or a distribution "
+                                 "has only -inf logits")
+            raise ValueError("pvals contain a negative value or NaN or a "
+                             "distribution does not have a positive, "
+                             "finite sum")
+        if out is None and np.PyArray_NDIM(randoms) == 0:
+            return dt.type(randoms)
+        return randoms
+
     def dirichlet(self, object alpha, size=None):
         """
         dirichlet(alpha, size=None)
@@ -4169,8 +6016,8 @@ cdef class Generator:
         # return val
 
         cdef np.npy_intp k, totsize, i, j
-        cdef np.ndarray alpha_arr, val_arr
-        cdef double *alpha_data
+        cdef np.ndarray alpha_arr, val_arr, params_arr
+        cdef gamma_params_t *params
         cdef double *val_data
         cdef double acc, invacc
 
@@ -4178,7 +6025,10 @@ cdef class Generator:
         alpha_arr = <np.ndarray>np.PyArray_FROM_OTF(alpha, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED | api.NPY_ARRAY_C_CONTIGUOUS)
         if np.any(np.less_equal(alpha_arr, 0)):
             raise ValueError("alpha <= 0")
-        alpha_data = <double*>np.PyArray_DATA(alpha_arr)
+        # The gamma constants only depend on alpha so compute them once
+        params_arr = setup_params(&random_gamma_setup, sizeof(gamma_params_t),
+                                  alpha_arr)
+        params = <gamma_params_t *>np.PyArray_DATA(params_arr)
 
         if size is None:
             shape = (k,)
@@ -4198,8 +6048,8 @@ cdef class Generator:
             while i < totsize:
                 acc = 0.0
                 for j in range(k):
-                    val_data[i+j] = random_standard_gamma_zig(&self._bitgen,
-                                                              alpha_data[j])
+                    val_data[i+j] = random_standard_gamma_params(&self._bitgen,
+                                                                 &params[j])
                     acc = acc + val_data[i + j]
                 invacc = 1/acc
                 for j in range(k):
@@ -4209,13 +6059,13 @@ cdef class Generator:
         return diric
 
     # Shuffling and permutations:
-    def shuffle(self, object x):
+    def shuffle(self, object x, axis=0, method=u"fisher-yates", n_threads=None):
         """
-        shuffle(x)
+        shuffle(x, axis=0, method="fisher-yates", n_threads=None)
 
         Modify a sequence in-place by shuffling its contents.
 
-        This function only shuffles the array along the first axis of a
+        This function only shuffles the array along a single axis of a
         multi-dimensional array. The order of sub-arrays is changed but
         their contents remains the same.
 
@@ -4223,11 +6073,41 @@ cdef class Generator:
         ----------
         x : array_like
             The array or list to be shuffled.
+        axis : int, optional
+            The axis along which `x` is shuffled. Must be 0 if `x` is not
+            an ndarray. Default is 0.
+        method : {"fisher-yates", "parallel"}, optional
+            The shuffle algorithm. "fisher-yates" is a sequential
+            Fisher-Yates shuffle. "parallel" uses multiple threads and is
+            faster for large arrays. See Notes.
+        n_threads : int, optional
+            Number of threads used when method is "parallel". Defaults to
+            the number of CPUs. The result does not depend on n_threads.
 
         Returns
         -------
         None
 
+        Notes
+        -----
+        The "parallel" method divides x into up to 64 chunks of at least
+        65536 items. Every item is assigned to a random bucket, the items
+        are gathered by bucket into a temporary buffer, and each bucket is
+        shuffled before being copied back. Assigning items to buckets
+        uniformly and then shuffling each bucket produces a uniformly
+        random permutation [1]_. Each chunk and bucket uses its own
+        Xoroshiro128 stream seeded from this generator so that the steps
+        can run concurrently while the result only depends on the state of
+        the generator. It requires temporary memory of about
+        ``x.nbytes + len(x)`` bytes and produces different values from
+        "fisher-yates".
+
+        References
+        ----------
+        .. [1] Sandelius, Martin. "A simple randomization procedure." Journal
+               of the Royal Statistical Society: Series B 24, no. 2 (1962):
+               472-481.
+
         Examples
         --------
         >>> arr = np.arange(10)
@@ -4244,11 +6124,59 @@ cdef class Generator:
                [6, 7, 8],
                [0, 1, 2]])
 
+        or along the axis selected by `axis`:
+
+        >>> arr = np.arange(9).reshape((3, 3))
+        >>> randomgen.generator.shuffle(arr, axis=1)
+        >>> arr
+        array([[2, 0, 1], # random
+               [5, 3, 4],
+               [8, 6, 7]])
+
         """
         cdef:
-            np.npy_intp i, j, n = len(x), stride, itemsize
+            np.npy_intp i, j, n, stride, itemsize
+            int sub_ndim
             char* x_ptr
             char* buf_ptr
+            np.ndarray arr
+
+        if method not in (u"fisher-yates", u"parallel"):
+            raise ValueError("method must be either \"fisher-yates\" or "
+                             "\"parallel\"")
+        if n_threads is None:
+            n_threads = multiprocessing.cpu_count()
+        n_threads = operator.index(n_threads)
+        if n_threads < 1:
+            raise ValueError("n_threads must be a positive integer")
+        if isinstance(x, np.ndarray):
+            # The native paths write through the data pointer
+            if not np.PyArray_ISWRITEABLE(<np.ndarray>x):
+                raise ValueError("assignment destination is read-only")
+            axis = _normalize_axis(axis, x.ndim)
+            if axis != 0:
+                x = np.moveaxis(x, axis, 0)
+        elif operator.index(axis) != 0:
+            raise ValueError("axis must be 0 when x is not an ndarray")
+        n = len(x)
+
+        if method == u"parallel":
+            if (type(x) is np.ndarray and x.ndim and x.size and
+                    (x.ndim == 1 or x[0].flags.c_contiguous)):
+                x_ptr = <char*><size_t>x.ctypes.data
+                self._shuffle_parallel(n, x.dtype.itemsize * (x.size // n),
+                                       x.strides[0], x_ptr, n_threads)
+            elif n > 1:
+                idx = np.arange(n, dtype=np.intp)
+                self._shuffle_parallel(n, idx.itemsize, idx.itemsize,
+                                       <char*>np.PyArray_DATA(idx), n_threads)
+                if isinstance(x, np.ndarray):
+                    x[...] = x[idx]
+                else:
+                    items = [x[i] for i in idx]
+                    for i in range(n):
+                        x[i] = items[i]
+            return
 
         if type(x) is np.ndarray and x.ndim == 1 and x.size:
             # Fast, statically typed path: shuffle the underlying buffer.
@@ -4264,13 +6192,46 @@ cdef class Generator:
             buf = np.empty(itemsize, dtype=np.int8)  # GC'd at function exit
             buf_ptr = <char*><size_t>buf.ctypes.data
             with self.lock:
-                # We trick gcc into providing a specialized implementation for
-                # the most common case, yielding a ~33% performance improvement.
-                # Note that apparently, only one branch can ever be specialized.
-                if itemsize == sizeof(np.npy_intp):
-                    self._shuffle_raw(n, 1, sizeof(np.npy_intp), stride, x_ptr, buf_ptr)
-                else:
+                if x.dtype.hasobject:
                     self._shuffle_raw(n, 1, itemsize, stride, x_ptr, buf_ptr)
+                else:
+                    with nogil:
+                        # We trick gcc into providing a specialized implementation for
+                        # the most common case, yielding a ~33% performance improvement.
+                        # Note that apparently, only one branch can ever be specialized.
+                        if itemsize == sizeof(np.npy_intp):
+                            self._shuffle_raw(n, 1, sizeof(np.npy_intp), stride, x_ptr, buf_ptr)
+                        else:
+                            self._shuffle_raw(n, 1, itemsize, stride, x_ptr, buf_ptr)
+        elif type(x) is np.ndarray and x.ndim and x.size:
+            arr = <np.ndarray>x
+            x_ptr = <char*>np.PyArray_DATA(arr)
+            stride = np.PyArray_STRIDES(arr)[0]
+            sub_ndim = np.PyArray_NDIM(arr) - 1
+            itemsize = np.PyArray_ITEMSIZE(arr)
+            # Trailing dimensions that are contiguous are moved as a block
+            while sub_ndim > 0 and np.PyArray_STRIDES(arr)[sub_ndim] == itemsize:
+                itemsize *= np.PyArray_DIMS(arr)[sub_ndim]
+                sub_ndim -= 1
+            if sub_ndim == 0 or itemsize >= 64 or x.dtype.hasobject:
+                # Swap the sub-arrays in place
+                buf = np.empty(itemsize, dtype=np.int8)  # GC'd at function exit
+                buf_ptr = <char*>np.PyArray_DATA(buf)
+                with self.lock:
+                    if x.dtype.hasobject:
+                        self._shuffle_strided(n, stride, sub_ndim, np.PyArray_DIMS(arr) + 1,
+                                              np.PyArray_STRIDES(arr) + 1, itemsize,
+                                              x_ptr, buf_ptr)
+                    else:
+                        with nogil:
+                            self._shuffle_strided(n, stride, sub_ndim, np.PyArray_DIMS(arr) + 1,
+                                                  np.PyArray_STRIDES(arr) + 1, itemsize,
+                                                  x_ptr, buf_ptr)
+            else:
+                # Small strided blocks have poor locality when swapped, so
+                # shuffle an index using the same draws and then reorder
+                # each 1-d slice along the axis in a single pass
+                self._shuffle_gather(arr, n)
         elif isinstance(x, np.ndarray) and x.ndim and x.size:
             buf = np.empty_like(x[0, ...])
             with self.lock:
@@ -4289,9 +6250,47 @@ cdef class Generator:
                     j = random_interval(&self._bitgen, i)
                     x[i], x[j] = x[j], x[i]
 
-    cdef inline _shuffle_raw(self, np.npy_intp n, np.npy_intp first,
-                             np.npy_intp itemsize, np.npy_intp stride,
-                             char* data, char* buf):
+    cdef _shuffle_parallel(self, np.npy_intp n, np.npy_intp itemsize,
+                           np.npy_intp stride, char* data, int n_threads):
+        """
+        Parameters
+        ----------
+        n
+            Number of elements in data
+        itemsize
+            Size in bytes of item
+        stride
+            Array stride
+        data
+            Location of data
+        n_threads
+            Number of threads to use
+        """
+        cdef _ParallelShuffle state
+        n_blocks = min(MAX_SHUFFLE_BLOCKS, max(1, n // SHUFFLE_BLOCK_SIZE))
+        seeds = self.integers(0, 2**64, size=n_blocks, dtype=np.uint64)
+        state = _ParallelShuffle()
+        state._setup(n, itemsize, stride, data, [int(seed) for seed in seeds])
+        blocks = range(n_blocks)
+        n_threads = min(n_threads, n_blocks)
+        if n_threads == 1:
+            for c in blocks:
+                state.label(c)
+            state.find_offsets()
+            for c in blocks:
+                state.scatter(c)
+            for c in blocks:
+                state.shuffle_bucket(c)
+            return
+        with ThreadPoolExecutor(n_threads) as executor:
+            list(executor.map(state.label, blocks))
+            state.find_offsets()
+            list(executor.map(state.scatter, blocks))
+            list(executor.map(state.shuffle_bucket, blocks))
+
+    cdef inline void _shuffle_raw(self, np.npy_intp n, np.npy_intp first,
+                                  np.npy_intp itemsize, np.npy_intp stride,
+                                  char* data, char* buf) nogil:
         """
         Parameters
         ----------
@@ -4317,6 +6316,77 @@ cdef class Generator:
             string.memcpy(data + j * stride, data + i * stride, itemsize)
             string.memcpy(data + i * stride, buf, itemsize)
 
+    cdef _shuffle_gather(self, np.ndarray arr, np.npy_intp n):
+        """
+        Parameters
+        ----------
+        arr
+            Array to shuffle along axis 0
+        n
+            Length of axis 0
+        """
+        cdef np.npy_intp i, k, cnt, stride, itemsize
+        cdef int axis = 0
+        cdef char *line
+        cdef char *tmp
+        cdef char *buf_ptr
+        cdef np.npy_intp *perm
+        cdef np.flatiter it
+
+        idx = np.arange(n, dtype=np.intp)
+        perm = <np.npy_intp *>np.PyArray_DATA(idx)
+        buf = np.empty(sizeof(np.npy_intp), dtype=np.int8)  # GC'd at function exit
+        buf_ptr = <char*>np.PyArray_DATA(buf)
+        with self.lock, nogil:
+            self._shuffle_raw(n, 1, sizeof(np.npy_intp), sizeof(np.npy_intp),
+                              <char*>perm, buf_ptr)
+
+        stride = np.PyArray_STRIDES(arr)[0]
+        itemsize = np.PyArray_ITEMSIZE(arr)
+        cnt = np.PyArray_SIZE(arr) // n
+        tmp_arr = np.empty(n * itemsize, dtype=np.int8)  # GC'd at function exit
+        tmp = <char*>np.PyArray_DATA(tmp_arr)
+        it = np.PyArray_IterAllButAxis(arr, &axis)
+        with nogil:
+            for i in range(cnt):
+                line = <char*>np.PyArray_ITER_DATA(it)
+                for k in range(n):
+                    string.memcpy(tmp + k * itemsize, line + perm[k] * stride, itemsize)
+                for k in range(n):
+                    string.memcpy(line + k * stride, tmp + k * itemsize, itemsize)
+                np.PyArray_ITER_NEXT(it)
+
+    cdef inline void _shuffle_strided(self, np.npy_intp n, np.npy_intp stride,
+                                      int ndim, np.npy_intp *shape,
+                                      np.npy_intp *strides, np.npy_intp itemsize,
+                                      char* data, char* buf) nogil:
+        """
+        Parameters
+        ----------
+        n
+            Number of sub-arrays in data
+        stride
+            Stride between sub-arrays
+        ndim
+            Number of dimensions of each sub-array
+        shape
+            Shape of each sub-array
+        strides
+            Strides of each sub-array
+        itemsize
+            Size in bytes of the contiguous blocks in each sub-array
+        data
+            Location of data
+        buf
+            Location of buffer (itemsize)
+        """
+        cdef np.npy_intp i, j
+        for i in reversed(range(1, n)):
+            j = random_interval(&self._bitgen, i)
+            if i != j:
+                _swap_strided(data + i * stride, data + j * stride, buf, ndim,
+                              shape, strides, itemsize)
+
     cdef inline void _shuffle_int(self, np.npy_intp n, np.npy_intp first,
                                   int64_t* data) nogil:
         """
@@ -4339,9 +6409,58 @@ cdef class Generator:
             data[j] = data[i]
             data[i] = temp
 
-    def permutation(self, object x):
+    cdef inline void _sparse_shuffle_tail(self, int64_t n, int64_t k, void *out,
+                                          int itemsize, uint64_t *keys,
+                                          int64_t *values, uint64_t mask) nogil:
+        """
+        Parameters
+        ----------
+        n
+            Number of elements in the virtual array arange(n)
+        k
+            Number of elements to take from the end of the shuffled array
+        out
+            Location of the output, which must have space for k values
+        itemsize
+            Size of each output value, either 4 or 8 bytes
+        keys, values
+            Hash map of positions to displaced values with mask + 1 slots
+            where empty keys are set to -1. Must have more than 2k slots.
+
+        Notes
+        -----
+        Produces the same values as ``_shuffle_int(n, max(n - k, 1), data)``
+        applied to ``data = arange(n)`` followed by ``data[n - k:]``.
+        """
+        cdef int64_t i, j, first, vi, vj
+        cdef uint64_t loc_i, loc_j
+
+        first = max(n - k, 1)
+        for i in range(n - 1, first - 1, -1):
+            j = random_bounded_uint64(&self._bitgen, 0, i, 0, 0)
+            loc_i = _sparse_find(keys, mask, i)
+            vi = values[loc_i] if keys[loc_i] == <uint64_t>i else i
+            loc_j = _sparse_find(keys, mask, j)
+            vj = values[loc_j] if keys[loc_j] == <uint64_t>j else j
+            if j != i:
+                keys[loc_j] = j
+                values[loc_j] = vi
+            if itemsize == 8:
+                (<int64_t*>out)[i - n + k] = vj
+            else:
+                (<int32_t*>out)[i - n + k] = <int32_t>vj
+        if n == k:
+            loc_i = _sparse_find(keys, mask, 0)
+            vi = values[loc_i] if keys[loc_i] == 0 else 0
+            if itemsize == 8:
+                (<int64_t*>out)[0] = vi
+            else:
+                (<int32_t*>out)[0] = <int32_t>vi
+
+    def permutation(self, object x, dtype=np.int64, method=u"fisher-yates",
+                    n_threads=None):
         """
-        permutation(x)
+        permutation(x, dtype=np.int64, method="fisher-yates", n_threads=None)
 
         Randomly permute a sequence, or return a permuted range.
 
@@ -4354,6 +6473,15 @@ cdef class Generator:
             If `x` is an integer, randomly permute ``np.arange(x)``.
             If `x` is an array, make a copy and shuffle the elements
             randomly.
+        dtype : {str, dtype}, optional
+            Integer dtype of the result when `x` is an integer. Must be able
+            to represent ``x - 1``. Ignored when `x` is an array. The default
+            value is np.int64.
+        method : {"fisher-yates", "parallel"}, optional
+            The shuffle algorithm. See ``shuffle``.
+        n_threads : int, optional
+            Number of threads used when method is "parallel". Defaults to
+            the number of CPUs.
 
         Returns
         -------
@@ -4378,8 +6506,15 @@ cdef class Generator:
 
         """
         if isinstance(x, (int, np.integer)):
-            arr = np.arange(x)
-            self.shuffle(arr)
+            dt = np.dtype(dtype)
+            if dt.kind not in "iu":
+                raise TypeError("Unsupported dtype \"{0}\" for "
+                                "permutation".format(dt.name))
+            if x - 1 > np.iinfo(dt).max:
+                raise ValueError("dtype {0} cannot represent all values in "
+                                 "the permutation".format(dt.name))
+            arr = np.arange(x, dtype=dt)
+            self.shuffle(arr, method=method, n_threads=n_threads)
             return arr
 
         arr = np.asarray(x)
@@ -4389,17 +6524,159 @@ cdef class Generator:
             # Return a copy if same memory
             if np.may_share_memory(arr, x):
                 arr = np.array(arr)
-            self.shuffle(arr)
+            self.shuffle(arr, method=method, n_threads=n_threads)
             return arr
 
         # Shuffle index array, dtype to ensure fast path
         idx = np.arange(arr.shape[0], dtype=np.intp)
-        self.shuffle(idx)
+        self.shuffle(idx, method=method, n_threads=n_threads)
         return arr[idx]
 
-    def complex_normal(self, loc=0.0, gamma=1.0, relation=0.0, size=None):
+    def permuted(self, object x, axis=None, out=None):
+        """
+        permuted(x, axis=None, out=None)
+
+        Randomly permute `x` along axis `axis`.
+
+        Unlike ``shuffle``, each slice along the given axis is shuffled
+        independently of the others.
+
+        Parameters
+        ----------
+        x : array_like, at least one-dimensional
+            Array to be shuffled.
+        axis : int, optional
+            Slices of `x` in this axis are shuffled. Each slice is shuffled
+            independently of the others. If `axis` is None, the flattened
+            array is shuffled.
+        out : ndarray, optional
+            If given, this is the destination of the shuffled array. It must
+            have the same shape as `x` and the values of `x` must be safely
+            castable to its dtype. If `out` is `x`, `x` is shuffled in place.
+
+        Returns
+        -------
+        out : ndarray
+            If `out` is None, a shuffled copy of `x` is returned. Otherwise,
+            the shuffled array is stored in `out`, and `out` is returned.
+
+        See Also
+        --------
+        shuffle
+        permutation
+
+        Examples
+        --------
+        >>> from randomgen import Generator
+        >>> gen = Generator()
+        >>> x = np.arange(24).reshape(3, 8)
+        >>> gen.permuted(x, axis=1)
+        array([[ 4,  3,  6,  7,  1,  2,  5,  0],  # random
+               [15, 10, 14,  9, 12, 11,  8, 13],
+               [17, 16, 20, 21, 18, 22, 23, 19]])
+        """
+        cdef np.npy_intp i, n, cnt, stride, itemsize
+        cdef int ax
+        cdef char *buf_ptr
+        cdef np.ndarray out_arr
+        cdef np.flatiter it
+
+        arr = np.asarray(x)
+        if out is None:
+            out = arr.copy(order="K")
+        else:
+            if not isinstance(out, np.ndarray):
+                raise TypeError("out must be a numpy array")
+            if out.shape != arr.shape:
+                raise ValueError("out must have the same shape as x")
+            np.copyto(out, arr, casting="safe")
+        out_arr = <np.ndarray>out
+
+        if axis is None:
+            if out.ndim > 1:
+                if out.flags.c_contiguous or out.flags.f_contiguous:
+                    self.shuffle(out.reshape(-1, order="A"))
+                else:
+                    flat = out.ravel()
+                    self.shuffle(flat)
+                    out[...] = flat.reshape(out.shape)
+            elif out.ndim == 1:
+                self.shuffle(out)
+            return out
+
+        ax = _normalize_axis(axis, out.ndim)
+        n = np.PyArray_DIM(out_arr, ax)
+        if n < 2 or out.size == 0:
+            return out
+        cnt = out.size // n
+        stride = np.PyArray_STRIDE(out_arr, ax)
+        itemsize = np.PyArray_ITEMSIZE(out_arr)
+        buf = np.empty(itemsize, dtype=np.int8)  # GC'd at function exit
+        buf_ptr = <char*>np.PyArray_DATA(buf)
+        it = np.PyArray_IterAllButAxis(out_arr, &ax)
+        with self.lock:
+            if out_arr.dtype.hasobject:
+                for i in range(cnt):
+                    self._shuffle_raw(n, 1, itemsize, stride,
+                                      <char*>np.PyArray_ITER_DATA(it), buf_ptr)
+                    np.PyArray_ITER_NEXT(it)
+            else:
+                with nogil:
+                    for i in range(cnt):
+                        self._shuffle_raw(n, 1, itemsize, stride,
+                                          <char*>np.PyArray_ITER_DATA(it), buf_ptr)
+                        np.PyArray_ITER_NEXT(it)
+        return out
+
+    def lazy_permutation(self, n):
+        """
+        lazy_permutation(n)
+
+        Random permutation of ``np.arange(n)`` computed on demand
+
+        Parameters
+        ----------
+        n : int
+            Number of elements in the permutation. Must be non-negative and
+            less than 2**63.
+
+        Returns
+        -------
+        perm : LazyPermutation
+            Object mapping each position i in [0, n) to the permuted value
+            ``perm[i]``. Supports integer, slice and array indexing, ``take``,
+            ``len`` and iteration.
+
+        See Also
+        --------
+        permutation
+
+        Notes
+        -----
+        Only the round keys, which are drawn from the generator when the
+        object is created, are stored so that memory use does not depend on
+        ``n`` and any element of the permutation can be computed
+        independently. This allows the shards of a permutation of a very
+        large dataset to be read by different workers without materializing
+        the permutation. The values differ from those produced by
+        ``permutation``.
+
+        Examples
+        --------
+        >>> from randomgen import Generator
+        >>> gen = Generator()
+        >>> perm = gen.lazy_permutation(10**10)
+        >>> perm[:5]
+        array([5432154302, 9418711367,  207358452, 7316264411, 1040914612]) # random
+        >>> perm[[0, -1]]
+        array([5432154302, 3370232216]) # random
+        """
+        return LazyPermutation(self, n)
+
+    def complex_normal(self, loc=0.0, gamma=1.0, relation=0.0, size=None,
+                       out=None):
         """
-        complex_normal(loc=0.0, gamma=1.0, relation=0.0, size=None)
+        complex_normal(loc=0.0, gamma=1.0, relation=0.0, size=None, out=None)
 
         Draw random samples from a complex normal (Gaussian) distribution.
 
@@ -4417,6 +6694,11 @@ cdef class Generator:
             a single value is returned if ``loc``, ``gamma`` and ``relation``
             are all scalars. Otherwise,
             ``np.broadcast(loc, gamma, relation).size`` samples are drawn.
+        out : ndarray, optional
+            Alternative complex128 output array in which to place the result.
+            If size is not None, it must have the same shape as the provided
+            size. If the parameters are arrays, they must broadcast to the
+            shape of out.
 
         Returns
         -------
@@ -4461,6 +6743,9 @@ cdef class Generator:
             fvar_r, fvar_i, floc_r, floc_i, f_real, f_imag, f_rho
         cdef np.npy_intp i, j, n, n2
         cdef np.broadcast it
+        cdef np.flatiter out_it
+
+        check_output(out, np.complex128, size)
 
         oloc = <np.ndarray>np.PyArray_FROM_OTF(loc, np.NPY_COMPLEX128, api.NPY_ARRAY_ALIGNED)
         ogamma = <np.ndarray>np.PyArray_FROM_OTF(gamma, np.NPY_COMPLEX128, api.NPY_ARRAY_ALIGNED)
@@ -4488,7 +6773,7 @@ cdef class Generator:
             if f_rho > 1.0 or f_rho < -1.0:
                 raise ValueError("Im(relation) ** 2 > Re(gamma ** 2 - relation** 2)")
 
-            if size is None:
+            if size is None and out is None:
                 f_real = random_gauss_zig(&self._bitgen)
                 f_imag = random_gauss_zig(&self._bitgen)
 
@@ -4496,10 +6781,26 @@ cdef class Generator:
                                 fvar_i, f_rho)
                 return PyComplex_FromDoubles(f_real, f_imag)
 
-            randoms = <np.ndarray>np.empty(size, np.complex128)
+            if out is None:
+                randoms = <np.ndarray>np.empty(size, np.complex128)
+            else:
+                randoms = <np.ndarray>out
             randoms_data = <double *>np.PyArray_DATA(randoms)
             n = np.PyArray_SIZE(randoms)
 
+            if not np.PyArray_IS_C_CONTIGUOUS(randoms):
+                out_it = <np.flatiter>np.PyArray_IterNew(randoms)
+                with self.lock, nogil:
+                    for i in range(n):
+                        f_real = random_gauss_zig(&self._bitgen)
+                        f_imag = random_gauss_zig(&self._bitgen)
+                        compute_complex(&f_real, &f_imag, floc_r, floc_i, fvar_r,
+                                        fvar_i, f_rho)
+                        (<double *>np.PyArray_ITER_DATA(out_it))[0] = f_real
+                        (<double *>np.PyArray_ITER_DATA(out_it))[1] = f_imag
+                        np.PyArray_ITER_NEXT(out_it)
+                return randoms
+
             j = 0
             with self.lock, nogil:
                 for i in range(n):
@@ -4531,7 +6832,14 @@ cdef class Generator:
         if np.any(cov.flat[~idx] != 0) or np.any(np.abs(rho) > 1):
             raise ValueError("Im(relation) ** 2 > Re(gamma ** 2 - relation ** 2)")
 
-        if size is not None:
+        if out is not None:
+            if np.PyArray_IS_C_CONTIGUOUS(<np.ndarray>out):
+                randoms = <np.ndarray>out
+            else:
+                # The values are generated in bulk and so are produced in a
+                # C-ordered block that is then copied to out
+                randoms = <np.ndarray>np.empty(out.shape, np.complex128)
+        elif size is not None:
             randoms = <np.ndarray>np.empty(size, np.complex128)
         else:
             it = np.PyArray_MultiIterNew4(oloc, v_real, v_imag, rho)
@@ -4541,6 +6849,10 @@ cdef class Generator:
         n = np.PyArray_SIZE(randoms)
 
         it = np.PyArray_MultiIterNew5(randoms, oloc, v_real, v_imag, rho)
+        if out is not None and it.shape != out.shape:
+            raise ValueError("The shape of out, {0}, is not compatible "
+                             "with the broadcast shape of the "
+                             "parameters, {1}".format(out.shape, it.shape))
         with self.lock, nogil:
             n2 = 2 * n  # Avoid compiler noise for cast
             for i in range(n2):
@@ -4558,9 +6870,680 @@ cdef class Generator:
                 j += 2
                 np.PyArray_MultiIter_NEXT(it)
 
+        if out is not None and randoms is not out:
+            np.copyto(out, randoms)
+            return out
         return randoms
 
 
+def _sorted_random_chunks(Generator gen, n, double low, double scale, chunk):
+    """
+    Iterate over consecutive chunks of n sorted uniforms
+
+    The last value in each chunk, other than the final chunk, is the chunk-th
+    smallest of the remaining values on [a, 1), which is a + (1 - a) B where
+    B is Beta(chunk, remaining - chunk + 1). The other values are then sorted
+    uniforms on [a, last).
+    """
+    cdef double a = 0.0, b
+    cdef np.ndarray out
+    remaining = n
+    while remaining > 0:
+        m = min(chunk, remaining)
+        out = <np.ndarray>np.empty(m, dtype=np.float64)
+        if m < remaining:
+            b = a + (1.0 - a) * gen.beta(m, remaining - m + 1)
+            b = min(b, np.nextafter(1.0, 0.0))
+            gen._sorted_uniform(a, b, low, scale, <np.ndarray>out[:m - 1])
+            out[m - 1] = low + scale * b
+        else:
+            b = 1.0
+            gen._sorted_uniform(a, b, low, scale, out)
+        yield out
+        a = b
+        remaining -= m
+
+
+def _sorted_integers_chunks(Generator gen, int64_t n_pop, int64_t k,
+                            int64_t low, chunk):
+    """Iterate over consecutive chunks of a sequential sample"""
+    cdef sequential_sample_t state
+    state.N = n_pop
+    state.n = k
+    state.pos = -1
+    state.vprime = -1.0
+    while state.n > 0:
+        yield gen._sequential_sample(&state, min(chunk, state.n), low)
+
+
+cdef class WeightedSampler:
+    """
+    WeightedSampler(generator, p)
+
+    Repeated weighted sampling using an alias table
+
+    Instances are created by
+    :meth:`~randomgen.generator.Generator.weighted_sampler`.
+
+    Parameters
+    ----------
+    generator : Generator
+        Generator used to produce the samples.
+    p : 1-D array_like
+        The probabilities associated with each index.
+
+    Attributes
+    ----------
+    p : ndarray
+        The probabilities, normalized to sum to 1.
+
+    Notes
+    -----
+    Uses Vose's alias method [1]_. Constructing the table requires O(n)
+    time and memory. Each sample then requires O(1) time and consumes a
+    bounded integer and a double from the generator.
+
+    Samples drawn without replacement use successive sampling from a
+    Fenwick tree of the probabilities that is built once when the sampler
+    is created. Each draw requires O(log n) time and consumes a single
+    double from the generator.
+
+    References
+    ----------
+    .. [1] Vose, Michael D. "A linear algorithm for generating random numbers
+           with a given distribution." IEEE Transactions on Software
+           Engineering 17, no. 9 (1991): 972-975.
+    """
+    cdef Generator _generator
+    cdef np.ndarray _prob
+    cdef np.ndarray _alias
+    cdef np.ndarray _tree
+    cdef np.npy_intp _n
+    cdef np.npy_intp _n_nonzero
+    cdef readonly np.ndarray p
+
+    def __init__(self, Generator generator, p):
+        cdef np.ndarray work
+        cdef double p_sum
+
+        atol = np.sqrt(np.finfo(np.float64).eps)
+        if isinstance(p, np.ndarray):
+            if np.issubdtype(p.dtype, np.floating):
+                atol = max(atol, np.sqrt(np.finfo(p.dtype).eps))
+        p = <np.ndarray>np.PyArray_FROM_OTF(p, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED | api.NPY_ARRAY_C_CONTIGUOUS)
+        if p.ndim != 1:
+            raise ValueError("`p` must be 1-dimensional")
+        if p.size == 0:
+            raise ValueError("`p` must not be empty")
+        p_sum = kahan_sum(<double*>np.PyArray_DATA(p), p.size)
+        if np.isnan(p_sum):
+            raise ValueError("probabilities contain NaN")
+        if np.logical_or.reduce(p < 0):
+            raise ValueError("probabilities are not non-negative")
+        if abs(p_sum - 1.) > atol:
+            raise ValueError("probabilities do not sum to 1")
+
+        self._generator = generator
+        self.p = p / p_sum
+        self.p.flags.writeable = False
+        self._n = self.p.size
+        self._prob = np.empty(self._n, dtype=np.double)
+        self._alias = np.empty(self._n, dtype=np.int64)
+        work = np.empty(self._n, dtype=np.int64)
+        random_alias_setup(<double *>np.PyArray_DATA(self.p), self._n,
+                           <double *>np.PyArray_DATA(self._prob),
+                           <int64_t *>np.PyArray_DATA(self._alias),
+                           <int64_t *>np.PyArray_DATA(work))
+        self._n_nonzero = np.count_nonzero(self.p)
+        self._tree = np.empty(self._n + 1, dtype=np.double)
+        random_fenwick_setup(<double *>np.PyArray_DATA(self.p), self._n,
+                             <double *>np.PyArray_DATA(self._tree))
+
+    def __repr__(self):
+        return "{0}(n={1})".format(self.__class__.__name__, self._n)
+
+    def sample(self, size=None, dtype=np.int64, replace=True):
+        """
+        sample(size=None, dtype=np.int64, replace=True)
+
+        Draw indices with probabilities p
+
+        Parameters
+        ----------
+        size : int or tuple of ints, optional
+            Output shape. If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` samples are drawn. Default is None, in which case a
+            single value is returned.
+        dtype : {str, dtype}, optional
+            Integer dtype of the result. Must be able to represent
+            ``len(p) - 1``. The default value is np.int64.
+        replace : bool, optional
+            Whether the sample is with or without replacement. When False,
+            the indices are distinct and each successive index is drawn
+            with probability proportional to the remaining entries of p.
+
+        Returns
+        -------
+        out : int or ndarray
+            Indices drawn from {0, 1, ..., len(p) - 1}.
+        """
+        cdef np.ndarray out
+        cdef np.npy_intp i, cnt
+        cdef int itemsize
+        cdef void *out_data
+        cdef bitgen_t *state = &self._generator._bitgen
+        cdef double *prob = <double *>np.PyArray_DATA(self._prob)
+        cdef int64_t *alias = <int64_t *>np.PyArray_DATA(self._alias)
+
+        dt = np.dtype(dtype)
+        if dt.kind not in "iu":
+            raise TypeError("Unsupported dtype \"{0}\" for "
+                            "sample".format(dt.name))
+        if self._n - 1 > np.iinfo(dt).max:
+            raise ValueError("dtype {0} cannot represent all indices in "
+                             "p".format(dt.name))
+        if not replace:
+            return self._sample_noreplace(size, dt)
+        if size is None:
+            with self._generator.lock:
+                return dt.type(random_alias(state, prob, alias, self._n))
+
+        out = <np.ndarray>np.empty(size, dtype=dt)
+        cnt = np.PyArray_SIZE(out)
+        out_data = np.PyArray_DATA(out)
+        itemsize = dt.itemsize
+        with self._generator.lock, nogil:
+            if itemsize == 8:
+                for i in range(cnt):
+                    (<int64_t *>out_data)[i] = random_alias(state, prob, alias, self._n)
+            elif itemsize == 4:
+                for i in range(cnt):
+                    (<int32_t *>out_data)[i] = <int32_t>random_alias(state, prob, alias, self._n)
+            elif itemsize == 2:
+                for i in range(cnt):
+                    (<int16_t *>out_data)[i] = <int16_t>random_alias(state, prob, alias, self._n)
+            else:
+                for i in range(cnt):
+                    (<int8_t *>out_data)[i] = <int8_t>random_alias(state, prob, alias, self._n)
+        return out
+
+    cdef object _sample_noreplace(self, object size, object dt):
+        cdef np.ndarray weights, tree, idx
+        cdef np.npy_intp cnt
+        cdef bitgen_t *state = &self._generator._bitgen
+
+        cnt = 1 if size is None else np.prod(size, dtype=np.intp)
+        if cnt < 0:
+            raise ValueError("negative dimensions are not allowed")
+        if cnt > self._n_nonzero:
+            raise ValueError("Fewer non-zero entries in p than size")
+        weights = self.p.copy()
+        tree = self._tree.copy()
+        idx = np.empty(cnt, dtype=np.int64)
+        with self._generator.lock, nogil:
+            random_weighted_without_replacement(state,
+                                                <double *>np.PyArray_DATA(weights),
+                                                <double *>np.PyArray_DATA(tree),
+                                                self._n, cnt,
+                                                <int64_t *>np.PyArray_DATA(idx))
+        if size is None:
+            return dt.type(idx[0])
+        return idx.astype(dt, copy=False).reshape(size)
+
+
+DEF POISSON_TABLE_LAM_MAX = 10.0
+DEF POISSON_TABLE_MAX_LEN = 128
+
+
+cdef class PoissonSampler:
+    """
+    PoissonSampler(generator, lam)
+
+    Repeated Poisson sampling with precomputed per-rate constants
+
+    Instances are created by
+    :meth:`~randomgen.generator.Generator.poisson_sampler`.
+
+    Parameters
+    ----------
+    generator : Generator
+        Generator used to produce the samples.
+    lam : float or array_like of floats
+        Expected number of events. Must be >= 0.
+
+    Attributes
+    ----------
+    lam : ndarray
+        The rates, one for each element of a sample.
+
+    Notes
+    -----
+    The distinct values in ``lam`` are found when the sampler is created
+    and the sampling constants are computed once for each. Rates below 10
+    use inversion by sequential search starting from a guide table so that
+    each draw requires a single double and O(1) expected time. Larger
+    rates use the transformed rejection method of Hoermann [1]_ with
+    precomputed constants.
+
+    The tables require memory proportional to the number of distinct
+    rates below 10.
+
+    References
+    ----------
+    .. [1] W. Hoermann, "The transformed rejection method for generating
+           Poisson random variables," Insurance: Mathematics and Economics
+           12, 39-45 (1993).
+    """
+    cdef Generator _generator
+    cdef np.ndarray _index
+    cdef np.ndarray _params
+    cdef np.ndarray _offsets
+    cdef np.ndarray _lengths
+    cdef np.ndarray _cdf
+    cdef np.ndarray _guide
+    cdef readonly np.ndarray lam
+
+    def __init__(self, Generator generator, lam):
+        cdef np.ndarray unique, scratch_cdf, scratch_guide
+        cdef np.npy_intp i, n_unique, total
+        cdef double *unique_data
+        cdef poisson_params_t *params
+        cdef np.npy_intp *offsets
+        cdef np.npy_intp *lengths
+
+        lam = <np.ndarray>np.PyArray_FROM_OTF(lam, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
+        check_array_constraint(lam, "lam", CONS_POISSON)
+        self._generator = generator
+        self.lam = lam.copy()
+        self.lam.flags.writeable = False
+
+        unique, index = np.unique(lam, return_inverse=True)
+        self._index = np.asarray(index, dtype=np.intp).reshape(-1)
+        n_unique = np.PyArray_SIZE(unique)
+        unique_data = <double *>np.PyArray_DATA(unique)
+        self._params = np.empty(n_unique * sizeof(poisson_params_t), dtype=np.uint8)
+        self._offsets = np.zeros(n_unique, dtype=np.intp)
+        self._lengths = np.zeros(n_unique, dtype=np.intp)
+        params = <poisson_params_t *>np.PyArray_DATA(self._params)
+        offsets = <np.npy_intp *>np.PyArray_DATA(self._offsets)
+        lengths = <np.npy_intp *>np.PyArray_DATA(self._lengths)
+
+        scratch_cdf = np.empty(POISSON_TABLE_MAX_LEN, dtype=np.double)
+        scratch_guide = np.empty(POISSON_TABLE_MAX_LEN, dtype=np.intp)
+        total = 0
+        for i in range(n_unique):
+            random_poisson_setup(unique_data[i], &params[i])
+            if 0 < unique_data[i] < POISSON_TABLE_LAM_MAX:
+                offsets[i] = total
+                lengths[i] = random_poisson_table_setup(
+                    unique_data[i], <double *>np.PyArray_DATA(scratch_cdf),
+                    <np.npy_intp *>np.PyArray_DATA(scratch_guide),
+                    POISSON_TABLE_MAX_LEN)
+                total += lengths[i]
+
+        self._cdf = np.empty(total, dtype=np.double)
+        self._guide = np.empty(total, dtype=np.intp)
+        for i in range(n_unique):
+            if lengths[i] > 0:
+                random_poisson_table_setup(
+                    unique_data[i],
+                    <double *>np.PyArray_DATA(self._cdf) + offsets[i],
+                    <np.npy_intp *>np.PyArray_DATA(self._guide) + offsets[i],
+                    POISSON_TABLE_MAX_LEN)
+
+    def __repr__(self):
+        return "{0}(shape={1})".format(self.__class__.__name__,
+                                       np.shape(self.lam))
+
+    def sample(self, size=None, out=None):
+        """
+        sample(size=None, out=None)
+
+        Draw one count for each element of lam
+
+        Parameters
+        ----------
+        size : int or tuple of ints, optional
+            Number of independent samples of lam to draw. If the given
+            shape is, e.g., ``(m, n)`` then the output has shape
+            ``(m, n) + lam.shape``. Default is None, in which case a single
+            sample with the shape of lam is returned.
+        out : ndarray, optional
+            Alternative int64 output array in which to place the result.
+            Must be C-contiguous and have shape ``size + lam.shape``.
+
+        Returns
+        -------
+        out : int or ndarray
+            Drawn samples. A single int is returned if lam is a scalar and
+            size is None.
+        """
+        cdef np.ndarray randoms
+        cdef np.npy_intp i, j, n, cnt, u
+        cdef int64_t *randoms_data
+        cdef bitgen_t *state = &self._generator._bitgen
+        cdef np.npy_intp *index = <np.npy_intp *>np.PyArray_DATA(self._index)
+        cdef poisson_params_t *params = <poisson_params_t *>np.PyArray_DATA(self._params)
+        cdef np.npy_intp *offsets = <np.npy_intp *>np.PyArray_DATA(self._offsets)
+        cdef np.npy_intp *lengths = <np.npy_intp *>np.PyArray_DATA(self._lengths)
+        cdef double *cdf = <double *>np.PyArray_DATA(self._cdf)
+        cdef np.npy_intp *guide = <np.npy_intp *>np.PyArray_DATA(self._guide)
+
+        if size is None:
+            shape = np.shape(self.lam)
+        else:
+            try:
+                shape = (operator.index(size),) + np.shape(self.lam)
+            except TypeError:
+                shape = tuple(size) + np.shape(self.lam)
+        if out is None:
+            randoms = <np.ndarray>np.empty(shape, dtype=np.int64)
+        else:
+            check_output(out, np.int64, shape)
+            randoms = <np.ndarray>out
+            if not np.PyArray_IS_C_CONTIGUOUS(randoms):
+                raise ValueError("out must be C-contiguous")
+
+        n = np.PyArray_SIZE(self.lam)
+        cnt = np.PyArray_SIZE(randoms) // n if n > 0 else 0
+        randoms_data = <int64_t *>np.PyArray_DATA(randoms)
+        with self._generator.lock, nogil:
+            for j in range(cnt):
+                for i in range(n):
+                    u = index[i]
+                    if lengths[u] > 0:
+                        randoms_data[i] = random_poisson_table(state, params[u].lam,
+                                                               cdf + offsets[u],
+                                                               guide + offsets[u],
+                                                               lengths[u])
+                    else:
+                        randoms_data[i] = random_poisson_params(state, &params[u])
+                randoms_data += n
+        if size is None and out is None and np.PyArray_NDIM(self.lam) == 0:
+            return int(randoms)
+        return randoms
+
+
+cdef class BinomialSampler:
+    """
+    BinomialSampler(generator, n, p)
+
+    Repeated binomial sampling with precomputed per-parameter setup
+
+    Instances are created by
+    :meth:`~randomgen.generator.Generator.binomial_sampler`.
+
+    Parameters
+    ----------
+    generator : Generator
+        Generator used to produce the samples.
+    n : int or array_like of ints
+        Parameter of the distribution, >= 0.
+    p : float or array_like of floats
+        Parameter of the distribution, >= 0 and <=1.
+
+    Attributes
+    ----------
+    n : ndarray
+        The number of trials, broadcast to the shape of a sample.
+    p : ndarray
+        The probabilities of success, broadcast to the shape of a sample.
+
+    Notes
+    -----
+    The distinct (n, p) pairs are found when the sampler is created and
+    each has its own setup, so the setup of the inversion or BTPE
+    algorithm is never repeated.
+    """
+    cdef Generator _generator
+    cdef np.ndarray _index
+    cdef np.ndarray _unique_n
+    cdef np.ndarray _unique_p
+    cdef np.ndarray _binomial
+    cdef readonly np.ndarray n
+    cdef readonly np.ndarray p
+
+    def __init__(self, Generator generator, n, p):
+        cdef np.ndarray n_arr, p_arr
+
+        p_arr = <np.ndarray>np.PyArray_FROM_OTF(p, np.NPY_DOUBLE, api.NPY_ARRAY_ALIGNED)
+        n_arr = <np.ndarray>np.PyArray_FROM_OTF(n, np.NPY_INT64, api.NPY_ARRAY_ALIGNED)
+        check_array_constraint(p_arr, "p", CONS_BOUNDED_0_1)
+        check_array_constraint(n_arr, "n", CONS_NON_NEGATIVE)
+        n_arr, p_arr = np.broadcast_arrays(n_arr, p_arr)
+        self._generator = generator
+        self.n = n_arr.copy()
+        self.n.flags.writeable = False
+        self.p = p_arr.copy()
+        self.p.flags.writeable = False
+
+        # Group the distinct (n, p) pairs
+        flat_n = self.n.ravel()
+        flat_p = self.p.ravel()
+        order = np.lexsort((flat_p, flat_n))
+        sorted_n = flat_n[order]
+        sorted_p = flat_p[order]
+        first = np.ones(sorted_n.shape[0], dtype=bool)
+        first[1:] = (sorted_n[1:] != sorted_n[:-1]) | (sorted_p[1:] != sorted_p[:-1])
+        self._index = np.empty(sorted_n.shape[0], dtype=np.intp)
+        self._index[order] = np.cumsum(first) - 1
+        self._unique_n = np.ascontiguousarray(sorted_n[first])
+        self._unique_p = np.ascontiguousarray(sorted_p[first])
+        # has_binomial is 0 so each entry is set up on its first draw
+        self._binomial = np.zeros(np.PyArray_SIZE(self._unique_n) * sizeof(binomial_t),
+                                  dtype=np.uint8)
+
+    def __repr__(self):
+        return "{0}(shape={1})".format(self.__class__.__name__,
+                                       np.shape(self.n))
+
+    def sample(self, size=None, out=None):
+        """
+        sample(size=None, out=None)
+
+        Draw one value for each element of the broadcast of n and p
+
+        Parameters
+        ----------
+        size : int or tuple of ints, optional
+            Number of independent samples to draw. If the given shape is,
+            e.g., ``(m, k)`` then the output has shape ``(m, k) + shape``
+            where shape is the broadcast shape of n and p. Default is None,
+            in which case a single sample is returned.
+        out : ndarray, optional
+            Alternative int64 output array in which to place the result.
+            Must be C-contiguous and have shape ``size + shape``.
+
+        Returns
+        -------
+        out : int or ndarray
+            Drawn samples. A single int is returned if n and p are scalars
+            and size is None.
+        """
+        cdef np.ndarray randoms
+        cdef np.npy_intp i, j, n, cnt, u
+        cdef int64_t *randoms_data
+        cdef bitgen_t *state = &self._generator._bitgen
+        cdef np.npy_intp *index = <np.npy_intp *>np.PyArray_DATA(self._index)
+        cdef int64_t *unique_n = <int64_t *>np.PyArray_DATA(self._unique_n)
+        cdef double *unique_p = <double *>np.PyArray_DATA(self._unique_p)
+        cdef binomial_t *binomial = <binomial_t *>np.PyArray_DATA(self._binomial)
+
+        if size is None:
+            shape = np.shape(self.n)
+        else:
+            try:
+                shape = (operator.index(size),) + np.shape(self.n)
+            except TypeError:
+                shape = tuple(size) + np.shape(self.n)
+        if out is None:
+            randoms = <np.ndarray>np.empty(shape, dtype=np.int64)
+        else:
+            check_output(out, np.int64, shape)
+            randoms = <np.ndarray>out
+            if not np.PyArray_IS_C_CONTIGUOUS(randoms):
+                raise ValueError("out must be C-contiguous")
+
+        n = np.PyArray_SIZE(self.n)
+        cnt = np.PyArray_SIZE(randoms) // n if n > 0 else 0
+        randoms_data = <int64_t *>np.PyArray_DATA(randoms)
+        with self._generator.lock, nogil:
+            for j in range(cnt):
+                for i in range(n):
+                    u = index[i]
+                    randoms_data[i] = random_binomial(state, unique_p[u],
+                                                      unique_n[u], &binomial[u])
+                randoms_data += n
+        if size is None and out is None and np.PyArray_NDIM(self.n) == 0:
+            return int(randoms)
+        return randoms
+
+
+DEF PERMUTATION_ROUNDS = 12
+
+
+cdef class LazyPermutation:
+    """
+    LazyPermutation(generator, n)
+
+    A random permutation of ``np.arange(n)`` computed on demand
+
+    Instances are created by
+    :meth:`~randomgen.generator.Generator.lazy_permutation`.
+
+    Parameters
+    ----------
+    generator : Generator
+        Generator used to produce the round keys.
+    n : int
+        Number of elements in the permutation.
+
+    Attributes
+    ----------
+    n : int
+        Number of elements in the permutation.
+
+    Notes
+    -----
+    Position i is mapped by a 12-round balanced Feistel network [1]_ on the
+    smallest even number of bits that can represent n - 1. The round
+    function mixes the right half with a 64-bit round key using the
+    SplitMix64 finalizer. Outputs outside of [0, n) are mapped again
+    (cycle walking [2]_) until they fall in range, which requires fewer
+    than 4 evaluations on average. The result is a bijection on [0, n)
+    for any set of round keys, although it is not uniformly distributed
+    over all n! permutations.
+
+    References
+    ----------
+    .. [1] Luby, Michael, and Charles Rackoff. "How to construct pseudorandom
+           permutations from pseudorandom functions." SIAM Journal on
+           Computing 17, no. 2 (1988): 373-386.
+    .. [2] Black, John, and Phillip Rogaway. "Ciphers with arbitrary finite
+           domains." In Cryptographers' Track at the RSA Conference,
+           pp. 114-130. Springer, 2002.
+    """
+    cdef readonly int64_t n
+    cdef int _half_bits
+    cdef uint64_t _keys[PERMUTATION_ROUNDS]
+
+    def __init__(self, Generator generator, n):
+        cdef int i
+        cdef bitgen_t *state = &generator._bitgen
+
+        n = operator.index(n)
+        if n < 0 or n > np.iinfo(np.int64).max:
+            raise ValueError("n must be non-negative and less than 2**63")
+        self.n = n
+        self._half_bits = (int(max(n - 1, 0)).bit_length() + 1) // 2
+        with generator.lock:
+            for i in range(PERMUTATION_ROUNDS):
+                self._keys[i] = state.next_uint64(state.state)
+
+    def __repr__(self):
+        return "{0}(n={1})".format(self.__class__.__name__, self.n)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        cdef int64_t start
+        cdef int64_t chunk = 65536
+        for start in range(0, self.n, chunk):
+            for value in self._take_range(start, 1, min(chunk, self.n - start)).tolist():
+                yield value
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.n)
+            return self._take_range(start, step, len(range(start, stop, step)))
+        try:
+            index = operator.index(key)
+        except TypeError:
+            return self.take(key)
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError("index {0} is out of bounds for a permutation "
+                             "with {1} elements".format(key, self.n))
+        return <int64_t>random_permuted_index(index, self.n, self._half_bits,
+                                              self._keys, PERMUTATION_ROUNDS)
+
+    cdef np.ndarray _take_range(self, int64_t start, int64_t step, np.npy_intp cnt):
+        cdef np.npy_intp i
+        cdef np.ndarray out = np.empty(cnt, dtype=np.int64)
+        cdef int64_t *out_data = <int64_t *>np.PyArray_DATA(out)
+        with nogil:
+            for i in range(cnt):
+                out_data[i] = <int64_t>random_permuted_index(start + i * step, self.n,
+                                                             self._half_bits, self._keys,
+                                                             PERMUTATION_ROUNDS)
+        return out
+
+    def take(self, indices):
+        """
+        take(indices)
+
+        Permuted values at the given positions
+
+        Parameters
+        ----------
+        indices : array_like of int
+            Positions in the permutation. Negative values index from the
+            end.
+
+        Returns
+        -------
+        out : int or ndarray
+            Permuted values with the same shape as indices.
+        """
+        cdef np.ndarray idx, out
+        cdef np.npy_intp i, cnt
+        cdef int64_t *idx_data
+        cdef int64_t *out_data
+
+        idx = np.asarray(indices)
+        if idx.dtype.kind not in "iu" and idx.size > 0:
+            raise IndexError("indices must be integers")
+        idx = np.array(idx, dtype=np.int64, order="C")
+        idx[idx < 0] += self.n
+        if idx.size and (idx.min() < 0 or idx.max() >= self.n):
+            raise IndexError("indices are out of bounds for a permutation "
+                             "with {0} elements".format(self.n))
+        out = np.empty_like(idx)
+        cnt = np.PyArray_SIZE(idx)
+        idx_data = <int64_t *>np.PyArray_DATA(idx)
+        out_data = <int64_t *>np.PyArray_DATA(out)
+        with nogil:
+            for i in range(cnt):
+                out_data[i] = <int64_t>random_permuted_index(idx_data[i], self.n,
+                                                             self._half_bits, self._keys,
+                                                             PERMUTATION_ROUNDS)
+        if np.PyArray_NDIM(out) == 0:
+            return out.item()
+        return out
+
+
 _random_generator = Generator()
 
 # TODO: Remove after final merge
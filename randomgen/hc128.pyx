@@ -16,6 +16,16 @@ cdef uint32_t hc128_uint32(void *st) nogil:
 cdef double hc128_double(void* st) nogil:
     return hc128_next_double(<hc128_state_t *> st)
 
+cdef void hc128_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = hc128_next64(<hc128_state_t *>st)
+
+cdef void hc128_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = hc128_next_double(<hc128_state_t *> st)
+
 
 cdef class HC128(BitGenerator):
     u"""
@@ -118,6 +128,8 @@ cdef class HC128(BitGenerator):
         self._bitgen.next_uint32 = &hc128_uint32
         self._bitgen.next_double = &hc128_double
         self._bitgen.next_raw = &hc128_uint64
+        self._bitgen.fill_uint64 = &hc128_fill_uint64
+        self._bitgen.fill_double = &hc128_fill_double
 
     def _seed_from_seq(self):
         state = self.seed_seq.generate_state(4, np.uint64)
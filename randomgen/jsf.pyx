@@ -64,6 +64,16 @@ cdef uint32_t jsf64_uint32(void *st) nogil:
 cdef double jsf64_double(void* st) nogil:
     return uint64_to_double(jsf64_next64(<jsf_state_t *>st))
 
+cdef void jsf64_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = jsf64_next64(<jsf_state_t *>st)
+
+cdef void jsf64_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(jsf64_next64(<jsf_state_t *>st))
+
 cdef uint64_t jsf32_uint64(void* st) nogil:
     return jsf32_next64(<jsf_state_t *>st)
 
@@ -73,6 +83,16 @@ cdef uint32_t jsf32_uint32(void *st) nogil:
 cdef double jsf32_double(void* st) nogil:
     return uint64_to_double(jsf32_next64(<jsf_state_t *>st))
 
+cdef void jsf32_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = jsf32_next64(<jsf_state_t *>st)
+
+cdef void jsf32_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(jsf32_next64(<jsf_state_t *>st))
+
 cdef uint64_t jsf32_raw(void* st) nogil:
     return <uint64_t>jsf32_next32(<jsf_state_t *>st)
 
@@ -207,11 +227,15 @@ cdef class JSF(BitGenerator):
             self._bitgen.next_uint32 = &jsf64_uint32
             self._bitgen.next_double = &jsf64_double
             self._bitgen.next_raw = &jsf64_uint64
+            self._bitgen.fill_uint64 = &jsf64_fill_uint64
+            self._bitgen.fill_double = &jsf64_fill_double
         else:
             self._bitgen.next_uint64 = &jsf32_uint64
             self._bitgen.next_uint32 = &jsf32_uint32
             self._bitgen.next_double = &jsf32_double
             self._bitgen.next_raw = &jsf32_raw
+            self._bitgen.fill_uint64 = &jsf32_fill_uint64
+            self._bitgen.fill_double = &jsf32_fill_double
         self.rng_state.p = p if p is not None else JSF_DEFAULTS[self.size]["p"]
         self.rng_state.q = q if q is not None else JSF_DEFAULTS[self.size]["q"]
         self.rng_state.r = r if r is not None else JSF_DEFAULTS[self.size]["r"]
@@ -18,6 +18,16 @@ cdef uint32_t mt19937_uint32(void *st) nogil:
 cdef double mt19937_double(void *st) nogil:
     return mt19937_next_double(<mt19937_state_t *> st)
 
+cdef void mt19937_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = mt19937_next64(<mt19937_state_t *> st)
+
+cdef void mt19937_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = mt19937_next_double(<mt19937_state_t *> st)
+
 cdef uint64_t mt19937_raw(void *st) nogil:
     return <uint64_t>mt19937_next32(<mt19937_state_t *> st)
 
@@ -118,6 +128,8 @@ cdef class MT19937(BitGenerator):
         self._bitgen.next_uint32 = &mt19937_uint32
         self._bitgen.next_double = &mt19937_double
         self._bitgen.next_raw = &mt19937_raw
+        self._bitgen.fill_uint64 = &mt19937_fill_uint64
+        self._bitgen.fill_double = &mt19937_fill_double
 
     def _seed_from_seq(self):
         state = self.seed_seq.generate_state(624, np.uint32)
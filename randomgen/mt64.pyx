@@ -18,8 +18,15 @@ cdef uint32_t mt64_uint32(void *st) nogil:
 cdef double mt64_double(void *st) nogil:
     return uint64_to_double(mt64_next64(<mt64_state_t *> st))
 
-cdef uint64_t mt64_raw(void *st) nogil:
-    return mt64_next64(<mt64_state_t *> st)
+cdef void mt64_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = mt64_next64(<mt64_state_t *> st)
+
+cdef void mt64_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(mt64_next64(<mt64_state_t *> st))
 
 cdef class MT64(BitGenerator):
     """
@@ -99,7 +106,9 @@ cdef class MT64(BitGenerator):
         self._bitgen.next_uint64 = &mt64_uint64
         self._bitgen.next_uint32 = &mt64_uint32
         self._bitgen.next_double = &mt64_double
-        self._bitgen.next_raw = &mt64_raw
+        self._bitgen.next_raw = &mt64_uint64
+        self._bitgen.fill_uint64 = &mt64_fill_uint64
+        self._bitgen.fill_double = &mt64_fill_double
 
     cdef _reset_state_variables(self):
         self.rng_state.has_uint32 = 0
@@ -8,7 +8,6 @@ import numpy as np
 from randomgen.bounded_integers import _integers_types
 from randomgen.mt19937 import MT19937 as _MT19937
 
-from cpython.pycapsule cimport PyCapsule_IsValid, PyCapsule_GetPointer
 from cpython cimport (Py_INCREF, PyFloat_AsDouble)
 from libc cimport string
 
@@ -99,12 +98,7 @@ cdef class RandomState:
             bit_generator = _MT19937(bit_generator, mode="legacy")
 
         self._bit_generator = bit_generator
-        capsule = bit_generator.capsule
-        cdef const char *name = "BitGenerator"
-        if not PyCapsule_IsValid(capsule, name):
-            raise ValueError("Invalid bit generator. The bit generator must "
-                             "be instantized.")
-        self._bitgen = (<bitgen_t *> PyCapsule_GetPointer(capsule, name))[0]
+        copy_bitgen(bit_generator, &self._bitgen)
         self._aug_state.bit_generator = &self._bitgen
         self._reset_gauss()
         self.lock = bit_generator.lock
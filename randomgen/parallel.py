@@ -0,0 +1,277 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+import multiprocessing
+
+import numpy as np
+
+from randomgen.generator import Generator
+from randomgen.xoroshiro128 import Xoroshiro128
+
+__all__ = ["ParallelGenerator"]
+
+
+class ParallelGenerator(object):
+    """
+    ParallelGenerator(bit_generator=None, n_threads=None)
+
+    Fill arrays with random values using multiple threads
+
+    Parameters
+    ----------
+    bit_generator : BitGenerator, optional
+        Bit generator used to initialize the child bit generators. Must
+        support ``jumped``. If none is provided, uses Xoroshiro128.
+    n_threads : int, optional
+        Number of threads, and child bit generators, to use. Defaults to
+        the number of CPUs.
+
+    Attributes
+    ----------
+    generators : list[Generator]
+        The generators, one per thread, used to fill arrays.
+    n_threads : int
+        The number of threads used to fill arrays.
+
+    Notes
+    -----
+    Child ``i`` uses ``bit_generator.jumped(i + 1)`` so that each thread
+    draws from a distinct, non-overlapping part of the same stream, and
+    ``bit_generator`` itself is never advanced. The output is split, in
+    memory order, into ``n_threads`` contiguous blocks and block ``i`` is
+    always filled in place by child ``i``. The output is therefore
+    reproducible for a fixed seed, number of threads and memory layout,
+    although it differs from the values produced by a single ``Generator``.
+    An F-ordered ``out`` holds the values that a C-ordered array with the
+    reversed shape would hold, transposed.
+
+    The thread pool is persistent so that repeated calls do not pay the
+    cost of creating threads. All of the methods release the GIL while
+    generating values.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from randomgen import ParallelGenerator, Xoshiro256
+    >>> pg = ParallelGenerator(Xoshiro256(1234, mode="sequence"), 4)
+    >>> out = np.empty(10000000)
+    >>> pg.standard_normal(out=out)
+    """
+    def __init__(self, bit_generator=None, n_threads=None):
+        if bit_generator is None:
+            bit_generator = Xoroshiro128(mode="sequence")
+        if n_threads is None:
+            n_threads = multiprocessing.cpu_count()
+        n_threads = int(n_threads)
+        if n_threads < 1:
+            raise ValueError("n_threads must be a positive integer")
+        if not hasattr(bit_generator, "jumped"):
+            raise TypeError("bit_generator must support jumped")
+
+        bit_generators = [bit_generator.jumped(i + 1)
+                          for i in range(n_threads)]
+        self.generators = [Generator(bg) for bg in bit_generators]
+        self.n_threads = n_threads
+        self._executor = ThreadPoolExecutor(n_threads)
+
+    def __repr__(self):
+        return self.__str__() + " at 0x{:X}".format(id(self))
+
+    def __str__(self):
+        bg = self.generators[0].bit_generator.__class__.__name__
+        return "{0}({1}, n_threads={2})".format(self.__class__.__name__,
+                                                bg, self.n_threads)
+
+    def __del__(self):
+        executor = getattr(self, "_executor", None)
+        if executor is not None:
+            executor.shutdown(False)
+
+    def _fill(self, func_name, size, dtype, out, **kwargs):
+        if out is None:
+            if size is None:
+                func = getattr(self.generators[0], func_name)
+                return func(dtype=dtype, **kwargs)
+            out = np.empty(size, dtype=dtype)
+        else:
+            if size is not None:
+                try:
+                    tup_size = tuple(size)
+                except TypeError:
+                    tup_size = (size,)
+                if tup_size != out.shape:
+                    raise ValueError("size must match out.shape when used "
+                                     "together")
+            if not (out.flags.c_contiguous or out.flags.f_contiguous):
+                raise ValueError("Supplied output array is not contiguous.")
+            if not out.flags.writeable:
+                raise ValueError("Supplied output array is not writable.")
+            if out.dtype != np.dtype(dtype):
+                raise TypeError("Supplied output array has the wrong type. "
+                                "Expected {0}, got {1}".format(np.dtype(dtype),
+                                                               out.dtype))
+        # A view of out in memory order so that the blocks are filled in place
+        flat = out.reshape(-1, order="A")
+        step = int(np.ceil(flat.shape[0] / self.n_threads))
+
+        def _fill_block(gen, block):
+            getattr(gen, func_name)(dtype=dtype, out=block, **kwargs)
+
+        futures = []
+        for i, gen in enumerate(self.generators):
+            block = flat[i * step:(i + 1) * step]
+            if block.shape[0] == 0:
+                break
+            futures.append(self._executor.submit(_fill_block, gen, block))
+        wait(futures)
+        for future in futures:
+            future.result()
+        return out
+
+    def random(self, size=None, dtype=np.float64, out=None):
+        """
+        random(size=None, dtype='d', out=None)
+
+        Return random floats in the half-open interval [0.0, 1.0).
+
+        Parameters
+        ----------
+        size : int or tuple of ints, optional
+            Output shape. If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` samples are drawn. Default is None, in which case a
+            single value is returned.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). The default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
+
+        Returns
+        -------
+        out : float or ndarray of floats
+            Array of random floats of shape `size` (unless ``size=None``, in
+            which case a single float is returned).
+
+        See Also
+        --------
+        randomgen.generator.Generator.random
+        """
+        return self._fill("random", size, dtype, out)
+
+    def standard_normal(self, size=None, dtype=np.float64, out=None):
+        """
+        standard_normal(size=None, dtype='d', out=None)
+
+        Draw samples from a standard Normal distribution (mean=0, stdev=1).
+
+        Parameters
+        ----------
+        size : int or tuple of ints, optional
+            Output shape. If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` samples are drawn. Default is None, in which case a
+            single value is returned.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). The default value is 'd'.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
+
+        Returns
+        -------
+        out : float or ndarray
+            A floating-point array of shape ``size`` of drawn samples, or a
+            single sample if ``size`` was not specified.
+
+        See Also
+        --------
+        randomgen.generator.Generator.standard_normal
+        """
+        return self._fill("standard_normal", size, dtype, out)
+
+    def standard_exponential(self, size=None, dtype=np.float64,
+                             method=u"zig", out=None):
+        """
+        standard_exponential(size=None, dtype='d', method='zig', out=None)
+
+        Draw samples from the standard exponential distribution.
+
+        Parameters
+        ----------
+        size : int or tuple of ints, optional
+            Output shape. If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` samples are drawn. Default is None, in which case a
+            single value is returned.
+        dtype : dtype, optional
+            Desired dtype of the result, either 'd' (or 'float64') or 'f'
+            (or 'float32'). The default value is 'd'.
+        method : str, optional
+            Either 'inv' or 'zig'. 'inv' uses the default inverse CDF method.
+            'zig' uses the much faster Ziggurat method of Marsaglia and Tsang.
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
+
+        Returns
+        -------
+        out : float or ndarray
+            Drawn samples.
+
+        See Also
+        --------
+        randomgen.generator.Generator.standard_exponential
+        """
+        return self._fill("standard_exponential", size, dtype, out,
+                          method=method)
+
+    def integers(self, low, high=None, size=None, dtype=np.int64,
+                 endpoint=False, out=None):
+        """
+        integers(low, high=None, size=None, dtype='int64', endpoint=False, out=None)
+
+        Return random integers from `low` (inclusive) to `high` (exclusive), or
+        if endpoint=True, `low` (inclusive) to `high` (inclusive).
+
+        Parameters
+        ----------
+        low : int
+            Lowest (signed) integer to be drawn from the distribution (unless
+            ``high=None``, in which case this parameter is one above the
+            *highest* such integer).
+        high : int, optional
+            If provided, one above the largest (signed) integer to be drawn
+            from the distribution (see above for behavior if ``high=None``).
+        size : int or tuple of ints, optional
+            Output shape. If the given shape is, e.g., ``(m, n, k)``, then
+            ``m * n * k`` samples are drawn. Default is None, in which case a
+            single value is returned.
+        dtype : {str, dtype}, optional
+            Desired dtype of the result. The default value is 'int64'.
+        endpoint : bool
+            If true, sample from the interval [low, high] instead of the
+            default [low, high)
+        out : ndarray, optional
+            Alternative output array in which to place the result. If size is
+            not None, it must have the same shape as the provided size and
+            must match the type of the output values.
+
+        Returns
+        -------
+        out : int or ndarray of ints
+            `size`-shaped array of random integers from the appropriate
+            distribution, or a single such random int if `size` not provided.
+
+        Notes
+        -----
+        Only scalar values of `low` and `high` are supported.
+
+        See Also
+        --------
+        randomgen.generator.Generator.integers
+        """
+        if np.ndim(low) != 0 or np.ndim(high) != 0:
+            raise ValueError("low and high must be scalars")
+        return self._fill("integers", size, dtype, out, low=low, high=high,
+                          endpoint=endpoint)
@@ -15,6 +15,16 @@ cdef uint32_t pcg32_uint32(void *st) nogil:
 cdef double pcg32_double(void* st) nogil:
     return pcg32_next_double(<pcg32_state_t *>st)
 
+cdef void pcg32_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = pcg32_next64(<pcg32_state_t *>st)
+
+cdef void pcg32_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = pcg32_next_double(<pcg32_state_t *>st)
+
 cdef uint64_t pcg32_raw(void* st) nogil:
     return <uint64_t>pcg32_next32(<pcg32_state_t *> st)
 
@@ -114,6 +124,8 @@ cdef class PCG32(BitGenerator):
         self._bitgen.next_uint32 = &pcg32_uint32
         self._bitgen.next_double = &pcg32_double
         self._bitgen.next_raw = &pcg32_raw
+        self._bitgen.fill_uint64 = &pcg32_fill_uint64
+        self._bitgen.fill_double = &pcg32_fill_double
 
     def _seed_from_seq(self, inc=None):
         cdef uint64_t _inc
@@ -15,6 +15,16 @@ cdef uint32_t pcg64_uint32(void *st) nogil:
 cdef double pcg64_double(void* st) nogil:
     return uint64_to_double(pcg64_next64(<pcg64_state_t *>st))
 
+cdef void pcg64_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = pcg64_next64(<pcg64_state_t *>st)
+
+cdef void pcg64_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(pcg64_next64(<pcg64_state_t *>st))
+
 
 cdef class PCG64(BitGenerator):
     u"""
@@ -113,6 +123,8 @@ cdef class PCG64(BitGenerator):
         self._bitgen.next_uint32 = &pcg64_uint32
         self._bitgen.next_double = &pcg64_double
         self._bitgen.next_raw = &pcg64_uint64
+        self._bitgen.fill_uint64 = &pcg64_fill_uint64
+        self._bitgen.fill_double = &pcg64_fill_double
 
     cdef _reset_state_variables(self):
         self.rng_state.has_uint32 = 0
@@ -88,15 +88,27 @@ cdef extern from "src/philox/philox.h":
     uint32_t philox2x32_next32(philox_all_t *state) nogil
     double philox2x32_next_double(philox_all_t *state) nogil
     void philox2x32_advance(philox_all_t *state, uint32_t *step, int use_carry)
+    void philox2x32_blocks_at(uint32_t *ctr, uint32_t *key, size_t cnt, uint32_t *out) nogil
+    void philox2x32_raw_at(philox_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
     uint64_t philox4x32_next64(philox_all_t *state) nogil
     uint32_t philox4x32_next32(philox_all_t *state) nogil
     double philox4x32_next_double(philox_all_t *state) nogil
     void philox4x32_advance(philox_all_t *state, uint32_t *step, int use_carry)
+    void philox4x32_blocks_at(uint32_t *ctr, uint32_t *key, size_t cnt, uint32_t *out) nogil
+    void philox4x32_raw_at(philox_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
     uint64_t philox2x64_next64(philox_all_t *state) nogil
     uint32_t philox2x64_next32(philox_all_t *state) nogil
     double philox2x64_next_double(philox_all_t *state) nogil
     void philox2x64_advance(philox_all_t *state, uint64_t *step, int use_carry)
+    void philox2x64_blocks_at(uint64_t *ctr, uint64_t *key, size_t cnt, uint64_t *out) nogil
+    void philox2x64_raw_at(philox_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
     uint64_t philox4x64_next64(philox_all_t *state) nogil
     uint32_t philox4x64_next32(philox_all_t *state) nogil
     double philox4x64_next_double(philox_all_t *state) nogil
     void philox4x64_advance(philox_all_t *state, uint64_t *step, int use_carry)
+    void philox4x64_blocks_at(uint64_t *ctr, uint64_t *key, size_t cnt, uint64_t *out) nogil
+    void philox4x64_raw_at(philox_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
+    void philox2x64_fill_next64(philox_all_t *state, size_t cnt, uint64_t *out) nogil
+    void philox2x64_fill_next_double(philox_all_t *state, size_t cnt, double *out) nogil
+    void philox4x64_fill_next64(philox_all_t *state, size_t cnt, uint64_t *out) nogil
+    void philox4x64_fill_next_double(philox_all_t *state, size_t cnt, double *out) nogil
@@ -14,6 +14,10 @@ cdef uint32_t philox2x64_uint32(void *st) nogil:
     return philox2x64_next32(<philox_all_t *> st)
 cdef double philox2x64_double(void*st) nogil:
     return philox2x64_next_double(<philox_all_t *> st)
+cdef void philox2x64_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    philox2x64_fill_next64(<philox_all_t *> st, <size_t>cnt, out)
+cdef void philox2x64_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    philox2x64_fill_next_double(<philox_all_t *> st, <size_t>cnt, out)
 
 cdef uint64_t philox4x64_uint64(void*st) nogil:
     return philox4x64_next64(<philox_all_t *> st)
@@ -21,6 +25,10 @@ cdef uint32_t philox4x64_uint32(void *st) nogil:
     return philox4x64_next32(<philox_all_t *> st)
 cdef double philox4x64_double(void*st) nogil:
     return philox4x64_next_double(<philox_all_t *> st)
+cdef void philox4x64_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    philox4x64_fill_next64(<philox_all_t *> st, <size_t>cnt, out)
+cdef void philox4x64_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    philox4x64_fill_next_double(<philox_all_t *> st, <size_t>cnt, out)
 
 cdef uint64_t philox4x32_uint64(void*st) nogil:
     return philox4x32_next64(<philox_all_t *> st)
@@ -30,6 +38,14 @@ cdef double philox4x32_double(void*st) nogil:
     return philox4x32_next_double(<philox_all_t *> st)
 cdef uint64_t philox4x32_raw(void *st) nogil:
     return <uint64_t>philox4x32_next32(<philox_all_t *> st)
+cdef void philox4x32_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = philox4x32_next64(<philox_all_t *> st)
+cdef void philox4x32_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = philox4x32_next_double(<philox_all_t *> st)
 
 cdef uint64_t philox2x32_uint64(void*st) nogil:
     return philox2x32_next64(<philox_all_t *> st)
@@ -39,6 +55,24 @@ cdef double philox2x32_double(void*st) nogil:
     return philox2x32_next_double(<philox_all_t *> st)
 cdef uint64_t philox2x32_raw(void *st) nogil:
     return <uint64_t>philox2x32_next32(<philox_all_t *> st)
+cdef void philox2x32_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = philox2x32_next64(<philox_all_t *> st)
+cdef void philox2x32_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = philox2x32_next_double(<philox_all_t *> st)
+
+cdef void philox2x64_values_at(void *st, uint64_t *positions, np.npy_intp cnt, uint64_t *out) nogil:
+    philox2x64_raw_at(<philox_all_t *> st, positions, <size_t>cnt, out)
+cdef void philox4x64_values_at(void *st, uint64_t *positions, np.npy_intp cnt, uint64_t *out) nogil:
+    philox4x64_raw_at(<philox_all_t *> st, positions, <size_t>cnt, out)
+cdef void philox4x32_values_at(void *st, uint64_t *positions, np.npy_intp cnt, uint64_t *out) nogil:
+    philox4x32_raw_at(<philox_all_t *> st, positions, <size_t>cnt, out)
+cdef void philox2x32_values_at(void *st, uint64_t *positions, np.npy_intp cnt, uint64_t *out) nogil:
+    philox2x32_raw_at(<philox_all_t *> st, positions, <size_t>cnt, out)
+
 
 cdef class Philox(BitGenerator):
     """
@@ -191,21 +225,29 @@ cdef class Philox(BitGenerator):
             self._bitgen.next_uint32 = &philox4x64_uint32
             self._bitgen.next_double = &philox4x64_double
             self._bitgen.next_raw = &philox4x64_uint64
+            self._bitgen.fill_uint64 = &philox4x64_fill_uint64
+            self._bitgen.fill_double = &philox4x64_fill_double
         elif self.n == 2 and self.w == 64:
             self._bitgen.next_uint64 = &philox2x64_uint64
             self._bitgen.next_uint32 = &philox2x64_uint32
             self._bitgen.next_double = &philox2x64_double
             self._bitgen.next_raw = &philox2x64_uint64
+            self._bitgen.fill_uint64 = &philox2x64_fill_uint64
+            self._bitgen.fill_double = &philox2x64_fill_double
         elif self.n == 4 and self.w == 32:
             self._bitgen.next_uint64 = &philox4x32_uint64
             self._bitgen.next_uint32 = &philox4x32_uint32
             self._bitgen.next_double = &philox4x32_double
             self._bitgen.next_raw = &philox4x32_raw
+            self._bitgen.fill_uint64 = &philox4x32_fill_uint64
+            self._bitgen.fill_double = &philox4x32_fill_double
         elif self.n == 2 and self.w == 32:
             self._bitgen.next_uint64 = &philox2x32_uint64
             self._bitgen.next_uint32 = &philox2x32_uint32
             self._bitgen.next_double = &philox2x32_double
             self._bitgen.next_raw = &philox2x32_raw
+            self._bitgen.fill_uint64 = &philox2x32_fill_uint64
+            self._bitgen.fill_double = &philox2x32_fill_double
 
     def __repr__(self):
         out = object.__repr__(self)
@@ -409,6 +451,145 @@ cdef class Philox(BitGenerator):
         self.rng_state.uinteger = value["uinteger"]
         self.rng_state.buffer_pos = value["buffer_pos"]
 
+    def random_raw_at(self, counter_start, n, key=None):
+        """
+        random_raw_at(counter_start, n, key=None)
+
+        Compute raw values directly from a counter and key
+
+        Parameters
+        ----------
+        counter_start : {int, array_like[uint64]}
+            Counter to start from. Can be either a Python int in
+            [0, 2**(number*width)) or an array of uint64 values.
+        n : int
+            Number of raw values to return.
+        key : {None, int, array_like[uint64]}, optional
+            Key to use. If None, the key of the bit generator is used.
+
+        Returns
+        -------
+        out : ndarray[uint64]
+            Array of n raw values.
+
+        Notes
+        -----
+        The values are identical to those returned by ``random_raw(n)`` from
+        a ``Philox`` with the same number and width initialized using
+        ``counter=counter_start`` and ``key=key``. The value at any position
+        in the stream is a function of the key and counter only, and so
+        the state of the bit generator is neither used nor changed.
+
+        Blocks are computed in batches directly into the output and the GIL
+        is released while computing the values.
+
+        Examples
+        --------
+        >>> from randomgen import Philox
+        >>> bg = Philox(key=1234)
+        >>> direct = bg.random_raw_at(2**64, 10)
+        >>> other = Philox(key=1234, counter=2**64)
+        >>> (direct == other.random_raw(10)).all()
+        True
+        """
+        cdef np.ndarray ctr, _key, out
+        cdef size_t nblocks
+        cdef void *ctr_p
+        cdef void *key_p
+        cdef void *out_p
+        cdef int number = self.n, width = self.w
+
+        n = int(n)
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        counter_start = object_to_int(counter_start, self.n * self.w,
+                                      "counter_start")
+        ctr = int_to_array(counter_start, "counter_start", self.n * self.w,
+                           self.w)
+        if key is None:
+            _key = self.state["state"]["key"]
+        else:
+            key = object_to_int(key, self.n // 2 * self.w, "key")
+            _key = int_to_array(key, "key", self.n // 2 * self.w, self.w)
+        dtype = np.uint64 if self.w == 64 else np.uint32
+        _key = np.ascontiguousarray(_key, dtype=dtype)
+        nblocks = (n + self.n - 1) // self.n
+        out = np.empty(nblocks * self.n, dtype=dtype)
+        ctr_p = np.PyArray_DATA(ctr)
+        key_p = np.PyArray_DATA(_key)
+        out_p = np.PyArray_DATA(out)
+        with nogil:
+            if number == 2 and width == 32:
+                philox2x32_blocks_at(<uint32_t *>ctr_p, <uint32_t *>key_p,
+                                     nblocks, <uint32_t *>out_p)
+            elif number == 4 and width == 32:
+                philox4x32_blocks_at(<uint32_t *>ctr_p, <uint32_t *>key_p,
+                                     nblocks, <uint32_t *>out_p)
+            elif number == 2 and width == 64:
+                philox2x64_blocks_at(<uint64_t *>ctr_p, <uint64_t *>key_p,
+                                     nblocks, <uint64_t *>out_p)
+            else:  # number == 4 and width == 64
+                philox4x64_blocks_at(<uint64_t *>ctr_p, <uint64_t *>key_p,
+                                     nblocks, <uint64_t *>out_p)
+        return out[:n].astype(np.uint64)
+
+    def values_at(self, positions, dtype=np.uint64):
+        """
+        values_at(positions, dtype=np.uint64)
+
+        Compute the values at positions in the stream without changing the state
+
+        Parameters
+        ----------
+        positions : array_like[int]
+            Non-negative positions relative to the next value. Position 0 is
+            the next value returned by ``random_raw``.
+        dtype : {np.uint64, np.float64}, optional
+            Type of the values to return. ``np.uint64`` returns the raw values
+            returned by ``random_raw``. ``np.float64`` returns the doubles in
+            [0, 1) that ``Generator.random`` would return.
+
+        Returns
+        -------
+        values : {int, float, ndarray}
+            Values at positions with the same shape as positions.
+
+        Notes
+        -----
+        The value at any position is a pure function of the key and the
+        counter and so positions can be evaluated in any order without
+        advancing the state. The cost of each value does not depend on the
+        position, which allows any part of a stream to be regenerated directly.
+        Consecutive positions that fall in the same block share the cost of
+        computing the block.
+
+        When width is 32, the raw values are 32-bit and each double is
+        constructed from two consecutive raw values.
+
+        Only uniform values are supported since distributions that use
+        rejection sampling, e.g., ``standard_normal``, consume an unknown
+        number of values.
+
+        Examples
+        --------
+        >>> from randomgen import Philox
+        >>> bg = Philox(1234, mode="sequence")
+        >>> values = bg.values_at([0, 1, 2**40])
+        >>> bool((values[:2] == bg.random_raw(2)).all())
+        True
+        """
+        cdef void *func
+        if self.n == 4 and self.w == 64:
+            func = <void *>&philox4x64_values_at
+        elif self.n == 2 and self.w == 64:
+            func = <void *>&philox2x64_values_at
+        elif self.n == 4 and self.w == 32:
+            func = <void *>&philox4x32_values_at
+        else:
+            func = <void *>&philox2x32_values_at
+        return values_at(func, <void *>&self.rng_state, self.lock, positions,
+                         dtype, self.w)
+
     cdef jump_inplace(self, object iter):
         """
         Jump state in-place
@@ -26,6 +26,16 @@ cdef uint32_t rdrand_uint32(void *st) nogil:
 cdef double rdrand_double(void* st) nogil:
     return uint64_to_double(rdrand_next64(<rdrand_state*>st))
 
+cdef void rdrand_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = rdrand_next64(<rdrand_state*>st)
+
+cdef void rdrand_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(rdrand_next64(<rdrand_state*>st))
+
 cdef class RDRAND(BitGenerator):
     """
     RDRAND(seed=None)
@@ -105,6 +115,8 @@ cdef class RDRAND(BitGenerator):
         self._bitgen.next_uint32 = &rdrand_uint32
         self._bitgen.next_double = &rdrand_double
         self._bitgen.next_raw = &rdrand_uint64
+        self._bitgen.fill_uint64 = &rdrand_fill_uint64
+        self._bitgen.fill_double = &rdrand_fill_double
 
     def _seed_from_seq(self):
         pass
@@ -18,12 +18,19 @@ cdef uint64_t sfmt_uint64(void* st) nogil:
 cdef uint32_t sfmt_uint32(void *st) nogil:
     return sfmt_next32(<sfmt_state_t *> st)
 
-cdef uint64_t sfmt_raw(void *st) nogil:
-    return sfmt_next64(<sfmt_state_t *>st)
-
 cdef double sfmt_double(void* st) nogil:
     return uint64_to_double(sfmt_next64(<sfmt_state_t *>st))
 
+cdef void sfmt_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = sfmt_next64(<sfmt_state_t *>st)
+
+cdef void sfmt_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(sfmt_next64(<sfmt_state_t *>st))
+
 
 cdef class SFMT(BitGenerator):
     u"""
@@ -125,7 +132,9 @@ cdef class SFMT(BitGenerator):
         self._bitgen.next_uint64 = &sfmt_uint64
         self._bitgen.next_uint32 = &sfmt_uint32
         self._bitgen.next_double = &sfmt_double
-        self._bitgen.next_raw = &sfmt_raw
+        self._bitgen.next_raw = &sfmt_uint64
+        self._bitgen.fill_uint64 = &sfmt_fill_uint64
+        self._bitgen.fill_double = &sfmt_fill_double
 
     def __dealloc__(self):
         if self.rng_state.state:
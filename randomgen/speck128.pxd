@@ -31,6 +31,7 @@ cdef extern from "src/speck-128/speck-128.h":
     void speck_seed(speck_state_t *state, uint64_t *seed)
     void speck_set_counter(speck_state_t *state, uint64_t *ctr)
     void speck_advance(speck_state_t *state, uint64_t *step)
+    void speck_raw_at(speck_state_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
 
 
 cdef class SPECK128(BitGenerator):
@@ -17,6 +17,20 @@ cdef uint32_t speck_uint32(void *st) nogil:
 cdef double speck_double(void* st) nogil:
     return uint64_to_double(speck_next64(<speck_state_t *>st))
 
+cdef void speck_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = speck_next64(<speck_state_t *>st)
+
+cdef void speck_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(speck_next64(<speck_state_t *>st))
+
+cdef void speck_values_at(void *st, uint64_t *positions, np.npy_intp cnt, uint64_t *out) nogil:
+    speck_raw_at(<speck_state_t *>st, positions, <size_t>cnt, out)
+
+
 cdef class SPECK128(BitGenerator):
     """
     SPECK128(seed=None, *, counter=None, key=None, rounds=34, mode=None)
@@ -148,6 +162,8 @@ cdef class SPECK128(BitGenerator):
         self._bitgen.next_uint32 = &speck_uint32
         self._bitgen.next_double = &speck_double
         self._bitgen.next_raw = &speck_uint64
+        self._bitgen.fill_uint64 = &speck_fill_uint64
+        self._bitgen.fill_double = &speck_fill_double
 
     def __dealloc__(self):
         if self.rng_state:
@@ -439,3 +455,48 @@ cdef class SPECK128(BitGenerator):
         self.rng_state.has_uint32 = 0
         self.rng_state.uinteger = 0
         return self
+
+    def values_at(self, positions, dtype=np.uint64):
+        """
+        values_at(positions, dtype=np.uint64)
+
+        Compute the values at positions in the stream without changing the state
+
+        Parameters
+        ----------
+        positions : array_like[int]
+            Non-negative positions relative to the next value. Position 0 is
+            the next value returned by ``random_raw``.
+        dtype : {np.uint64, np.float64}, optional
+            Type of the values to return. ``np.uint64`` returns the raw values
+            returned by ``random_raw``. ``np.float64`` returns the doubles in
+            [0, 1) that ``Generator.random`` would return.
+
+        Returns
+        -------
+        values : {int, float, ndarray}
+            Values at positions with the same shape as positions.
+
+        Notes
+        -----
+        The value at any position is a pure function of the key and the
+        counter and so positions can be evaluated in any order without
+        advancing the state. The cost of each value does not depend on the
+        position, which allows any part of a stream to be regenerated directly.
+        Consecutive positions that fall in the same block share the cost of
+        computing the block.
+
+        Only uniform values are supported since distributions that use
+        rejection sampling, e.g., ``standard_normal``, consume an unknown
+        number of values.
+
+        Examples
+        --------
+        >>> from randomgen import SPECK128
+        >>> bg = SPECK128(1234, mode="sequence")
+        >>> values = bg.values_at([0, 1, 2**40])
+        >>> bool((values[:2] == bg.random_raw(2)).all())
+        True
+        """
+        return values_at(<void *>&speck_values_at, <void *>self.rng_state,
+                         self.lock, positions, dtype, 64)
@@ -2,8 +2,11 @@
 #include "../common/cpu_features.h"
 
 #define AES_FEATURE_FLAG 25
+#define AVX512F_FEATURE_FLAG 16
+#define VAES_FEATURE_FLAG 9
 
 int RANDOMGEN_USE_AESNI;
+int RANDOMGEN_USE_VAES;
 
 int aes_capable(void)
 {
@@ -18,6 +21,74 @@ int aes_capable(void)
 #endif
 }
 
+int aes_vaes_capable(void)
+{
+#if defined(RANDOMGEN_HAVE_VAES)
+    int flags[32], ebx_flags[32], ecx_flags[32];
+    feature_flags(flags, RANDOMGEN_ECX);
+    extended_feature_flags(ebx_flags, RANDOMGEN_EBX);
+    extended_feature_flags(ecx_flags, RANDOMGEN_ECX);
+    RANDOMGEN_USE_VAES = flags[AES_FEATURE_FLAG] &&
+                         ebx_flags[AVX512F_FEATURE_FLAG] &&
+                         ecx_flags[VAES_FEATURE_FLAG] && os_avx512_support();
+    return RANDOMGEN_USE_VAES;
+#else
+    RANDOMGEN_USE_VAES = 0;
+    return 0;
+#endif
+}
+
+#if defined(RANDOMGEN_HAVE_VAES)
+#define VAES_TARGET __attribute__((target("avx512f,vaes")))
+
+/* Encrypt 4 blocks per instruction. n is constant so the loops unroll */
+static INLINE VAES_TARGET void aesctr_vaes_n(aesctr_state_t *state,
+                                             const int n)
+{
+    __m512i work[AESCTR_MAX_UNROLL / 4];
+    __m512i subkey;
+    int i, r;
+    subkey = _mm512_broadcast_i32x4(state->seed[0].m128);
+    for (i = 0; i < n; ++i)
+    {
+        work[i] = _mm512_xor_si512(
+            _mm512_loadu_si512((void *)&state->ctr[4 * i]), subkey);
+    }
+    for (r = 1; r <= AESCTR_ROUNDS - 1; ++r)
+    {
+        subkey = _mm512_broadcast_i32x4(state->seed[r].m128);
+        for (i = 0; i < n; ++i)
+        {
+            work[i] = _mm512_aesenc_epi128(work[i], subkey);
+        }
+    }
+    subkey = _mm512_broadcast_i32x4(state->seed[AESCTR_ROUNDS].m128);
+    for (i = 0; i < n; ++i)
+    {
+        _mm512_storeu_si512((void *)&state->state[64 * i],
+                            _mm512_aesenclast_epi128(work[i], subkey));
+    }
+    aesctr_increment(state, 4 * n);
+}
+
+VAES_TARGET void aesctr_refill_vaes(aesctr_state_t *state)
+{
+    switch (state->lanes)
+    {
+    case 16:
+        aesctr_vaes_n(state, 4);
+        break;
+    case 8:
+        aesctr_vaes_n(state, 2);
+        break;
+    default:
+        aesctr_vaes_n(state, 1);
+    }
+}
+
+#undef VAES_TARGET
+#endif
+
 #define AES_ROUND(rcon, index)                                                 \
     do                                                                         \
     {                                                                          \
@@ -32,8 +103,13 @@ int aes_capable(void)
 void aesctr_seed_r(aesctr_state_t *state, uint64_t *seed)
 {
     int i;
-    /* Call to ensure  RANDOMGEN_USE_AESNI is assigned*/
+    /* Call to ensure RANDOMGEN_USE_AESNI and RANDOMGEN_USE_VAES are assigned*/
     aes_capable();
+    aes_vaes_capable();
+    if (state->lanes != 8 && state->lanes != 16)
+    {
+        state->lanes = AESCTR_UNROLL;
+    }
     /*static const uint8_t rcon[] = {
         0x8d, 0x01, 0x02, 0x04,
         0x08, 0x10, 0x20, 0x40,
@@ -65,7 +141,7 @@ void aesctr_seed_r(aesctr_state_t *state, uint64_t *seed)
         AES_ROUND(0x80, 8);
         AES_ROUND(0x1b, 9);
         AES_ROUND(0x36, 10);
-        for (i = 0; i < AESCTR_UNROLL; ++i)
+        for (i = 0; i < state->lanes; ++i)
         {
             state->ctr[i].m128 = _mm_set_epi64x(0, i);
         }
@@ -73,20 +149,22 @@ void aesctr_seed_r(aesctr_state_t *state, uint64_t *seed)
     }
     else
     {
-        for (i = 0; i < AESCTR_UNROLL; ++i)
+        for (i = 0; i < state->lanes; ++i)
         {
             state->ctr[i].u64[0] = i;
             state->ctr[i].u64[1] = 0;
         }
         tinyaes_expand_key((uint8_t *)&state->seed, (uint8_t *)seed);
     }
-    state->offset = 16 * AESCTR_UNROLL;
+    state->offset = 16 * state->lanes;
 }
 
 #undef AES_ROUND
 
 void aesctr_use_aesni(int val) { RANDOMGEN_USE_AESNI = val; }
 
+void aesctr_use_vaes(int val) { RANDOMGEN_USE_VAES = val; }
+
 void aesctr_seed(aesctr_state_t *state, uint64_t *seed)
 {
     aesctr_seed_r(state, seed);
@@ -96,12 +174,12 @@ void aesctr_get_seed_counter(aesctr_state_t *state, uint64_t *seed,
                              uint64_t *counter)
 {
     memcpy(seed, &state->seed, (AESCTR_ROUNDS + 1) * sizeof(aes128_t));
-    memcpy(counter, &state->ctr, AESCTR_UNROLL * sizeof(aes128_t));
+    memcpy(counter, &state->ctr, state->lanes * sizeof(aes128_t));
 }
 
 void aesctr_set_counter(aesctr_state_t *state, uint64_t *counter)
 {
-    memcpy(&state->ctr, counter, AESCTR_UNROLL * sizeof(aes128_t));
+    memcpy(&state->ctr, counter, state->lanes * sizeof(aes128_t));
 }
 
 void aesctr_set_seed_counter(aesctr_state_t *state, uint64_t *seed,
@@ -116,9 +194,10 @@ void aesctr_advance(aesctr_state_t *state, uint64_t *step)
     uint64_t low;
     uint64_t temp[2];
     uint64_t adj_step[2];
-    size_t new_offset;
+    size_t new_offset, buffer_size;
     int i;
-    if (state->offset == 64)
+    buffer_size = 16 * (size_t)state->lanes;
+    if (state->offset == buffer_size)
     {
         /* Force update and reset the offset to simplify */
         aesctr_r(state);
@@ -135,7 +214,7 @@ void aesctr_advance(aesctr_state_t *state, uint64_t *step)
     }
     /* Update the counters to new **next** values */
     /* TODO: These memcpy are not needed since can use .u64 directly */
-    for (i = 0; i < AESCTR_UNROLL; i++)
+    for (i = 0; i < state->lanes; i++)
     {
         memcpy(&temp, &state->ctr[i], sizeof(aes128_t));
         low = temp[0];
@@ -147,12 +226,12 @@ void aesctr_advance(aesctr_state_t *state, uint64_t *step)
         };
         memcpy(&state->ctr[i].u64[0], &temp, sizeof(aes128_t));
     }
-    /* Subtract 4 to get previous counter, and regenerate */
-    for (i = 0; i < AESCTR_UNROLL; i++)
+    /* Subtract lanes to get previous counter, and regenerate */
+    for (i = 0; i < state->lanes; i++)
     {
         memcpy(&temp, &state->ctr[i], sizeof(aes128_t));
         low = temp[0];
-        temp[0] -= 4;
+        temp[0] -= state->lanes;
         if (temp[0] > low)
         {
             temp[1]--;
@@ -161,7 +240,7 @@ void aesctr_advance(aesctr_state_t *state, uint64_t *step)
     }
     /* Force update */
     new_offset = state->offset;
-    state->offset = 64;
+    state->offset = buffer_size;
     aesctr_r(state);
     /* Reset the offset */
     state->offset = new_offset;
@@ -172,3 +251,68 @@ extern INLINE uint64_t aes_next64(aesctr_state_t *state);
 extern INLINE uint32_t aes_next32(aesctr_state_t *state);
 
 extern INLINE double aes_next_double(aesctr_state_t *state);
+
+extern INLINE void aes_fill64(aesctr_state_t *state, size_t cnt,
+                              uint64_t *out);
+
+/* Encrypt a single 128-bit counter */
+static INLINE void aesctr_encrypt(aesctr_state_t *state, const uint64_t *ctr,
+                                  uint64_t *out)
+{
+    aes128_t block;
+    block.u64[0] = ctr[0];
+    block.u64[1] = ctr[1];
+    if (RANDOMGEN_USE_AESNI)
+    {
+#if defined(__AES__) && __AES__
+        int r;
+        __m128i work = _mm_xor_si128(block.m128, state->seed[0].m128);
+        for (r = 1; r <= AESCTR_ROUNDS - 1; ++r)
+        {
+            work = _mm_aesenc_si128(work, state->seed[r].m128);
+        }
+        block.m128 = _mm_aesenclast_si128(work, state->seed[AESCTR_ROUNDS].m128);
+#endif
+    }
+    else
+    {
+        tiny_encrypt((state_t *)&block, (uint8_t *)&state->seed);
+    }
+    out[0] = block.u64[0];
+    out[1] = block.u64[1];
+}
+
+/* Stateless evaluation of the values at positions relative to the next value
+   returned by aes_next64 */
+void aesctr_raw_at(aesctr_state_t *state, uint64_t *positions, size_t cnt,
+                   uint64_t *out)
+{
+    size_t j, lanes;
+    uint64_t w, blk, last_blk = 0;
+    uint64_t base[2], ctr[2], block[2];
+    int have_block = 0;
+    lanes = (size_t)state->lanes;
+    /* The buffer holds the encrypted counters ctr[0] - lanes, ... */
+    base[0] = state->ctr[0].u64[0] - lanes;
+    base[1] = state->ctr[0].u64[1] - (base[0] > state->ctr[0].u64[0]);
+    for (j = 0; j < cnt; j++)
+    {
+        w = positions[j] + state->offset / sizeof(uint64_t);
+        if (w < 2 * lanes)
+        {
+            memcpy(&out[j], &state->state[sizeof(uint64_t) * w],
+                   sizeof(uint64_t));
+            continue;
+        }
+        blk = w / 2;
+        if (!have_block || blk != last_blk)
+        {
+            ctr[0] = base[0] + blk;
+            ctr[1] = base[1] + (ctr[0] < blk);
+            aesctr_encrypt(state, ctr, block);
+            last_blk = blk;
+            have_block = 1;
+        }
+        out[j] = block[w % 2];
+    }
+}
@@ -20,9 +20,20 @@
 #include "softaes.h"
 
 #define AESCTR_UNROLL 4
+#define AESCTR_MAX_UNROLL 16
 #define AESCTR_ROUNDS 10
 
+/* VAES requires compiler support for the target attribute */
+#undef RANDOMGEN_HAVE_VAES
+#if defined(__AES__) && __AES__ && (defined(__x86_64__) || defined(_M_X64))
+#if (defined(__clang__) && __clang_major__ >= 8) ||                            \
+    (!defined(__clang__) && defined(__GNUC__) && __GNUC__ >= 8)
+#define RANDOMGEN_HAVE_VAES 1
+#endif
+#endif
+
 extern int RANDOMGEN_USE_AESNI;
+extern int RANDOMGEN_USE_VAES;
 
 union AES128_T {
 #if defined(__AES__) && __AES__
@@ -36,58 +47,91 @@ union AES128_T {
 typedef union AES128_T aes128_t;
 
 struct AESCTR_STATE_T {
-  ALIGN_WINDOWS aes128_t ctr[AESCTR_UNROLL] ALIGN_GCC_CLANG;
+  ALIGN_WINDOWS aes128_t ctr[AESCTR_MAX_UNROLL] ALIGN_GCC_CLANG;
   ALIGN_WINDOWS aes128_t seed[AESCTR_ROUNDS + 1] ALIGN_GCC_CLANG;
-  ALIGN_WINDOWS uint8_t state[16 * AESCTR_UNROLL] ALIGN_GCC_CLANG;
+  ALIGN_WINDOWS uint8_t state[16 * AESCTR_MAX_UNROLL] ALIGN_GCC_CLANG;
   size_t offset;
   int has_uint32;
   uint32_t uinteger;
+  int lanes;
 };
 
 typedef struct AESCTR_STATE_T aesctr_state_t;
 
-static INLINE uint64_t aesctr_r(aesctr_state_t *state) {
-  uint64_t output;
-  if (UNLIKELY(state->offset >= 16 * AESCTR_UNROLL)) {
-    if (RANDOMGEN_USE_AESNI) {
+#if defined(RANDOMGEN_HAVE_VAES)
+extern void aesctr_refill_vaes(aesctr_state_t *state);
+#endif
+
+static INLINE void aesctr_increment(aesctr_state_t *state, const int lanes) {
+  int i;
+  for (i = 0; i < lanes; i++) {
+    state->ctr[i].u64[0] += lanes;
+    /* Rolled if less than lanes */
+    state->ctr[i].u64[1] += (state->ctr[i].u64[0] < (uint64_t)lanes);
+  }
+}
+
 #if defined(__AES__) && __AES__
-      __m128i work[AESCTR_UNROLL];
-      for (int i = 0; i < AESCTR_UNROLL; ++i) {
-        work[i] = _mm_xor_si128(state->ctr[i].m128, state->seed[0].m128);
-      }
-      for (int r = 1; r <= AESCTR_ROUNDS - 1; ++r) {
-        const __m128i subkey = state->seed[r].m128;
-        for (int i = 0; i < AESCTR_UNROLL; ++i) {
-          work[i] = _mm_aesenc_si128(work[i], subkey);
-        }
-      }
-      for (int i = 0; i < AESCTR_UNROLL; ++i) {
-        state->ctr[i].m128 =
-            _mm_add_epi64(state->ctr[i].m128, _mm_set_epi64x(0, AESCTR_UNROLL));
-        if (UNLIKELY(state->ctr[i].u64[0] < AESCTR_UNROLL)) {
-          /* rolled, add carry */
-          state->ctr[i].m128 =
-              _mm_add_epi64(state->ctr[i].m128, _mm_set_epi64x(1, 0));
-        }
-        _mm_storeu_si128(
-            (__m128i *)&state->state[16 * i],
-            _mm_aesenclast_si128(work[i], state->seed[AESCTR_ROUNDS].m128));
-      }
-      state->offset = 0;
+/* lanes is always a constant so that the loops are unrolled */
+static INLINE void aesctr_refill_aesni(aesctr_state_t *state,
+                                       const int lanes) {
+  __m128i work[AESCTR_MAX_UNROLL];
+  int i, r;
+  for (i = 0; i < lanes; ++i) {
+    work[i] = _mm_xor_si128(state->ctr[i].m128, state->seed[0].m128);
+  }
+  for (r = 1; r <= AESCTR_ROUNDS - 1; ++r) {
+    const __m128i subkey = state->seed[r].m128;
+    for (i = 0; i < lanes; ++i) {
+      work[i] = _mm_aesenc_si128(work[i], subkey);
+    }
+  }
+  for (i = 0; i < lanes; ++i) {
+    _mm_storeu_si128(
+        (__m128i *)&state->state[16 * i],
+        _mm_aesenclast_si128(work[i], state->seed[AESCTR_ROUNDS].m128));
+  }
+  aesctr_increment(state, lanes);
+}
 #endif
-    } else {
-      int i;
-      memcpy(&state->state, &state->ctr, sizeof(state->state));
-      for (i = 0; i < 4; i++) {
-        tiny_encrypt((state_t *)&state->state[16 * i], (uint8_t *)&state->seed);
-      }
-      for (i = 0; i < 4; i++) {
-        state->ctr[i].u64[0] += AESCTR_UNROLL;
-        /* Rolled if less than AESCTR_UNROLL */
-        state->ctr[i].u64[1] += (state->ctr[i].u64[0] < AESCTR_UNROLL);
-      }
+
+static INLINE void aesctr_refill(aesctr_state_t *state) {
+  if (RANDOMGEN_USE_AESNI) {
+#if defined(RANDOMGEN_HAVE_VAES)
+    if (RANDOMGEN_USE_VAES) {
+      aesctr_refill_vaes(state);
       state->offset = 0;
+      return;
+    }
+#endif
+#if defined(__AES__) && __AES__
+    switch (state->lanes) {
+    case 16:
+      aesctr_refill_aesni(state, 16);
+      break;
+    case 8:
+      aesctr_refill_aesni(state, 8);
+      break;
+    default:
+      aesctr_refill_aesni(state, AESCTR_UNROLL);
     }
+    state->offset = 0;
+#endif
+  } else {
+    int i;
+    memcpy(&state->state, &state->ctr, 16 * state->lanes);
+    for (i = 0; i < state->lanes; i++) {
+      tiny_encrypt((state_t *)&state->state[16 * i], (uint8_t *)&state->seed);
+    }
+    aesctr_increment(state, state->lanes);
+    state->offset = 0;
+  }
+}
+
+static INLINE uint64_t aesctr_r(aesctr_state_t *state) {
+  uint64_t output;
+  if (UNLIKELY(state->offset >= 16 * (size_t)state->lanes)) {
+    aesctr_refill(state);
   }
   output = 0;
   memcpy(&output, &state->state[state->offset], sizeof(output));
@@ -115,8 +159,27 @@ static INLINE double aes_next_double(aesctr_state_t *state) {
   return (aesctr_r(state) >> 11) * (1. / (UINT64_C(1) << 53));
 }
 
+/* Copy cnt values from the buffer in blocks rather than one at a time */
+static INLINE void aes_fill64(aesctr_state_t *state, size_t cnt,
+                              uint64_t *out) {
+  size_t avail, n;
+  while (cnt > 0) {
+    if (UNLIKELY(state->offset >= 16 * (size_t)state->lanes)) {
+      aesctr_refill(state);
+    }
+    avail = (16 * (size_t)state->lanes - state->offset) / sizeof(uint64_t);
+    n = cnt < avail ? cnt : avail;
+    memcpy(out, &state->state[state->offset], n * sizeof(uint64_t));
+    state->offset += n * sizeof(uint64_t);
+    out += n;
+    cnt -= n;
+  }
+}
+
 extern void aesctr_use_aesni(int val);
 extern int aes_capable(void);
+extern void aesctr_use_vaes(int val);
+extern int aes_vaes_capable(void);
 extern void aesctr_seed(aesctr_state_t *state, uint64_t *seed);
 extern void aesctr_set_counter(aesctr_state_t *state, uint64_t *counter);
 extern void aesctr_set_seed_counter(aesctr_state_t *state, uint64_t *seed,
@@ -124,5 +187,7 @@ extern void aesctr_set_seed_counter(aesctr_state_t *state, uint64_t *seed,
 extern void aesctr_get_seed_counter(aesctr_state_t *state, uint64_t *seed,
                                     uint64_t *counter);
 extern void aesctr_advance(aesctr_state_t *state, uint64_t *step);
+extern void aesctr_raw_at(aesctr_state_t *state, uint64_t *positions,
+                          size_t cnt, uint64_t *out);
 //#endif // __AES__
 #endif
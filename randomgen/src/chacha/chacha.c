@@ -1,11 +1,16 @@
 #include "chacha.h"
 #include "../common/cpu_features.h"
 
+#define AVX2_FEATURE_FLAG 5
+
 int RANDOMGEN_USE_SIMD;
+int RANDOMGEN_USE_AVX2;
 
 extern INLINE uint32_t chacha_next32(chacha_state_t *state);
 extern INLINE uint64_t chacha_next64(chacha_state_t *state);
 extern INLINE double chacha_next_double(chacha_state_t *state);
+extern INLINE void chacha_fill64(chacha_state_t *state, size_t cnt,
+                                 uint64_t *out);
 
 #if defined(__SSE2__) && __SSE2__
 #if defined(__SSSE3__) && __SSSE3__
@@ -33,9 +38,130 @@ int chacha_simd_capable(void) {
 
 void chacha_use_simd(int flag) { RANDOMGEN_USE_SIMD = flag; }
 
+int chacha_avx2_capable(void) {
+#if defined(RANDOMGEN_HAVE_AVX2)
+  int flags[32];
+  extended_feature_flags(flags, RANDOMGEN_EBX);
+  RANDOMGEN_USE_AVX2 = flags[AVX2_FEATURE_FLAG] && os_avx_support();
+  return RANDOMGEN_USE_AVX2;
+#else
+  RANDOMGEN_USE_AVX2 = 0;
+  return 0;
+#endif
+}
+
+void chacha_use_avx2(int flag) { RANDOMGEN_USE_AVX2 = flag; }
+
+#if defined(RANDOMGEN_HAVE_AVX2)
+#define AVX2_TARGET __attribute__((target("avx2")))
+
+#define CHACHA_ROTL_AVX2(x, n)                                                 \
+  _mm256_or_si256(_mm256_slli_epi32(x, n), _mm256_srli_epi32(x, 32 - (n)))
+
+#define CHACHA_QUARTERROUND_AVX2(x, a, b, c, d)                                \
+  x[a] = _mm256_add_epi32(x[a], x[b]);                                         \
+  x[d] = _mm256_shuffle_epi8(_mm256_xor_si256(x[d], x[a]), rot16);             \
+  x[c] = _mm256_add_epi32(x[c], x[d]);                                         \
+  x[b] = CHACHA_ROTL_AVX2(_mm256_xor_si256(x[b], x[c]), 12);                   \
+  x[a] = _mm256_add_epi32(x[a], x[b]);                                         \
+  x[d] = _mm256_shuffle_epi8(_mm256_xor_si256(x[d], x[a]), rot8);              \
+  x[c] = _mm256_add_epi32(x[c], x[d]);                                         \
+  x[b] = CHACHA_ROTL_AVX2(_mm256_xor_si256(x[b], x[c]), 7)
+
+/* Transpose 8 rows of 8 words so that row i holds word i of each block */
+static INLINE AVX2_TARGET void chacha_transpose_avx2(__m256i *r) {
+  __m256i t0, t1, t2, t3, t4, t5, t6, t7;
+  __m256i u0, u1, u2, u3, u4, u5, u6, u7;
+  t0 = _mm256_unpacklo_epi32(r[0], r[1]);
+  t1 = _mm256_unpackhi_epi32(r[0], r[1]);
+  t2 = _mm256_unpacklo_epi32(r[2], r[3]);
+  t3 = _mm256_unpackhi_epi32(r[2], r[3]);
+  t4 = _mm256_unpacklo_epi32(r[4], r[5]);
+  t5 = _mm256_unpackhi_epi32(r[4], r[5]);
+  t6 = _mm256_unpacklo_epi32(r[6], r[7]);
+  t7 = _mm256_unpackhi_epi32(r[6], r[7]);
+  u0 = _mm256_unpacklo_epi64(t0, t2);
+  u1 = _mm256_unpackhi_epi64(t0, t2);
+  u2 = _mm256_unpacklo_epi64(t1, t3);
+  u3 = _mm256_unpackhi_epi64(t1, t3);
+  u4 = _mm256_unpacklo_epi64(t4, t6);
+  u5 = _mm256_unpackhi_epi64(t4, t6);
+  u6 = _mm256_unpacklo_epi64(t5, t7);
+  u7 = _mm256_unpackhi_epi64(t5, t7);
+  r[0] = _mm256_permute2x128_si256(u0, u4, 0x20);
+  r[1] = _mm256_permute2x128_si256(u1, u5, 0x20);
+  r[2] = _mm256_permute2x128_si256(u2, u6, 0x20);
+  r[3] = _mm256_permute2x128_si256(u3, u7, 0x20);
+  r[4] = _mm256_permute2x128_si256(u0, u4, 0x31);
+  r[5] = _mm256_permute2x128_si256(u1, u5, 0x31);
+  r[6] = _mm256_permute2x128_si256(u2, u6, 0x31);
+  r[7] = _mm256_permute2x128_si256(u3, u7, 0x31);
+}
+
+/* Compute 8 consecutive blocks in parallel, one block per 32-bit lane */
+AVX2_TARGET void chacha_core_avx2(chacha_state_t *state, uint32_t input[16]) {
+  __m256i x[16], orig[16];
+  const __m256i rot16 =
+      _mm256_setr_epi8(2, 3, 0, 1, 6, 7, 4, 5, 10, 11, 8, 9, 14, 15, 12, 13, 2,
+                       3, 0, 1, 6, 7, 4, 5, 10, 11, 8, 9, 14, 15, 12, 13);
+  const __m256i rot8 =
+      _mm256_setr_epi8(3, 0, 1, 2, 7, 4, 5, 6, 11, 8, 9, 10, 15, 12, 13, 14, 3,
+                       0, 1, 2, 7, 4, 5, 6, 11, 8, 9, 10, 15, 12, 13, 14);
+  int i;
+
+  for (i = 0; i < 16; ++i) {
+    orig[i] = _mm256_set1_epi32((int)input[i]);
+  }
+  /* ctr is a multiple of CHACHA_BUFFER_WORDS so input[12] never carries */
+  orig[12] = _mm256_add_epi32(orig[12], _mm256_setr_epi32(0, 1, 2, 3, 4, 5, 6, 7));
+  for (i = 0; i < 16; ++i) {
+    x[i] = orig[i];
+  }
+  for (i = 0; i < state->rounds; i += 2) {
+    CHACHA_QUARTERROUND_AVX2(x, 0, 4, 8, 12);
+    CHACHA_QUARTERROUND_AVX2(x, 1, 5, 9, 13);
+    CHACHA_QUARTERROUND_AVX2(x, 2, 6, 10, 14);
+    CHACHA_QUARTERROUND_AVX2(x, 3, 7, 11, 15);
+    CHACHA_QUARTERROUND_AVX2(x, 0, 5, 10, 15);
+    CHACHA_QUARTERROUND_AVX2(x, 1, 6, 11, 12);
+    CHACHA_QUARTERROUND_AVX2(x, 2, 7, 8, 13);
+    CHACHA_QUARTERROUND_AVX2(x, 3, 4, 9, 14);
+  }
+  for (i = 0; i < 16; ++i) {
+    x[i] = _mm256_add_epi32(x[i], orig[i]);
+  }
+  chacha_transpose_avx2(&x[0]);
+  chacha_transpose_avx2(&x[8]);
+  for (i = 0; i < 8; ++i) {
+    _mm256_storeu_si256((__m256i *)&state->block[16 * i], x[i]);
+    _mm256_storeu_si256((__m256i *)&state->block[16 * i + 8], x[8 + i]);
+  }
+}
+
+#undef CHACHA_QUARTERROUND_AVX2
+#undef CHACHA_ROTL_AVX2
+#undef AVX2_TARGET
+#endif
+
+/* Regenerate the buffer that contains the most recently used word */
+void chacha_refresh(chacha_state_t *state) {
+  uint64_t ctr[2];
+  ctr[0] = state->ctr[0];
+  ctr[1] = state->ctr[1];
+  /* Move to the start of the buffer containing ctr - 1 */
+  if (state->ctr[0] == 0) {
+    --state->ctr[1];
+  }
+  state->ctr[0] = ((state->ctr[0] - 1) / CHACHA_BUFFER_WORDS) * CHACHA_BUFFER_WORDS;
+  generate_block(state);
+  state->ctr[0] = ctr[0];
+  state->ctr[1] = ctr[1];
+}
+
 void chacha_seed(chacha_state_t *state, uint64_t *seedval, uint64_t *stream,
                  uint64_t *ctr) {
   chacha_simd_capable();
+  chacha_avx2_capable();
   // Using a 128-bit seed.
   state->keysetup[0] = seedval[0] & 0xffffffffu;
   state->keysetup[1] = seedval[0] >> 32;
@@ -47,22 +173,55 @@ void chacha_seed(chacha_state_t *state, uint64_t *seedval, uint64_t *stream,
   state->keysetup[6] = stream[1] & 0xffffffffu;
   state->keysetup[7] = stream[1] >> 32;
 
-  /* Ensure str[0] is at a node where a block would be generated */
-  state->ctr[0] = ((ctr[0] >> 4) << 4);
-  state->ctr[1] = ctr[1];
-  generate_block(state);
-  /* Store correct value of counter */
   state->ctr[0] = ctr[0];
+  state->ctr[1] = ctr[1];
+  chacha_refresh(state);
 }
 
 void chacha_advance(chacha_state_t *state, uint64_t *delta) {
-  int carry, idx = state->ctr[0] % 16;
+  int carry;
   uint64_t orig;
   orig = state->ctr[0];
   state->ctr[0] += delta[0];
   carry = state->ctr[0] < orig;
   state->ctr[1] += (delta[1] + carry);
-  if ((idx + delta[0] >= 16 || delta[1]) && ((state->ctr[0] % 16) != 0)) {
-    generate_block(state);
+  chacha_refresh(state);
+}
+
+/* Stateless evaluation of the values at positions relative to the next value
+   returned by chacha_next64. Each value combines two consecutive words. */
+void chacha_raw_at(chacha_state_t *state, uint64_t *positions, size_t cnt,
+                   uint64_t *out) {
+  size_t j;
+  int i, k, have_block = 0;
+  uint64_t word[2], blk[2], last_blk[2] = {0, 0}, step;
+  uint32_t input[16], block[16], value[2];
+  uint32_t constants[4] = {0x61707865, 0x3320646e, 0x79622d32, 0x6b206574};
+
+  for (i = 0; i < 4; ++i) input[i] = constants[i];
+  for (i = 0; i < 8; ++i) input[4 + i] = state->keysetup[i];
+  for (j = 0; j < cnt; j++) {
+    for (k = 0; k < 2; k++) {
+      /* 128-bit index of the word */
+      step = 2 * positions[j] + k;
+      word[0] = state->ctr[0] + step;
+      word[1] = state->ctr[1] + (word[0] < step) + (positions[j] >> 63);
+      blk[0] = (word[0] >> 4) | (word[1] << 60);
+      blk[1] = word[1] >> 4;
+      if (!have_block || blk[0] != last_blk[0] || blk[1] != last_blk[1]) {
+        input[12] = blk[0] & 0xffffffffu;
+        input[13] = blk[0] >> 32;
+        input[14] = blk[1] & 0xffffffffu;
+        input[15] = blk[1] >> 32;
+        for (i = 0; i < 16; ++i) block[i] = input[i];
+        chacha_core(block, state->rounds);
+        for (i = 0; i < 16; ++i) block[i] += input[i];
+        last_blk[0] = blk[0];
+        last_blk[1] = blk[1];
+        have_block = 1;
+      }
+      value[k] = block[word[0] % 16];
+    }
+    out[j] = value[0] | ((uint64_t)value[1] << 32);
   }
 }
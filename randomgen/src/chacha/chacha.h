@@ -30,13 +30,27 @@
 #define M128I_CAST (__m128i)
 #endif
 
+/* Number of 64-byte blocks generated in each refill of the buffer */
+#define CHACHA_BUFFER_BLOCKS 8
+#define CHACHA_BUFFER_WORDS (16 * CHACHA_BUFFER_BLOCKS)
+
+/* AVX2 requires compiler support for the target attribute */
+#undef RANDOMGEN_HAVE_AVX2
+#if defined(__SSE2__) && __SSE2__ && (defined(__x86_64__) || defined(_M_X64))
+#if (defined(__clang__) && __clang_major__ >= 4) ||                            \
+    (!defined(__clang__) && defined(__GNUC__) && __GNUC__ >= 5)
+#define RANDOMGEN_HAVE_AVX2 1
+#endif
+#endif
+
 extern int RANDOMGEN_USE_SIMD;
+extern int RANDOMGEN_USE_AVX2;
 
 
 typedef double * aligned_double_ptr ;
 
 ALIGN_WINDOWS struct CHACHA_STATE_T {
-    ALIGN_WINDOWS uint32_t block[16] ALIGN_GCC_CLANG;
+    ALIGN_WINDOWS uint32_t block[CHACHA_BUFFER_WORDS] ALIGN_GCC_CLANG;
     uint32_t keysetup[8];
     uint64_t ctr[2];
     int rounds;
@@ -79,7 +93,7 @@ typedef struct CHACHA_STATE_T chacha_state_t;
     #include <xopintrin.h>
 #endif
 
-static INLINE void chacha_core_ssse3(chacha_state_t *state) {
+static INLINE void chacha_core_ssse3(uint32_t *block, int rounds) {
     // ROTVn rotates the elements in the given vector n places to the left.
     int i;
 
@@ -87,12 +101,12 @@ static INLINE void chacha_core_ssse3(chacha_state_t *state) {
     #define CHACHA_ROTV2(x) _mm_shuffle_epi32(M128I_CAST x, 0x4e)
     #define CHACHA_ROTV3(x) _mm_shuffle_epi32(M128I_CAST x, 0x93)
 
-    __m128i a = _mm_load_si128((__m128i*) (&state->block[0]));
-    __m128i b = _mm_load_si128((__m128i*) (&state->block[4]));
-    __m128i c = _mm_load_si128((__m128i*) (&state->block[8]));
-    __m128i d = _mm_load_si128((__m128i*) (&state->block[12]));
+    __m128i a = _mm_load_si128((__m128i*) (&block[0]));
+    __m128i b = _mm_load_si128((__m128i*) (&block[4]));
+    __m128i c = _mm_load_si128((__m128i*) (&block[8]));
+    __m128i d = _mm_load_si128((__m128i*) (&block[12]));
 
-    for (i = 0; i < state->rounds; i += 2) {
+    for (i = 0; i < rounds; i += 2) {
         a = _mm_add_epi32(a, b);
         d = _mm_xor_si128(d, a);
         d = _mm_roti_epi32(d, 16);
@@ -128,10 +142,10 @@ static INLINE void chacha_core_ssse3(chacha_state_t *state) {
         d = CHACHA_ROTV1(d);
     }
 
-    _mm_store_si128((__m128i*) (&state->block[0]), a);
-    _mm_store_si128((__m128i*) (&state->block[4]), b);
-    _mm_store_si128((__m128i*) (&state->block[8]), c);
-    _mm_store_si128((__m128i*) (&state->block[12]), d);
+    _mm_store_si128((__m128i*) (&block[0]), a);
+    _mm_store_si128((__m128i*) (&block[4]), b);
+    _mm_store_si128((__m128i*) (&block[8]), c);
+    _mm_store_si128((__m128i*) (&block[12]), d);
 
     #undef CHACHA_ROTV3
     #undef CHACHA_ROTV2
@@ -139,7 +153,7 @@ static INLINE void chacha_core_ssse3(chacha_state_t *state) {
 }
 #endif
 
-static INLINE void chacha_core(chacha_state_t *state) {
+static INLINE void chacha_core(uint32_t *block, int rounds) {
     int i;
     #define CHACHA_ROTL32(x, n) (((x) << (n)) | ((x) >> (32 - (n))))
 
@@ -149,23 +163,29 @@ static INLINE void chacha_core(chacha_state_t *state) {
         x[a] = x[a] + x[b]; x[d] ^= x[a]; x[d] = CHACHA_ROTL32(x[d],  8); \
         x[c] = x[c] + x[d]; x[b] ^= x[c]; x[b] = CHACHA_ROTL32(x[b],  7)
 
-    for (i = 0; i < state->rounds ; i += 2) {
-        CHACHA_QUARTERROUND(state->block, 0, 4,  8, 12);
-        CHACHA_QUARTERROUND(state->block, 1, 5,  9, 13);
-        CHACHA_QUARTERROUND(state->block, 2, 6, 10, 14);
-        CHACHA_QUARTERROUND(state->block, 3, 7, 11, 15);
-        CHACHA_QUARTERROUND(state->block, 0, 5, 10, 15);
-        CHACHA_QUARTERROUND(state->block, 1, 6, 11, 12);
-        CHACHA_QUARTERROUND(state->block, 2, 7,  8, 13);
-        CHACHA_QUARTERROUND(state->block, 3, 4,  9, 14);
+    for (i = 0; i < rounds ; i += 2) {
+        CHACHA_QUARTERROUND(block, 0, 4,  8, 12);
+        CHACHA_QUARTERROUND(block, 1, 5,  9, 13);
+        CHACHA_QUARTERROUND(block, 2, 6, 10, 14);
+        CHACHA_QUARTERROUND(block, 3, 7, 11, 15);
+        CHACHA_QUARTERROUND(block, 0, 5, 10, 15);
+        CHACHA_QUARTERROUND(block, 1, 6, 11, 12);
+        CHACHA_QUARTERROUND(block, 2, 7,  8, 13);
+        CHACHA_QUARTERROUND(block, 3, 4,  9, 14);
     }
 
     #undef CHACHA_QUARTERROUND
     #undef CHACHA_ROTL32
 }
 
+#if defined(RANDOMGEN_HAVE_AVX2)
+extern void chacha_core_avx2(chacha_state_t *state, uint32_t input[16]);
+#endif
+
+/* Fill the buffer with the CHACHA_BUFFER_BLOCKS blocks starting at ctr */
 static INLINE void generate_block(chacha_state_t *state) {
-    int i;
+    int i, j;
+    uint32_t *block;
     uint32_t constants[4] = {0x61707865, 0x3320646e, 0x79622d32, 0x6b206574};
 
     uint32_t input[16];
@@ -178,21 +198,33 @@ static INLINE void generate_block(chacha_state_t *state) {
     input[14] = (state->ctr[1] / 16) & 0xffffffffu;
     input[15] = (state->ctr[1] / 16) >> 32;
 
-    for (i = 0; i < 16; ++i) state->block[i] = input[i];
+#if defined(RANDOMGEN_HAVE_AVX2)
+    if LIKELY(RANDOMGEN_USE_SIMD > 0 && RANDOMGEN_USE_AVX2 > 0) {
+        chacha_core_avx2(state, input);
+        return;
+    }
+#endif
+    /* ctr is a multiple of CHACHA_BUFFER_WORDS so input[12] never carries */
+    for (j = 0; j < CHACHA_BUFFER_BLOCKS; ++j) {
+        block = &state->block[16 * j];
+        for (i = 0; i < 16; ++i) block[i] = input[i];
+        block[12] += j;
 #if defined(__SSE2__) && __SSE2__
-    if LIKELY(RANDOMGEN_USE_SIMD > 0) {
-        chacha_core_ssse3(state);
-    } else {
+        if LIKELY(RANDOMGEN_USE_SIMD > 0) {
+            chacha_core_ssse3(block, state->rounds);
+        } else {
 #endif
-        chacha_core(state);
+            chacha_core(block, state->rounds);
 #if defined(__SSE2__) && __SSE2__
-    }
+        }
 #endif
-    for (i = 0; i < 16; ++i) state->block[i] += input[i];
+        for (i = 0; i < 16; ++i) block[i] += input[i];
+        block[12] += j;
+    }
 }
 
 static INLINE uint32_t chacha_next32(chacha_state_t *state){
-    int idx = state->ctr[0] % 16;
+    int idx = state->ctr[0] % CHACHA_BUFFER_WORDS;
     if UNLIKELY(idx == 0) generate_block(state);
     ++state->ctr[0];
     if (state->ctr[0] == 0) ++state->ctr[1];
@@ -209,9 +241,41 @@ static INLINE double chacha_next_double(chacha_state_t *state){
     return (chacha_next64(state) >> 11) * (1.0/9007199254740992.0);
 }
 
+/* Combine pairs of words directly from the buffer */
+static INLINE void chacha_fill64(chacha_state_t *state, size_t cnt,
+                                 uint64_t *out) {
+    size_t i, idx, avail, n;
+    uint64_t orig;
+    if (state->ctr[0] % 2) {
+        /* Values straddle a pair of words */
+        for (i = 0; i < cnt; ++i) out[i] = chacha_next64(state);
+        return;
+    }
+    while (cnt > 0) {
+        idx = state->ctr[0] % CHACHA_BUFFER_WORDS;
+        if UNLIKELY(idx == 0) generate_block(state);
+        avail = (CHACHA_BUFFER_WORDS - idx) / 2;
+        n = cnt < avail ? cnt : avail;
+        for (i = 0; i < n; ++i) {
+            out[i] = state->block[idx + 2 * i] |
+                     ((uint64_t)state->block[idx + 2 * i + 1] << 32);
+        }
+        orig = state->ctr[0];
+        state->ctr[0] += 2 * n;
+        if (state->ctr[0] < orig) ++state->ctr[1];
+        out += n;
+        cnt -= n;
+    }
+}
+
 void chacha_use_simd(int flag);
 int chacha_simd_capable(void);
+void chacha_use_avx2(int flag);
+int chacha_avx2_capable(void);
+void chacha_refresh(chacha_state_t *state);
 void chacha_seed(chacha_state_t *state, uint64_t *seedval, uint64_t *stream, uint64_t *ctr);
 void chacha_advance(chacha_state_t *state, uint64_t *delta);
+void chacha_raw_at(chacha_state_t *state, uint64_t *positions, size_t cnt,
+                   uint64_t *out);
 
 #endif /* _RANDOMDGEN__CHACHA_H_ */
@@ -52,3 +52,101 @@ void feature_flags(int flags[32], int major)
         flags[i] = (reg >> i) & 0x1;
     }
 }
+
+
+#if defined(HAVE_CPUID) && HAVE_CPUID && defined(_MSC_VER) && defined(_WIN32)
+#include <immintrin.h>
+#endif
+
+/* Structured extended feature flags from leaf 7, sub-leaf 0 */
+void extended_feature_flags(int flags[32], int major)
+{
+    int i;
+#if defined(HAVE_CPUID) && HAVE_CPUID
+#if defined(__clang__) || defined(__GNUC__)
+    uint32_t num_ids = 0, reg  = 0, eax = 0, ebx = 0, ecx = 0, edx = 0;
+    num_ids = __get_cpuid_max(0, &ebx);
+    ebx = 0;
+    if (num_ids >= 7)
+    {
+        __cpuid_count(7, 0, eax, ebx, ecx, edx);
+    }
+#elif defined(_MSC_VER) && defined(_WIN32)
+    int cpu_info[4] = {0};
+    int num_ids, reg = 0, eax = 0, ebx = 0, ecx = 0, edx = 0;
+    __cpuid(cpu_info, 0);
+    num_ids = (int)cpu_info[0];
+    if (num_ids >= 7)
+    {
+        __cpuidex(cpu_info, 7, 0);
+        eax = cpu_info[0];
+        ebx = cpu_info[1];
+        ecx = cpu_info[2];
+        edx = cpu_info[3];
+    }
+#endif
+#else
+    uint32_t reg, eax, ebx, ecx, edx;
+    reg = 0; eax = 0; ebx = 0; ecx = 0; edx = 0;
+#endif
+    switch(major){
+        case 0:
+        reg = eax;
+        break;
+
+        case 1:
+        reg = ebx;
+        break;
+
+        case 2:
+        reg = ecx;
+        break;
+
+        case 3:
+        reg = edx;
+        break;
+    }
+    for (i = 0; i < 32; i++)
+    {
+        flags[i] = (reg >> i) & 0x1;
+    }
+}
+
+/* Extended control register XCR0 which reports the register state saved by
+   the OS, or 0 if unavailable */
+static uint64_t xcr0_value(void)
+{
+    uint64_t xcr0 = 0;
+#if defined(HAVE_CPUID) && HAVE_CPUID
+    int flags[32];
+    feature_flags(flags, RANDOMGEN_ECX);
+    /* OSXSAVE */
+    if (!flags[27])
+    {
+        return 0;
+    }
+#if defined(__clang__) || defined(__GNUC__)
+    {
+        uint32_t eax = 0, edx = 0;
+        __asm__ __volatile__("xgetbv" : "=a"(eax), "=d"(edx) : "c"(0));
+        xcr0 = ((uint64_t)edx << 32) | eax;
+    }
+#elif defined(_MSC_VER) && defined(_WIN32) && _MSC_VER >= 1600
+    xcr0 = (uint64_t)_xgetbv(0);
+#endif
+#endif
+    return xcr0;
+}
+
+/* Check that the OS saves the SSE and AVX registers */
+int os_avx_support(void)
+{
+    return (xcr0_value() & 0x6) == 0x6;
+}
+
+/* Check that the OS saves the opmask and ZMM registers */
+int os_avx512_support(void)
+{
+    /* SSE, AVX, opmask, ZMM_Hi256 and Hi16_ZMM state */
+    return (xcr0_value() & 0xE6) == 0xE6;
+}
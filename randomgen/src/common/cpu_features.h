@@ -22,5 +22,8 @@
 #endif
 
 void feature_flags(int flags[32], int major);
+void extended_feature_flags(int flags[32], int major);
+int os_avx_support(void);
+int os_avx512_support(void);
 
 #endif /* _RANDOMGEN_CPU_FEATURES_H */
\ No newline at end of file
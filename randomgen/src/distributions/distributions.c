@@ -2,6 +2,7 @@
 #include "loggam.h"
 #include "ziggurat.h"
 #include "ziggurat_constants.h"
+#include <float.h>
 
 #if defined(_MSC_VER) && defined(_WIN64)
 #include <intrin.h>
@@ -36,6 +37,10 @@ float random_standard_exponential_f(bitgen_t *bitgen_state) {
 
 void random_double_fill(bitgen_t *bitgen_state, npy_intp cnt, double *out) {
   npy_intp i;
+  if (bitgen_state->fill_double != NULL) {
+    bitgen_state->fill_double(bitgen_state->state, cnt, out);
+    return;
+  }
   for (i = 0; i < cnt; i++) {
     out[i] = next_double(bitgen_state);
   }
@@ -248,6 +253,267 @@ float random_gauss_zig_f(bitgen_t *bitgen_state) {
   }
 }
 
+/* Bits of the IEEE half nearest to f, rounding ties to even */
+static NPY_INLINE uint16_t float_to_half_bits(float f) {
+  uint32_t x, absx, h, m, rem, halfway;
+  uint16_t sign;
+  int shift;
+
+  memcpy(&x, &f, sizeof(x));
+  sign = (uint16_t)((x >> 16) & 0x8000);
+  absx = x & 0x7fffffff;
+  if (absx - 0x38800000U < 0x47800000U - 0x38800000U) {
+    /* Normal half. Rebias the exponent and round, allowing the carry to
+     * propagate into the exponent */
+    return sign | (uint16_t)((absx - 0x38000000U + 0x0fffU +
+                              ((absx >> 13) & 1)) >> 13);
+  }
+  if (absx >= 0x47800000) {
+    /* Overflow, inf or nan */
+    return sign | ((absx > 0x7f800000) ? 0x7e00 : 0x7c00);
+  }
+  /* Subnormal half or zero */
+  if (absx > 0x33000000) {
+    m = (absx & 0x7fffff) | 0x800000;
+    shift = 126 - (int)(absx >> 23);
+    h = m >> shift;
+    rem = m & ((1U << shift) - 1);
+    halfway = 1U << (shift - 1);
+    if (rem > halfway || (rem == halfway && (h & 1))) {
+      h += 1;
+    }
+    return sign | (uint16_t)h;
+  }
+  return sign;
+}
+
+/* Bits of the bfloat16 nearest to f, rounding ties to even */
+static NPY_INLINE uint16_t float_to_bfloat16_bits(float f) {
+  uint32_t x;
+
+  memcpy(&x, &f, sizeof(x));
+  if ((x & 0x7fffffff) > 0x7f800000) {
+    return (uint16_t)((x >> 16) | 0x0040);
+  }
+  x += 0x7fff + ((x >> 16) & 1);
+  return (uint16_t)(x >> 16);
+}
+
+void random_half_fill(bitgen_t *bitgen_state, npy_intp cnt, uint16_t *out) {
+  npy_intp i;
+  int j;
+  uint64_t r;
+  for (i = 0; i < cnt; i += 4) {
+    r = next_uint64(bitgen_state);
+    for (j = 0; j < 4 && i + j < cnt; j++) {
+      out[i + j] = float_to_half_bits(
+          (((r >> (16 * j)) & 0xffff) >> 5) * (1.0f / 2048.0f));
+    }
+  }
+}
+
+void random_bfloat16_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                          uint16_t *out) {
+  npy_intp i;
+  int j;
+  uint64_t r;
+  for (i = 0; i < cnt; i += 4) {
+    r = next_uint64(bitgen_state);
+    for (j = 0; j < 4 && i + j < cnt; j++) {
+      out[i + j] = float_to_bfloat16_bits(
+          (((r >> (16 * j)) & 0xffff) >> 8) * (1.0f / 256.0f));
+    }
+  }
+}
+
+/*
+ * Normals with 16 bits per value use one bit for the sign and 15 bits to
+ * select one of 32768 equiprobable intervals of |x|. The last interval is
+ * sampled exactly from the tail beyond gauss_16_tail. The entry for each of
+ * the other intervals holds a 16-bit value in its low bits and a threshold
+ * t - 1 in its high bits. 16 extra random bits u return the value if
+ * u < t and the next larger value otherwise. This depends on how many
+ * output values the interval covers:
+ *
+ * - One value: t is 65536 so that the value is always returned.
+ * - Two adjacent values: t / 65536 is the fraction of the interval's
+ *   probability that rounds to the lower value.
+ * - More values, which happens in the tails and near 0: the entry is
+ *   GAUSS_16_EXACT and |x| is drawn from the normal restricted to the
+ *   interval, whose ends are held in gauss_16_lower, by rejection.
+ *
+ * The values are then distributed as normals rounded to 16 bits, up to
+ * the 2**-31 resolution of the thresholds.
+ */
+#define GAUSS_16_TABLE_SIZE 32767
+#define GAUSS_16_EXACT 0xFFFFFFFFU
+static uint32_t gauss_16_half[GAUSS_16_TABLE_SIZE];
+static uint32_t gauss_16_bfloat16[GAUSS_16_TABLE_SIZE];
+static double gauss_16_lower[GAUSS_16_TABLE_SIZE + 1];
+static int gauss_16_ready = 0;
+
+/* 0.5 * erfc(x / sqrt(2)) */
+static double normal_sf(double x) {
+  return 0.5 * erfc(x * 0.70710678118654752440);
+}
+
+/* Solve normal_sf(x) = q for x > 0 using Newton's method. The function is
+ * convex and decreasing, so that the iterates increase monotonically when
+ * the starting value is below the root. */
+static double normal_isf(double q, double x) {
+  double step;
+  int i;
+  for (i = 0; i < 100; i++) {
+    step = (normal_sf(x) - q) / (0.39894228040143267794 * exp(-0.5 * x * x));
+    x += step;
+    if (step < 1e-15 * (1.0 + x)) {
+      break;
+    }
+  }
+  return x;
+}
+
+/*
+ * Table entry for the interval [lower, upper) where lower and upper round to
+ * lo_bits and hi_bits, and boundary is the midpoint between the value of
+ * lo_bits and the next value
+ */
+static uint32_t gauss_16_entry(double lower, double upper, uint16_t lo_bits,
+                               uint16_t hi_bits, float boundary) {
+  double t;
+  if (lo_bits == hi_bits) {
+    return lo_bits | 0xFFFF0000U;
+  }
+  if (hi_bits != lo_bits + 1) {
+    return GAUSS_16_EXACT;
+  }
+  t = floor((normal_sf(lower) - normal_sf(boundary)) * 65536.0 * 65536.0 +
+            0.5);
+  if (t <= 0.0) {
+    return hi_bits | 0xFFFF0000U;
+  } else if (t >= 65536.0) {
+    return lo_bits | 0xFFFF0000U;
+  }
+  return lo_bits | ((uint32_t)(t - 1) << 16);
+}
+
+/* Value of the bits of a positive, finite half */
+static float half_bits_to_float(uint16_t bits) {
+  union {
+    uint32_t u;
+    float f;
+  } v;
+  uint32_t e = (bits >> 10) & 0x1f, m = bits & 0x3ff;
+  if (e == 0) {
+    return (float)m * (1.0f / 16777216.0f);
+  }
+  v.u = ((e + 112) << 23) | (m << 13);
+  return v.f;
+}
+
+/* Value of the bits of a positive, finite bfloat16 */
+static float bfloat16_bits_to_float(uint16_t bits) {
+  union {
+    uint32_t u;
+    float f;
+  } v;
+  v.u = (uint32_t)bits << 16;
+  return v.f;
+}
+
+void random_gauss_16_setup(void) {
+  npy_intp k;
+  double lower = 0.0, upper;
+  uint16_t lo_bits, hi_bits;
+  if (gauss_16_ready) {
+    return;
+  }
+  for (k = 0; k < GAUSS_16_TABLE_SIZE; k++) {
+    upper = normal_isf((32767 - k) / 65536.0, lower);
+    gauss_16_lower[k] = lower;
+    lo_bits = float_to_half_bits((float)lower);
+    hi_bits = float_to_half_bits((float)upper);
+    gauss_16_half[k] = gauss_16_entry(lower, upper, lo_bits, hi_bits,
+                                      0.5f * (half_bits_to_float(lo_bits) +
+                                              half_bits_to_float(lo_bits + 1)));
+    lo_bits = float_to_bfloat16_bits((float)lower);
+    hi_bits = float_to_bfloat16_bits((float)upper);
+    gauss_16_bfloat16[k] = gauss_16_entry(lower, upper, lo_bits, hi_bits,
+                                          0.5f * (bfloat16_bits_to_float(lo_bits) +
+                                                  bfloat16_bits_to_float(lo_bits + 1)));
+    lower = upper;
+  }
+  gauss_16_lower[GAUSS_16_TABLE_SIZE] = lower;
+  gauss_16_ready = 1;
+}
+
+/* |x| drawn exactly from the interval k, or from the tail when k is last */
+static float gauss_16_exact(bitgen_t *bitgen_state, uint16_t k) {
+  double lower, width, x, y, a, tail;
+  if (k < GAUSS_16_TABLE_SIZE) {
+    /* Rejection from a uniform on the interval, where the density is at
+     * most its value at lower, using 1 - a <= exp(-a) as a squeeze */
+    lower = gauss_16_lower[k];
+    width = gauss_16_lower[k + 1] - lower;
+    for (;;) {
+      x = lower + width * next_double(bitgen_state);
+      y = next_double(bitgen_state);
+      a = 0.5 * (x - lower) * (x + lower);
+      if (y <= 1.0 - a || y <= exp(-a)) {
+        return (float)x;
+      }
+    }
+  }
+  /* Marsaglia's method for the tail */
+  tail = gauss_16_lower[GAUSS_16_TABLE_SIZE];
+  for (;;) {
+    x = -log(1.0 - next_double(bitgen_state)) / tail;
+    y = -log(1.0 - next_double(bitgen_state));
+    if (y + y > x * x) {
+      return (float)(tail + x);
+    }
+  }
+}
+
+/* Fill using the entries of table, rounding exact draws with to_bits */
+static NPY_INLINE void gauss_16_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                                     uint16_t *out, const uint32_t *table,
+                                     uint16_t (*to_bits)(float)) {
+  npy_intp i;
+  int j;
+  uint64_t r, extra;
+  uint32_t e;
+  uint16_t v, k, bits;
+
+  random_gauss_16_setup();
+  for (i = 0; i < cnt; i += 4) {
+    r = next_uint64(bitgen_state);
+    extra = next_uint64(bitgen_state);
+    for (j = 0; j < 4 && i + j < cnt; j++) {
+      v = (uint16_t)(r >> (16 * j));
+      k = v >> 1;
+      e = (k < GAUSS_16_TABLE_SIZE) ? table[k] : GAUSS_16_EXACT;
+      if (e != GAUSS_16_EXACT) {
+        bits = (uint16_t)e + (((extra >> (16 * j)) & 0xffff) > (e >> 16));
+      } else {
+        bits = to_bits(gauss_16_exact(bitgen_state, k));
+      }
+      out[i + j] = (uint16_t)((v & 0x1) << 15) | bits;
+    }
+  }
+}
+
+void random_gauss_half_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                            uint16_t *out) {
+  gauss_16_fill(bitgen_state, cnt, out, gauss_16_half, float_to_half_bits);
+}
+
+void random_gauss_bfloat16_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                                uint16_t *out) {
+  gauss_16_fill(bitgen_state, cnt, out, gauss_16_bfloat16,
+                float_to_bfloat16_bits);
+}
+
 /*
 static NPY_INLINE double standard_gamma(bitgen_t *bitgen_state, double shape) {
   double b, c;
@@ -342,9 +608,28 @@ float random_standard_gamma_f(bitgen_t *bitgen_state, float shape) {
 }
 */
 
-static NPY_INLINE double standard_gamma_zig(bitgen_t *bitgen_state,
-                                            double shape) {
-  double b, c;
+/*
+ * Constants used by standard_gamma_zig that only depend on the shape.
+ * shape < 1 uses inv_shape = 1 / shape and shape > 1 uses the
+ * Marsaglia-Tsang constants b = shape - 1 / 3 and c = 1 / sqrt(9 b).
+ */
+void random_gamma_setup(double shape, gamma_params_t *params) {
+  params->shape = shape;
+  params->b = 0.0;
+  params->c = 0.0;
+  if (shape == 1.0 || shape == 0.0) {
+    return;
+  } else if (shape < 1.0) {
+    params->b = 1. / shape;
+  } else {
+    params->b = shape - 1. / 3.;
+    params->c = 1. / sqrt(9 * params->b);
+  }
+}
+
+static NPY_INLINE double standard_gamma_zig_params(bitgen_t *bitgen_state,
+                                                   const gamma_params_t *params) {
+  double shape = params->shape, b = params->b, c = params->c;
   double U, V, X, Y;
 
   if (shape == 1.0) {
@@ -356,21 +641,19 @@ static NPY_INLINE double standard_gamma_zig(bitgen_t *bitgen_state,
       U = next_double(bitgen_state);
       V = random_standard_exponential_zig(bitgen_state);
       if (U <= 1.0 - shape) {
-        X = pow(U, 1. / shape);
+        X = pow(U, b);
         if (X <= V) {
           return X;
         }
       } else {
         Y = -log((1 - U) / shape);
-        X = pow(1.0 - shape + shape * Y, 1. / shape);
+        X = pow(1.0 - shape + shape * Y, b);
         if (X <= (V + Y)) {
           return X;
         }
       }
     }
   } else {
-    b = shape - 1. / 3.;
-    c = 1. / sqrt(9 * b);
     for (;;) {
       do {
         X = random_gauss_zig(bitgen_state);
@@ -388,6 +671,14 @@ static NPY_INLINE double standard_gamma_zig(bitgen_t *bitgen_state,
   }
 }
 
+static NPY_INLINE double standard_gamma_zig(bitgen_t *bitgen_state,
+                                            double shape) {
+  gamma_params_t params;
+
+  random_gamma_setup(shape, &params);
+  return standard_gamma_zig_params(bitgen_state, &params);
+}
+
 static NPY_INLINE float standard_gamma_zig_f(bitgen_t *bitgen_state,
                                              float shape) {
   float b, c;
@@ -438,6 +729,11 @@ double random_standard_gamma_zig(bitgen_t *bitgen_state, double shape) {
   return standard_gamma_zig(bitgen_state, shape);
 }
 
+double random_standard_gamma_params(bitgen_t *bitgen_state,
+                                    const gamma_params_t *params) {
+  return standard_gamma_zig_params(bitgen_state, params);
+}
+
 float random_standard_gamma_zig_f(bitgen_t *bitgen_state, float shape) {
   return standard_gamma_zig_f(bitgen_state, shape);
 }
@@ -482,11 +778,18 @@ double random_gamma(bitgen_t *bitgen_state, double shape, double scale) {
   return scale * random_standard_gamma_zig(bitgen_state, shape);
 }
 
+double random_gamma_params(bitgen_t *bitgen_state,
+                           const gamma_params_t *params, double scale) {
+  return scale * standard_gamma_zig_params(bitgen_state, params);
+}
+
 float random_gamma_float(bitgen_t *bitgen_state, float shape, float scale) {
   return scale * random_standard_gamma_zig_f(bitgen_state, shape);
 }
 
-double random_beta(bitgen_t *bitgen_state, double a, double b) {
+double random_beta_params(bitgen_t *bitgen_state, const gamma_params_t *a_params,
+                          const gamma_params_t *b_params) {
+  double a = a_params->shape, b = b_params->shape;
   double Ga, Gb;
 
   if ((a <= 1.0) && (b <= 1.0)) {
@@ -515,12 +818,20 @@ double random_beta(bitgen_t *bitgen_state, double a, double b) {
       }
     }
   } else {
-    Ga = random_standard_gamma_zig(bitgen_state, a);
-    Gb = random_standard_gamma_zig(bitgen_state, b);
+    Ga = standard_gamma_zig_params(bitgen_state, a_params);
+    Gb = standard_gamma_zig_params(bitgen_state, b_params);
     return Ga / (Ga + Gb);
   }
 }
 
+double random_beta(bitgen_t *bitgen_state, double a, double b) {
+  gamma_params_t a_params, b_params;
+
+  random_gamma_setup(a, &a_params);
+  random_gamma_setup(b, &b_params);
+  return random_beta_params(bitgen_state, &a_params, &b_params);
+}
+
 double random_chisquare(bitgen_t *bitgen_state, double df) {
   return 2.0 * random_standard_gamma_zig(bitgen_state, df / 2.0);
 }
@@ -602,11 +913,129 @@ double random_standard_t(bitgen_t *bitgen_state, double df) {
   return sqrt(df / 2) * num / sqrt(denom);
 }
 
-static RAND_INT_TYPE random_poisson_mult(bitgen_t *bitgen_state, double lam) {
+float random_normal_f(bitgen_t *bitgen_state, float loc, float scale) {
+  return loc + scale * random_gauss_zig_f(bitgen_state);
+}
+
+float random_exponential_f(bitgen_t *bitgen_state, float scale) {
+  return scale * standard_exponential_zig_f(bitgen_state);
+}
+
+float random_uniform_f(bitgen_t *bitgen_state, float lower, float range) {
+  return lower + range * next_float(bitgen_state);
+}
+
+float random_beta_f(bitgen_t *bitgen_state, float a, float b) {
+  float Ga, Gb;
+
+  if ((a <= 1.0f) && (b <= 1.0f)) {
+    float U, V, X, Y, XpY;
+    /* Use Johnk's algorithm */
+
+    while (1) {
+      U = next_float(bitgen_state);
+      V = next_float(bitgen_state);
+      X = powf(U, 1.0f / a);
+      Y = powf(V, 1.0f / b);
+      XpY = X + Y;
+      /* Reject if both U and V are 0.0 */
+      if ((XpY <= 1.0f) && (XpY > 0.0f)) {
+        return X / XpY;
+      }
+    }
+  } else {
+    Ga = standard_gamma_zig_f(bitgen_state, a);
+    Gb = standard_gamma_zig_f(bitgen_state, b);
+    return Ga / (Ga + Gb);
+  }
+}
+
+float random_chisquare_f(bitgen_t *bitgen_state, float df) {
+  return 2.0f * standard_gamma_zig_f(bitgen_state, df / 2.0f);
+}
+
+float random_weibull_f(bitgen_t *bitgen_state, float a) {
+  if (a == 0.0f) {
+    return 0.0f;
+  }
+  return powf(standard_exponential_zig_f(bitgen_state), 1.0f / a);
+}
+
+float random_laplace_f(bitgen_t *bitgen_state, float loc, float scale) {
+  float U;
+
+  for (;;) {
+    U = next_float(bitgen_state);
+    if (U >= 0.5f) {
+      return loc - scale * logf(2.0f - U - U);
+    } else if (U > 0.0f) {
+      return loc + scale * logf(U + U);
+    }
+    /* Reject U == 0.0 and draw again */
+  }
+}
+
+float random_gumbel_f(bitgen_t *bitgen_state, float loc, float scale) {
+  float U;
+
+  for (;;) {
+    U = 1.0f - next_float(bitgen_state);
+    if (U < 1.0f) {
+      return loc - scale * logf(-logf(U));
+    }
+    /* Reject U == 1.0 and draw again */
+  }
+}
+
+float random_logistic_f(bitgen_t *bitgen_state, float loc, float scale) {
+  float U;
+
+  for (;;) {
+    U = next_float(bitgen_state);
+    if (U > 0.0f) {
+      return loc + scale * logf(U / (1.0f - U));
+    }
+    /* Reject U == 0.0 and draw again */
+  }
+}
+
+float random_lognormal_f(bitgen_t *bitgen_state, float mean, float sigma) {
+  return expf(random_normal_f(bitgen_state, mean, sigma));
+}
+
+float random_standard_t_f(bitgen_t *bitgen_state, float df) {
+  float num, denom;
+
+  num = random_gauss_zig_f(bitgen_state);
+  denom = standard_gamma_zig_f(bitgen_state, df / 2.0f);
+  return sqrtf(df / 2.0f) * num / sqrtf(denom);
+}
+
+/*
+ * Constants used by random_poisson that only depend on lam. lam < 10 uses
+ * enlam = exp(-lam) and lam >= 10 uses the PTRS constants.
+ */
+void random_poisson_setup(double lam, poisson_params_t *params) {
+  memset(params, 0, sizeof(poisson_params_t));
+  params->lam = lam;
+  if (lam >= 10) {
+    params->slam = sqrt(lam);
+    params->loglam = log(lam);
+    params->b = 0.931 + 2.53 * params->slam;
+    params->a = -0.059 + 0.02483 * params->b;
+    params->invalpha = 1.1239 + 1.1328 / (params->b - 3.4);
+    params->vr = 0.9277 - 3.6224 / (params->b - 2);
+  } else {
+    params->enlam = exp(-lam);
+  }
+}
+
+static RAND_INT_TYPE random_poisson_mult(bitgen_t *bitgen_state,
+                                         const poisson_params_t *params) {
   RAND_INT_TYPE X;
   double prod, U, enlam;
 
-  enlam = exp(-lam);
+  enlam = params->enlam;
   X = 0;
   prod = 1.0;
   while (1) {
@@ -627,16 +1056,12 @@ static RAND_INT_TYPE random_poisson_mult(bitgen_t *bitgen_state, double lam) {
  */
 #define LS2PI 0.91893853320467267
 #define TWELFTH 0.083333333333333333333333
-static RAND_INT_TYPE random_poisson_ptrs(bitgen_t *bitgen_state, double lam) {
+static RAND_INT_TYPE random_poisson_ptrs(bitgen_t *bitgen_state,
+                                         const poisson_params_t *params) {
   RAND_INT_TYPE k;
-  double U, V, slam, loglam, a, b, invalpha, vr, us;
-
-  slam = sqrt(lam);
-  loglam = log(lam);
-  b = 0.931 + 2.53 * slam;
-  a = -0.059 + 0.02483 * b;
-  invalpha = 1.1239 + 1.1328 / (b - 3.4);
-  vr = 0.9277 - 3.6224 / (b - 2);
+  double U, V, us;
+  double lam = params->lam, loglam = params->loglam, a = params->a;
+  double b = params->b, invalpha = params->invalpha, vr = params->vr;
 
   while (1) {
     U = next_double(bitgen_state) - 0.5;
@@ -658,14 +1083,80 @@ static RAND_INT_TYPE random_poisson_ptrs(bitgen_t *bitgen_state, double lam) {
   }
 }
 
-RAND_INT_TYPE random_poisson(bitgen_t *bitgen_state, double lam) {
-  if (lam >= 10) {
-    return random_poisson_ptrs(bitgen_state, lam);
-  } else if (lam == 0) {
+RAND_INT_TYPE random_poisson_params(bitgen_t *bitgen_state,
+                                    const poisson_params_t *params) {
+  if (params->lam >= 10) {
+    return random_poisson_ptrs(bitgen_state, params);
+  } else if (params->lam == 0) {
     return 0;
   } else {
-    return random_poisson_mult(bitgen_state, lam);
+    return random_poisson_mult(bitgen_state, params);
+  }
+}
+
+RAND_INT_TYPE random_poisson(bitgen_t *bitgen_state, double lam) {
+  poisson_params_t params;
+
+  random_poisson_setup(lam, &params);
+  return random_poisson_params(bitgen_state, &params);
+}
+
+/*
+ * Fill cdf with the Poisson CDF until the remaining mass is negligible
+ * and guide with a guide table of the same length where guide[j] is the
+ * smallest k with cdf[k] > j / len. Returns the number of entries used,
+ * at most max_len.
+ */
+npy_intp random_poisson_table_setup(double lam, double *cdf, npy_intp *guide,
+                                    npy_intp max_len) {
+  double pmf = exp(-lam), total = pmf;
+  npy_intp j, k, len = 1;
+
+  cdf[0] = total;
+  while (len < max_len && !(len > lam && pmf < DBL_EPSILON * total)) {
+    pmf *= lam / len;
+    total += pmf;
+    cdf[len++] = total;
+  }
+  k = 0;
+  for (j = 0; j < len; j++) {
+    while (k < len - 1 && cdf[k] <= (double)j / len) {
+      k++;
+    }
+    guide[j] = k;
+  }
+  return len;
+}
+
+/*
+ * Poisson by inversion using a table from random_poisson_table_setup.
+ * Consumes a single double.
+ */
+RAND_INT_TYPE random_poisson_table(bitgen_t *bitgen_state, double lam,
+                                   const double *cdf, const npy_intp *guide,
+                                   npy_intp len) {
+  double U, pmf, total;
+  npy_intp j, k;
+
+  U = next_double(bitgen_state);
+  j = (npy_intp)(U * len);
+  k = guide[j < len ? j : len - 1];
+  while (k < len && U >= cdf[k]) {
+    k++;
   }
+  if (k < len) {
+    return (RAND_INT_TYPE)k;
+  }
+  /* U is in the tail beyond the table so continue the recursion */
+  pmf = exp(-lam);
+  total = pmf;
+  k = 0;
+  while (U >= total && pmf > 0) {
+    k++;
+    pmf *= lam / k;
+    total += pmf;
+  }
+  return (RAND_INT_TYPE)k;
 }
 
 RAND_INT_TYPE random_negative_binomial(bitgen_t *bitgen_state, double n,
@@ -877,6 +1368,29 @@ RAND_INT_TYPE random_binomial(bitgen_t *bitgen_state, double p, RAND_INT_TYPE n,
   }
 }
 
+/*
+ * Select the entry of a direct-mapped cache of n_entries binomial_t used
+ * for (n, p). n_entries must be a power of 2. Each entry stores the key it
+ * was set up for so a collision only costs a recomputation.
+ */
+static NPY_INLINE binomial_t *binomial_entry(binomial_t *entries,
+                                             npy_intp n_entries, double p,
+                                             RAND_INT_TYPE n) {
+  uint64_t key;
+
+  memcpy(&key, &p, sizeof(key));
+  key ^= (uint64_t)n * 0x9E3779B97F4A7C15ULL;
+  key *= 0xBF58476D1CE4E5B9ULL;
+  return &entries[(key >> 32) & (uint64_t)(n_entries - 1)];
+}
+
+RAND_INT_TYPE random_binomial_cached(bitgen_t *bitgen_state, double p,
+                                     RAND_INT_TYPE n, binomial_cache_t *cache) {
+  return random_binomial(
+      bitgen_state, p, n,
+      binomial_entry(cache->entries, BINOMIAL_CACHE_SIZE, p, n));
+}
+
 double random_noncentral_chisquare(bitgen_t *bitgen_state, double df,
                                    double nonc) {
   if (npy_isnan(nonc)) {
@@ -1037,6 +1551,165 @@ RAND_INT_TYPE random_geometric(bitgen_t *bitgen_state, double p) {
   }
 }
 
+/*
+ * Sorted positions in [0, n) of the successes in n Bernoulli(p) trials.
+ * The gaps between successes are geometric, and are sampled by inversion
+ * as G = 1 + floor(E / -log(1 - p)) using a standard exponential E, so that
+ * the cost is proportional to the number of successes. At most cnt
+ * positions are written. pos holds the position of the last success, or -1
+ * before the first call, and is updated so that the trials can be continued
+ * by a later call. Returns the number of positions written, which is less
+ * than cnt once all n trials have been used.
+ */
+npy_intp random_bernoulli_indices(bitgen_t *bitgen_state, double p, int64_t n,
+                                  int64_t *pos, npy_intp cnt, int64_t *out) {
+  double scale, gap;
+  npy_intp i = 0;
+  int64_t last = *pos;
+
+  if (p <= 0.0) {
+    *pos = n;
+    return 0;
+  }
+  scale = (p >= 1.0) ? 0.0 : -1.0 / log1p(-p);
+  while (i < cnt && last < n) {
+    gap = 1.0 + floor(standard_exponential_zig(bitgen_state) * scale);
+    if (gap >= (double)(n - last)) {
+      last = n;
+      break;
+    }
+    last += (int64_t)gap;
+    out[i++] = last;
+  }
+  *pos = last;
+  return i;
+}
+
+/*
+ * cnt sorted uniforms on [0, 1). The uniform order statistics are
+ * distributed as the normalized partial sums of cnt + 1 standard
+ * exponentials, S_k / S_{cnt+1}, so the values are generated in order
+ * without sorting.
+ */
+void random_sorted_uniform_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                                double *out) {
+  npy_intp i;
+  double total = 0.0, scale;
+
+  for (i = 0; i < cnt; i++) {
+    total += standard_exponential_zig(bitgen_state);
+    out[i] = total;
+  }
+  total += standard_exponential_zig(bitgen_state);
+  scale = 1.0 / total;
+  for (i = 0; i < cnt; i++) {
+    out[i] *= scale;
+  }
+  /* Rounding can only push the largest values up to 1 */
+  for (i = cnt - 1; i >= 0 && out[i] >= 1.0; i--) {
+    out[i] = nextafter(1.0, 0.0);
+  }
+}
+
+/* Skip before the next selection using Vitter's method A */
+static int64_t sequential_skip_a(bitgen_t *bitgen_state, int64_t N, int64_t n) {
+  double top = (double)(N - n), Nreal = (double)N, quot, V;
+  int64_t S = 0;
+
+  V = next_double(bitgen_state);
+  quot = top / Nreal;
+  while (quot > V) {
+    S++;
+    top -= 1.0;
+    Nreal -= 1.0;
+    quot *= top / Nreal;
+  }
+  return S;
+}
+
+/* Skip before the next selection using Vitter's method D, for n > 1 */
+static int64_t sequential_skip_d(bitgen_t *bitgen_state,
+                                 sequential_sample_t *state) {
+  double N = (double)state->N, n = (double)state->n;
+  double ninv = 1.0 / n, nmin1inv = 1.0 / (n - 1.0), qu1 = N - n + 1.0;
+  double vprime = state->vprime;
+  double X, S, U, y1, y2, top, bottom, limit, t;
+
+  if (vprime < 0.0) {
+    vprime = exp(log(next_double(bitgen_state)) * ninv);
+  }
+  while (1) {
+    while (1) {
+      X = N * (1.0 - vprime);
+      S = floor(X);
+      if (S < qu1) {
+        break;
+      }
+      vprime = exp(log(next_double(bitgen_state)) * ninv);
+    }
+    U = next_double(bitgen_state);
+    y1 = exp(log(U * N / qu1) * nmin1inv);
+    vprime = y1 * (1.0 - X / N) * (qu1 / (qu1 - S));
+    if (vprime <= 1.0) {
+      /* Accepted by the squeeze, and vprime can be reused for n - 1 */
+      break;
+    }
+    y2 = 1.0;
+    top = N - 1.0;
+    if (n - 1.0 > S) {
+      bottom = N - n;
+      limit = N - S;
+    } else {
+      bottom = N - S - 1.0;
+      limit = qu1;
+    }
+    for (t = N - 1.0; t >= limit; t -= 1.0) {
+      y2 = (y2 * top) / bottom;
+      top -= 1.0;
+      bottom -= 1.0;
+    }
+    if (N / (N - X) >= y1 * exp(log(y2) * nmin1inv)) {
+      vprime = exp(log(next_double(bitgen_state)) * nmin1inv);
+      break;
+    }
+    vprime = exp(log(next_double(bitgen_state)) * ninv);
+  }
+  state->vprime = vprime;
+  return (int64_t)S;
+}
+
+/*
+ * Sequential random sampling of state->n of the state->N positions that
+ * follow state->pos, using Vitter's method D. The skip between selected
+ * positions is sampled directly so that the cost is proportional to the
+ * number selected. Method A, which is faster when more than 1 in 13
+ * positions is selected, is used for dense samples. At most cnt positions
+ * are written, in increasing order, and state is updated so that sampling
+ * can be continued by a later call. Returns the number of positions written.
+ */
+npy_intp random_sequential_sample(bitgen_t *bitgen_state,
+                                  sequential_sample_t *state, npy_intp cnt,
+                                  int64_t *out) {
+  npy_intp i;
+  int64_t S;
+
+  for (i = 0; i < cnt && state->n > 0; i++) {
+    if (state->n == 1) {
+      S = (int64_t)random_interval(bitgen_state, (uint64_t)(state->N - 1));
+    } else if (state->n < state->N / 13) {
+      S = sequential_skip_d(bitgen_state, state);
+    } else {
+      S = sequential_skip_a(bitgen_state, state->N, state->n);
+      state->vprime = -1.0;
+    }
+    state->pos += S + 1;
+    state->N -= S + 1;
+    state->n--;
+    out[i] = state->pos;
+  }
+  return i;
+}
+
 RAND_INT_TYPE random_zipf(bitgen_t *bitgen_state, double a) {
   double am1, b;
 
@@ -1112,6 +1785,31 @@ uint64_t random_interval(bitgen_t *bitgen_state, uint64_t max) {
   return value;
 }
 
+/* The upper 64 bits of the 128-bit product x * y */
+static NPY_INLINE uint64_t umulh_uint64(uint64_t x, uint64_t y) {
+#if __SIZEOF_INT128__
+  return (uint64_t)((((__uint128_t)x) * y) >> 64);
+#elif defined(_MSC_VER) && defined(_WIN64)
+  /* _WIN64 architecture. Use the __umulh intrinsic. */
+  return __umulh(x, y);
+#else
+  /* 32-bit architecture. Emulate __umulh. */
+  uint64_t x0, x1, y0, y1;
+  uint64_t w0, w1, w2, t;
+
+  x0 = x & 0xFFFFFFFFULL;
+  x1 = x >> 32;
+  y0 = y & 0xFFFFFFFFULL;
+  y1 = y >> 32;
+  w0 = x0 * y0;
+  t = x1 * y0 + (w0 >> 32);
+  w1 = t & 0xFFFFFFFFULL;
+  w2 = t >> 32;
+  w1 += x0 * y1;
+  return x1 * y1 + w2 + (w1 >> 32);
+#endif
+}
+
 /* Static `Lemire rejection` function called by random_bounded_uint64(...) */
 static NPY_INLINE uint64_t bounded_lemire_uint64(bitgen_t *bitgen_state,
                                                  uint64_t rng) {
@@ -1174,27 +1872,7 @@ static NPY_INLINE uint64_t bounded_lemire_uint64(bitgen_t *bitgen_state,
     }
   }
 
-#if defined(_MSC_VER) && defined(_WIN64)
-  /* _WIN64 architecture. Use the __umulh intrinsic to calc `m1`. */
-  m1 = __umulh(x, rng_excl);
-#else
-  /* 32-bit architecture. Emulate __umulh to calc `m1`. */
-  {
-    uint64_t x0, x1, rng_excl0, rng_excl1;
-    uint64_t w0, w1, w2, t;
-
-    x0 = x & 0xFFFFFFFFULL;
-    x1 = x >> 32;
-    rng_excl0 = rng_excl & 0xFFFFFFFFULL;
-    rng_excl1 = rng_excl >> 32;
-    w0 = x0 * rng_excl0;
-    t = x1 * rng_excl0 + (w0 >> 32);
-    w1 = t & 0xFFFFFFFFULL;
-    w2 = t >> 32;
-    w1 += x0 * rng_excl1;
-    m1 = x1 * rng_excl1 + w2 + (w1 >> 32);
-  }
-#endif
+  m1 = umulh_uint64(x, rng_excl);
 
   return m1;
 #endif
@@ -1419,6 +2097,44 @@ npy_bool random_buffered_bounded_bool(bitgen_t *bitgen_state, npy_bool off,
   return buffered_bounded_bool(bitgen_state, off, rng, mask, bcnt, buf);
 }
 
+/*
+ * Bounded 64-bit values using words from the bulk fill_uint64.
+ *
+ * The raw words are written into out and consumed in order, accepted values
+ * being written back to the front of out. When words have been rejected, the
+ * tail of out is refilled with exactly as many words as there are values
+ * left so that no word is wasted. The values and the final state are
+ * identical to drawing the words one at a time.
+ */
+static void bounded_uint64_bulk_fill(bitgen_t *bitgen_state, uint64_t off,
+                                     uint64_t rng, npy_intp cnt,
+                                     bool use_masked, uint64_t *out) {
+  npy_intp i = 0, j;
+  uint64_t x;
+  const uint64_t mask = gen_mask(rng);
+  const uint64_t rng_excl = rng + 1;
+  const uint64_t threshold = -rng_excl % rng_excl;
+
+  while (i < cnt) {
+    bitgen_state->fill_uint64(bitgen_state->state, cnt - i, out + i);
+    if (use_masked) {
+      for (j = i; j < cnt; j++) {
+        x = out[j] & mask;
+        if (x <= rng) {
+          out[i++] = off + x;
+        }
+      }
+    } else {
+      for (j = i; j < cnt; j++) {
+        x = out[j];
+        if (x * rng_excl >= threshold) {
+          out[i++] = off + umulh_uint64(x, rng_excl);
+        }
+      }
+    }
+  }
+}
+
 /*
  * Fills an array with cnt random npy_uint64 between off and off + rng
  * inclusive. The numbers wrap if rng is sufficiently large.
@@ -1453,9 +2169,20 @@ void random_bounded_uint64_fill(bitgen_t *bitgen_state, uint64_t off,
     }
   } else if (rng == 0xFFFFFFFFFFFFFFFFULL) {
     /* Lemire64 doesn't support rng = 0xFFFFFFFFFFFFFFFF. */
+    if (bitgen_state->fill_uint64 != NULL) {
+      bitgen_state->fill_uint64(bitgen_state->state, cnt, out);
+      if (off != 0) {
+        for (i = 0; i < cnt; i++) {
+          out[i] += off;
+        }
+      }
+      return;
+    }
     for (i = 0; i < cnt; i++) {
       out[i] = off + next_uint64(bitgen_state);
     }
+  } else if (bitgen_state->fill_uint64 != NULL) {
+    bounded_uint64_bulk_fill(bitgen_state, off, rng, cnt, use_masked, out);
   } else {
     if (use_masked) {
       /* Smallest bit mask >= max */
@@ -1585,6 +2312,67 @@ void random_bounded_uint8_fill(bitgen_t *bitgen_state, uint8_t off, uint8_t rng,
   }
 }
 
+/* Fill out with cnt words of random bits */
+void random_bits_fill(bitgen_t *bitgen_state, npy_intp cnt, uint64_t *out) {
+  npy_intp i;
+  if (bitgen_state->fill_uint64 != NULL) {
+    bitgen_state->fill_uint64(bitgen_state->state, cnt, out);
+    return;
+  }
+  for (i = 0; i < cnt; i++) {
+    out[i] = next_uint64(bitgen_state);
+  }
+}
+
+/*
+ * Fill out with cnt words whose bits are independent Bernoulli(p) draws.
+ *
+ * Each of the 64 bits of a word compares a uniform U with p one binary digit
+ * at a time, using one bit of a raw draw for the digit of U. A bit is
+ * decided at the first digit where U and p differ, and so all 64 bits are
+ * usually decided after about 8 raw draws irrespective of p. Bits that agree
+ * with every nonzero digit of p have U >= p. The comparison uses every digit
+ * of p, and so is exact for any double p.
+ */
+void random_bernoulli_fill(bitgen_t *bitgen_state, double p, npy_intp cnt,
+                           uint64_t *out) {
+  npy_intp i;
+  int exponent, digit, lead, last;
+  uint64_t mantissa, r, undecided, result;
+
+  if (p <= 0.0 || p >= 1.0) {
+    memset(out, (p >= 1.0) ? 0xff : 0x00, cnt * sizeof(uint64_t));
+    return;
+  }
+  /* p = mantissa * 2**(exponent - 53) with the top bit of the 53-bit
+   * mantissa set, so that its first nonzero binary digit is at 2**(-lead) */
+  mantissa = (uint64_t)ldexp(frexp(p, &exponent), 53);
+  lead = 1 - exponent;
+  last = 0;
+  while (!((mantissa >> last) & 0x1)) {
+    last++;
+  }
+  for (i = 0; i < cnt; i++) {
+    undecided = 0xFFFFFFFFFFFFFFFFULL;
+    result = 0;
+    /* Leading zero digits of p, where a one digit of U decides U > p */
+    for (digit = 1; digit < lead && undecided; digit++) {
+      undecided &= ~next_uint64(bitgen_state);
+    }
+    for (digit = 52; digit >= last && undecided; digit--) {
+      r = next_uint64(bitgen_state);
+      if ((mantissa >> digit) & 0x1) {
+        /* U has a zero where p has a one, so U < p */
+        result |= undecided & ~r;
+        undecided &= r;
+      } else {
+        undecided &= ~r;
+      }
+    }
+    out[i] = result;
+  }
+}
+
 /*
  * Fills an array with cnt random npy_bool between off and off + rng
  * inclusive.
@@ -1602,14 +2390,19 @@ void random_bounded_bool_fill(bitgen_t *bitgen_state, npy_bool off,
   }
 }
 
-void random_multinomial(bitgen_t *bitgen_state, RAND_INT_TYPE n,
-                        RAND_INT_TYPE *mnix, double *pix, npy_intp d,
-                        binomial_t *binomial) {
+static NPY_INLINE void multinomial(bitgen_t *bitgen_state, RAND_INT_TYPE n,
+                                    RAND_INT_TYPE *mnix, double *pix,
+                                    npy_intp d, binomial_t *entries,
+                                    npy_intp n_entries) {
   double remaining_p = 1.0;
   npy_intp j;
   RAND_INT_TYPE dn = n;
+  double pj;
+
   for (j = 0; j < (d - 1); j++) {
-    mnix[j] = random_binomial(bitgen_state, pix[j] / remaining_p, dn, binomial);
+    pj = pix[j] / remaining_p;
+    mnix[j] = random_binomial(bitgen_state, pj, dn,
+                              binomial_entry(entries, n_entries, pj, dn));
     dn = dn - mnix[j];
     if (dn <= 0) {
       break;
@@ -1620,3 +2413,338 @@ void random_multinomial(bitgen_t *bitgen_state, RAND_INT_TYPE n,
       mnix[d - 1] = dn;
   }
 }
+
+void random_multinomial(bitgen_t *bitgen_state, RAND_INT_TYPE n,
+                        RAND_INT_TYPE *mnix, double *pix, npy_intp d,
+                        binomial_t *binomial) {
+  multinomial(bitgen_state, n, mnix, pix, d, binomial, 1);
+}
+
+void random_multinomial_cached(bitgen_t *bitgen_state, RAND_INT_TYPE n,
+                               RAND_INT_TYPE *mnix, double *pix, npy_intp d,
+                               binomial_cache_t *cache) {
+  multinomial(bitgen_state, n, mnix, pix, d, cache->entries,
+              BINOMIAL_CACHE_SIZE);
+}
+
+/*
+ * Draw a single category from k non-negative weights read every stride
+ * elements by inverting the CDF with a single double. The weights need not
+ * be normalized. Returns -1 if a weight is negative or NaN or the total is
+ * not positive and finite.
+ */
+#define CATEGORICAL_SEARCH(weight)                                           \
+  do {                                                                       \
+    total = 0.0;                                                             \
+    for (i = 0; i < k; i++) {                                                \
+      w = (weight);                                                          \
+      if (!(w >= 0)) {                                                       \
+        return -1;                                                           \
+      }                                                                      \
+      total += w;                                                            \
+    }                                                                        \
+    if (!(total > 0) || total == NPY_INFINITY) {                             \
+      return -1;                                                             \
+    }                                                                        \
+    u = next_double(bitgen_state) * total;                                   \
+    cum = 0.0;                                                               \
+    last = -1;                                                               \
+    for (i = 0; i < k; i++) {                                                \
+      w = (weight);                                                          \
+      if (w > 0) {                                                           \
+        cum += w;                                                            \
+        last = i;                                                            \
+        if (u < cum) {                                                       \
+          return i;                                                          \
+        }                                                                    \
+      }                                                                      \
+    }                                                                        \
+    /* Rounding left u >= cum so use the last category with mass */          \
+    return last;                                                             \
+  } while (0)
+
+int64_t random_categorical(bitgen_t *bitgen_state, const double *p, npy_intp k,
+                           npy_intp stride) {
+  double total, cum, u, w;
+  npy_intp i;
+  int64_t last;
+
+  CATEGORICAL_SEARCH(p[i * stride]);
+}
+
+int64_t random_categorical_f(bitgen_t *bitgen_state, const float *p,
+                             npy_intp k, npy_intp stride) {
+  double total, cum, u, w;
+  npy_intp i;
+  int64_t last;
+
+  CATEGORICAL_SEARCH((double)p[i * stride]);
+}
+
+/*
+ * Draw a single category from k unnormalized log-probabilities. buf must
+ * have space for k doubles. -inf logits have probability 0. Returns -1 if
+ * a logit is NaN or +inf or all logits are -inf.
+ */
+#define CATEGORICAL_LOGITS(logit)                                            \
+  do {                                                                       \
+    max = -NPY_INFINITY;                                                     \
+    for (i = 0; i < k; i++) {                                                \
+      w = (logit);                                                           \
+      if (npy_isnan(w) || w == NPY_INFINITY) {                               \
+        return -1;                                                           \
+      }                                                                      \
+      max = w > max ? w : max;                                               \
+    }                                                                        \
+    if (max == -NPY_INFINITY) {                                              \
+      return -1;                                                             \
+    }                                                                        \
+    for (i = 0; i < k; i++) {                                                \
+      buf[i] = exp((logit) - max);                                           \
+    }                                                                        \
+    return random_categorical(bitgen_state, buf, k, 1);                      \
+  } while (0)
+
+int64_t random_categorical_logits(bitgen_t *bitgen_state, const double *logits,
+                                  npy_intp k, npy_intp stride, double *buf) {
+  double max, w;
+  npy_intp i;
+
+  CATEGORICAL_LOGITS(logits[i * stride]);
+}
+
+int64_t random_categorical_logits_f(bitgen_t *bitgen_state,
+                                    const float *logits, npy_intp k,
+                                    npy_intp stride, double *buf) {
+  double max, w;
+  npy_intp i;
+
+  CATEGORICAL_LOGITS((double)logits[i * stride]);
+}
+
+/*
+ * Construct the alias table for Vose's alias method.
+ *
+ * p must be non-negative and sum to 1. prob and alias must have n elements
+ * and work is scratch space with n elements that holds the stacks of small
+ * (from the front) and large (from the back) entries.
+ */
+void random_alias_setup(const double *p, npy_intp n, double *prob,
+                        int64_t *alias, int64_t *work) {
+  npy_intp i, n_small = 0, large_pos = n;
+  int64_t s, l;
+
+  for (i = 0; i < n; i++) {
+    alias[i] = i;
+    prob[i] = p[i] * (double)n;
+    if (prob[i] < 1.0) {
+      work[n_small++] = i;
+    } else {
+      work[--large_pos] = i;
+    }
+  }
+  while (n_small > 0 && large_pos < n) {
+    s = work[--n_small];
+    l = work[large_pos];
+    alias[s] = l;
+    prob[l] = (prob[l] + prob[s]) - 1.0;
+    if (prob[l] < 1.0) {
+      large_pos++;
+      work[n_small++] = l;
+    }
+  }
+  /* Remaining entries are 1 up to rounding error */
+  while (n_small > 0) {
+    prob[work[--n_small]] = 1.0;
+  }
+  while (large_pos < n) {
+    prob[work[large_pos++]] = 1.0;
+  }
+}
+
+/* Draw a single index from an alias table with n entries */
+int64_t random_alias(bitgen_t *bitgen_state, const double *prob,
+                     const int64_t *alias, npy_intp n) {
+  int64_t i = (int64_t)random_bounded_uint64(bitgen_state, 0, n - 1, 0, 0);
+  return next_double(bitgen_state) < prob[i] ? i : alias[i];
+}
+
+/*
+ * Multinomial by drawing n indices from an alias table with d entries and
+ * counting. mnix must be zeroed. Requires O(n) rather than O(d) time.
+ */
+void random_multinomial_alias(bitgen_t *bitgen_state, RAND_INT_TYPE n,
+                              RAND_INT_TYPE *mnix, const double *prob,
+                              const int64_t *alias, npy_intp d) {
+  RAND_INT_TYPE i;
+
+  for (i = 0; i < n; i++) {
+    mnix[random_alias(bitgen_state, prob, alias, d)]++;
+  }
+}
+
+static int compare_int64(const void *a, const void *b) {
+  const int64_t x = *(const int64_t *)a, y = *(const int64_t *)b;
+  return (x > y) - (x < y);
+}
+
+/*
+ * Sparse multinomial using an alias table. draws is scratch space for n
+ * values. The distinct categories are written to indices in increasing
+ * order with their counts. Returns the number of distinct categories.
+ */
+npy_intp random_multinomial_alias_sparse(bitgen_t *bitgen_state,
+                                         RAND_INT_TYPE n, const double *prob,
+                                         const int64_t *alias, npy_intp d,
+                                         int64_t *draws, int64_t *indices,
+                                         int64_t *counts) {
+  RAND_INT_TYPE i;
+  npy_intp m = 0;
+
+  for (i = 0; i < n; i++) {
+    draws[i] = random_alias(bitgen_state, prob, alias, d);
+  }
+  qsort(draws, (size_t)n, sizeof(int64_t), compare_int64);
+  for (i = 0; i < n; i++) {
+    if (m > 0 && indices[m - 1] == draws[i]) {
+      counts[m - 1]++;
+    } else {
+      indices[m] = draws[i];
+      counts[m++] = 1;
+    }
+  }
+  return m;
+}
+
+/*
+ * Sparse multinomial using conditional binomials. dense is scratch space
+ * for d values. Returns the number of non-zero categories.
+ */
+npy_intp random_multinomial_sparse(bitgen_t *bitgen_state, RAND_INT_TYPE n,
+                                   double *pix, npy_intp d,
+                                   binomial_cache_t *cache, int64_t *dense,
+                                   int64_t *indices, int64_t *counts) {
+  npy_intp j, m = 0;
+
+  memset(dense, 0, d * sizeof(int64_t));
+  random_multinomial_cached(bitgen_state, n, dense, pix, d, cache);
+  for (j = 0; j < d; j++) {
+    if (dense[j] != 0) {
+      indices[m] = j;
+      counts[m++] = dense[j];
+    }
+  }
+  return m;
+}
+
+/*
+ * Build a Fenwick (binary indexed) tree over n weights.
+ *
+ * tree must have n + 1 elements and uses 1-based indexing so that
+ * tree[0] is unused.
+ */
+void random_fenwick_setup(const double *weights, npy_intp n, double *tree) {
+  npy_intp i, j;
+
+  tree[0] = 0.0;
+  for (i = 1; i <= n; i++) {
+    tree[i] = weights[i - 1];
+  }
+  for (i = 1; i <= n; i++) {
+    j = i + (i & -i);
+    if (j <= n) {
+      tree[j] += tree[i];
+    }
+  }
+}
+
+/* Index of the weight containing the cumulative value target */
+static NPY_INLINE npy_intp fenwick_search(const double *tree, npy_intp n,
+                                          double target) {
+  npy_intp pos = 0, step = 1;
+
+  while ((step << 1) <= n) {
+    step <<= 1;
+  }
+  for (; step > 0; step >>= 1) {
+    if (pos + step <= n && tree[pos + step] <= target) {
+      pos += step;
+      target -= tree[pos];
+    }
+  }
+  return pos;
+}
+
+/*
+ * Draw k distinct indices with probability proportional to weights using
+ * successive sampling. Each draw selects from the remaining weights and
+ * then removes the selected weight from the tree in O(log n).
+ *
+ * weights and tree are modified. tree must have been populated by
+ * random_fenwick_setup, and at least k weights must be positive.
+ */
+void random_weighted_without_replacement(bitgen_t *bitgen_state,
+                                         double *weights, double *tree,
+                                         npy_intp n, npy_intp k,
+                                         int64_t *out) {
+  npy_intp i, j, idx;
+  double total, w;
+
+  for (i = 0; i < k; i++) {
+    while (1) {
+      /* Total of the remaining weights, consistent with the tree */
+      total = 0.0;
+      for (j = n; j > 0; j -= (j & -j)) {
+        total += tree[j];
+      }
+      idx = fenwick_search(tree, n, next_double(bitgen_state) * total);
+      if (idx < n && weights[idx] > 0) {
+        break;
+      }
+      /* Rounding error has accumulated after removals, so rebuild */
+      random_fenwick_setup(weights, n, tree);
+    }
+    out[i] = idx;
+    w = weights[idx];
+    weights[idx] = 0.0;
+    for (j = idx + 1; j <= n; j += (j & -j)) {
+      tree[j] -= w;
+    }
+  }
+}
+
+/* Round function of the Feistel network used by random_permuted_index */
+static NPY_INLINE uint64_t feistel_round(uint64_t value, uint64_t key) {
+  uint64_t z = value ^ key;
+  z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL;
+  z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL;
+  return z ^ (z >> 31);
+}
+
+/*
+ * Position of index in a random permutation of {0, 1, ..., n - 1}
+ *
+ * Applies a balanced Feistel network on 2 * half_bits bits keyed by
+ * rounds keys. Values outside of [0, n) are mapped again (cycle walking)
+ * until one falls in range. half_bits must be the smallest value so that
+ * n <= 2**(2 * half_bits), in which case the domain has fewer than 4n
+ * elements and fewer than 4 evaluations are needed on average.
+ */
+uint64_t random_permuted_index(uint64_t index, uint64_t n, int half_bits,
+                               const uint64_t *keys, int rounds) {
+  uint64_t left, right, temp, mask;
+  int i;
+
+  mask = half_bits >= 32 ? 0xFFFFFFFFULL : (1ULL << half_bits) - 1;
+  do {
+    left = (index >> half_bits) & mask;
+    right = index & mask;
+    for (i = 0; i < rounds; i++) {
+      temp = right;
+      right = left ^ (feistel_round(right, keys[i]) & mask);
+      left = temp;
+    }
+    index = (left << half_bits) | right;
+  } while (index >= n);
+  return index;
+}
@@ -69,12 +69,47 @@ typedef struct s_binomial_t {
   double p4;
 } binomial_t;
 
+/* Number of binomial_t entries in binomial_cache_t, a power of 2 */
+#define BINOMIAL_CACHE_SIZE 16
+
+typedef struct s_binomial_cache {
+  binomial_t entries[BINOMIAL_CACHE_SIZE];
+} binomial_cache_t;
+
+/* State of a sequential random sample of n of the N positions after pos */
+typedef struct s_sequential_sample {
+  int64_t N;
+  int64_t n;
+  int64_t pos;
+  double vprime; /* Carried value used by method D, or < 0 if not set */
+} sequential_sample_t;
+
+typedef struct s_gamma_params {
+  double shape;
+  double b;
+  double c;
+} gamma_params_t;
+
+typedef struct s_poisson_params {
+  double lam;
+  double enlam;
+  double slam;
+  double loglam;
+  double a;
+  double b;
+  double invalpha;
+  double vr;
+} poisson_params_t;
+
 typedef struct bitgen {
   void *state;
   uint64_t (*next_uint64)(void *st);
   uint32_t (*next_uint32)(void *st);
   double (*next_double)(void *st);
   uint64_t (*next_raw)(void *st);
+  /* Optional bulk fills, NULL when a bit generator does not provide them */
+  void (*fill_uint64)(void *st, npy_intp cnt, uint64_t *out);
+  void (*fill_double)(void *st, npy_intp cnt, double *out);
 } bitgen_t;
 
 /* Inline generators for internal use */
@@ -232,6 +267,15 @@ DECLDIR float random_gauss_f(bitgen_t *bitgen_state);
 */
 DECLDIR double random_gauss_zig(bitgen_t *bitgen_state);
 DECLDIR float random_gauss_zig_f(bitgen_t *bitgen_state);
+DECLDIR void random_half_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                              uint16_t *out);
+DECLDIR void random_bfloat16_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                                  uint16_t *out);
+DECLDIR void random_gauss_16_setup(void);
+DECLDIR void random_gauss_half_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                                    uint16_t *out);
+DECLDIR void random_gauss_bfloat16_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                                        uint16_t *out);
 DECLDIR void random_gauss_zig_fill(bitgen_t *bitgen_state, npy_intp cnt,
                                    double *out);
 
@@ -240,6 +284,14 @@ DECLDIR double random_standard_gamma(bitgen_t *bitgen_state, double shape);
 DECLDIR float random_standard_gamma_f(bitgen_t *bitgen_state, float shape);
 */
 DECLDIR double random_standard_gamma_zig(bitgen_t *bitgen_state, double shape);
+DECLDIR void random_gamma_setup(double shape, gamma_params_t *params);
+DECLDIR double random_standard_gamma_params(bitgen_t *bitgen_state,
+                                            const gamma_params_t *params);
+DECLDIR double random_gamma_params(bitgen_t *bitgen_state,
+                                   const gamma_params_t *params, double scale);
+DECLDIR double random_beta_params(bitgen_t *bitgen_state,
+                                  const gamma_params_t *a_params,
+                                  const gamma_params_t *b_params);
 DECLDIR float random_standard_gamma_zig_f(bitgen_t *bitgen_state, float shape);
 
 /*
@@ -270,6 +322,21 @@ DECLDIR double random_lognormal(bitgen_t *bitgen_state, double mean,
                                 double sigma);
 DECLDIR double random_rayleigh(bitgen_t *bitgen_state, double mode);
 DECLDIR double random_standard_t(bitgen_t *bitgen_state, double df);
+
+DECLDIR float random_normal_f(bitgen_t *bitgen_state, float loc, float scale);
+DECLDIR float random_exponential_f(bitgen_t *bitgen_state, float scale);
+DECLDIR float random_uniform_f(bitgen_t *bitgen_state, float lower,
+                               float range);
+DECLDIR float random_beta_f(bitgen_t *bitgen_state, float a, float b);
+DECLDIR float random_chisquare_f(bitgen_t *bitgen_state, float df);
+DECLDIR float random_weibull_f(bitgen_t *bitgen_state, float a);
+DECLDIR float random_laplace_f(bitgen_t *bitgen_state, float loc, float scale);
+DECLDIR float random_gumbel_f(bitgen_t *bitgen_state, float loc, float scale);
+DECLDIR float random_logistic_f(bitgen_t *bitgen_state, float loc,
+                                float scale);
+DECLDIR float random_lognormal_f(bitgen_t *bitgen_state, float mean,
+                                 float sigma);
+DECLDIR float random_standard_t_f(bitgen_t *bitgen_state, float df);
 DECLDIR double random_noncentral_chisquare(bitgen_t *bitgen_state, double df,
                                            double nonc);
 DECLDIR double random_noncentral_f(bitgen_t *bitgen_state, double dfnum,
@@ -280,15 +347,34 @@ DECLDIR double random_triangular(bitgen_t *bitgen_state, double left,
                                  double mode, double right);
 
 DECLDIR RAND_INT_TYPE random_poisson(bitgen_t *bitgen_state, double lam);
+DECLDIR void random_poisson_setup(double lam, poisson_params_t *params);
+DECLDIR RAND_INT_TYPE random_poisson_params(bitgen_t *bitgen_state,
+                                            const poisson_params_t *params);
+DECLDIR npy_intp random_poisson_table_setup(double lam, double *cdf,
+                                            npy_intp *guide, npy_intp max_len);
+DECLDIR RAND_INT_TYPE random_poisson_table(bitgen_t *bitgen_state, double lam,
+                                           const double *cdf,
+                                           const npy_intp *guide, npy_intp len);
 DECLDIR RAND_INT_TYPE random_negative_binomial(bitgen_t *bitgen_state, double n,
                                                double p);
 DECLDIR RAND_INT_TYPE random_binomial(bitgen_t *bitgen_state, double p,
                                       RAND_INT_TYPE n, binomial_t *binomial);
+DECLDIR RAND_INT_TYPE random_binomial_cached(bitgen_t *bitgen_state, double p,
+                                             RAND_INT_TYPE n,
+                                             binomial_cache_t *cache);
 DECLDIR RAND_INT_TYPE random_logseries(bitgen_t *bitgen_state, double p);
 DECLDIR RAND_INT_TYPE random_geometric_search(bitgen_t *bitgen_state, double p);
 DECLDIR RAND_INT_TYPE random_geometric_inversion(bitgen_t *bitgen_state,
                                                  double p);
 DECLDIR RAND_INT_TYPE random_geometric(bitgen_t *bitgen_state, double p);
+DECLDIR npy_intp random_bernoulli_indices(bitgen_t *bitgen_state, double p,
+                                          int64_t n, int64_t *pos,
+                                          npy_intp cnt, int64_t *out);
+DECLDIR void random_sorted_uniform_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                                        double *out);
+DECLDIR npy_intp random_sequential_sample(bitgen_t *bitgen_state,
+                                          sequential_sample_t *state,
+                                          npy_intp cnt, int64_t *out);
 DECLDIR RAND_INT_TYPE random_zipf(bitgen_t *bitgen_state, double a);
 DECLDIR int64_t random_hypergeometric(bitgen_t *bitgen_state, int64_t good,
                                       int64_t bad, int64_t sample);
@@ -330,6 +416,10 @@ DECLDIR void random_bounded_uint16_fill(bitgen_t *bitgen_state, uint16_t off,
 DECLDIR void random_bounded_uint8_fill(bitgen_t *bitgen_state, uint8_t off,
                                        uint8_t rng, npy_intp cnt,
                                        bool use_masked, uint8_t *out);
+DECLDIR void random_bits_fill(bitgen_t *bitgen_state, npy_intp cnt,
+                              uint64_t *out);
+DECLDIR void random_bernoulli_fill(bitgen_t *bitgen_state, double p,
+                                   npy_intp cnt, uint64_t *out);
 DECLDIR void random_bounded_bool_fill(bitgen_t *bitgen_state, npy_bool off,
                                       npy_bool rng, npy_intp cnt,
                                       bool use_masked, npy_bool *out);
@@ -337,5 +427,45 @@ DECLDIR void random_bounded_bool_fill(bitgen_t *bitgen_state, npy_bool off,
 DECLDIR void random_multinomial(bitgen_t *bitgen_state, RAND_INT_TYPE n,
                                 RAND_INT_TYPE *mnix, double *pix, npy_intp d,
                                 binomial_t *binomial);
+DECLDIR int64_t random_categorical(bitgen_t *bitgen_state, const double *p,
+                                   npy_intp k, npy_intp stride);
+DECLDIR int64_t random_categorical_f(bitgen_t *bitgen_state, const float *p,
+                                     npy_intp k, npy_intp stride);
+DECLDIR int64_t random_categorical_logits(bitgen_t *bitgen_state,
+                                          const double *logits, npy_intp k,
+                                          npy_intp stride, double *buf);
+DECLDIR int64_t random_categorical_logits_f(bitgen_t *bitgen_state,
+                                            const float *logits, npy_intp k,
+                                            npy_intp stride, double *buf);
+DECLDIR void random_multinomial_cached(bitgen_t *bitgen_state, RAND_INT_TYPE n,
+                                       RAND_INT_TYPE *mnix, double *pix,
+                                       npy_intp d, binomial_cache_t *cache);
+
+DECLDIR void random_multinomial_alias(bitgen_t *bitgen_state, RAND_INT_TYPE n,
+                                      RAND_INT_TYPE *mnix, const double *prob,
+                                      const int64_t *alias, npy_intp d);
+DECLDIR npy_intp random_multinomial_alias_sparse(
+    bitgen_t *bitgen_state, RAND_INT_TYPE n, const double *prob,
+    const int64_t *alias, npy_intp d, int64_t *draws, int64_t *indices,
+    int64_t *counts);
+DECLDIR npy_intp random_multinomial_sparse(bitgen_t *bitgen_state,
+                                           RAND_INT_TYPE n, double *pix,
+                                           npy_intp d, binomial_cache_t *cache,
+                                           int64_t *dense, int64_t *indices,
+                                           int64_t *counts);
+
+DECLDIR void random_alias_setup(const double *p, npy_intp n, double *prob,
+                                int64_t *alias, int64_t *work);
+DECLDIR int64_t random_alias(bitgen_t *bitgen_state, const double *prob,
+                             const int64_t *alias, npy_intp n);
+DECLDIR void random_fenwick_setup(const double *weights, npy_intp n,
+                                  double *tree);
+DECLDIR void random_weighted_without_replacement(bitgen_t *bitgen_state,
+                                                 double *weights, double *tree,
+                                                 npy_intp n, npy_intp k,
+                                                 int64_t *out);
+DECLDIR uint64_t random_permuted_index(uint64_t index, uint64_t n,
+                                       int half_bits, const uint64_t *keys,
+                                       int rounds);
 
 #endif
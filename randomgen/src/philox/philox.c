@@ -44,3 +44,74 @@ _philoxNxW_next_extern_tpl(2, 32)
 _philoxNxW_next_extern_tpl(4, 32)
 _philoxNxW_next_extern_tpl(2, 64)
 _philoxNxW_next_extern_tpl(4, 64)
+
+#define _philoxNx64_fill_extern_tpl(N)                                                         \
+extern INLINE void philox##N##x64_fill_next64(philox_all_t *state, size_t cnt, uint64_t *out);     \
+extern INLINE void philox##N##x64_fill_next_double(philox_all_t *state, size_t cnt, double *out);
+
+_philoxNx64_fill_extern_tpl(2)
+_philoxNx64_fill_extern_tpl(4)
+
+/* Stateless evaluation of cnt blocks starting with the block after ctr */
+#define _philoxNxW_blocks_at_tpl(N, W)                                                        \
+void philox##N##x##W##_blocks_at(uint##W##_t *ctr, uint##W##_t *key, size_t cnt, uint##W##_t *out) { \
+  int i;                                                                                    \
+  philox##N##x##W##_ctr_t ct;                                                               \
+  philox##N##x##W##_key_t ky;                                                               \
+  for (i = 0; i < N; i++) {                                                                 \
+    ct.v[i] = ctr[i];                                                                       \
+  }                                                                                         \
+  for (i = 0; i < (int)(sizeof(ky.v) / sizeof(ky.v[0])); i++) {                             \
+    ky.v[i] = key[i];                                                                       \
+  }                                                                                         \
+  philox##N##x##W##_blocks(&ct, ky, cnt, out);                                              \
+}
+
+_philoxNxW_blocks_at_tpl(2, 32)
+_philoxNxW_blocks_at_tpl(4, 32)
+_philoxNxW_blocks_at_tpl(2, 64)
+_philoxNxW_blocks_at_tpl(4, 64)
+
+/* Stateless evaluation of the raw values at positions relative to the next
+   value returned by philoxNxW_next. Consecutive positions in the same block
+   reuse the block. */
+#define _philoxNxW_raw_at_tpl(N, W)                                                            \
+void philox##N##x##W##_raw_at(philox_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) { \
+  size_t j;                                                                                   \
+  int i, have_block = 0;                                                                      \
+  uint64_t q, blk, last_blk = 0, rem;                                                         \
+  uint##W##_t add, sum, carry;                                                                \
+  philox##N##x##W##_ctr_t ct, block;                                                           \
+  /* buffer_pos may exceed N when the buffer is exhausted */                                   \
+  int buffer_pos = state->buffer_pos < N ? state->buffer_pos : N;                            \
+  for (j = 0; j < cnt; j++) {                                                                 \
+    q = positions[j] + (uint64_t)buffer_pos;                                                  \
+    blk = q / N;                                                                              \
+    if (blk == 0) {                                                                           \
+      /* Still in the current buffer */                                                       \
+      out[j] = state->buffer[q].u##W;                                                         \
+      continue;                                                                               \
+    }                                                                                         \
+    if (!have_block || blk != last_blk) {                                                     \
+      ct = state->state.state##N##x##W.ctr;                                                   \
+      rem = blk;                                                                              \
+      carry = 0;                                                                              \
+      for (i = 0; i < N; i++) {                                                               \
+        add = (uint##W##_t)rem;                                                               \
+        rem = (W == 64) ? 0 : rem >> (W % 64);                                                \
+        sum = ct.v[i] + add;                                                                  \
+        ct.v[i] = sum + carry;                                                                \
+        carry = (sum < add) || (ct.v[i] < carry);                                             \
+      }                                                                                       \
+      block = philox##N##x##W(ct, state->state.state##N##x##W.key);                              \
+      last_blk = blk;                                                                         \
+      have_block = 1;                                                                         \
+    }                                                                                         \
+    out[j] = block.v[q % N];                                                                  \
+  }                                                                                           \
+}
+
+_philoxNxW_raw_at_tpl(2, 32)
+_philoxNxW_raw_at_tpl(4, 32)
+_philoxNxW_raw_at_tpl(2, 64)
+_philoxNxW_raw_at_tpl(4, 64)
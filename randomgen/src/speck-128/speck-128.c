@@ -84,3 +84,40 @@ void speck_advance(speck_state_t *state, uint64_t *step)
     /* Reset the offset */
     state->offset = new_offset;
 }
+
+/* Stateless evaluation of the values at positions relative to the next value
+   returned by speck_next64 */
+void speck_raw_at(speck_state_t *state, uint64_t *positions, size_t cnt,
+                  uint64_t *out)
+{
+    size_t j;
+    uint64_t w, blk, last_blk = 0;
+    uint64_t base[2], block[2];
+    int i, have_block = 0;
+    /* The buffer holds the encrypted counters ctr[0] - SPECK_CTR_SZ, ... */
+    base[0] = state->ctr[0].u64[0] - SPECK_CTR_SZ;
+    base[1] = state->ctr[0].u64[1] - (base[0] > state->ctr[0].u64[0]);
+    for (j = 0; j < cnt; j++)
+    {
+        w = positions[j] + state->offset / sizeof(uint64_t);
+        if (w < 2 * SPECK_CTR_SZ)
+        {
+            memcpy(&out[j], &state->buffer[sizeof(uint64_t) * w],
+                   sizeof(uint64_t));
+            continue;
+        }
+        blk = w / 2;
+        if (!have_block || blk != last_blk)
+        {
+            block[0] = base[0] + blk;
+            block[1] = base[1] + (block[0] < blk);
+            for (i = 0; i < state->rounds; ++i)
+            {
+                ER64(block[1], block[0], state->round_key[i].u64[0]);
+            }
+            last_blk = blk;
+            have_block = 1;
+        }
+        out[j] = block[w % 2];
+    }
+}
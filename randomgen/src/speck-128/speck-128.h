@@ -138,5 +138,7 @@ void speck_use_sse41(int val);
 void speck_seed(speck_state_t *state, uint64_t seed[4]);
 void speck_set_counter(speck_state_t *state, uint64_t *ctr);
 void speck_advance(speck_state_t *state, uint64_t *step);
+void speck_raw_at(speck_state_t *state, uint64_t *positions, size_t cnt,
+                  uint64_t *out);
 
 #endif /* _RANDOMDGEN__SPECK128_H_ */
\ No newline at end of file
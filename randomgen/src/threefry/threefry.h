@@ -856,6 +856,88 @@ _threefryNx32_next_double_tpl(4)
 _threefryNx64_next_double_tpl(2)
 _threefryNx64_next_double_tpl(4)
 
+#ifndef THREEFRY_BATCH
+#define THREEFRY_BATCH 16
+#endif
+
+/* Compute cnt consecutive blocks, starting with the block after *ctr, directly
+   into out. Blocks are independent and are computed in batches so that the
+   compiler can interleave or vectorize them. *ctr holds the counter of the
+   last block on exit. */
+#define _threefryNxW_blocks_tpl(N, W, T) \
+R123_STATIC_INLINE void threefry##N##x##W##_blocks(threefry##N##x##W##_ctr_t *ctr, \
+    threefry##N##x##W##_key_t key, size_t cnt, T *out) { \
+  threefry##N##x##W##_ctr_t batch[THREEFRY_BATCH]; \
+  size_t j, n; \
+  int i; \
+  while (cnt > 0) { \
+    n = cnt < THREEFRY_BATCH ? cnt : THREEFRY_BATCH; \
+    for (j = 0; j < n; j++) { \
+      i = 0; \
+      do { \
+        ctr->v[i++]++; \
+      } while (ctr->v[i-1]==0 && i < N ); \
+      batch[j] = *ctr; \
+    } \
+    for (j = 0; j < n; j++) { \
+      batch[j] = threefry##N##x##W(batch[j], key); \
+    } \
+    for (j = 0; j < n; j++) { \
+      for (i = 0; i < N; i++) { \
+        out[i] = batch[j].v[i]; \
+      } \
+      out += N; \
+    } \
+    cnt -= n; \
+  } \
+}
+
+_threefryNxW_blocks_tpl(2, 32, uint32_t)
+_threefryNxW_blocks_tpl(4, 32, uint32_t)
+_threefryNxW_blocks_tpl(2, 64, uint64_t)
+_threefryNxW_blocks_tpl(4, 64, uint64_t)
+
+/* Drain the buffer and then compute whole blocks directly into out */
+#define _threefryNx64_fill_tpl(N) \
+R123_STATIC_INLINE void threefry##N##x64_fill_next64(threefry_all_t *state, size_t cnt, uint64_t *out) { \
+  size_t nblocks; \
+  int i; \
+  while (cnt > 0 && state->buffer_pos < N) { \
+    *out++ = state->buffer[state->buffer_pos++].u64; \
+    cnt--; \
+  } \
+  nblocks = cnt / N; \
+  if (nblocks > 0) { \
+    threefry##N##x64_blocks(&state->state.state##N##x64.ctr, state->state.state##N##x64.key, nblocks, out); \
+    /* Leave the buffer as if the blocks were generated one at a time */ \
+    for (i = 1; i < N; i++) { \
+      state->buffer[i].u64 = out[N * (nblocks - 1) + i]; \
+    } \
+    out += N * nblocks; \
+    cnt -= N * nblocks; \
+  } \
+  while (cnt > 0) { \
+    *out++ = threefry##N##x64_next(state); \
+    cnt--; \
+  } \
+} \
+R123_STATIC_INLINE void threefry##N##x64_fill_next_double(threefry_all_t *state, size_t cnt, double *out) { \
+  uint64_t buffer[4 * THREEFRY_BATCH]; \
+  size_t i, n; \
+  while (cnt > 0) { \
+    n = cnt < 4 * THREEFRY_BATCH ? cnt : 4 * THREEFRY_BATCH; \
+    threefry##N##x64_fill_next64(state, n, buffer); \
+    for (i = 0; i < n; i++) { \
+      out[i] = (buffer[i] >> 11) * (1.0 / 9007199254740992.0); \
+    } \
+    out += n; \
+    cnt -= n; \
+  } \
+}
+
+_threefryNx64_fill_tpl(2)
+_threefryNx64_fill_tpl(4)
+
 
 #define _threefryNxW_advance_h_tpl(N, W)                                          \
 void threefry##N##x##W##_advance(threefry_all_t *state, uint##W##_t *step, int use_carry); \
@@ -865,5 +947,21 @@ _threefryNxW_advance_h_tpl(4, 32)
 _threefryNxW_advance_h_tpl(2, 64)
 _threefryNxW_advance_h_tpl(4, 64)
 
+#define _threefryNxW_blocks_at_h_tpl(N, W)                                          \
+void threefry##N##x##W##_blocks_at(uint##W##_t *ctr, uint##W##_t *key, size_t cnt, uint##W##_t *out);
+
+_threefryNxW_blocks_at_h_tpl(2, 32)
+_threefryNxW_blocks_at_h_tpl(4, 32)
+_threefryNxW_blocks_at_h_tpl(2, 64)
+_threefryNxW_blocks_at_h_tpl(4, 64)
+
+#define _threefryNxW_raw_at_h_tpl(N, W)                                          \
+void threefry##N##x##W##_raw_at(threefry_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out);
+
+_threefryNxW_raw_at_h_tpl(2, 32)
+_threefryNxW_raw_at_h_tpl(4, 32)
+_threefryNxW_raw_at_h_tpl(2, 64)
+_threefryNxW_raw_at_h_tpl(4, 64)
+
 
 #endif
@@ -30,6 +30,8 @@ aes = AESCounter(mode="sequence")
 HAS_AESNI = aes.use_aesni
 
 USE_AESNI = [True, False] if HAS_AESNI else [False]
+HAS_VAES = aes.use_vaes
+USE_VAES = [True, False] if HAS_VAES else [False]
 
 try:
     import cffi  # noqa: F401
@@ -225,6 +227,52 @@ class Base(object):
         uints = bit_generator.random_raw(1000, output=False)
         assert uints is None
 
+    def test_bulk_fill(self):
+        bit_generator = self.setup_bitgenerator(self.data1["seed"])
+        bit_generator.random_raw(3)
+        state = bit_generator.state
+        interface = bit_generator.ctypes
+        expected = [interface.next_uint64(interface.state)
+                    for _ in range(1003)]
+        bit_generator.state = state
+        g = Generator(bit_generator)
+        uints = g.integers(0, 2 ** 64, size=1003, dtype=np.uint64)
+        assert_equal(uints, np.array(expected, dtype=np.uint64))
+
+        bit_generator.state = state
+        expected = [interface.next_double(interface.state)
+                    for _ in range(1003)]
+        bit_generator.state = state
+        out = np.empty(1003)
+        g.random(out=out)
+        assert_equal(out, expected)
+
+    @pytest.mark.parametrize("use_masked", [True, False])
+    def test_bulk_fill_bounded(self, use_masked):
+        # Bounded 64-bit values consume the raw words in order
+        bit_generator = self.setup_bitgenerator(self.data1["seed"])
+        state = bit_generator.state
+        interface = bit_generator.ctypes
+        rng = 3 * 2 ** 61 + 12345
+        mask = 2 ** 63 - 1
+        expected = []
+        while len(expected) < 1003:
+            x = interface.next_uint64(interface.state)
+            if use_masked:
+                if x & mask <= rng:
+                    expected.append(100 + (x & mask))
+            else:
+                m = x * (rng + 1)
+                if m % 2 ** 64 >= (2 ** 64 - rng - 1) % (rng + 1):
+                    expected.append(100 + (m >> 64))
+        next_raw = interface.next_uint64(interface.state)
+        bit_generator.state = state
+        g = Generator(bit_generator)
+        uints = g.integers(100, 100 + rng, size=1003, dtype=np.uint64,
+                           endpoint=True, use_masked=use_masked)
+        assert_equal(uints, np.array(expected, dtype=np.uint64))
+        assert_equal(interface.next_uint64(interface.state), next_raw)
+
     def test_gauss_inv(self):
         n = 25
         rs = RandomState(self.setup_bitgenerator(self.data1["seed"]))
@@ -433,6 +481,39 @@ class Base(object):
         next_g = g.integers(0, 2 ** 32, dtype=np.uint32)
         assert next_g != next_advanced
 
+    @pytest.mark.parametrize("warmup", [0, 1, 3, 131])
+    def test_values_at(self, warmup):
+        bg = self.setup_bitgenerator([None])
+        if not hasattr(bg, "values_at"):
+            pytest.skip("bit generator does not support values_at")
+        bg.random_raw(warmup)
+        state = bg.state
+        positions = np.array([[0, 1, 2, 5], [17, 1000, 3, 3]])
+        values = bg.values_at(positions)
+        assert_state_equal(bg.state, state)
+        assert values.dtype == np.uint64
+        assert values.shape == positions.shape
+        assert bg.values_at(17) == values[1, 0]
+        expected = bg.random_raw(1001)
+        assert_equal(values, expected[positions])
+
+        bg.state = state
+        doubles = bg.values_at(positions.ravel(), dtype=np.float64)
+        assert_state_equal(bg.state, state)
+        expected = Generator(bg).random(1001)
+        assert_equal(doubles, expected[positions.ravel()])
+
+    def test_values_at_errors(self):
+        bg = self.setup_bitgenerator([None])
+        if not hasattr(bg, "values_at"):
+            pytest.skip("bit generator does not support values_at")
+        with pytest.raises(ValueError):
+            bg.values_at([0, -1])
+        with pytest.raises(TypeError):
+            bg.values_at([0.0, 1.0])
+        with pytest.raises(TypeError):
+            bg.values_at([0, 1], dtype=np.float32)
+
     def test_seed_sequence(self):
         bg = self.bit_generator(mode="sequence")
         assert isinstance(bg, self.bit_generator)
@@ -531,6 +612,47 @@ class Random123(Base):
         with pytest.raises(ValueError, match="seed and key"):
             self.setup_bitgenerator([0], mode="legacy", key=0, counter=0)
 
+    @pytest.mark.parametrize("number", [2, 4])
+    def test_random_raw_at(self, number):
+        counter = 2 ** (number * self.width) - 7
+        bg = self.bit_generator(0, number=number, mode="sequence")
+        bg.random_raw(3)
+        state = bg.state
+        direct = bg.random_raw_at(counter, 41, key=1234)
+        assert_state_equal(bg.state, state)
+        assert direct.dtype == np.uint64
+        keyed = self.bit_generator(counter=counter, key=1234, number=number)
+        assert_equal(direct, keyed.random_raw(41))
+
+        key = bg.state["state"]["key"]
+        key = sum([int(key[i]) * 2 ** (self.width * i)
+                   for i in range(len(key))])
+        keyed = self.bit_generator(counter=3, key=key, number=number)
+        assert_equal(bg.random_raw_at(3, 17), keyed.random_raw(17))
+        assert_equal(bg.random_raw_at(0, 0).shape, (0,))
+        with pytest.raises(ValueError):
+            bg.random_raw_at(0, -1)
+        with pytest.raises(ValueError):
+            bg.random_raw_at(2 ** (number * self.width), 1)
+
+    @pytest.mark.parametrize("number", [2, 4])
+    def test_bulk_matches_scalar(self, number):
+        bg = self.bit_generator(0, number=number, mode="sequence")
+        bg2 = self.bit_generator(0, number=number, mode="sequence")
+        bg.random_raw(3)
+        bg2.random_raw(3)
+        bulk = bg.random_raw(1001)
+        scalar = np.array([bg2.random_raw() for _ in range(1001)],
+                          dtype=np.uint64)
+        assert_equal(bulk, scalar)
+        assert_state_equal(bg.state, bg2.state)
+        gen = Generator(bg)
+        gen2 = Generator(bg2)
+        bulk = gen.random(999)
+        scalar = np.array([gen2.random() for _ in range(999)])
+        assert_equal(bulk, scalar)
+        assert_state_equal(bg.state, bg2.state)
+
 
 class TestJSF64(Base):
     @classmethod
@@ -962,6 +1084,14 @@ class TestAESCounter(TestPhilox):
     def test_advance_deprecated(self):
         pass
 
+    @pytest.mark.skip(reason="Not applicable to AESCounter")
+    def test_random_raw_at(self):
+        pass
+
+    @pytest.mark.skip(reason="Not applicable to AESCounter")
+    def test_bulk_matches_scalar(self):
+        pass
+
     @pytest.mark.skipif(HAS_AESNI, reason="Not valid when cpu has AESNI")
     def test_no_aesni(self):
         bg = self.bit_generator(mode="sequence")
@@ -972,6 +1102,51 @@ class TestAESCounter(TestPhilox):
         with pytest.raises(ValueError, match="seed and key"):
             self.setup_bitgenerator([0], mode="legacy", counter=0, key=0)
 
+    @pytest.mark.parametrize("lanes", [8, 16])
+    @pytest.mark.parametrize("use_vaes", USE_VAES)
+    def test_lanes(self, lanes, use_vaes):
+        bg = self.setup_bitgenerator(self.data1["seed"])
+        expected = bg.random_raw(1003)
+        bg = self.setup_bitgenerator(self.data1["seed"], lanes=lanes)
+        bg.use_vaes = use_vaes
+        assert_equal(bg.random_raw(3), expected[:3])
+        state = bg.state
+        assert state["s"]["lanes"] == lanes
+        assert state["s"]["counter"].shape == (2 * lanes,)
+        assert state["s"]["state"].shape == (16 * lanes,)
+        assert_equal(bg.random_raw(1000), expected[3:])
+        bg.state = state
+        assert_equal(bg.random_raw(1000), expected[3:])
+        bg.state = state
+        bg.advance(997)
+        assert_equal(bg.random_raw(), expected[1000])
+        bg = self.setup_bitgenerator(self.data1["seed"], lanes=lanes)
+        assert_equal(bg.jumped().random_raw(10),
+                     self.setup_bitgenerator(self.data1["seed"]).jumped()
+                     .random_raw(10))
+
+    def test_lanes_state(self):
+        bg = self.setup_bitgenerator(self.data1["seed"])
+        bg.random_raw(7)
+        state = bg.state
+        del state["s"]["lanes"]
+        wide = self.setup_bitgenerator(self.data1["seed"], lanes=16)
+        wide.state = state
+        assert wide.state["s"]["lanes"] == 4
+        assert_equal(wide.random_raw(100), bg.random_raw(100))
+        with pytest.raises(ValueError, match="lanes"):
+            self.bit_generator(mode="sequence", lanes=6)
+        state = wide.state
+        state["s"]["lanes"] = 8
+        with pytest.raises(ValueError, match="128 elements"):
+            wide.state = state
+
+    @pytest.mark.skipif(HAS_VAES, reason="Not valid when cpu has VAES")
+    def test_no_vaes(self):
+        bg = self.bit_generator(mode="sequence")
+        with pytest.raises(ValueError, match="CPU does not support VAES"):
+            bg.use_vaes = True
+
 
 class TestMT19937(Base):
 
@@ -1303,6 +1478,14 @@ class TestRDRAND(Base):
         gauss = rs.standard_normal(n)
         assert (gauss.max() - gauss.min()) > 0
 
+    @pytest.mark.skip("RDRAND state cannot be restored")
+    def test_bulk_fill(self):
+        pass
+
+    @pytest.mark.skip("RDRAND state cannot be restored")
+    def test_bulk_fill_bounded(self, use_masked):
+        pass
+
     def test_uniform_double(self):
         rs = Generator(self.setup_bitgenerator(self.data1["seed"]))
         uniforms = rs.random(1000)
@@ -1477,6 +1660,35 @@ class TestChaCha(Base):
         bg2.use_simd = not bg.use_simd
         assert_equal(bg.random_raw(100), bg2.random_raw(100))
 
+    def test_use_avx2(self):
+        bg = self.bit_generator(0, mode="legacy")
+        if not bg.use_avx2:
+            with pytest.raises(ValueError):
+                bg.use_avx2 = True
+            return
+        expected = bg.random_raw(1003)
+        bg2 = self.bit_generator(0, mode="legacy")
+        bg2.use_avx2 = False
+        assert_equal(bg2.random_raw(1003), expected)
+        bg2.use_avx2 = True
+
+    @pytest.mark.parametrize("rounds", [8, 20])
+    def test_state_buffer(self, rounds):
+        gen = Generator(self.bit_generator(0, rounds=rounds, mode="sequence"))
+        for n in (1, 16, 63, 64, 65, 200):
+            gen.bit_generator.random_raw(n)
+            state = gen.bit_generator.state
+            bg = self.bit_generator(mode="sequence")
+            bg.state = state
+            assert_state_equal(bg.state, state)
+            assert_equal(bg.random_raw(3), gen.bit_generator.random_raw(3))
+        gen.bit_generator.state = bg.state
+        # 32-bit draw leaves the counter between 64-bit values
+        gen.integers(2 ** 32, dtype=np.uint32)
+        bg.state = gen.bit_generator.state
+        values = gen.integers(0, 2 ** 64, size=201, dtype=np.uint64)
+        assert_equal(values, [bg.random_raw() for _ in range(201)])
+
     def test_seed_key(self):
         with pytest.raises(ValueError, match="seed and key"):
             self.setup_bitgenerator([0], mode="sequence", key=0, counter=0)
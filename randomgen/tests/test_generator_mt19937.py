@@ -3,12 +3,13 @@ import warnings
 from distutils.version import LooseVersion
 import numpy as np
 import hashlib
-from numpy.testing import (assert_, assert_array_almost_equal,
-                           assert_array_equal, assert_equal,
-                           assert_no_warnings, assert_raises, assert_warns)
+from numpy.testing import (assert_, assert_allclose,
+                           assert_array_almost_equal, assert_array_equal,
+                           assert_equal, assert_no_warnings, assert_raises, assert_warns)
 import pytest
 
 from randomgen import MT19937, Generator
+from randomgen.generator import _OUT_METHODS, _stream
 from randomgen._testing import suppress_warnings
 from randomgen.tests.test_direct import assert_state_equal
 
@@ -147,6 +148,397 @@ class TestMultinomial(object):
         with pytest.raises(ValueError, match=r"sum\(pvals"):
             random.multinomial(100, np.array([.7, .6, .5, 0]))
 
+    def test_pvals_2d(self):
+        pvals = np.array([[0.2, 0.3, 0.5], [0.9, 0.05, 0.05]])
+        random.bit_generator.seed(1432985819)
+        actual = random.multinomial([[10], [100]], pvals)
+        assert_equal(actual.shape, (2, 2, 3))
+        random.bit_generator.seed(1432985819)
+        desired = [random.multinomial(n, p) for n in (10, 100) for p in pvals]
+        assert_array_equal(actual.reshape(4, 3), desired)
+        assert_array_equal(actual.sum(-1), [[10, 10], [100, 100]])
+
+    def test_pvals_2d_size(self):
+        pvals = np.array([[0.2, 0.3, 0.5], [0.9, 0.05, 0.05]])
+        assert_equal(random.multinomial(5, pvals, size=(4, 2)).shape, (4, 2, 3))
+        assert_equal(random.multinomial([5, 7], pvals[:1]).shape, (2, 3))
+        assert_raises(ValueError, random.multinomial, 5, pvals, size=3)
+        assert_raises(ValueError, random.multinomial, 5, [[0.9, 0.9, 0.1]])
+        assert_raises(ValueError, random.multinomial, 5, [[-0.1, 1.1]])
+        assert_raises(ValueError, random.multinomial, -5, pvals)
+
+
+    @pytest.mark.parametrize("method", ["alias", "conditional"])
+    def test_method_frequencies(self, method):
+        pvals = np.array([0.1, 0.2, 0.0, 0.3, 0.4])
+        gen = Generator(MT19937(0, mode="sequence"))
+        draws = gen.multinomial(10, pvals, size=50000, method=method)
+        assert_array_equal(draws.sum(1), 10)
+        assert_array_equal(draws[:, 2], 0)
+        assert_array_almost_equal(draws.mean(0) / 10, pvals, decimal=2)
+        # The last category holds the remaining probability
+        draws = gen.multinomial(10, [0.5, 0.0, 0.9], size=50000, method=method)
+        assert_array_almost_equal(draws.mean(0) / 10, [0.5, 0, 0.5], decimal=2)
+
+    def test_auto_method(self):
+        pvals = np.full(2048, 1 / 2048)
+        gen = Generator(MT19937(0, mode="sequence"))
+        auto = gen.multinomial([10, 128], pvals)
+        gen = Generator(MT19937(0, mode="sequence"))
+        alias = gen.multinomial([10, 128], pvals, method="alias")
+        assert_array_equal(auto, alias)
+        gen = Generator(MT19937(0, mode="sequence"))
+        auto = gen.multinomial([10, 129], pvals)
+        gen = Generator(MT19937(0, mode="sequence"))
+        conditional = gen.multinomial([10, 129], pvals, method="conditional")
+        assert_array_equal(auto, conditional)
+        assert_raises(ValueError, random.multinomial, 10, pvals, method="other")
+
+    @pytest.mark.parametrize("method", ["alias", "conditional"])
+    def test_sparse(self, method):
+        pvals = np.full((2, 3000), 1 / 3000)
+        gen = Generator(MT19937(0, mode="sequence"))
+        dense = gen.multinomial([[5], [40]], pvals, size=(2, 2), method=method)
+        gen = Generator(MT19937(0, mode="sequence"))
+        indices, counts = gen.multinomial([[5], [40]], pvals, size=(2, 2),
+                                          method=method, sparse=True)
+        assert_equal(indices.shape, (2, 2, 40))
+        assert_equal(counts.shape, (2, 2, 40))
+        for idx in np.ndindex(2, 2):
+            nonzero = counts[idx] > 0
+            assert_array_equal(indices[idx][nonzero],
+                               np.flatnonzero(dense[idx]))
+            assert_array_equal(counts[idx][nonzero], dense[idx][dense[idx] > 0])
+            assert np.all(indices[idx][~nonzero] == -1)
+        indices, counts = random.multinomial(100, [0.5, 0.5], sparse=True)
+        assert_equal(indices.shape, (2,))
+        assert_equal(counts.sum(), 100)
+
+
+
+class TestBernoulli(object):
+    @pytest.mark.parametrize("p", [0.5, 0.25, 0.1, 1 / 3, 0.9, 1e-4])
+    def test_frequency(self, p):
+        gen = Generator(MT19937(0, mode="sequence"))
+        values = gen.bernoulli(p, size=200000)
+        assert values.dtype == np.bool_
+        assert_allclose(values.mean(), p, atol=4 * np.sqrt(p * (1 - p) / 200000))
+        cols = gen.bernoulli(p, size=(20000, 64)).astype(np.double)
+        assert_allclose(cols.mean(0), p, atol=5 * np.sqrt(p * (1 - p) / 20000))
+
+    def test_extremes(self):
+        assert not random.bernoulli(0.0, size=1000).any()
+        assert random.bernoulli(1.0, size=1000).all()
+        assert_equal(random.bernoulli(1.0, size=100, packed=True)[-1], 15)
+        assert not random.bernoulli(5e-324, size=1000).any()
+        assert isinstance(random.bernoulli(0.5), bool)
+
+    @pytest.mark.parametrize("dtype", [np.uint8, np.uint64])
+    def test_packed(self, dtype):
+        gen = Generator(MT19937(0, mode="sequence"))
+        packed = gen.bernoulli(0.3, size=(3, 1000), packed=True, dtype=dtype)
+        width = np.dtype(dtype).itemsize * 8
+        assert packed.dtype == dtype
+        assert_equal(packed.shape, (3, (1000 + width - 1) // width))
+        bits = np.unpackbits(packed.view(np.uint8), axis=-1, bitorder="little")
+        assert not bits[:, 1000:].any()
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_array_equal(bits[:, :1000], gen.bernoulli(0.3, size=(3, 1000)))
+
+    def test_random_bits(self):
+        bit_gen = MT19937(0, mode="sequence")
+        words = Generator(bit_gen).random_bits(64 * 5, dtype=np.uint64)
+        expected = Generator(MT19937(0, mode="sequence"))
+        expected = expected.integers(0, 2 ** 64, size=5, dtype=np.uint64)
+        assert_array_equal(words, expected)
+        gen = Generator(MT19937(0, mode="sequence"))
+        packed = gen.random_bits((2, 100))
+        assert_equal(packed.shape, (2, 13))
+        assert_equal(packed[:, -1] >> 4, 0)
+        gen = Generator(MT19937(0, mode="sequence"))
+        bits = gen.random_bits((2, 100), packed=False)
+        assert bits.dtype == np.bool_
+        assert_array_equal(np.packbits(bits, axis=-1, bitorder="little"),
+                           packed)
+
+    def test_out(self):
+        out = np.empty((3, 2), dtype=np.uint64)
+        assert random.bernoulli(0.5, size=(3, 100), packed=True,
+                                dtype=np.uint64, out=out) is out
+        out = np.empty((3, 100), dtype=np.bool_)
+        assert random.random_bits((3, 100), packed=False, out=out) is out
+        gen = Generator(MT19937(0, mode="sequence"))
+        expected = gen.bernoulli(0.3, size=(3, 100))
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert gen.bernoulli(0.3, out=out) is out
+        assert_array_equal(out, expected)
+        assert_raises(ValueError, random.bernoulli, 0.3, packed=True,
+                      out=np.empty((3, 13), dtype=np.uint8))
+        assert_raises(ValueError, random.random_bits, (3, 100),
+                      out=np.empty((3, 12), dtype=np.uint8))
+        assert_raises(TypeError, random.random_bits, (3, 100),
+                      out=np.empty((3, 13), dtype=np.int8))
+        assert_raises(ValueError, random.random_bits, (3, 100),
+                      out=np.empty((13, 3), dtype=np.uint8).T)
+
+    def test_errors(self):
+        assert_raises(ValueError, random.bernoulli, 1.5, size=10)
+        assert_raises(ValueError, random.bernoulli, np.nan, size=10)
+        assert_raises(ValueError, random.bernoulli, [0.5, 0.5], size=10)
+        assert_raises(ValueError, random.bernoulli, 0.5, packed=True)
+        assert_raises(TypeError, random.bernoulli, 0.5, size=10, packed=True,
+                      dtype=np.uint32)
+        assert_raises(ValueError, random.random_bits, ())
+        assert_raises(ValueError, random.random_bits, -1)
+
+
+class TestBernoulliIndices(object):
+    def test_frequencies(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        counts = np.zeros(50)
+        for _ in range(5000):
+            idx = gen.bernoulli_indices(50, 0.3)
+            assert idx.dtype == np.int64
+            assert np.all(np.diff(idx) > 0)
+            counts[idx] += 1
+        assert_allclose(counts / 5000, 0.3, atol=0.03)
+
+    def test_large(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        idx = gen.bernoulli_indices(10 ** 12, 1e-7)
+        assert abs(idx.shape[0] - 10 ** 5) < 2000
+        assert idx[0] >= 0
+        assert idx[-1] < 10 ** 12
+        assert np.all(np.diff(idx) > 0)
+
+    def test_edge_cases(self):
+        assert_array_equal(random.bernoulli_indices(10, 1.0), np.arange(10))
+        assert_equal(random.bernoulli_indices(10, 0.0).shape, (0,))
+        assert_equal(random.bernoulli_indices(0, 0.5).shape, (0,))
+
+    def test_coordinates(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        rows, cols = gen.bernoulli_indices((100, 200), 0.05)
+        gen = Generator(MT19937(12345, mode="sequence"))
+        flat = gen.bernoulli_indices(100 * 200, 0.05)
+        expected = np.unravel_index(flat, (100, 200))
+        assert_array_equal(rows, expected[0])
+        assert_array_equal(cols, expected[1])
+        assert rows.max() < 100
+        assert cols.max() < 200
+
+    def test_sparse_random(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        data, indices, indptr = gen.sparse_random((300, 400), 0.05)
+        assert_equal(indptr.shape, (301,))
+        assert_equal(indptr[0], 0)
+        assert_equal(indptr[-1], data.shape[0])
+        assert indices.dtype == np.int64
+        assert indptr.dtype == np.int64
+        assert np.all((data > 0) & (data < 1))
+        dense = np.zeros((300, 400))
+        for i in range(300):
+            row = indices[indptr[i]:indptr[i + 1]]
+            assert np.all(np.diff(row) > 0)
+            dense[i, row] = data[indptr[i]:indptr[i + 1]]
+        assert_equal(np.count_nonzero(dense), data.shape[0])
+        assert abs(data.shape[0] - 6000) < 400
+
+        gen = Generator(MT19937(12345, mode="sequence"))
+        rows, cols = gen.bernoulli_indices((300, 400), 0.05)
+        assert_array_equal(indices, cols)
+        assert_array_equal(np.diff(indptr), np.bincount(rows, minlength=300))
+
+    def test_sparse_random_dtype(self):
+        data, indices, indptr = random.sparse_random((30, 40), 0.1,
+                                                     dtype=np.float32)
+        assert data.dtype == np.float32
+        data, indices, indptr = random.sparse_random((3, 0), 0.5)
+        assert_array_equal(indptr, np.zeros(4))
+        assert_equal(data.shape, (0,))
+
+    @pytest.mark.parametrize("dtype", ["float16", "bfloat16"])
+    def test_sparse_random_no_zeros(self, dtype):
+        # Low precision uniforms are exactly 0 often enough to be stored
+        gen = Generator(MT19937(12345, mode="sequence"))
+        data, indices, indptr = gen.sparse_random((1000, 1000), 0.5,
+                                                  dtype=dtype)
+        assert_equal(data.shape, indices.shape)
+        assert np.count_nonzero(data) == data.shape[0]
+
+    def test_errors(self):
+        assert_raises(ValueError, random.bernoulli_indices, 10, 1.5)
+        assert_raises(ValueError, random.bernoulli_indices, 10, np.nan)
+        assert_raises(ValueError, random.bernoulli_indices, 10, [0.5])
+        assert_raises(ValueError, random.bernoulli_indices, -1, 0.5)
+        assert_raises(ValueError, random.bernoulli_indices, 2 ** 64, 0.5)
+        assert_raises(ValueError, random.sparse_random, (10,), 0.5)
+        assert_raises(ValueError, random.sparse_random, (10, 10), -0.1)
+
+
+class TestSortedSampling(object):
+    def test_sorted_random(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        values = np.array([gen.sorted_random(9) for _ in range(10000)])
+        assert np.all(np.diff(values, axis=1) >= 0)
+        assert np.all((values >= 0) & (values < 1))
+        k = np.arange(1, 10)
+        assert_allclose(values.mean(0), k / 10, atol=0.01)
+        assert_allclose(values.var(0), k * (10 - k) / (100 * 11), rtol=0.1)
+
+    def test_sorted_random_low_high(self):
+        values = random.sorted_random(1000, -3.0, 5.0)
+        assert np.all(np.diff(values) >= 0)
+        assert np.all((values >= -3.0) & (values < 5.0))
+        assert_equal(random.sorted_random(0).shape, (0,))
+        assert_array_equal(random.sorted_random(5, 2.0, 2.0), 2.0)
+
+    def test_sorted_random_out(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        expected = gen.sorted_random(100)
+        gen = Generator(MT19937(12345, mode="sequence"))
+        out = np.empty(100)
+        assert gen.sorted_random(100, out=out) is out
+        assert_array_equal(out, expected)
+        assert_raises(ValueError, random.sorted_random, 100,
+                      out=np.empty(200)[::2])
+        assert_raises(ValueError, random.sorted_random, 100,
+                      out=np.empty(99))
+        assert_raises(TypeError, random.sorted_random, 100,
+                      out=np.empty(100, dtype=np.float32))
+
+    def test_sorted_random_chunk(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        values = []
+        for _ in range(10000):
+            chunks = list(gen.sorted_random(9, chunk=4))
+            assert_equal([c.shape[0] for c in chunks], [4, 4, 1])
+            values.append(np.concatenate(chunks))
+        values = np.array(values)
+        assert np.all(np.diff(values, axis=1) >= 0)
+        assert np.all((values >= 0) & (values < 1))
+        k = np.arange(1, 10)
+        assert_allclose(values.mean(0), k / 10, atol=0.01)
+        assert_allclose(values.var(0), k * (10 - k) / (100 * 11), rtol=0.1)
+        assert_equal(list(random.sorted_random(0, chunk=4)), [])
+
+    def test_sorted_integers_subsets(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        counts = {}
+        for _ in range(20000):
+            sample = tuple(gen.sorted_integers(10, 16, 3))
+            counts[sample] = counts.get(sample, 0) + 1
+        assert_equal(len(counts), 20)
+        assert all(s[0] >= 10 and s[-1] < 16 for s in counts)
+        assert all(s[0] < s[1] < s[2] for s in counts)
+        freq = np.array(list(counts.values())) / 20000
+        assert_allclose(freq, 1 / 20, atol=0.01)
+
+    def test_sorted_integers_sparse(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        counts = np.zeros(1000)
+        for _ in range(10000):
+            sample = gen.sorted_integers(0, 1000, 10)
+            assert sample.dtype == np.int64
+            assert np.all(np.diff(sample) > 0)
+            counts[sample] += 1
+        assert_allclose(counts / 10000, 0.01, atol=0.005)
+        sample = gen.sorted_integers(0, 10 ** 15, 1000)
+        assert np.all(np.diff(sample) > 0)
+        assert sample[-1] < 10 ** 15
+
+    def test_sorted_integers_edge_cases(self):
+        assert_array_equal(random.sorted_integers(3, 8, 5), np.arange(3, 8))
+        assert_array_equal(random.sorted_integers(3, 8, 6, endpoint=True),
+                           np.arange(3, 9))
+        assert_equal(random.sorted_integers(3, 3, 0).shape, (0,))
+        int64_max = np.iinfo(np.int64).max
+        sample = random.sorted_integers(int64_max - 10, int64_max, 3,
+                                        endpoint=True)
+        assert np.all(sample >= int64_max - 10)
+
+    def test_sorted_integers_chunk(self):
+        gen = Generator(MT19937(12345, mode="sequence"))
+        expected = gen.sorted_integers(0, 10 ** 6, 1000)
+        gen = Generator(MT19937(12345, mode="sequence"))
+        chunks = list(gen.sorted_integers(0, 10 ** 6, 1000, chunk=300))
+        assert_equal([c.shape[0] for c in chunks], [300, 300, 300, 100])
+        assert_array_equal(np.concatenate(chunks), expected)
+
+    def test_errors(self):
+        assert_raises(ValueError, random.sorted_random, -1)
+        assert_raises(ValueError, random.sorted_random, 10, 1.0, 0.0)
+        assert_raises(ValueError, random.sorted_random, 10, 0.0, np.inf)
+        assert_raises(ValueError, random.sorted_random, 10, [0.0], 1.0)
+        assert_raises(OverflowError, random.sorted_random, 10, -1e308, 1e308)
+        assert_raises(ValueError, random.sorted_random, 10, chunk=0)
+        assert_raises(ValueError, random.sorted_random, 10, chunk=5,
+                      out=np.empty(10))
+        assert_raises(TypeError, random.sorted_random, 10.0)
+        assert_raises(ValueError, random.sorted_integers, 0, 10, 11)
+        assert_raises(ValueError, random.sorted_integers, 0, 10, -1)
+        assert_raises(ValueError, random.sorted_integers, 0, 2 ** 64, 1)
+        assert_raises(ValueError, random.sorted_integers, 0, 10, 5, chunk=0)
+        assert_raises(TypeError, random.sorted_integers, 0, 10.0, 5)
+
+
+class TestCategorical(object):
+    def test_matches_inverse_cdf(self):
+        pvals = np.random.RandomState(0).random_sample((10, 6))
+        gen = Generator(MT19937(0, mode="sequence"))
+        u = gen.random(10)
+        cdf = np.cumsum(pvals, 1)
+        desired = [np.searchsorted(cdf[i], u[i] * cdf[i, -1], side="right")
+                   for i in range(10)]
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_array_equal(gen.categorical(pvals), desired)
+        gen = Generator(MT19937(0, mode="sequence"))
+        actual = gen.categorical(pvals.T.astype(np.float32), axis=0)
+        assert_array_equal(actual, desired)
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_frequencies(self, dtype):
+        p = np.array([0.1, 0.0, 0.25, 0.05, 0.6])
+        gen = Generator(MT19937(0, mode="sequence"))
+        draws = gen.categorical(np.tile(p, (100000, 1)).astype(dtype))
+        freq = np.bincount(draws, minlength=5) / 100000.0
+        assert freq[1] == 0
+        assert_array_almost_equal(freq, p, decimal=2)
+        with np.errstate(divide="ignore"):
+            logits = np.log(p).astype(dtype) + 100
+        draws = gen.categorical(np.tile(logits, (100000, 1)), logits=True)
+        freq = np.bincount(draws, minlength=5) / 100000.0
+        assert freq[1] == 0
+        assert_array_almost_equal(freq, p, decimal=2)
+
+    def test_shape_dtype_out(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        pvals = np.full((2, 3, 4), 0.25)
+        assert_equal(gen.categorical(pvals).shape, (2, 3))
+        assert_equal(gen.categorical(pvals, axis=1).shape, (2, 4))
+        assert gen.categorical(pvals, dtype=np.int32).dtype == np.int32
+        assert isinstance(gen.categorical([0.5, 0.5]), np.int64)
+        assert_equal(gen.categorical(np.ones((0, 3))).shape, (0,))
+        out = np.empty((4, 3), dtype=np.int32).T
+        assert gen.categorical(pvals, axis=0, dtype=np.int32, out=out) is out
+        assert np.all((out >= 0) & (out < 2))
+        assert_raises(ValueError, gen.categorical, pvals, out=np.empty(6, dtype=np.int64))
+        assert_raises(TypeError, gen.categorical, pvals, out=np.empty((2, 3), dtype=np.int32))
+
+    def test_errors(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_raises(TypeError, gen.categorical, [0.5, 0.5], dtype=np.float64)
+        assert_raises(ValueError, gen.categorical, 0.5)
+        assert_raises(ValueError, gen.categorical, np.ones((3, 0)))
+        assert_raises(np.AxisError, gen.categorical, [0.5, 0.5], axis=1)
+        assert_raises(ValueError, gen.categorical, [[0.5, -0.5]])
+        assert_raises(ValueError, gen.categorical, [[0.0, 0.0]])
+        assert_raises(ValueError, gen.categorical, [[np.nan, 1.0]])
+        assert_raises(ValueError, gen.categorical, [[np.nan, 1.0]], logits=True)
+        assert_raises(ValueError, gen.categorical, [[np.inf, 1.0]], logits=True)
+        assert_raises(ValueError, gen.categorical, [[-np.inf, -np.inf]],
+                      logits=True)
+
 
 class TestSetState(object):
     def setup(self):
@@ -698,9 +1090,100 @@ class TestRandomDist(object):
     def test_choice_nonuniform_noreplace(self):
         random.bit_generator.seed(self.seed)
         actual = random.choice(4, 3, replace=False, p=[0.1, 0.3, 0.5, 0.1])
-        desired = np.array([2, 3, 1], dtype=np.int64)
+        desired = np.array([2, 1, 3], dtype=np.int64)
         assert_array_equal(actual, desired)
 
+    def test_choice_nonuniform_noreplace_distribution(self):
+        random.bit_generator.seed(self.seed)
+        p = np.array([0.1, 0.2, 0.3, 0.4, 0.0, 0.0])
+        draws = np.array([random.choice(6, 2, replace=False, p=p)
+                          for _ in range(10000)])
+        assert np.all(draws[:, 0] != draws[:, 1])
+        assert np.all(draws < 4)
+        freq = np.bincount(draws[:, 0], minlength=6) / 10000.0
+        assert_array_almost_equal(freq, p, decimal=1)
+        # Second draw is proportional to the remaining weights
+        second = draws[draws[:, 0] == 3, 1]
+        freq = np.bincount(second, minlength=3) / second.shape[0]
+        assert_array_almost_equal(freq, p[:3] / 0.6, decimal=1)
+
+    def test_choice_noreplace_sparse_shuffle(self):
+        # Large populations track displaced values rather than shuffling
+        # arange(pop_size), and must match the partial shuffle
+        pop_size, size = 20000, 1000
+        random.bit_generator.seed(self.seed)
+        expected = np.arange(pop_size)
+        for i in range(pop_size - 1, pop_size - size - 1, -1):
+            j = random.integers(0, i, endpoint=True, use_masked=False)
+            expected[i], expected[j] = expected[j], expected[i]
+        expected = expected[pop_size - size:]
+        random.bit_generator.seed(self.seed)
+        actual = random.choice(pop_size, size, replace=False)
+        assert_array_equal(actual, expected)
+        random.bit_generator.seed(self.seed)
+        actual = random.choice(pop_size, (10, 100), replace=False,
+                               dtype=np.uint32)
+        assert actual.dtype == np.uint32
+        assert_array_equal(actual.ravel(), expected)
+        random.bit_generator.seed(self.seed)
+        out = np.empty((100, 10), dtype=np.int32, order="F")
+        res = random.choice(pop_size, replace=False, dtype=np.int32, out=out)
+        assert res is out
+        assert_array_equal(out.ravel(), expected)
+
+    @pytest.mark.parametrize("replace", [True, False])
+    @pytest.mark.parametrize("dtype", [np.uint8, np.int16, np.int32,
+                                       np.uint32, np.int64, np.uint64])
+    def test_choice_dtype_out(self, replace, dtype):
+        random.bit_generator.seed(self.seed)
+        expected = random.choice(100, (3, 4), replace=replace)
+        random.bit_generator.seed(self.seed)
+        actual = random.choice(100, (3, 4), replace=replace, dtype=dtype)
+        assert actual.dtype == dtype
+        assert_array_equal(actual, expected)
+        random.bit_generator.seed(self.seed)
+        out = np.empty((6, 4), dtype=dtype)[::2]
+        res = random.choice(100, replace=replace, dtype=dtype, out=out)
+        assert res is out
+        assert_array_equal(out, expected)
+
+    @pytest.mark.parametrize("replace", [True, False])
+    @pytest.mark.parametrize("p", [None, np.full(10, 0.1)])
+    @pytest.mark.parametrize("dtype", [np.int8, np.uint32, np.int64])
+    def test_choice_dtype_scalar(self, replace, p, dtype):
+        random.bit_generator.seed(self.seed)
+        expected = random.choice(10, replace=replace, p=p)
+        random.bit_generator.seed(self.seed)
+        actual = random.choice(10, replace=replace, p=p, dtype=dtype)
+        assert type(actual) is dtype
+        assert actual == expected
+
+    def test_choice_dtype_out_errors(self):
+        assert_raises(TypeError, random.choice, 10, 3, dtype=np.float64)
+        assert_raises(ValueError, random.choice, 1000, 3, dtype=np.int8)
+        assert_raises(TypeError, random.choice, 10, 3,
+                      out=np.empty(3, dtype=np.int32))
+        assert_raises(ValueError, random.choice, 10, 3,
+                      out=np.empty(4, dtype=np.int64))
+
+    def test_choice_array_out(self):
+        a = np.arange(10.0) * 2
+        random.bit_generator.seed(self.seed)
+        expected = random.choice(a, 5, replace=False)
+        random.bit_generator.seed(self.seed)
+        out = np.empty(5)
+        res = random.choice(a, 5, replace=False, out=out)
+        assert res is out
+        assert_array_equal(out, expected)
+
+    def test_choice_nonuniform_noreplace_large(self):
+        random.bit_generator.seed(self.seed)
+        p = 1.0 / np.arange(1.0, 1001.0) ** 2
+        p /= p.sum()
+        actual = random.choice(1000, (10, 100), replace=False, p=p)
+        assert_equal(actual.shape, (10, 100))
+        assert_equal(np.unique(actual).shape[0], 1000)
+
     def test_choice_noninteger(self):
         random.bit_generator.seed(self.seed)
         actual = random.choice(["a", "b", "c", "d"], 4)
@@ -880,6 +1363,159 @@ class TestRandomDist(object):
         actual = random.permutation(arr_2d)
         assert_array_equal(actual, np.atleast_2d(desired).T)
 
+    @pytest.mark.parametrize("shape, axis", [((7, 4), 0), ((7, 4), 1),
+                                             ((3, 7, 5), -1), ((3, 7, 5), 1),
+                                             ((7, 30, 40), 0), ((5, 7, 3), 1)])
+    @pytest.mark.parametrize("order", ["C", "F", "strided", "object"])
+    def test_shuffle_axis(self, shape, axis, order):
+        x = np.arange(np.prod(shape)).reshape(shape)
+        n = x.shape[axis]
+        random.bit_generator.seed(self.seed)
+        perm = np.arange(n)
+        random.shuffle(perm)
+        expected = np.take(x, perm, axis=axis)
+        if order == "F":
+            x = np.asfortranarray(x)
+        elif order == "strided":
+            x = np.repeat(x, 2, axis=-1)[..., ::2]
+        elif order == "object":
+            x = x.astype(object)
+        random.bit_generator.seed(self.seed)
+        random.shuffle(x, axis=axis)
+        assert_array_equal(x, expected)
+
+    def test_shuffle_axis_errors(self):
+        x = np.arange(12).reshape((3, 4))
+        assert_raises(np.AxisError, random.shuffle, x, axis=2)
+        assert_raises(np.AxisError, random.shuffle, x, axis=-3)
+        assert_raises(ValueError, random.shuffle, [1, 2, 3], axis=1)
+
+    @pytest.mark.parametrize("shape, axis", [((1000, 4), 0), ((1000, 4), 1),
+                                             ((7, 30, 40), 0), ((100,), 0)])
+    def test_shuffle_read_only(self, shape, axis):
+        x = np.arange(np.prod(shape)).reshape(shape)
+        x.flags.writeable = False
+        assert_raises(ValueError, random.shuffle, x, axis=axis)
+        assert_array_equal(x, np.arange(np.prod(shape)).reshape(shape))
+        buf = np.arange(4000, dtype=np.int64).tobytes()
+        y = np.frombuffer(buf, dtype=np.int64).reshape((1000, 4))
+        assert_raises(ValueError, random.shuffle, y, axis=axis % 2)
+        assert_array_equal(y.ravel(), np.arange(4000))
+
+    def test_permuted(self):
+        random.bit_generator.seed(self.seed)
+        x = np.arange(200).reshape((10, 20))
+        y = random.permuted(x, axis=1)
+        assert_array_equal(np.sort(y, axis=1), x)
+        assert not np.all(y[0] - y[0, 0] == y[1] - y[1, 0])
+        y = random.permuted(x, axis=0)
+        assert_array_equal(np.sort(y, axis=0), x)
+        y = random.permuted(x)
+        assert_array_equal(np.sort(y.ravel()), x.ravel())
+        assert_equal(y.shape, x.shape)
+        y = random.permuted(x.T, axis=-1)
+        assert_array_equal(np.sort(y, axis=-1), x.T)
+        y = random.permuted(x.astype(object), axis=1)
+        assert_array_equal(np.sort(y, axis=1), x)
+        y = random.permuted(list(range(10)))
+        assert_array_equal(np.sort(y), np.arange(10))
+
+    def test_permuted_out(self):
+        random.bit_generator.seed(self.seed)
+        x = np.arange(200).reshape((10, 20))
+        expected = random.permuted(x, axis=1)
+        random.bit_generator.seed(self.seed)
+        out = np.empty((20, 10), dtype=np.float64).T
+        res = random.permuted(x, axis=1, out=out)
+        assert res is out
+        assert_array_equal(out, expected)
+        random.bit_generator.seed(self.seed)
+        y = x.copy()
+        random.permuted(y, axis=1, out=y)
+        assert_array_equal(y, expected)
+        out = np.empty((20, 20))[::2]
+        random.permuted(x, out=out)
+        assert_array_equal(np.sort(out.ravel()), x.ravel())
+        assert_raises(TypeError, random.permuted, x, out=[0] * 200)
+        assert_raises(ValueError, random.permuted, x, out=np.empty((20, 10)))
+        assert_raises(TypeError, random.permuted, x,
+                      out=np.empty((10, 20), dtype=np.int8))
+        assert_raises(np.AxisError, random.permuted, x, axis=2)
+
+    @pytest.mark.parametrize("dtype", [np.int8, np.uint16, np.int32,
+                                       np.uint32, np.int64])
+    def test_permutation_dtype(self, dtype):
+        random.bit_generator.seed(self.seed)
+        desired = random.permutation(100)
+        random.bit_generator.seed(self.seed)
+        actual = random.permutation(100, dtype=dtype)
+        assert actual.dtype == dtype
+        assert_array_equal(actual, desired)
+
+    def test_permutation_dtype_errors(self):
+        assert_raises(TypeError, random.permutation, 10, dtype=np.float64)
+        assert_raises(ValueError, random.permutation, 1000, dtype=np.int8)
+
+    def test_shuffle_parallel(self):
+        n = 3 * 65536 + 17
+        random.bit_generator.seed(self.seed)
+        x = np.arange(n)
+        random.shuffle(x, method="parallel", n_threads=1)
+        assert_array_equal(np.sort(x), np.arange(n))
+        assert np.any(x != np.arange(n))
+        # Items from each chunk are spread over the buckets
+        first = np.isin(x[:n // 3], np.arange(n // 3))
+        assert 0.3 < first.mean() < 0.37
+        for n_threads in (2, 3, 8):
+            random.bit_generator.seed(self.seed)
+            y = np.arange(n)
+            random.shuffle(y, method="parallel", n_threads=n_threads)
+            assert_array_equal(y, x)
+        random.bit_generator.seed(self.seed)
+        z = np.arange(2 * n)[::2]
+        random.shuffle(z, method="parallel")
+        assert_array_equal(z, 2 * x)
+        random.bit_generator.seed(self.seed)
+        p = random.permutation(n, dtype=np.uint32, method="parallel")
+        assert_array_equal(p, x)
+
+    @pytest.mark.parametrize("shape, axis", [((50000, 3), 0), ((50000, 3), 1),
+                                             ((200000,), 0)])
+    def test_shuffle_parallel_read_only(self, shape, axis):
+        x = np.arange(np.prod(shape)).reshape(shape)
+        x.flags.writeable = False
+        assert_raises(ValueError, random.shuffle, x, axis=axis,
+                      method="parallel")
+        assert_array_equal(x, np.arange(np.prod(shape)).reshape(shape))
+        buf = np.arange(150000, dtype=np.int64).tobytes()
+        y = np.frombuffer(buf, dtype=np.int64).reshape((50000, 3))
+        assert_raises(ValueError, random.shuffle, y, method="parallel")
+        assert_array_equal(y.ravel(), np.arange(150000))
+
+    def test_shuffle_parallel_other(self):
+        random.bit_generator.seed(self.seed)
+        arr = np.arange(150000).reshape((50000, 3))
+        random.shuffle(arr, method="parallel")
+        assert_array_equal(arr[:, 1] - arr[:, 0], 1)
+        assert_array_equal(np.sort(arr[:, 0]), np.arange(0, 150000, 3))
+        arr = np.asfortranarray(np.arange(150000).reshape((50000, 3)))
+        random.shuffle(arr, method="parallel")
+        assert_array_equal(arr[:, 2] - arr[:, 0], 2)
+        obj = np.array([str(i) for i in range(1000)], dtype=object)
+        random.shuffle(obj, method="parallel")
+        assert_equal(sorted(obj), sorted(str(i) for i in range(1000)))
+        alist = list(range(100))
+        random.shuffle(alist, method="parallel")
+        assert_equal(sorted(alist), list(range(100)))
+        masked = np.ma.array(np.arange(10), mask=[0, 1] * 5)
+        random.shuffle(masked, method="parallel")
+        assert_equal(sorted(masked.data), list(range(10)))
+        empty = np.empty(0)
+        random.shuffle(empty, method="parallel")
+        assert_raises(ValueError, random.shuffle, alist, method="unknown")
+        assert_raises(ValueError, random.shuffle, alist, method="parallel",
+                      n_threads=0)
+
     def test_beta(self):
         random.bit_generator.seed(self.seed)
         actual = random.beta(.1, .9, size=(3, 2))
@@ -889,6 +1525,16 @@ class TestRandomDist(object):
              [1.58405155108498093e-04, 1.26252891949397652e-04]])
         assert_array_almost_equal(actual, desired, decimal=15)
 
+    def test_binomial_many_pairs(self):
+        # More distinct pairs than entries in the setup cache
+        n = np.tile(np.arange(10, 400, 10), 3)
+        p = np.tile([0.05, 0.45, 0.6], 39)
+        random.bit_generator.seed(self.seed)
+        actual = random.binomial(n, p)
+        random.bit_generator.seed(self.seed)
+        desired = [random.binomial(n_i, p_i) for n_i, p_i in zip(n, p)]
+        assert_array_equal(actual, desired)
+
     def test_binomial(self):
         random.bit_generator.seed(self.seed)
         actual = random.binomial(100.123, .456, size=(3, 2))
@@ -929,6 +1575,16 @@ class TestRandomDist(object):
         actual = random.dirichlet(alpha)
         assert_array_almost_equal(actual, desired[0, 0], decimal=15)
 
+    def test_dirichlet_matches_standard_gamma(self):
+        alpha = np.array([0.3, 1.0, 2.5, 40.0])
+        random.bit_generator.seed(self.seed)
+        actual = random.dirichlet(alpha, size=5)
+        random.bit_generator.seed(self.seed)
+        gammas = np.array([[random.standard_gamma(a) for a in alpha]
+                           for _ in range(5)])
+        desired = gammas / gammas.sum(1)[:, None]
+        assert_array_almost_equal(actual, desired, decimal=15)
+
     def test_dirichlet_size(self):
         # gh-3173
         p = np.array([51.72840233779265162, 39.74494232180943953])
@@ -1150,6 +1806,69 @@ class TestRandomDist(object):
         assert_raises(ValueError, random.multivariate_normal,
                       mu, np.eye(3))
 
+    @pytest.mark.parametrize("method", ["svd", "eigh", "cholesky"])
+    def test_multivariate_normal_method(self, method):
+        random.bit_generator.seed(self.seed)
+        mean = (.123456789, 10)
+        cov = [[1, 0.5], [0.5, 2]]
+        actual = random.multivariate_normal(mean, cov, 100000, method=method)
+        assert_array_almost_equal(np.cov(actual.T), cov, decimal=1)
+        assert_array_almost_equal(actual.mean(0), mean, decimal=1)
+
+        # Positive semidefinite cov
+        cov = [[1, 1], [1, 1]]
+        if method == "cholesky":
+            assert_raises(np.linalg.LinAlgError, random.multivariate_normal,
+                          mean, cov, method=method)
+        else:
+            assert_no_warnings(random.multivariate_normal, mean, cov,
+                               method=method)
+            cov = [[1, 2], [2, 1]]
+            assert_warns(RuntimeWarning, random.multivariate_normal, mean,
+                         cov, method=method)
+            assert_raises(ValueError, random.multivariate_normal, mean,
+                          cov, check_valid="raise", method=method)
+        assert_raises(ValueError, random.multivariate_normal, mean, cov,
+                      method="qr")
+
+    @pytest.mark.parametrize("method", ["svd", "eigh", "cholesky"])
+    def test_multivariate_normal_stacked(self, method):
+        means = np.array([[0.0, 1.0], [10.0, -10.0], [2.0, 3.0]])
+        covs = np.array([np.eye(2), [[1, 0.5], [0.5, 2]], [[4, 1], [1, 1]]])
+        random.bit_generator.seed(self.seed)
+        actual = random.multivariate_normal(means, covs, (4,), method=method)
+        assert_equal(actual.shape, (4, 3, 2))
+        random.bit_generator.seed(self.seed)
+        z = random.standard_normal((4, 3, 2))
+        for i in range(3):
+            factor = random.mvnormal_factory(means[i], covs[i],
+                                             method=method).factor
+            assert_array_almost_equal(actual[:, i], z[:, i] @ factor + means[i])
+
+        assert_equal(random.multivariate_normal(means, covs[1]).shape, (3, 2))
+        assert_equal(random.multivariate_normal(means[0], covs).shape, (3, 2))
+        assert_equal(random.multivariate_normal(means, covs, 5).shape,
+                     (5, 3, 2))
+        assert_raises(ValueError, random.multivariate_normal, means[:2],
+                      covs)
+
+    @pytest.mark.parametrize("method", ["svd", "eigh", "cholesky"])
+    def test_mvnormal_factory(self, method):
+        mean = (.123456789, 10)
+        cov = [[1, 0.5], [0.5, 2]]
+        random.bit_generator.seed(self.seed)
+        desired = random.multivariate_normal(mean, cov, (3, 2), method=method)
+        random.bit_generator.seed(self.seed)
+        mvn = random.mvnormal_factory(mean, cov, method=method)
+        assert mvn.method == method
+        assert "MultivariateNormal(dim=2" in repr(mvn)
+        assert_array_equal(mvn((3, 2)), desired)
+        assert_equal(mvn().shape, (2,))
+        assert_array_almost_equal(mvn.factor.T @ mvn.factor, cov)
+        with pytest.raises((ValueError, np.linalg.LinAlgError)):
+            random.mvnormal_factory(mean, [[1, 2], [2, 1]],
+                                    check_valid="raise", method=method)
+
     def test_negative_binomial(self):
         random.bit_generator.seed(self.seed)
         actual = random.negative_binomial(n=100, p=.12345, size=(3, 2))
@@ -1233,6 +1952,18 @@ class TestRandomDist(object):
                             [0, 0]])
         assert_array_equal(actual, desired)
 
+    def test_poisson_scalar_lam_size(self):
+        random.bit_generator.seed(self.seed)
+        actual = random.poisson(lam=25.5, size=(3, 2))
+        random.bit_generator.seed(self.seed)
+        desired = [random.poisson(lam=25.5) for _ in range(6)]
+        assert_array_equal(actual.ravel(), desired)
+        out = np.empty((2, 5), dtype=np.int64)[:, ::2]
+        random.bit_generator.seed(self.seed)
+        random.poisson(lam=3.5, out=out)
+        random.bit_generator.seed(self.seed)
+        assert_array_equal(out, random.poisson(lam=3.5, size=(2, 3)))
+
     def test_poisson_exceptions(self):
         lambig = np.iinfo("int64").max
         lamneg = -1
@@ -1318,6 +2049,152 @@ class TestRandomDist(object):
         random.standard_gamma(10.0, out=actual, size=(3, 2), dtype=np.float32)
         assert_array_almost_equal(actual, desired, decimal=5)
 
+    @pytest.mark.parametrize("method, args, mean, var", [
+        ("normal", (2.0, 3.0), 2.0, 9.0),
+        ("uniform", (-1.0, 3.0), 1.0, 16 / 12),
+        ("lognormal", (0.0, 0.5), np.exp(0.125), (np.exp(0.25) - 1) * np.exp(0.25)),
+        ("beta", (2.0, 3.0), 0.4, 0.04),
+        ("beta", (0.5, 0.5), 0.5, 0.125),
+        ("gamma", (2.0, 2.0), 4.0, 8.0),
+        ("laplace", (1.0, 2.0), 1.0, 8.0),
+        ("gumbel", (0.0, 1.0), np.euler_gamma, np.pi ** 2 / 6),
+        ("logistic", (0.0, 1.0), 0.0, np.pi ** 2 / 3),
+        ("weibull", (2.0,), np.sqrt(np.pi) / 2, 1 - np.pi / 4),
+        ("exponential", (3.0,), 3.0, 9.0),
+        ("standard_t", (5.0,), 0.0, 5 / 3),
+        ("chisquare", (4.0,), 4.0, 8.0),
+    ])
+    def test_float32(self, method, args, mean, var):
+        gen = Generator(MT19937(self.seed, mode="legacy"))
+        func = getattr(gen, method)
+        actual = func(*args, size=200000, dtype=np.float32)
+        assert actual.dtype == np.float32
+        assert np.all(np.isfinite(actual))
+        assert_allclose(actual.mean(), mean, atol=4 * np.sqrt(var / 200000))
+        assert_allclose(actual.var(), var, rtol=0.05)
+
+        assert isinstance(func(*args, dtype=np.float32), float)
+        params = [np.full((3, 1), arg) for arg in args]
+        assert_equal(func(*params, size=(3, 2), dtype=np.float32).dtype,
+                     np.float32)
+        out = np.zeros((4, 6), dtype=np.float32)[:, ::2]
+        assert func(*args, dtype=np.float32, out=out) is out
+        assert np.all(out != 0)
+        assert_raises(TypeError, func, *args, dtype=np.float32,
+                      out=np.zeros(3))
+        assert_raises(TypeError, func, *args, dtype=np.int32)
+
+    def test_float32_values(self):
+        random.bit_generator.seed(self.seed)
+        actual = random.normal(1.0, 2.0, size=3, dtype=np.float32)
+        random.bit_generator.seed(self.seed)
+        desired = 1.0 + 2.0 * random.standard_normal(3, dtype=np.float32)
+        assert_array_equal(actual, desired)
+
+        random.bit_generator.seed(self.seed)
+        actual = random.uniform(1.0, 3.0, size=3, dtype=np.float32)
+        random.bit_generator.seed(self.seed)
+        desired = 1.0 + 2.0 * random.random(3, dtype=np.float32)
+        assert_array_equal(actual, desired)
+
+        random.bit_generator.seed(self.seed)
+        actual = random.gamma(3.0, 2.0, size=3, dtype=np.float32)
+        random.bit_generator.seed(self.seed)
+        desired = 2.0 * random.standard_gamma(3.0, size=3, dtype=np.float32)
+        assert_array_equal(actual, desired)
+
+    def test_random_16bit(self):
+        bg = MT19937(self.seed, mode="legacy")
+        gen = Generator(bg)
+        half = gen.random(100003, dtype=np.float16)
+        assert half.dtype == np.float16
+        assert np.all((half >= 0) & (half < 1))
+        assert_equal(np.unique(half.astype(np.float64) * 2 ** 11 % 1), [0])
+        assert_allclose(half.astype(np.float64).mean(), 0.5, atol=0.005)
+        bfloat = gen.random(100003, dtype="bfloat16")
+        assert bfloat.dtype == np.uint16
+        values = (bfloat.astype(np.uint32) << 16).view(np.float32)
+        assert np.all((values >= 0) & (values < 1))
+        assert_equal(np.unique(values * 2 ** 8 % 1), [0])
+        assert_allclose(values.mean(), 0.5, atol=0.005)
+
+        bg = MT19937(self.seed, mode="legacy")
+        Generator(bg).random(1000, dtype=np.float16)
+        expected = MT19937(self.seed, mode="legacy")
+        # Four values per 64-bit draw, each of which uses 2 32-bit outputs
+        expected.random_raw(500)
+        assert_state_equal(bg.state, expected.state)
+
+    def test_standard_normal_16bit(self):
+        gen = Generator(MT19937(self.seed, mode="legacy"))
+        half = gen.standard_normal(200000, dtype=np.float16)
+        assert half.dtype == np.float16
+        values = half.astype(np.float64)
+        assert_allclose(values.mean(), 0, atol=0.01)
+        assert_allclose(values.var(), 1, atol=0.015)
+        assert_allclose(np.mean(np.abs(values) > 2), 0.0455, atol=0.002)
+        assert np.any(np.abs(values) > 4.17)
+
+        gen = Generator(MT19937(self.seed, mode="legacy"))
+        bfloat = gen.standard_normal(200000, dtype="bfloat16")
+        assert bfloat.dtype == np.uint16
+        bvalues = (bfloat.astype(np.uint32) << 16).view(np.float32)
+        assert_allclose(bvalues.mean(), 0, atol=0.01)
+        assert_allclose(bvalues.var(), 1, atol=0.015)
+
+    @pytest.mark.parametrize("dtype", [np.float16, "bfloat16"])
+    def test_standard_normal_16bit_tail(self, dtype):
+        gen = Generator(MT19937(self.seed, mode="sequence"))
+        n = 2000000
+        values = gen.standard_normal(n, dtype=dtype)
+        expected = gen.standard_normal(n, dtype=np.float32)
+        if dtype == "bfloat16":
+            values = (values.astype(np.uint32) << 16).view(np.float32)
+            bits = expected.view(np.uint32).astype(np.uint64)
+            bits = (bits + 0x7FFF + ((bits >> 16) & 1)) >> 16
+            expected = (bits.astype(np.uint32) << 16).view(np.float32)
+        else:
+            expected = expected.astype(np.float16)
+        values = np.abs(values.astype(np.float64))
+        expected = np.abs(expected.astype(np.float64))
+        # Every value that the rounded float32 produces in the tail appears
+        for low, high in ((3.0, 3.5), (3.5, 4.17)):
+            in_range = (expected >= low) & (expected < high)
+            count = np.unique(expected[in_range]).shape[0]
+            in_range = (values >= low) & (values < high)
+            assert np.unique(values[in_range]).shape[0] > 0.9 * count
+        bins = np.arange(2.5, 4.55, 0.05)
+        a = np.histogram(values, bins)[0]
+        b = np.histogram(expected, bins)[0]
+        assert np.all(a > 0)
+        stat = np.sum((a - b) ** 2 / (a + b))
+        assert stat < 80
+
+    @pytest.mark.parametrize("method", ["random", "standard_normal"])
+    @pytest.mark.parametrize("dtype", [np.float16, "bfloat16"])
+    def test_16bit_out(self, method, dtype):
+        func = getattr(random, method)
+        out_dtype = np.float16 if dtype is np.float16 else np.uint16
+        scalar = func(dtype=dtype)
+        assert scalar.dtype == out_dtype
+        assert scalar.shape == ()
+        out = np.zeros((4, 6), dtype=out_dtype)[:, ::2]
+        assert func(dtype=dtype, out=out) is out
+        assert np.count_nonzero(out) > 6
+        assert_equal(func(size=(3, 2), dtype=dtype).shape, (3, 2))
+        assert_raises(TypeError, func, dtype=dtype, out=np.zeros(3))
+        assert_raises(ValueError, func, size=4, dtype=dtype,
+                      out=np.zeros(3, dtype=out_dtype))
+
+    def test_float32_errors(self):
+        assert_raises(ValueError, random.normal, 0, -1, dtype=np.float32)
+        assert_raises(ValueError, random.normal, 0, [1, -1], dtype=np.float32)
+        assert_raises(ValueError, random.beta, [1, 0], 1, dtype=np.float32)
+        assert_raises(OverflowError, random.uniform, -3e38, 3e38,
+                      dtype=np.float32)
+        assert_raises(OverflowError, random.uniform, [-3e38], [3e38],
+                      dtype=np.float32)
+
     def test_standard_gamma_unknown_type(self):
         assert_raises(TypeError, random.standard_gamma, 1.,
                       dtype="int32")
@@ -1486,6 +2363,36 @@ class TestRandomDist(object):
         assert_raises(ValueError, random.complex_normal, relation=[-3])
         assert_raises(ValueError, random.complex_normal, relation=[10j])
 
+    @pytest.mark.parametrize("loc", [1.0, np.arange(1.0, 3.0)])
+    @pytest.mark.parametrize("order", ["C", "F", "strided"])
+    def test_complex_normal_out(self, loc, order):
+        random.bit_generator.seed(self.seed)
+        desired = random.complex_normal(loc, 1., 0.5, size=(3, 2))
+        if order == "strided":
+            out = np.empty((3, 4), dtype=np.complex128)[:, ::2]
+        else:
+            out = np.empty((3, 2), dtype=np.complex128, order=order)
+        random.bit_generator.seed(self.seed)
+        actual = random.complex_normal(loc, 1., 0.5, out=out)
+        assert actual is out
+        assert_array_equal(out, desired)
+
+        random.bit_generator.seed(self.seed)
+        out[...] = 0
+        random.complex_normal(loc, 1., 0.5, size=(3, 2), out=out)
+        assert_array_equal(out, desired)
+
+    def test_complex_normal_out_invalid(self):
+        out = np.empty((3, 2), dtype=np.complex128)
+        assert_raises(ValueError, random.complex_normal, size=(2, 3),
+                      out=out)
+        assert_raises(ValueError, random.complex_normal, np.arange(3.0),
+                      out=out)
+        assert_raises(ValueError, random.complex_normal, np.zeros((2, 1)),
+                      out=out)
+        assert_raises(TypeError, random.complex_normal,
+                      out=np.empty((3, 2)))
+
 
 class TestBroadcast(object):
     # tests that functions that broadcast behave
@@ -1601,6 +2508,30 @@ class TestBroadcast(object):
         assert_raises(ValueError, gamma, bad_shape, scale * 3)
         assert_raises(ValueError, gamma, shape, bad_scale * 3)
 
+    @pytest.mark.parametrize("method", ["gamma", "standard_gamma", "beta"])
+    def test_gamma_params_match_scalar(self, method):
+        # Array parameters precompute the gamma constants once per element
+        shape = np.array([0.0, 0.3, 1.0, 2.5, 0.3, 7.0])
+        other = np.array([[0.5], [2.0]])
+        args = (shape,) if method == "standard_gamma" else (shape, other)
+        if method == "beta":
+            args = (shape + 0.1, other)
+        self.set_seed()
+        actual = getattr(random, method)(*args)
+        self.set_seed()
+        bcast = np.broadcast_arrays(*args)
+        desired = [getattr(random, method)(*vals)
+                   for vals in zip(*[arr.ravel() for arr in bcast])]
+        assert_array_equal(actual.ravel(), desired)
+
+        extra = () if method == "standard_gamma" else (1.5,)
+        self.set_seed()
+        actual = getattr(random, method)(args[0], *extra, size=(3, 6))
+        self.set_seed()
+        scalars = np.broadcast_to(args[0], (3, 6)).ravel()
+        desired = [getattr(random, method)(val, *extra) for val in scalars]
+        assert_array_equal(actual.ravel(), desired)
+
     def test_f(self):
         dfnum = [1]
         dfden = [2]
@@ -2173,6 +3104,134 @@ class TestThread(object):
         self.check_function(gen_random, sz=(10000, 6))
 
 
+class TestStream(object):
+    @pytest.mark.parametrize("background", [True, False])
+    @pytest.mark.parametrize("n_buffers", [2, 3])
+    def test_stream(self, background, n_buffers):
+        gen = Generator(MT19937(0, mode="sequence"))
+        stream = gen.stream("standard_normal", (10, 3), n_buffers=n_buffers,
+                            background=background)
+        chunks = [next(stream).copy() for _ in range(7)]
+        stream.close()
+        gen = Generator(MT19937(0, mode="sequence"))
+        for chunk in chunks:
+            assert_array_equal(chunk, gen.standard_normal((10, 3)))
+
+    def test_stream_reuses_buffers(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        stream = gen.stream("random", 100, dtype=np.float32,
+                            background=False)
+        first = next(stream)
+        second = next(stream)
+        assert first.dtype == np.float32
+        assert first is not second
+        assert next(stream) is first
+
+    def test_stream_args(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        stream = gen.stream("gamma", 20, 2.0, scale=3.0)
+        gamma = [next(stream).copy() for _ in range(3)]
+        stream.close()
+        gen = Generator(MT19937(0, mode="sequence"))
+        for chunk in gamma:
+            assert_array_equal(chunk, gen.gamma(2.0, scale=3.0, size=20))
+
+        gen = Generator(MT19937(0, mode="sequence"))
+        stream = gen.stream("integers", 20, 0, 10, dtype=np.uint8)
+        integers = [next(stream).copy() for _ in range(3)]
+        stream.close()
+        gen = Generator(MT19937(0, mode="sequence"))
+        for chunk in integers:
+            assert_array_equal(chunk, gen.integers(0, 10, size=20,
+                                                   dtype=np.uint8))
+
+    def test_stream_bernoulli(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        stream = gen.stream("bernoulli", (4, 8), 0.3, background=False)
+        chunks = [next(stream).copy() for _ in range(3)]
+        stream.close()
+        gen = Generator(MT19937(0, mode="sequence"))
+        for chunk in chunks:
+            assert chunk.dtype == np.bool_
+            assert_array_equal(chunk, gen.bernoulli(0.3, size=(4, 8)))
+
+    def test_stream_without_out(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        stream = gen.stream("dirichlet", 5, [1.0, 2.0, 3.0],
+                            background=False)
+        chunks = [next(stream).copy() for _ in range(3)]
+        stream.close()
+        gen = Generator(MT19937(0, mode="sequence"))
+        for chunk in chunks:
+            assert_array_equal(chunk, gen.dirichlet([1.0, 2.0, 3.0], size=5))
+
+        # random_bits requires size and so is refilled without out
+        gen = Generator(MT19937(0, mode="sequence"))
+        stream = gen.stream("random_bits", 16, background=False)
+        chunks = [next(stream).copy() for _ in range(3)]
+        stream.close()
+        gen = Generator(MT19937(0, mode="sequence"))
+        for chunk in chunks:
+            assert_array_equal(chunk, gen.random_bits(16))
+
+    @pytest.mark.parametrize("method", sorted(_OUT_METHODS))
+    def test_stream_out_methods(self, method):
+        # Refilling in place produces the same chunks as fresh draws
+        args = {"bernoulli": (0.3,), "beta": (2.0, 3.0),
+                "binomial": (10, 0.3), "chisquare": (3.0,), "choice": (10,),
+                "f": (3.0, 4.0),
+                "gamma": (2.0,), "geometric": (0.3,),
+                "hypergeometric": (10, 5, 7), "integers": (0, 1000),
+                "logseries": (0.3,), "negative_binomial": (3, 0.4),
+                "noncentral_chisquare": (3.0, 2.0),
+                "noncentral_f": (3.0, 4.0, 2.0), "pareto": (2.0,),
+                "poisson": (4.0,), "power": (2.0,), "standard_gamma": (2.0,),
+                "standard_t": (5.0,), "triangular": (0.0, 1.0, 3.0),
+                "vonmises": (0.0, 2.0), "wald": (1.0, 2.0),
+                "weibull": (2.0,), "zipf": (2.0,)}.get(method, ())
+        func = getattr(Generator(MT19937(0, mode="sequence")), method)
+        stream = _stream(func, (4, 5), args, {}, 2, False, True)
+        chunks = [next(stream).copy() for _ in range(4)]
+        stream.close()
+        func = getattr(Generator(MT19937(0, mode="sequence")), method)
+        stream = _stream(func, (4, 5), args, {}, 2, False, False)
+        for chunk in chunks:
+            assert_array_equal(chunk, next(stream))
+        stream.close()
+
+        gen = Generator(MT19937(0, mode="sequence"))
+        stream = gen.stream(method, (4, 5), *args)
+        for chunk in chunks:
+            assert_array_equal(chunk, next(stream))
+        stream.close()
+
+    def test_stream_fill_type_error(self):
+        calls = []
+
+        def func(size=None, out=None):
+            calls.append(out)
+            if out is not None:
+                raise TypeError("Supplied output array has the wrong type")
+            return np.zeros(size)
+
+        stream = _stream(func, 10, (), {}, 2, False, True)
+        next(stream)
+        with pytest.raises(TypeError, match="output array"):
+            next(stream)
+        assert len(calls) == 2
+
+    def test_stream_errors(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        with pytest.raises(ValueError):
+            gen.stream("not_a_method", 10)
+        with pytest.raises(ValueError):
+            gen.stream("random", 10, n_buffers=0)
+        with pytest.raises(ValueError):
+            gen.stream("random", 10, n_buffers=1)
+        stream = gen.stream("random", 10, n_buffers=1, background=False)
+        assert next(stream).shape == (10,)
+
+
 # See Issue #4263
 class TestSingleEltArrayInput(object):
     def setup(self):
@@ -2296,3 +3355,247 @@ def test_jumped(config):
     md5 = hashlib.md5(jumped.state["state"]["key"])
     assert md5.hexdigest() == values["jumped"]["key_md5"]
     assert jumped.state["state"]["pos"] == values["jumped"]["pos"]
+
+
+class TestWeightedSampler(object):
+    def test_reproducible(self):
+        p = np.arange(1, 11) / 55.0
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.weighted_sampler(p)
+        first = sampler.sample(1000)
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_array_equal(gen.weighted_sampler(p).sample(1000), first)
+        assert first.dtype == np.int64
+        assert_array_equal(sampler.p, p)
+        assert "WeightedSampler(n=10)" in repr(sampler)
+
+    def test_frequencies(self):
+        p = np.array([0.1, 0.0, 0.25, 0.05, 0.6])
+        gen = Generator(MT19937(0, mode="sequence"))
+        draws = gen.weighted_sampler(p).sample(200000)
+        freq = np.bincount(draws, minlength=5) / 200000.0
+        assert freq[1] == 0
+        assert_array_almost_equal(freq, p, decimal=2)
+
+    def test_degenerate(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_array_equal(gen.weighted_sampler([1.0]).sample(10), 0)
+        assert_array_equal(gen.weighted_sampler([0, 0, 1.0]).sample(10), 2)
+
+    @pytest.mark.parametrize("dtype", [np.int8, np.uint8, np.int16, np.uint16,
+                                       np.int32, np.uint32, np.int64,
+                                       np.uint64])
+    def test_dtype(self, dtype):
+        p = np.full(100, 0.01)
+        gen = Generator(MT19937(0, mode="sequence"))
+        expected = gen.weighted_sampler(p).sample((10, 7))
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.weighted_sampler(p)
+        actual = sampler.sample((10, 7), dtype=dtype)
+        assert actual.dtype == dtype
+        assert_array_equal(actual, expected)
+        assert isinstance(sampler.sample(dtype=dtype), dtype)
+
+    def test_errors(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_raises(ValueError, gen.weighted_sampler, [0.5, 0.6])
+        assert_raises(ValueError, gen.weighted_sampler, [1.5, -0.5])
+        assert_raises(ValueError, gen.weighted_sampler, [[0.5, 0.5]])
+        assert_raises(ValueError, gen.weighted_sampler, [np.nan, 1.0])
+        assert_raises(ValueError, gen.weighted_sampler, [])
+        sampler = gen.weighted_sampler(np.full(1000, 0.001))
+        assert_raises(ValueError, sampler.sample, 10, dtype=np.int8)
+        assert_raises(TypeError, sampler.sample, 10, dtype=np.float64)
+
+    def test_noreplace(self):
+        p = np.array([0.1, 0.2, 0.3, 0.4])
+        gen = Generator(MT19937(0, mode="sequence"))
+        expected = gen.choice(4, 3, replace=False, p=p)
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.weighted_sampler(p)
+        actual = sampler.sample(3, replace=False)
+        assert_array_equal(actual, expected)
+        for _ in range(100):
+            draws = sampler.sample((2, 2), dtype=np.uint8, replace=False)
+            assert draws.dtype == np.uint8
+            assert_equal(np.sort(draws.ravel()), np.arange(4))
+        assert isinstance(sampler.sample(replace=False), np.int64)
+
+    def test_noreplace_zeros(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.weighted_sampler([0.5, 0.0, 0.5, 0.0])
+        for _ in range(100):
+            assert_equal(np.sort(sampler.sample(2, replace=False)), [0, 2])
+        assert_raises(ValueError, sampler.sample, 3, replace=False)
+
+
+class TestBinomialSampler(object):
+    def test_matches_binomial(self):
+        n = np.array([10, 1000, 10, 5000, 0, 20, 1000, 37])
+        p = np.array([0.5, 0.1, 0.5, 0.7, 0.3, 1.0, 0.1, 0.0])
+        gen = Generator(MT19937(0, mode="sequence"))
+        expected = gen.binomial(n, p, size=(3, 8))
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.binomial_sampler(n, p)
+        assert_array_equal(sampler.sample(3), expected)
+        gen = Generator(MT19937(0, mode="sequence"))
+        scalars = [gen.binomial(n_i, p_i) for n_i, p_i in zip(n, p)]
+        assert_array_equal(expected[0], scalars)
+        assert_array_equal(sampler.n, n)
+        assert_array_equal(sampler.p, p)
+        assert "BinomialSampler(shape=(8,))" in repr(sampler)
+
+    def test_shape(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.binomial_sampler([[10], [20]], [0.1, 0.6, 0.9])
+        assert_equal(sampler.sample().shape, (2, 3))
+        assert_equal(sampler.sample((4, 5)).shape, (4, 5, 2, 3))
+        assert_equal(sampler.n.shape, (2, 3))
+        assert isinstance(gen.binomial_sampler(10, 0.3).sample(), int)
+        assert_equal(gen.binomial_sampler(10, []).sample(3).shape, (3, 0))
+
+    def test_out(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        expected = gen.binomial_sampler([5, 50], 0.4).sample(3)
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.binomial_sampler([5, 50], 0.4)
+        out = np.empty((3, 2), dtype=np.int64)
+        assert sampler.sample(3, out=out) is out
+        assert_array_equal(out, expected)
+        assert_raises(ValueError, sampler.sample, 2, out=out)
+        assert_raises(ValueError, sampler.sample, 3,
+                      out=np.empty((3, 4), dtype=np.int64)[:, ::2])
+
+    def test_errors(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_raises(ValueError, gen.binomial_sampler, -1, 0.5)
+        assert_raises(ValueError, gen.binomial_sampler, 10, [0.5, 1.5])
+        assert_raises(ValueError, gen.binomial_sampler, [1, 2], [0.1, 0.2, 0.3])
+
+
+class TestPoissonSampler(object):
+    def test_reproducible(self):
+        lam = [0.0, 0.5, 3.0, 3.0, 9.99, 10.0, 250.0]
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.poisson_sampler(lam)
+        first = sampler.sample(100)
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_array_equal(gen.poisson_sampler(lam).sample(100), first)
+        assert first.dtype == np.int64
+        assert_equal(first.shape, (100, 7))
+        assert_array_equal(first[:, 0], 0)
+        assert_array_equal(sampler.lam, lam)
+        assert "PoissonSampler(shape=(7,))" in repr(sampler)
+
+    def test_shape(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.poisson_sampler(np.full((2, 3), 4.0))
+        assert_equal(sampler.sample().shape, (2, 3))
+        assert_equal(sampler.sample(5).shape, (5, 2, 3))
+        assert_equal(sampler.sample((4, 5)).shape, (4, 5, 2, 3))
+        assert isinstance(gen.poisson_sampler(4.0).sample(), int)
+        assert_equal(gen.poisson_sampler(4.0).sample(3).shape, (3,))
+        assert_equal(gen.poisson_sampler([]).sample(3).shape, (3, 0))
+
+    def test_out(self):
+        lam = np.array([[0.1, 7.0], [30.0, 7.0]])
+        gen = Generator(MT19937(0, mode="sequence"))
+        expected = gen.poisson_sampler(lam).sample(3)
+        gen = Generator(MT19937(0, mode="sequence"))
+        sampler = gen.poisson_sampler(lam)
+        out = np.empty((3, 2, 2), dtype=np.int64)
+        assert sampler.sample(3, out=out) is out
+        assert_array_equal(out, expected)
+        assert_raises(ValueError, sampler.sample, 2, out=out)
+        assert_raises(TypeError, sampler.sample, 3, out=out.astype(np.int32))
+        out = np.empty((3, 2, 4), dtype=np.int64)[:, :, ::2]
+        assert_raises(ValueError, sampler.sample, 3, out=out)
+
+    @pytest.mark.parametrize("lam", [0.01, 0.7, 3.3, 9.9, 10.0, 42.0])
+    def test_moments(self, lam):
+        gen = Generator(MT19937(0, mode="sequence"))
+        draws = gen.poisson_sampler(np.full(10, lam)).sample(20000)
+        # 6 standard errors of the mean
+        assert abs(draws.mean() - lam) < 6 * np.sqrt(lam / draws.size)
+        assert abs(draws.var() / lam - 1) < 0.05
+
+    def test_frequencies(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        draws = gen.poisson_sampler(np.full(10, 2.0)).sample(20000).ravel()
+        freq = np.bincount(draws, minlength=6)[:6] / draws.size
+        k = np.arange(6)
+        pmf = np.exp(-2.0) * 2.0 ** k / np.array([1, 1, 2, 6, 24, 120])
+        assert_array_almost_equal(freq, pmf, decimal=2)
+
+    def test_errors(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_raises(ValueError, gen.poisson_sampler, [1.0, -1.0])
+        assert_raises(ValueError, gen.poisson_sampler, np.iinfo("int64").max)
+        with np.errstate(invalid="ignore"):
+            assert_raises(ValueError, gen.poisson_sampler, [np.nan])
+
+
+class TestLazyPermutation(object):
+    @pytest.mark.parametrize("n", [0, 1, 2, 3, 16, 17, 1000, 4097])
+    def test_bijection(self, n):
+        gen = Generator(MT19937(0, mode="sequence"))
+        perm = gen.lazy_permutation(n)
+        values = perm[:]
+        assert values.dtype == np.int64
+        assert_array_equal(np.sort(values), np.arange(n))
+        assert_equal(len(perm), n)
+        assert_equal(list(perm), values.tolist())
+
+    def test_reproducible(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        first = gen.lazy_permutation(1000)[:]
+        second = gen.lazy_permutation(1000)[:]
+        assert np.any(first != second)
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_array_equal(gen.lazy_permutation(1000)[:], first)
+
+    def test_indexing(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        perm = gen.lazy_permutation(100)
+        values = perm[:]
+        assert perm[3] == values[3]
+        assert isinstance(perm[3], int)
+        assert perm[-1] == values[-1]
+        assert perm[np.int32(7)] == values[7]
+        assert_array_equal(perm[10:50:7], values[10:50:7])
+        assert_array_equal(perm[::-3], values[::-3])
+        assert_array_equal(perm[[1, -2, 5]], values[[1, -2, 5]])
+        idx = np.array([[0, 1], [98, 99]], dtype=np.uint8)
+        assert_array_equal(perm.take(idx), values[idx])
+        assert perm.take(4) == values[4]
+        assert_equal(perm.take([]).shape, (0,))
+        assert "LazyPermutation(n=100)" in repr(perm)
+        assert perm.n == 100
+
+    def test_large(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        n = 10 ** 12
+        perm = gen.lazy_permutation(n)
+        values = perm[n - 10000:]
+        assert values.min() >= 0
+        assert values.max() < n
+        assert_equal(np.unique(values).shape[0], 10000)
+        assert_array_equal(perm.take(np.arange(n - 5, n)), values[-5:])
+
+    def test_uniform_positions(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        counts = np.zeros((5, 5))
+        for _ in range(5000):
+            counts[np.arange(5), gen.lazy_permutation(5)[:]] += 1
+        assert_array_almost_equal(counts / 5000, 0.2, decimal=1)
+
+    def test_errors(self):
+        gen = Generator(MT19937(0, mode="sequence"))
+        assert_raises(ValueError, gen.lazy_permutation, -1)
+        assert_raises(ValueError, gen.lazy_permutation, 2 ** 63)
+        assert_raises(TypeError, gen.lazy_permutation, 10.0)
+        perm = gen.lazy_permutation(10)
+        assert_raises(IndexError, perm.__getitem__, 10)
+        assert_raises(IndexError, perm.__getitem__, -11)
+        assert_raises(IndexError, perm.take, [0, 10])
+        assert_raises(IndexError, perm.take, [0.5])
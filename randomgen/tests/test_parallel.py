@@ -0,0 +1,131 @@
+import numpy as np
+from numpy.testing import assert_array_equal, assert_equal
+import pytest
+
+from randomgen import (HC128, Generator, ParallelGenerator, Xoshiro256,
+                       Xorshift1024)
+from randomgen.tests.test_direct import assert_state_equal
+
+METHODS = ["random", "standard_normal", "standard_exponential"]
+
+
+@pytest.fixture(params=METHODS)
+def method(request):
+    return request.param
+
+
+def test_reproducible(method):
+    pg = ParallelGenerator(Xoshiro256(12345, mode="sequence"), 4)
+    a = getattr(pg, method)(1001)
+    pg = ParallelGenerator(Xoshiro256(12345, mode="sequence"), 4)
+    b = getattr(pg, method)(1001)
+    assert_array_equal(a, b)
+
+
+def test_blocks_match_jumped(method):
+    pg = ParallelGenerator(Xoshiro256(12345, mode="sequence"), 3)
+    bit_gens = [Xoshiro256(12345, mode="sequence").jumped(i)
+                for i in (1, 2, 3)]
+    out = np.empty((10, 11))
+    getattr(pg, method)(out=out)
+    flat = out.ravel()
+    step = 37
+    for i in range(3):
+        gen = Generator(bit_gens[i])
+        expected = getattr(gen, method)(len(flat[i * step:(i + 1) * step]))
+        assert_array_equal(flat[i * step:(i + 1) * step], expected)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_dtype_and_shape(method, dtype):
+    pg = ParallelGenerator(Xorshift1024(0, mode="sequence"), 2)
+    values = getattr(pg, method)((7, 3, 5), dtype=dtype)
+    assert_equal(values.shape, (7, 3, 5))
+    assert values.dtype == dtype
+
+
+def test_out(method):
+    pg = ParallelGenerator(Xorshift1024(0, mode="sequence"), 4)
+    out = np.zeros((31, 7), order="F")
+    res = getattr(pg, method)(out=out)
+    assert res is out
+    assert np.all(out != 0)
+    with pytest.raises(ValueError):
+        getattr(pg, method)(out=np.empty((10, 10))[::2])
+    with pytest.raises(ValueError):
+        getattr(pg, method)(size=(3, 3), out=np.empty((3, 4)))
+
+
+def test_f_order_out(method):
+    # Blocks are filled in place in memory order
+    pg = ParallelGenerator(Xoshiro256(12345, mode="sequence"), 3)
+    expected = getattr(pg, method)((7, 31))
+    pg = ParallelGenerator(Xoshiro256(12345, mode="sequence"), 3)
+    out = np.zeros((31, 7), order="F")
+    assert getattr(pg, method)(out=out) is out
+    assert_array_equal(out, expected.T)
+
+
+def test_bit_generator_unchanged(method):
+    bit_gen = Xoshiro256(12345, mode="sequence")
+    state = bit_gen.state
+    pg = ParallelGenerator(bit_gen, 3)
+    getattr(pg, method)(1001)
+    getattr(pg, method)()
+    pg.integers(0, 10, size=1001)
+    assert_state_equal(bit_gen.state, state)
+
+
+def test_out_errors(method):
+    pg = ParallelGenerator(Xorshift1024(0, mode="sequence"), 2)
+    out = np.zeros(100)
+    out.flags.writeable = False
+    with pytest.raises(ValueError, match="writable"):
+        getattr(pg, method)(out=out)
+    with pytest.raises(TypeError, match="wrong type"):
+        getattr(pg, method)(out=np.zeros(100, dtype=np.float32))
+    with pytest.raises(TypeError, match="wrong type"):
+        pg.integers(0, 10, out=np.zeros(100, dtype=np.int32))
+
+
+def test_scalar(method):
+    pg = ParallelGenerator(Xorshift1024(0, mode="sequence"), 4)
+    assert np.isscalar(getattr(pg, method)())
+
+
+def test_small_size():
+    pg = ParallelGenerator(Xorshift1024(0, mode="sequence"), 8)
+    assert_equal(pg.random(3).shape, (3,))
+    assert_equal(pg.random(0).shape, (0,))
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.int32, np.int64, np.uint64])
+def test_integers(dtype):
+    pg = ParallelGenerator(Xoshiro256(0, mode="sequence"), 4)
+    values = pg.integers(10, 20, size=1003, dtype=dtype)
+    assert values.dtype == dtype
+    assert values.min() >= 10
+    assert values.max() < 20
+    out = np.empty(1003, dtype=dtype)
+    pg = ParallelGenerator(Xoshiro256(0, mode="sequence"), 4)
+    pg.integers(10, 20, dtype=dtype, out=out)
+    assert_array_equal(out, values)
+    with pytest.raises(TypeError):
+        pg.integers(10, 20, dtype=dtype, out=np.empty(10, dtype=np.float64))
+    with pytest.raises(ValueError):
+        pg.integers([0, 1], 20, size=2, dtype=dtype)
+
+
+def test_errors():
+    with pytest.raises(TypeError):
+        ParallelGenerator(HC128(0, mode="sequence"), 2)
+    with pytest.raises(ValueError):
+        ParallelGenerator(Xoshiro256(0, mode="sequence"), 0)
+
+
+def test_attributes():
+    pg = ParallelGenerator(Xoshiro256(0, mode="sequence"), 3)
+    assert pg.n_threads == 3
+    assert len(pg.generators) == 3
+    assert "ParallelGenerator(Xoshiro256, n_threads=3)" in repr(pg)
+    assert isinstance(ParallelGenerator().n_threads, int)
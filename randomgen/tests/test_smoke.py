@@ -777,8 +777,10 @@ class RNG(object):
         existing = np.empty(size)
         with pytest.raises(TypeError):
             rg.standard_normal(out=existing, dtype=np.float32)
+        read_only = np.empty(size)
+        read_only.flags.writeable = False
         with pytest.raises(ValueError):
-            rg.standard_normal(out=existing[::3])
+            rg.standard_normal(out=read_only)
         existing = np.empty(size, dtype=np.float32)
         with pytest.raises(TypeError):
             rg.standard_normal(out=existing, dtype=np.float64)
@@ -786,13 +788,129 @@ class RNG(object):
         existing = np.zeros(size, dtype=np.float32)
         with pytest.raises(TypeError):
             rg.standard_gamma(1.0, out=existing, dtype=np.float64)
-        with pytest.raises(ValueError):
-            rg.standard_gamma(1.0, out=existing[::3], dtype=np.float32)
         existing = np.zeros(size, dtype=np.float64)
         with pytest.raises(TypeError):
             rg.standard_gamma(1.0, out=existing, dtype=np.float32)
         with pytest.raises(ValueError):
-            rg.standard_gamma(1.0, out=existing[::3])
+            rg.standard_gamma(np.ones((3, 7, 97)), out=existing)
+
+    def test_output_fill_strided(self):
+        rg = self.rg
+        state = rg.bit_generator.state
+        size = (31, 7, 97)
+        for dtype in (np.float64, np.float32):
+            existing = np.zeros((62, 7, 97), dtype=dtype)
+            rg.standard_normal(out=existing[::2], dtype=dtype)
+            rg.bit_generator.state = state
+            direct = rg.standard_normal(size=size, dtype=dtype)
+            assert_equal(direct, existing[::2])
+            assert np.all(existing[1::2] == 0)
+            rg.bit_generator.state = state
+
+            existing = np.zeros((62, 7, 97), dtype=dtype)
+            rg.standard_gamma(2.0, out=existing[::2], dtype=dtype)
+            rg.bit_generator.state = state
+            direct = rg.standard_gamma(2.0, size=size, dtype=dtype)
+            assert_equal(direct, existing[::2])
+            rg.bit_generator.state = state
+
+    @pytest.mark.parametrize("method, args",
+                             [("normal", (1.0, 2.0)),
+                              ("beta", (2.0, 3.0)),
+                              ("standard_cauchy", ()),
+                              ("triangular", (0.0, 1.0, 3.0)),
+                              ("binomial", (10, 0.3)),
+                              ("poisson", (4.0,)),
+                              ("hypergeometric", (10, 5, 4)),
+                              ("logseries", (0.3,))])
+    def test_output_fill_distributions(self, method, args):
+        rg = self.rg
+        state = rg.bit_generator.state
+        direct = getattr(rg, method)(*args, size=(6, 5))
+        for out in (np.zeros((6, 5), dtype=direct.dtype),
+                    np.zeros((6, 5), dtype=direct.dtype, order="F"),
+                    np.zeros((12, 10), dtype=direct.dtype)[::2, ::2]):
+            rg.bit_generator.state = state
+            res = getattr(rg, method)(*args, out=out)
+            assert res is out
+            assert_equal(out, direct)
+        if not args:
+            return
+        # Broadcasting path
+        args = (np.full((6, 5), args[0]),) + args[1:]
+        rg.bit_generator.state = state
+        direct = getattr(rg, method)(*args)
+        for out in (np.zeros((6, 5), dtype=direct.dtype, order="F"),
+                    np.zeros((12, 10), dtype=direct.dtype)[::2, ::2]):
+            rg.bit_generator.state = state
+            getattr(rg, method)(*args, out=out)
+            assert_equal(out, direct)
+        with pytest.raises(ValueError):
+            getattr(rg, method)(*args, out=np.zeros(5, dtype=direct.dtype))
+        with pytest.raises(TypeError):
+            getattr(rg, method)(*args, out=np.zeros((6, 5), dtype=np.float32))
+
+    def test_output_fill_integers(self, dtype):
+        rg = self.rg
+        state = rg.bit_generator.state
+        upper = 2 if dtype == np.bool else 100
+        direct = rg.integers(upper, size=(6, 5), dtype=dtype)
+        existing = np.zeros((12, 10), dtype=dtype)
+        rg.bit_generator.state = state
+        res = rg.integers(upper, dtype=dtype, out=existing[::2, ::2])
+        assert res.base is existing
+        assert_equal(existing[::2, ::2], direct)
+        assert np.all(existing[1::2] == 0)
+
+        rg.bit_generator.state = state
+        direct = rg.integers(np.full((6, 5), upper), dtype=dtype)
+        existing = np.zeros((6, 5), dtype=dtype, order="F")
+        rg.bit_generator.state = state
+        rg.integers(np.full((6, 5), upper), dtype=dtype, out=existing)
+        assert_equal(existing, direct)
+        with pytest.raises(TypeError):
+            rg.integers(upper, dtype=dtype, out=np.empty(3, dtype=np.float64))
+
+    @pytest.mark.parametrize("method, args, kwargs",
+                             [("normal", (0.0, 1.0), {}),
+                              ("normal", (0.0, 1.0), {"dtype": np.float32}),
+                              ("standard_gamma", (2.0,), {}),
+                              ("standard_gamma", (2.0,), {"dtype": np.float32}),
+                              ("exponential", (2.0,), {}),
+                              ("binomial", (10, 0.3), {}),
+                              ("poisson", (4.0,), {}),
+                              ("integers", (0, 100), {}),
+                              ("integers", (0, 100), {"dtype": np.uint8})])
+    def test_output_fill_logical_order(self, method, args, kwargs):
+        # Scalar and broadcast parameters fill out in the same order
+        rg = self.rg
+        state = rg.bit_generator.state
+        direct = getattr(rg, method)(*args, size=(3, 4), **kwargs)
+        scalar = np.zeros((3, 4), dtype=direct.dtype, order="F")
+        broadcast = np.zeros((3, 4), dtype=direct.dtype, order="F")
+        rg.bit_generator.state = state
+        getattr(rg, method)(*args, out=scalar, **kwargs)
+        rg.bit_generator.state = state
+        getattr(rg, method)(np.full((3, 4), args[0]), *args[1:], out=broadcast,
+                            **kwargs)
+        assert_equal(scalar, broadcast)
+        assert_equal(scalar, direct)
+
+    @pytest.mark.parametrize("method, dtype", [("random", np.float64),
+                                               ("random", np.float32),
+                                               ("random", np.float16),
+                                               ("standard_normal", np.float64),
+                                               ("standard_normal", np.float32),
+                                               ("standard_normal", np.float16),
+                                               ("standard_exponential", np.float32)])
+    def test_output_fill_f_order(self, method, dtype):
+        rg = self.rg
+        state = rg.bit_generator.state
+        direct = getattr(rg, method)(size=(3, 4), dtype=dtype)
+        out = np.zeros((3, 4), dtype=dtype, order="F")
+        rg.bit_generator.state = state
+        getattr(rg, method)(out=out, dtype=dtype)
+        assert_equal(out, direct)
 
     def test_integers_broadcast(self, dtype):
         if dtype == np.bool:
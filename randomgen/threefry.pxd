@@ -88,15 +88,27 @@ cdef extern from "src/threefry/threefry.h":
     uint32_t threefry2x32_next32(threefry_all_t *state) nogil
     double threefry2x32_next_double(threefry_all_t *state) nogil
     void threefry2x32_advance(threefry_all_t *state, uint32_t *step, int use_carry)
+    void threefry2x32_blocks_at(uint32_t *ctr, uint32_t *key, size_t cnt, uint32_t *out) nogil
+    void threefry2x32_raw_at(threefry_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
     uint64_t threefry4x32_next64(threefry_all_t *state) nogil
     uint32_t threefry4x32_next32(threefry_all_t *state) nogil
     double threefry4x32_next_double(threefry_all_t *state) nogil
     void threefry4x32_advance(threefry_all_t *state, uint32_t *step, int use_carry)
+    void threefry4x32_blocks_at(uint32_t *ctr, uint32_t *key, size_t cnt, uint32_t *out) nogil
+    void threefry4x32_raw_at(threefry_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
     uint64_t threefry2x64_next64(threefry_all_t *state) nogil
     uint32_t threefry2x64_next32(threefry_all_t *state) nogil
     double threefry2x64_next_double(threefry_all_t *state) nogil
     void threefry2x64_advance(threefry_all_t *state, uint64_t *step, int use_carry)
+    void threefry2x64_blocks_at(uint64_t *ctr, uint64_t *key, size_t cnt, uint64_t *out) nogil
+    void threefry2x64_raw_at(threefry_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
     uint64_t threefry4x64_next64(threefry_all_t *state) nogil
     uint32_t threefry4x64_next32(threefry_all_t *state) nogil
     double threefry4x64_next_double(threefry_all_t *state) nogil
     void threefry4x64_advance(threefry_all_t *state, uint64_t *step, int use_carry)
+    void threefry4x64_blocks_at(uint64_t *ctr, uint64_t *key, size_t cnt, uint64_t *out) nogil
+    void threefry4x64_raw_at(threefry_all_t *state, uint64_t *positions, size_t cnt, uint64_t *out) nogil
+    void threefry2x64_fill_next64(threefry_all_t *state, size_t cnt, uint64_t *out) nogil
+    void threefry2x64_fill_next_double(threefry_all_t *state, size_t cnt, double *out) nogil
+    void threefry4x64_fill_next64(threefry_all_t *state, size_t cnt, uint64_t *out) nogil
+    void threefry4x64_fill_next_double(threefry_all_t *state, size_t cnt, double *out) nogil
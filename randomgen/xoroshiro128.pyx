@@ -15,6 +15,16 @@ cdef uint32_t xoroshiro128_uint32(void *st) nogil:
 cdef double xoroshiro128_double(void* st) nogil:
     return uint64_to_double(xoroshiro128_next64(<xoroshiro128_state_t *>st))
 
+cdef void xoroshiro128_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = xoroshiro128_next64(<xoroshiro128_state_t *>st)
+
+cdef void xoroshiro128_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(xoroshiro128_next64(<xoroshiro128_state_t *>st))
+
 cdef class Xoroshiro128(BitGenerator):
     """
     Xoroshiro128(seed=None)
@@ -124,6 +134,8 @@ cdef class Xoroshiro128(BitGenerator):
         self._bitgen.next_uint32 = &xoroshiro128_uint32
         self._bitgen.next_double = &xoroshiro128_double
         self._bitgen.next_raw = &xoroshiro128_uint64
+        self._bitgen.fill_uint64 = &xoroshiro128_fill_uint64
+        self._bitgen.fill_double = &xoroshiro128_fill_double
 
     cdef _reset_state_variables(self):
         self.rng_state.has_uint32 = 0
@@ -16,6 +16,16 @@ cdef uint32_t xorshift1024_uint32(void *st) nogil:
 cdef double xorshift1024_double(void* st) nogil:
     return uint64_to_double(xorshift1024_next64(<xorshift1024_state_t *>st))
 
+cdef void xorshift1024_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = xorshift1024_next64(<xorshift1024_state_t *>st)
+
+cdef void xorshift1024_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(xorshift1024_next64(<xorshift1024_state_t *>st))
+
 cdef class Xorshift1024(BitGenerator):
     u"""
     Xorshift1024(seed=None)
@@ -128,6 +138,8 @@ cdef class Xorshift1024(BitGenerator):
         self._bitgen.next_uint32 = &xorshift1024_uint32
         self._bitgen.next_double = &xorshift1024_double
         self._bitgen.next_raw = &xorshift1024_uint64
+        self._bitgen.fill_uint64 = &xorshift1024_fill_uint64
+        self._bitgen.fill_double = &xorshift1024_fill_double
 
     cdef _reset_state_variables(self):
         self.rng_state.has_uint32 = 0
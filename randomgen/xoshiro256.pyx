@@ -15,6 +15,16 @@ cdef uint32_t xoshiro256_uint32(void *st) nogil:
 cdef double xoshiro256_double(void* st) nogil:
     return uint64_to_double(xoshiro256_next64(<xoshiro256_state_t *>st))
 
+cdef void xoshiro256_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = xoshiro256_next64(<xoshiro256_state_t *>st)
+
+cdef void xoshiro256_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(xoshiro256_next64(<xoshiro256_state_t *>st))
+
 cdef class Xoshiro256(BitGenerator):
     """
     Xoshiro256(seed=None)
@@ -127,6 +137,8 @@ cdef class Xoshiro256(BitGenerator):
         self._bitgen.next_uint32 = &xoshiro256_uint32
         self._bitgen.next_double = &xoshiro256_double
         self._bitgen.next_raw = &xoshiro256_uint64
+        self._bitgen.fill_uint64 = &xoshiro256_fill_uint64
+        self._bitgen.fill_double = &xoshiro256_fill_double
 
     cdef _reset_state_variables(self):
         self.rng_state.has_uint32 = 0
@@ -15,6 +15,16 @@ cdef uint32_t xoshiro512_uint32(void *st) nogil:
 cdef double xoshiro512_double(void* st) nogil:
     return uint64_to_double(xoshiro512_next64(<xoshiro512_state_t *>st))
 
+cdef void xoshiro512_fill_uint64(void *st, np.npy_intp cnt, uint64_t *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = xoshiro512_next64(<xoshiro512_state_t *>st)
+
+cdef void xoshiro512_fill_double(void *st, np.npy_intp cnt, double *out) nogil:
+    cdef np.npy_intp i
+    for i in range(cnt):
+        out[i] = uint64_to_double(xoshiro512_next64(<xoshiro512_state_t *>st))
+
 cdef class Xoshiro512(BitGenerator):
     """
     Xoshiro512(seed=None, *, mode=None)
@@ -123,6 +133,8 @@ cdef class Xoshiro512(BitGenerator):
         self._bitgen.next_uint32 = &xoshiro512_uint32
         self._bitgen.next_double = &xoshiro512_double
         self._bitgen.next_raw = &xoshiro512_uint64
+        self._bitgen.fill_uint64 = &xoshiro512_fill_uint64
+        self._bitgen.fill_double = &xoshiro512_fill_double
 
     cdef _reset_state_variables(self):
         self.rng_state.has_uint32 = 0